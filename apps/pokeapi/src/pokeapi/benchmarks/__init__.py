@@ -0,0 +1,15 @@
+from __future__ import annotations
+
+from . import fixtures, mock_server, runner
+from .fixtures import pokemon_name, pokemon_payload
+from .mock_server import MockPokeAPI
+from .runner import (
+    SCENARIOS,
+    TARGETS,
+    BenchmarkResult,
+    BenchmarkRunner,
+    compare,
+    environment,
+    isolate,
+    percentiles,
+)
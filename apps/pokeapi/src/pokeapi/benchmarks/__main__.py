@@ -0,0 +1,203 @@
+"""Benchmark the fetch, cache & refresh paths against a local, fake Pokemon API.
+
+Usage (from the src/ directory):
+
+    python -m pokeapi.benchmarks
+    python -m pokeapi.benchmarks --count 500 --latency 0.05 --jitter 0.02 --error-rate 0.01
+    python -m pokeapi.benchmarks --target aget --scenario cold --scenario warm
+    python -m pokeapi.benchmarks --compare .data/benchmarks/bench-20260101-120000-abc1234.json
+
+Caches are created in a temporary directory, so the app's own caches are never touched, and no
+Redis, RabbitMQ or network access is needed. Results are saved as JSON to
+[data_dir]/benchmarks/bench-[timestamp]-[commit].json (or --output). Pass --compare with an older
+results file to list regressions, and --fail-on-regression to exit with an error when there are any.
+"""
+from __future__ import annotations
+
+import sys
+
+sys.path.append(".")
+
+import argparse
+
+from datetime import datetime, timezone
+import json
+from pathlib import Path
+import tempfile
+
+from pokeapi.core.conf import app_settings
+from pokeapi.dependencies import close_http_clients
+
+from .mock_server import MockPokeAPI
+from .runner import SCENARIOS, TARGETS, BenchmarkRunner, compare, environment, isolate
+
+from loguru import logger as log
+
+## Options that change the workload. Runs only compare when these match.
+WORKLOAD_OPTIONS: tuple[str, ...] = (
+    "count",
+    "moves",
+    "latency",
+    "jitter",
+    "error_rate",
+    "rate_limited",
+    "retry_after",
+    "changed",
+    "concurrency",
+    "listing_calls",
+    "rate_limit",
+)
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(
+        description="Benchmark the fetch, cache & refresh paths against a local, fake Pokemon API."
+    )
+    parser.add_argument("--count", type=int, default=1000, help="Pokemon served by the fake API")
+    parser.add_argument("--moves", type=int, default=60, help="Moves per Pokemon, which drive payload size")
+    parser.add_argument("--latency", type=float, default=0.02, help="Seconds each response is delayed")
+    parser.add_argument("--jitter", type=float, default=0.01, help="Max extra random delay, in seconds")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="Fraction of requests answered with a 503")
+    parser.add_argument("--rate-limited", type=float, default=0.0, help="Fraction of requests answered with a 429")
+    parser.add_argument("--retry-after", type=int, default=0, help="Retry-After seconds sent with 429s")
+    parser.add_argument(
+        "--changed",
+        type=float,
+        default=0.1,
+        help="Fraction of Pokemon changed upstream before each revalidate scenario",
+    )
+    parser.add_argument(
+        "--concurrency",
+        type=int,
+        default=None,
+        help="Requests in flight at once. Defaults to the api_max_concurrency setting",
+    )
+    parser.add_argument("--listing-calls", type=int, default=20, help="get_pokemon calls per scenario")
+    parser.add_argument(
+        "--rate-limit",
+        action="store_true",
+        help="Keep the app's rate limiter on. Off by default, so its rate doesn't cap throughput",
+    )
+    parser.add_argument(
+        "--target", action="append", choices=TARGETS, default=None, help="Target to run. Repeat for several"
+    )
+    parser.add_argument(
+        "--scenario", action="append", choices=SCENARIOS, default=None, help="Scenario to run. Repeat for several"
+    )
+    parser.add_argument("--seed", type=int, default=0, help="Seed of the fake API's delays & faults")
+    parser.add_argument("--output", default=None, help="Results file. Defaults to [data_dir]/benchmarks/")
+    parser.add_argument("--compare", default=None, help="Results file of an earlier run to compare against")
+    parser.add_argument(
+        "--threshold",
+        type=float,
+        default=0.1,
+        help="Throughput drop or p99 rise counted as a regression, as a fraction",
+    )
+    parser.add_argument("--fail-on-regression", action="store_true", help="Exit with 1 on regressions")
+    parser.add_argument(
+        "--log-level",
+        default="ERROR",
+        help="Log level while benchmarking. Per-request logs at INFO/DEBUG skew the numbers",
+    )
+
+    return parser.parse_args()
+
+
+def print_results(results: list[dict] = None) -> None:
+    header: str = (
+        f"{'target':<22} {'scenario':<11} {'ok':>11} {'items/s':>9} {'p50 ms':>8} "
+        f"{'p99 ms':>8} {'up p99 ms':>9} {'upstream':<24} {'rss MB':>7} {'cache MB':>8}"
+    )
+    print(header)
+    print("-" * len(header))
+
+    def _ms(stats: dict, key: str) -> str:
+        return f"{stats[key] * 1000:.1f}" if key in stats else "-"
+
+    for r in results:
+        upstream: str = " ".join(f"{k}:{v}" for k, v in r["upstream_statuses"].items()) or "-"
+        cache_mb: str = f"{r['cache_bytes'] / 1e6:.1f}" if r["cache_bytes"] is not None else "-"
+
+        print(
+            f"{r['target']:<22} {r['scenario']:<11} {r['ok']:>5}/{r['items']:<5} "
+            f"{r['throughput']:>9.1f} {_ms(r['latency'], 'p50'):>8} {_ms(r['latency'], 'p99'):>8} "
+            f"{_ms(r['upstream_latency'], 'p99'):>9} {upstream:<24} {r['rss_bytes'] / 1e6:>7.1f} {cache_mb:>8}"
+        )
+
+
+if __name__ == "__main__":
+    args = parse_args()
+
+    log.remove()
+    log.add(sys.stderr, level=args.log_level.upper())
+
+    ## Before isolate() moves data_dir to the scratch directory
+    output_dir: Path = Path(app_settings.data_dir) / "benchmarks"
+
+    with tempfile.TemporaryDirectory(prefix="pokeapi-bench-") as scratch:
+        isolate(scratch, rate_limit=args.rate_limit)
+
+        with MockPokeAPI(
+            count=args.count,
+            latency=args.latency,
+            jitter=args.jitter,
+            error_rate=args.error_rate,
+            rate_limit_rate=args.rate_limited,
+            retry_after=args.retry_after,
+            moves=args.moves,
+            seed=args.seed,
+        ) as server:
+            runner = BenchmarkRunner(
+                server,
+                concurrency=args.concurrency,
+                changed=args.changed,
+                listing_calls=args.listing_calls,
+            )
+
+            results: list[dict] = [
+                runner.run(target, scenario)._asdict()
+                for target in args.target or TARGETS
+                for scenario in args.scenario or SCENARIOS
+            ]
+
+            close_http_clients()
+
+    env: dict = environment()
+    report: dict = {
+        "created_at": datetime.now(timezone.utc).isoformat(),
+        "environment": env,
+        "config": {k: v for k, v in vars(args).items() if k not in ("output", "compare", "fail_on_regression")}
+        | {"concurrency": runner.concurrency},
+        "results": results,
+    }
+
+    output: Path = (
+        Path(args.output)
+        if args.output
+        else output_dir
+        / f"bench-{datetime.now():%Y%m%d-%H%M%S}-{env['commit'] or 'unknown'}.json"
+    )
+    output.parent.mkdir(parents=True, exist_ok=True)
+    output.write_text(json.dumps(report, indent=2))
+
+    print_results(results)
+    print(f"\nResults saved to {output}")
+
+    if args.compare:
+        baseline: dict = json.loads(Path(args.compare).read_text())
+        differing: list[str] = [
+            k for k in WORKLOAD_OPTIONS if baseline.get("config", {}).get(k) != report["config"][k]
+        ]
+        if differing:
+            print(f"Warning: the baseline was run with different {differing}, results may not compare.")
+
+        regressions: list[str] = compare(results, baseline["results"], threshold=args.threshold)
+        if regressions:
+            print(f"\n[{len(regressions)}] regression(s) against {args.compare}:")
+            for regression in regressions:
+                print(f"  {regression}")
+
+            if args.fail_on_regression:
+                sys.exit(1)
+        else:
+            print(f"\nNo regressions against {args.compare}")
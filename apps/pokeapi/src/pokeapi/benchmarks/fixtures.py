@@ -0,0 +1,170 @@
+"""Synthetic Pokemon API payloads, shaped & sized like the real ones.
+
+Every payload is generated from its Pokemon ID (and a version, bumped to simulate an upstream
+change), so a benchmark serves the same bytes across runs & machines. Real /pokemon responses are
+dominated by their moves list; a few dozen moves with several version groups each lands in the
+same 50-300 KB range.
+"""
+from __future__ import annotations
+
+import json
+import random
+
+STAT_NAMES: tuple[str, ...] = (
+    "hp",
+    "attack",
+    "defense",
+    "special-attack",
+    "special-defense",
+    "speed",
+)
+TYPE_NAMES: tuple[str, ...] = (
+    "normal",
+    "fighting",
+    "flying",
+    "poison",
+    "ground",
+    "rock",
+    "bug",
+    "ghost",
+    "steel",
+    "fire",
+    "water",
+    "grass",
+    "electric",
+    "psychic",
+    "ice",
+    "dragon",
+    "dark",
+    "fairy",
+)
+VERSION_GROUPS: tuple[str, ...] = (
+    "red-blue",
+    "yellow",
+    "gold-silver",
+    "crystal",
+    "ruby-sapphire",
+    "emerald",
+    "firered-leafgreen",
+    "diamond-pearl",
+    "platinum",
+    "heartgold-soulsilver",
+    "black-white",
+    "black-2-white-2",
+    "x-y",
+    "omega-ruby-alpha-sapphire",
+    "sun-moon",
+    "ultra-sun-ultra-moon",
+    "sword-shield",
+    "scarlet-violet",
+)
+LEARN_METHODS: tuple[str, ...] = ("level-up", "machine", "egg", "tutor")
+
+API_URL: str = "https://pokeapi.co/api/v2"
+SPRITES_URL: str = "https://raw.githubusercontent.com/PokeAPI/sprites/master/sprites/pokemon"
+
+
+def pokemon_name(pokemon_id: int = None) -> str:
+    return f"pokemon-{pokemon_id}"
+
+
+def _ref(endpoint: str, resource_id: int, name: str) -> dict:
+    return {"name": name, "url": f"{API_URL}/{endpoint}/{resource_id}/"}
+
+
+def _sprites(pokemon_id: int) -> dict:
+    def _set(prefix: str) -> dict:
+        return {
+            "front_default": f"{SPRITES_URL}/{prefix}{pokemon_id}.png",
+            "front_shiny": f"{SPRITES_URL}/{prefix}shiny/{pokemon_id}.png",
+            "back_default": f"{SPRITES_URL}/{prefix}back/{pokemon_id}.png",
+            "back_shiny": f"{SPRITES_URL}/{prefix}back/shiny/{pokemon_id}.png",
+            "front_female": None,
+            "back_female": None,
+        }
+
+    return {
+        **_set(""),
+        "other": {
+            "dream_world": {"front_default": f"{SPRITES_URL}/other/dream-world/{pokemon_id}.svg"},
+            "home": _set("other/home/"),
+            "official-artwork": _set("other/official-artwork/"),
+        },
+        "versions": {
+            f"generation-{gen}": {group: _set(f"versions/generation-{gen}/{group}/")}
+            for gen, group in enumerate(VERSION_GROUPS[:8:2], 1)
+        },
+    }
+
+
+def pokemon_payload(pokemon_id: int = None, version: int = 0, moves: int = 60) -> dict:
+    """Build a /pokemon/{id} response for a Pokemon ID.
+
+    PARAMS:
+    -------
+
+    * pokemon_id (int): ID of the Pokemon. Its name is pokemon_name(pokemon_id).
+    * version (int): Bump to change the payload, i.e. to make a revalidation download it again.
+    * moves (int): Number of moves, which drive the payload's size.
+    """
+    rng = random.Random(pokemon_id)
+    name: str = pokemon_name(pokemon_id)
+    type_ids: list[int] = rng.sample(range(1, len(TYPE_NAMES) + 1), rng.choice((1, 2)))
+
+    return {
+        "id": pokemon_id,
+        "name": name,
+        "order": pokemon_id,
+        "is_default": True,
+        "height": rng.randint(2, 40),
+        "weight": rng.randint(10, 2000),
+        "base_experience": rng.randint(40, 300) + version,
+        "location_area_encounters": f"{API_URL}/pokemon/{pokemon_id}/encounters",
+        "abilities": [
+            {
+                "ability": _ref("ability", ability_id, f"ability-{ability_id}"),
+                "is_hidden": slot == 3,
+                "slot": slot,
+            }
+            for slot, ability_id in enumerate(rng.sample(range(1, 300), 2), 1)
+        ],
+        "forms": [_ref("pokemon-form", pokemon_id, name)],
+        "game_indices": [
+            {"game_index": pokemon_id, "version": _ref("version", i, group)}
+            for i, group in enumerate(VERSION_GROUPS, 1)
+        ],
+        "held_items": [],
+        "moves": [
+            {
+                "move": _ref("move", move_id, f"move-{move_id}"),
+                "version_group_details": [
+                    {
+                        "level_learned_at": rng.randint(0, 80),
+                        "move_learn_method": _ref(
+                            "move-learn-method", method + 1, LEARN_METHODS[method]
+                        ),
+                        "version_group": _ref("version-group", group + 1, VERSION_GROUPS[group]),
+                    }
+                    for group in sorted(rng.sample(range(len(VERSION_GROUPS)), rng.randint(3, 10)))
+                    for method in (rng.randrange(len(LEARN_METHODS)),)
+                ],
+            }
+            for move_id in sorted(rng.sample(range(1, 920), moves))
+        ],
+        "past_types": [],
+        "species": _ref("pokemon-species", pokemon_id, name),
+        "sprites": _sprites(pokemon_id),
+        "stats": [
+            {"base_stat": rng.randint(5, 200), "effort": 0, "stat": _ref("stat", i, stat)}
+            for i, stat in enumerate(STAT_NAMES, 1)
+        ],
+        "types": [
+            {"slot": slot, "type": _ref("type", type_id, TYPE_NAMES[type_id - 1])}
+            for slot, type_id in enumerate(type_ids, 1)
+        ],
+        "weight_version": version,
+    }
+
+
+def encode_payload(payload: dict = None) -> bytes:
+    return json.dumps(payload, separators=(",", ":")).encode()
@@ -0,0 +1,266 @@
+"""A local, fake Pokemon API for benchmarks.
+
+Serves the /pokemon listing & /pokemon/{name or id} endpoints with fixture payloads (see
+pokeapi.benchmarks.fixtures), from its own thread & event loop, so it can run next to the code being
+measured. Responses can be delayed, rate limited (429 with a Retry-After) or fail (503) at
+configurable rates, and carry an ETag, so revalidations get a 304 until the payload is changed with
+.mutate().
+"""
+from __future__ import annotations
+
+import asyncio
+
+from collections import Counter
+import gzip
+import hashlib
+import random
+import threading
+
+from pokeapi.server.http import HTTPServer, Request, Response
+
+from .fixtures import encode_payload, pokemon_name, pokemon_payload
+
+from loguru import logger as log
+
+class _Body:
+    """A payload pre-encoded once, so serving it costs the server nothing but the write."""
+
+    __slots__ = ("raw", "gzipped", "etag")
+
+    def __init__(self, raw: bytes = None) -> None:
+        self.raw = raw
+        self.gzipped = gzip.compress(raw, compresslevel=6, mtime=0)
+        self.etag = f'"{hashlib.blake2b(raw, digest_size=12).hexdigest()}"'
+
+
+class MockPokeAPI:
+    """Fake Pokemon API server, running in a background thread.
+
+    PARAMS:
+    -------
+
+    * count (int): Number of Pokemon served, with IDs 1 to count.
+    * latency (float): Seconds each response is delayed by.
+    * jitter (float): Up to this many extra seconds are added to each delay, at random.
+    * error_rate (float): Fraction of requests answered with a 503.
+    * rate_limit_rate (float): Fraction of requests answered with a 429.
+    * retry_after (int): Retry-After seconds sent with 429s.
+    * moves (int): Moves per Pokemon payload, which drive the payload's size.
+    * host (str): Address to listen on.
+    * port (int): Port to listen on. 0 picks a free port.
+    * seed (int): Seed of the random delays & faults, so runs with the same settings match.
+
+    Usage:
+
+        with MockPokeAPI(count=200, latency=0.05) as server:
+            APIAllPokemon(url=f"{server.base_url}/pokemon").get_pokemon()
+    """
+
+    def __init__(
+        self,
+        count: int = 1000,
+        latency: float = 0.0,
+        jitter: float = 0.0,
+        error_rate: float = 0.0,
+        rate_limit_rate: float = 0.0,
+        retry_after: int = 0,
+        moves: int = 60,
+        host: str = "127.0.0.1",
+        port: int = 0,
+        seed: int = 0,
+    ) -> None:
+        """Configure the server. Call .start() (or use it as a context manager) to serve."""
+        if count < 1:
+            raise ValueError(f"Invalid count: {count}. Must serve at least 1 Pokemon")
+        if not 0 <= error_rate + rate_limit_rate <= 1:
+            raise ValueError("error_rate & rate_limit_rate must add up to a fraction between 0 & 1")
+
+        self.count = count
+        self.latency = latency
+        self.jitter = jitter
+        self.error_rate = error_rate
+        self.rate_limit_rate = rate_limit_rate
+        self.retry_after = retry_after
+        self.moves = moves
+        self.host = host
+        self.port = port
+
+        self.statuses: Counter[int] = Counter()
+        self.bytes_sent: int = 0
+
+        self._rng = random.Random(seed)
+        self._versions: dict[int, int] = {}
+        self._bodies: dict[int, _Body] = {}
+        self._ids: dict[str, int] = {}
+        self._listings: dict[tuple[int, int], _Body] = {}
+
+        self._server: HTTPServer | None = None
+        self._loop: asyncio.AbstractEventLoop | None = None
+        self._thread: threading.Thread | None = None
+
+    @property
+    def base_url(self) -> str:
+        """The fake API's equivalent of api_settings.base_url, i.e. http://127.0.0.1:40123/api/v2."""
+        return f"http://{self.host}:{self.port}/api/v2"
+
+    @property
+    def requests(self) -> int:
+        return sum(self.statuses.values())
+
+    def pokemon_url(self, pokemon_id: int = None) -> str:
+        return f"{self.base_url}/pokemon/{pokemon_id}/"
+
+    def prepare(self) -> None:
+        """Generate & encode every payload up front, so payload generation isn't measured."""
+        for pokemon_id in range(1, self.count + 1):
+            self._ids[pokemon_name(pokemon_id)] = pokemon_id
+            self._ids[str(pokemon_id)] = pokemon_id
+            self._encode(pokemon_id)
+
+    def _encode(self, pokemon_id: int) -> None:
+        version: int = self._versions.get(pokemon_id, 0)
+        self._bodies[pokemon_id] = _Body(
+            encode_payload(pokemon_payload(pokemon_id, version=version, moves=self.moves))
+        )
+
+    def mutate(self, fraction: float = 0.1) -> list[int]:
+        """Change the payloads of a random fraction of the Pokemon. Returns the changed IDs.
+
+        Revalidating a changed Pokemon downloads it again. The others get a 304.
+        """
+        changed: list[int] = sorted(
+            self._rng.sample(range(1, self.count + 1), round(self.count * fraction))
+        )
+
+        for pokemon_id in changed:
+            self._versions[pokemon_id] = self._versions.get(pokemon_id, 0) + 1
+            self._encode(pokemon_id)
+
+        return changed
+
+    def reset_stats(self) -> None:
+        self.statuses = Counter()
+        self.bytes_sent = 0
+
+    def start(self) -> MockPokeAPI:
+        if self._thread is not None:
+            return self
+
+        if not self._bodies:
+            self.prepare()
+
+        self._loop = asyncio.new_event_loop()
+        self._thread = threading.Thread(
+            target=self._loop.run_forever, name="mock-pokeapi", daemon=True
+        )
+        self._thread.start()
+
+        self._server = HTTPServer(self.handle, host=self.host, port=self.port)
+        asyncio.run_coroutine_threadsafe(self._server.start(), self._loop).result()
+        self.port = self._server.port
+
+        log.info(f"Mock Pokemon API serving [{self.count}] Pokemon at {self.base_url}")
+
+        return self
+
+    def stop(self) -> None:
+        if self._thread is None:
+            return
+
+        asyncio.run_coroutine_threadsafe(self._server.close(), self._loop).result()
+        self._loop.call_soon_threadsafe(self._loop.stop)
+        self._thread.join()
+        self._loop.close()
+
+        self._server = self._loop = self._thread = None
+
+    def __enter__(self) -> MockPokeAPI:
+        """Start serving."""
+        return self.start()
+
+    def __exit__(self, *exc) -> None:
+        """Stop serving."""
+        self.stop()
+
+    async def handle(self, request: Request) -> Response:
+        delay: float = self.latency + (self._rng.uniform(0, self.jitter) if self.jitter else 0)
+        if delay > 0:
+            await asyncio.sleep(delay)
+
+        response: Response = self._respond(request)
+
+        self.statuses[response.status] += 1
+        if request.method != "HEAD":
+            self.bytes_sent += len(response.body)
+
+        return response
+
+    def _respond(self, request: Request) -> Response:
+        parts: list[str] = [p for p in request.path.split("/") if p]
+
+        if parts[:3] != ["api", "v2", "pokemon"] or len(parts) > 4:
+            return Response.error(404)
+
+        fault: float = self._rng.random()
+        if fault < self.rate_limit_rate:
+            response = Response.error(429)
+            response.headers["Retry-After"] = str(self.retry_after)
+
+            return response
+        if fault < self.rate_limit_rate + self.error_rate:
+            return Response.error(503)
+
+        if len(parts) == 3:
+            return self._listing(request)
+
+        pokemon_id: int | None = self._ids.get(parts[3])
+        if pokemon_id is None:
+            return Response.error(404)
+
+        return self._send(request, self._bodies[pokemon_id])
+
+    def _listing(self, request: Request) -> Response:
+        try:
+            limit: int = int(request.query.get("limit", 20))
+            offset: int = int(request.query.get("offset", 0))
+        except ValueError:
+            return Response.error(400, "limit & offset must be integers")
+
+        body: _Body | None = self._listings.get((limit, offset))
+        if body is None:
+            body = self._listings[(limit, offset)] = _Body(self._listing_page(limit, offset))
+
+        return self._send(request, body)
+
+    def _listing_page(self, limit: int, offset: int) -> bytes:
+        ids = range(offset + 1, min(offset + limit, self.count) + 1)
+
+        def _page(page_offset: int) -> str | None:
+            if page_offset >= self.count:
+                return None
+
+            return f"{self.base_url}/pokemon?offset={page_offset}&limit={limit}"
+
+        return encode_payload(
+            {
+                "count": self.count,
+                "next": _page(offset + limit),
+                "previous": _page(max(offset - limit, 0)) if offset else None,
+                "results": [
+                    {"name": pokemon_name(i), "url": self.pokemon_url(i)} for i in ids
+                ],
+            }
+        )
+
+    def _send(self, request: Request, body: _Body) -> Response:
+        headers: dict[str, str] = {"Content-Type": "application/json", "ETag": body.etag}
+
+        if body.etag in request.headers.get("if-none-match", ""):
+            return Response(304, headers=headers)
+
+        if request.accepts_gzip():
+            headers["Content-Encoding"] = "gzip"
+
+            return Response(200, body.gzipped, headers=headers)
+
+        return Response(200, body.raw, headers=headers)
@@ -0,0 +1,452 @@
+"""Run the fetch, cache & refresh paths against a MockPokeAPI & measure them.
+
+Targets (what's measured):
+
+* aget: APIPokemonResource.aget() per Pokemon, [concurrency] at a time. The only target with
+    per-Pokemon latencies.
+* cache_all_pokemon: One cache_all_pokemon() call over the whole listing.
+* get_pokemon: APIAllPokemon.get_pokemon(), the /pokemon listing, called [listing_calls] times.
+* refresh_pokemon_batch: The Celery batch refresh task, called in-process (without a broker) on
+    chunks of celery_settings.refresh_chunk_size Pokemon. It always revalidates.
+
+Scenarios (the state of the cache):
+
+* cold: The cache starts empty, so every Pokemon is downloaded.
+* warm: Every Pokemon is cached & fresh.
+* revalidate: Every Pokemon is cached, and revalidated with conditional requests after
+    [changed] of them changed upstream (see MockPokeAPI.mutate()).
+
+Each run records throughput, latency percentiles, the upstream requests made (by status, with their
+time to response headers), memory & the cache's size.
+"""
+from __future__ import annotations
+
+import asyncio
+import math
+import os
+
+from pathlib import Path
+import platform
+import resource
+import subprocess
+import time
+from typing import Any, Callable, NamedTuple
+
+from pokeapi.core.conf import (
+    api_settings,
+    app_settings,
+    cache_settings,
+    celery_settings,
+    db_settings,
+    ratelimit_settings,
+)
+
+from .mock_server import MockPokeAPI
+
+import httpx
+
+from loguru import logger as log
+
+TARGETS: tuple[str, ...] = ("aget", "cache_all_pokemon", "get_pokemon", "refresh_pokemon_batch")
+SCENARIOS: tuple[str, ...] = ("cold", "warm", "revalidate")
+
+PERCENTILES: tuple[int, ...] = (50, 90, 99)
+
+
+class BenchmarkResult(NamedTuple):
+    target: str
+    scenario: str
+    ## Operations measured: Pokemon, or listing calls for get_pokemon
+    items: int
+    ok: int
+    seconds: float
+    throughput: float
+    ## Percentiles of each operation's duration, in seconds. Empty for cache_all_pokemon, which is one call.
+    latency: dict[str, float]
+    ## Requests the mock server answered, by status
+    upstream_statuses: dict[str, int]
+    upstream_bytes: int
+    ## Percentiles of the time to response headers of requests to the mock server, in seconds
+    upstream_latency: dict[str, float]
+    rss_bytes: int
+    rss_delta_bytes: int
+    peak_rss_bytes: int
+    cache_entries: int
+    cache_bytes: int | None
+
+
+def percentiles(values: list[float] = None) -> dict[str, float]:
+    """Nearest-rank p50/p90/p99 (plus mean & max) of a list of durations."""
+    if not values:
+        return {}
+
+    ordered: list[float] = sorted(values)
+    stats: dict[str, float] = {
+        f"p{q}": ordered[max(0, math.ceil(q / 100 * len(ordered)) - 1)] for q in PERCENTILES
+    }
+    stats["mean"] = sum(ordered) / len(ordered)
+    stats["max"] = ordered[-1]
+
+    return stats
+
+
+def rss_bytes() -> int:
+    """Resident memory of this process. Falls back to the peak on systems without /proc."""
+    try:
+        with open("/proc/self/statm") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError, IndexError):
+        return peak_rss_bytes()
+
+
+def peak_rss_bytes() -> int:
+    peak: int = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+
+    ## Bytes on macOS, KiB elsewhere
+    return peak if platform.system() == "Darwin" else peak * 1024
+
+
+def environment() -> dict[str, Any]:
+    """Where a benchmark ran, so results from different machines & versions can be told apart."""
+    try:
+        commit: str | None = subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            capture_output=True,
+            text=True,
+            timeout=5,
+            check=True,
+        ).stdout.strip()
+    except (OSError, subprocess.SubprocessError):
+        commit = None
+
+    return {
+        "commit": commit,
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "cpus": os.cpu_count(),
+        "httpx": httpx.__version__,
+        "cache_backend": cache_settings.backend,
+        "cache_codec": cache_settings.codec,
+        "memory_max_size": cache_settings.memory_max_size,
+    }
+
+
+def isolate(directory: str | Path = None, rate_limit: bool = False) -> None:
+    """Point the cache & data directories at a scratch directory & make the app run in-process.
+
+    Call before importing pokeapi.celery_tasks, which opens its caches on import. Redis isn't
+    needed: locks are off, rate limits are kept per process & background refreshes run locally.
+
+    PARAMS:
+    -------
+
+    * directory (str | Path): Scratch directory the benchmark's caches are created in.
+    * rate_limit (bool): Keep rate limiting requests to the mock server. Off, requests only wait
+        on the concurrency limit & retries.
+    """
+    directory = Path(directory)
+
+    app_settings.data_dir = directory / "data"
+    app_settings.cache_dir = directory / "cache"
+    cache_settings.snapshot_dir = ""
+    cache_settings.lock_enabled = False
+    cache_settings.refresh_backend = "local"
+    db_settings.sync_enabled = False
+    ratelimit_settings.backend = "local"
+    ratelimit_settings.enabled = rate_limit
+
+    for path in (app_settings.data_dir, app_settings.cache_dir):
+        path.mkdir(parents=True, exist_ok=True)
+
+
+class _UpstreamTimer:
+    """Times requests made by the pooled httpx client, from sending them to their response headers."""
+
+    def __init__(self) -> None:
+        self.durations: list[float] = []
+        self._client: httpx.AsyncClient | None = None
+
+    async def _on_request(self, request: httpx.Request) -> None:
+        request.extensions["benchmark_started"] = time.perf_counter()
+
+    async def _on_response(self, response: httpx.Response) -> None:
+        started: float | None = response.request.extensions.get("benchmark_started")
+        if started is not None:
+            self.durations.append(time.perf_counter() - started)
+
+    def attach(self) -> None:
+        from pokeapi.core.fetch import run_sync
+        from pokeapi.dependencies import get_async_client
+
+        async def _client() -> httpx.AsyncClient:
+            ## The pooled client belongs to the loop run_sync() runs on
+            return get_async_client()
+
+        self._client = run_sync(_client())
+        self._client.event_hooks["request"].append(self._on_request)
+        self._client.event_hooks["response"].append(self._on_response)
+
+    def detach(self) -> None:
+        if self._client is None:
+            return
+
+        self._client.event_hooks["request"].remove(self._on_request)
+        self._client.event_hooks["response"].remove(self._on_response)
+        self._client = None
+
+
+class BenchmarkRunner:
+    """Run benchmark targets & scenarios against a running MockPokeAPI.
+
+    Call isolate() first. Every target shares the cache Celery's refresh tasks use.
+
+    PARAMS:
+    -------
+
+    * server (MockPokeAPI): The started mock server.
+    * concurrency (int): Requests in flight at once. Defaults to api_settings.max_concurrency.
+    * changed (float): Fraction of Pokemon changed upstream before each revalidate scenario.
+    * listing_calls (int): Times get_pokemon is called per scenario.
+    """
+
+    def __init__(
+        self,
+        server: MockPokeAPI = None,
+        concurrency: int | None = None,
+        changed: float = 0.1,
+        listing_calls: int = 20,
+    ) -> None:
+        """Set up a runner against a started server."""
+        if server is None:
+            raise ValueError("Missing MockPokeAPI to benchmark against.")
+
+        ## Imported here, so isolate() runs before celery_tasks opens its caches
+        from pokeapi import celery_tasks
+
+        if concurrency is not None:
+            api_settings.max_concurrency = concurrency
+
+        self.server = server
+        self.concurrency: int = api_settings.max_concurrency
+        self.changed = changed
+        self.listing_calls = listing_calls
+
+        self.cache = celery_tasks.req_cache
+        self._refresh_batch = celery_tasks.refresh_pokemon_batch
+        self._pairs: list[tuple[str, str]] | None = None
+
+    @property
+    def listing_url(self) -> str:
+        return f"{self.server.base_url}/pokemon"
+
+    def pokemon(self) -> list:
+        """Fresh APIPokemonResource objects (without responses) for every Pokemon the server has."""
+        from pokeapi.domain.api.responses import APIAllPokemon, APIPokemonResource
+
+        if self._pairs is None:
+            listing = APIAllPokemon(url=self.listing_url)
+            listing.get_pokemon(use_cache=False)
+
+            if listing.pokemon_list is None:
+                raise RuntimeError(f"Could not load the Pokemon listing from {self.listing_url}")
+
+            self._pairs = [(p.name, p.request_url) for p in listing.pokemon_list]
+
+        return [APIPokemonResource(name=name, url=url) for name, url in self._pairs]
+
+    def cache_size(self) -> tuple[int, int | None]:
+        """Entries & bytes in the cache. Bytes is None for backends that can't tell (i.e. Redis)."""
+        volume: Callable[[], int] | None = getattr(self.cache, "volume", None)
+
+        return len(self.cache), volume() if callable(volume) else None
+
+    def prepare(self, scenario: str = None) -> None:
+        """Bring the cache & the mock server to the state a scenario starts in. Not measured."""
+        if scenario not in SCENARIOS:
+            raise ValueError(f"Invalid scenario: {scenario}. Must be one of {list(SCENARIOS)}")
+
+        from pokeapi.utils.pokemon_utils import cache_all_pokemon
+
+        pokemon: list = self.pokemon()
+
+        if scenario == "cold":
+            self.cache.clear()
+            return
+
+        missing: list = [p for p in pokemon if p.cache_key not in self.cache]
+        if missing:
+            log.info(f"Warming the cache with [{len(missing)}] Pokemon")
+            cache_all_pokemon(pokemon_list=missing, cache=self.cache)
+
+        if "all_pokemon" not in self.cache:
+            self._listing().get_pokemon(use_cache=True, cache=self.cache)
+
+        if scenario == "revalidate" and self.changed:
+            self.server.mutate(self.changed)
+
+    def _listing(self):
+        from pokeapi.domain.api.responses import APIAllPokemon
+
+        return APIAllPokemon(url=self.listing_url)
+
+    def run(self, target: str = None, scenario: str = None) -> BenchmarkResult:
+        """Measure one target in one scenario."""
+        runners: dict[str, Callable[[str], tuple[int, int, list[float]]]] = {
+            "aget": self._run_aget,
+            "cache_all_pokemon": self._run_cache_all_pokemon,
+            "get_pokemon": self._run_get_pokemon,
+            "refresh_pokemon_batch": self._run_refresh_pokemon_batch,
+        }
+        if target not in runners:
+            raise ValueError(f"Invalid target: {target}. Must be one of {list(runners)}")
+
+        self.prepare(scenario)
+        self.server.reset_stats()
+
+        timer = _UpstreamTimer()
+        timer.attach()
+        rss_before: int = rss_bytes()
+        start: float = time.perf_counter()
+
+        try:
+            items, ok, latencies = runners[target](scenario)
+        finally:
+            seconds: float = time.perf_counter() - start
+            timer.detach()
+
+        rss_after: int = rss_bytes()
+        entries, volume = self.cache_size()
+
+        result = BenchmarkResult(
+            target=target,
+            scenario=scenario,
+            items=items,
+            ok=ok,
+            seconds=seconds,
+            throughput=items / seconds if seconds else 0.0,
+            latency=percentiles(latencies),
+            upstream_statuses={str(k): v for k, v in sorted(self.server.statuses.items())},
+            upstream_bytes=self.server.bytes_sent,
+            upstream_latency=percentiles(timer.durations),
+            rss_bytes=rss_after,
+            rss_delta_bytes=rss_after - rss_before,
+            peak_rss_bytes=peak_rss_bytes(),
+            cache_entries=entries,
+            cache_bytes=volume,
+        )
+        log.info(
+            f"[{target}/{scenario}] {ok}/{items} ok in {seconds:.2f}s "
+            f"({result.throughput:.1f}/s), upstream {dict(self.server.statuses)}"
+        )
+
+        return result
+
+    def _run_aget(self, scenario: str) -> tuple[int, int, list[float]]:
+        from pokeapi.core.fetch import run_sync
+
+        revalidate: bool = scenario == "revalidate"
+        pokemon: list = self.pokemon()
+        latencies: list[float] = []
+
+        async def _run() -> int:
+            semaphore = asyncio.Semaphore(self.concurrency)
+
+            async def _one(p) -> bool:
+                async with semaphore:
+                    start: float = time.perf_counter()
+                    try:
+                        res = await p.aget(use_cache=True, cache=self.cache, revalidate=revalidate)
+                    finally:
+                        latencies.append(time.perf_counter() - start)
+
+                    return res is not None
+
+            results = await asyncio.gather(*(_one(p) for p in pokemon), return_exceptions=True)
+
+            return sum(r is True for r in results)
+
+        return len(pokemon), run_sync(_run()), latencies
+
+    def _run_cache_all_pokemon(self, scenario: str) -> tuple[int, int, list[float]]:
+        from pokeapi.utils.pokemon_utils import cache_all_pokemon
+
+        pokemon: list = self.pokemon()
+        loaded: list = cache_all_pokemon(
+            pokemon_list=pokemon,
+            cache=self.cache,
+            concurrency=self.concurrency,
+            revalidate=scenario == "revalidate",
+        )
+
+        return len(pokemon), len(loaded), []
+
+    def _run_get_pokemon(self, scenario: str) -> tuple[int, int, list[float]]:
+        latencies: list[float] = []
+        ok: int = 0
+
+        for _ in range(self.listing_calls):
+            if scenario == "cold":
+                self.cache.delete("all_pokemon")
+
+            listing = self._listing()
+            start: float = time.perf_counter()
+            content = listing.get_pokemon(
+                use_cache=True, cache=self.cache, revalidate=scenario == "revalidate"
+            )
+            latencies.append(time.perf_counter() - start)
+
+            ok += content is not None
+
+        return self.listing_calls, ok, latencies
+
+    def _run_refresh_pokemon_batch(self, scenario: str) -> tuple[int, int, list[float]]:
+        chunk_size: int = celery_settings.refresh_chunk_size
+        dicts: list[dict] = [
+            p.model_dump(by_alias=True, exclude={"response"}) for p in self.pokemon()
+        ]
+        latencies: list[float] = []
+        ok: int = 0
+
+        for i in range(0, len(dicts), chunk_size):
+            start: float = time.perf_counter()
+            ok += len(self._refresh_batch(dicts[i : i + chunk_size]))
+            latencies.append(time.perf_counter() - start)
+
+        return len(dicts), ok, latencies
+
+
+def compare(
+    current: list[dict] = None, baseline: list[dict] = None, threshold: float = 0.1
+) -> list[str]:
+    """Regressions between two runs' results: a throughput drop or a p99 latency rise above threshold.
+
+    PARAMS:
+    -------
+
+    * current (list[dict]): Results of this run (BenchmarkResult._asdict() dicts).
+    * baseline (list[dict]): Results of the run to compare against.
+    * threshold (float): Allowed change, as a fraction (0.1 = 10%).
+    """
+    previous: dict[tuple[str, str], dict] = {(r["target"], r["scenario"]): r for r in baseline}
+    regressions: list[str] = []
+
+    for result in current:
+        key: tuple[str, str] = (result["target"], result["scenario"])
+        before: dict | None = previous.get(key)
+        if before is None:
+            continue
+
+        if before["throughput"] and result["throughput"] < before["throughput"] * (1 - threshold):
+            regressions.append(
+                f"{key[0]}/{key[1]}: throughput {before['throughput']:.1f}/s -> {result['throughput']:.1f}/s"
+            )
+
+        p99_before: float | None = (before.get("latency") or {}).get("p99")
+        p99_now: float | None = (result.get("latency") or {}).get("p99")
+        if p99_before and p99_now and p99_now > p99_before * (1 + threshold):
+            regressions.append(
+                f"{key[0]}/{key[1]}: p99 latency {p99_before * 1000:.1f}ms -> {p99_now * 1000:.1f}ms"
+            )
+
+    return regressions
+
@@ -1,13 +1,25 @@
-from .celeryapp import app
-from loguru import logger as log
+from __future__ import annotations
 
-from pokeapi.domain.api.responses import APIAllPokemon, APIPokemonResource
-from pokeapi.utils.pokemon_utils import cache_all_pokemon
-from red_utils.ext.diskcache_utils import check_cache_key_exists, get_val, set_val
-from pokeapi.dependencies import init_cache
+from pokeapi.core.conf import celery_settings, db_settings
+from pokeapi.dependencies import init_cache, span
+from pokeapi.domain.api.responses import (
+    APIAllPokemon,
+    APIPokemonResource,
+    APIResource,
+    PokemonListing,
+)
+from pokeapi.domain.pokemon import get_pokemon_store
+from pokeapi.utils.pokemon_utils import cache_all_pokemon, update_pokemon_index
+
+from .celeryapp import app
 
+from celery import chord, group
+from celery.result import AsyncResult
 import diskcache
 
+from loguru import logger as log
+from red_utils.ext.diskcache_utils import check_cache_key_exists, get_val, set_val
+
 req_cache = init_cache("requests")
 app_cache = init_cache("app")
 
@@ -20,12 +32,18 @@ def refresh_all_pokemon(all_pokemon_dict: dict) -> dict:
     cache: diskcache.Cache = req_cache
 
     # log.debug(f"All Pokemon dict ({type(all_pokemon_dict)}): {all_pokemon_dict}")
-    all_pokemon: APIAllPokemon = APIAllPokemon.model_validate(all_pokemon_dict)
+    with span("pydantic.validate", model="APIAllPokemon"):
+        all_pokemon: APIAllPokemon = APIAllPokemon.model_validate(all_pokemon_dict)
     # log.debug(f"All Pokemon object ({type(all_pokemon)}): {all_pokemon}")
 
-    all_pokemon.get_pokemon(use_cache=True, cache=cache)
+    all_pokemon.get_pokemon(use_cache=True, cache=cache, revalidate=True)
 
-    return all_pokemon.model_dump()
+    if all_pokemon.pokemon_list is not None:
+        with span("index.update", count=len(all_pokemon.pokemon_list)):
+            update_pokemon_index(all_pokemon, cache=app_cache)
+
+    with span("pydantic.dump", model="APIAllPokemon"):
+        return all_pokemon.model_dump()
 
 
 @app.task
@@ -35,9 +53,123 @@ def refresh_single_pokemon(pokemon_dict: dict) -> dict:
 
     cache: diskcache.Cache = req_cache
 
-    pokemon: APIPokemonResource = APIPokemonResource.model_validate(pokemon_dict)
+    with span("pydantic.validate", model="APIPokemonResource"):
+        pokemon: APIPokemonResource = APIPokemonResource.model_validate(pokemon_dict)
     log.info(f"Refreshing Pokemon {pokemon.name}")
 
-    pokemon.get(use_cache=True, cache=cache)
+    pokemon.get(use_cache=True, cache=cache, revalidate=True)
 
     return pokemon.model_dump()
+
+
+@app.task
+def refresh_resource(resource_dict: dict) -> dict:
+    """Revalidate a cached resource (i.e. a type or move), see APIResource."""
+    if resource_dict is None:
+        raise ValueError("Missing APIResource dict object")
+
+    resource: APIResource = APIResource.model_validate(resource_dict)
+    log.info(f"Refreshing resource {resource.cache_key}")
+
+    resource.get(use_cache=True, cache=req_cache, revalidate=True)
+
+    return resource.model_dump(by_alias=True, exclude={"response"})
+
+
+@app.task
+def refresh_pokemon_batch(pokemon_dicts: list[dict]) -> list[dict]:
+    """Refresh a chunk of Pokemon concurrently inside one task.
+
+    Takes & returns name/URL pairs only. The responses themselves stay in the cache instead
+    of travelling through the broker & result backend. With db_settings.sync_enabled, the
+    refreshed Pokemon are also upserted into the PokemonStore.
+    """
+    if pokemon_dicts is None:
+        raise ValueError("Missing list of APIPokemonResource dict objects")
+
+    cache: diskcache.Cache = req_cache
+
+    with span("pydantic.validate", model="APIPokemonResource", count=len(pokemon_dicts)):
+        pokemon_list: list[APIPokemonResource] = [
+            APIPokemonResource.model_validate(p) for p in pokemon_dicts
+        ]
+    log.info(f"Refreshing batch of [{len(pokemon_list)}] Pokemon")
+
+    with span("cache_all_pokemon", count=len(pokemon_list)) as batch_span:
+        refreshed: list[APIPokemonResource] = cache_all_pokemon(
+            pokemon_list=pokemon_list,
+            cache=cache,
+            revalidate=True,
+            store=get_pokemon_store() if db_settings.sync_enabled else None,
+        )
+        batch_span.set_attribute("refreshed", len(refreshed))
+
+    if len(refreshed) < len(pokemon_list):
+        log.warning(
+            f"Refreshed [{len(refreshed)}/{len(pokemon_list)}] Pokemon in batch."
+        )
+
+    with span("pydantic.dump", model="APIPokemonResource", count=len(refreshed)):
+        return [p.model_dump(by_alias=True, exclude={"response"}) for p in refreshed]
+
+
+@app.task
+def aggregate_refresh_results(batch_results: list[list[dict]]) -> dict:
+    """Chord callback for refresh_pokemon_batch. Summarize the batch results as counts.
+
+    The refreshed Pokemon are already stored in the result backend once per batch, so only
+    the counts are stored here.
+    """
+    refreshed_count: int = sum(len(batch) for batch in batch_results if batch)
+    log.info(
+        f"Refreshed [{refreshed_count}] Pokemon across [{len(batch_results)}] batch(es)"
+    )
+
+    return {
+        "batches": len(batch_results),
+        "refreshed_count": refreshed_count,
+    }
+
+
+def refresh_pokemon_in_batches(
+    pokemon_list: list[APIPokemonResource] | PokemonListing = None,
+    chunk_size: int | None = None,
+) -> AsyncResult:
+    """Fan a Pokemon refresh out to refresh_pokemon_batch tasks & aggregate them with a chord.
+
+    PARAMS:
+    -------
+
+    * pokemon_list (list[APIPokemonResource] | PokemonListing): The Pokemon to refresh.
+    * chunk_size (int): Number of Pokemon per batch task. Defaults to celery_settings.refresh_chunk_size.
+
+    Returns the AsyncResult of the aggregate_refresh_results callback. The batch task results
+    are available on its .parent GroupResult.
+    """
+    if pokemon_list is None:
+        raise ValueError("Missing list of APIPokemonResource objects.")
+
+    if chunk_size is None:
+        chunk_size = celery_settings.refresh_chunk_size
+
+    if chunk_size < 1:
+        raise ValueError(f"Chunk size must be at least 1, not {chunk_size}")
+
+    if isinstance(pokemon_list, PokemonListing):
+        ## Skip building a resource object for every Pokemon just to dump it again
+        pokemon_dicts: list[dict] = pokemon_list.to_dicts()
+    else:
+        pokemon_dicts: list[dict] = [
+            p.model_dump(by_alias=True, exclude={"response"}) for p in pokemon_list
+        ]
+    batches: list[list[dict]] = [
+        pokemon_dicts[i : i + chunk_size]
+        for i in range(0, len(pokemon_dicts), chunk_size)
+    ]
+    log.debug(
+        f"Sending [{len(pokemon_dicts)}] Pokemon as [{len(batches)}] batch task(s) of up to [{chunk_size}]"
+    )
+
+    header = group(refresh_pokemon_batch.s(batch) for batch in batches)
+
+    return chord(header)(aggregate_refresh_results.s())
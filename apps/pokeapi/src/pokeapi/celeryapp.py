@@ -1,9 +1,43 @@
+from __future__ import annotations
+
 import sys
 
 sys.path.append(".")
+from contextvars import Token
+import time
+
 from pokeapi.core.conf import celery_settings
+from pokeapi.dependencies import (
+    SamplingProfiler,
+    Span,
+    activate,
+    close_http_clients,
+    close_redis_clients,
+    deactivate,
+    default_profile_dir,
+    extract,
+    flush_spans,
+    inject,
+    mark_process_dead,
+    observe_queue_wait,
+    observe_task,
+    start_metrics_server,
+    start_span,
+    tracing_enabled,
+)
+from pokeapi.dependencies.tracing import TRACEPARENT_HEADER
 
 from celery import Celery
+from celery.signals import (
+    after_task_publish,
+    before_task_publish,
+    task_failure,
+    task_postrun,
+    task_prerun,
+    worker_init,
+    worker_process_shutdown,
+)
+from loguru import logger as log
 
 app = Celery(
     "pokeapi",
@@ -15,5 +49,155 @@ app = Celery(
 
 app.conf.update(result_expires=3600, result_max=100000)
 
+
+## Message header holding the time a task was sent, to measure how long it waited in the queue
+SENT_AT_HEADER: str = "pokeapi_sent_at"
+
+## Message header asking the worker to profile the task, see profile_sent_tasks()
+PROFILE_HEADER: str = "pokeapi_profile"
+
+## Start times of the tasks running in this process, by task ID
+_task_started: dict[str, float] = {}
+
+## Tracing spans of tasks being sent from, & running in, this process, by task ID
+_publish_spans: dict[str, Span] = {}
+_task_spans: dict[str, tuple[Span, Token | None]] = {}
+
+## Profilers of the tasks running in this process, by task ID
+_task_profilers: dict[str, SamplingProfiler] = {}
+_profile_sent_tasks: bool = False
+
+
+def profile_sent_tasks(enabled: bool = True) -> None:
+    """Have workers profile every task this process sends from now on (see SamplingProfiler).
+
+    Each task's profile is written to [data_dir]/profiles/ on the worker, and its summary logged.
+    """
+    global _profile_sent_tasks
+
+    _profile_sent_tasks = enabled
+
+
+def _task_label(name: str | None = None) -> str:
+    return (name or "unknown").rsplit(".", 1)[-1]
+
+
+@before_task_publish.connect
+def stamp_sent_at(headers: dict | None = None, **kwargs) -> None:
+    if headers is not None:
+        headers[SENT_AT_HEADER] = time.time()
+
+
+@before_task_publish.connect
+def trace_task_publish(sender: str = None, headers: dict | None = None, **kwargs) -> None:
+    if headers is None:
+        return
+
+    if _profile_sent_tasks:
+        headers[PROFILE_HEADER] = True
+
+    if not tracing_enabled():
+        return
+
+    task_id: str | None = headers.get("id")
+    publish_span: Span = start_span(
+        f"celery.publish {_task_label(sender)}", attributes={"celery.task_id": task_id}
+    )
+    ## The task's span is a child of the publish span
+    inject(headers, publish_span)
+    _publish_spans[task_id] = publish_span
+
+
+@after_task_publish.connect
+def end_publish_span(headers: dict | None = None, **kwargs) -> None:
+    publish_span: Span | None = _publish_spans.pop((headers or {}).get("id"), None)
+
+    if publish_span is not None:
+        publish_span.end()
+
+
+@task_prerun.connect
+def record_task_start(task_id: str = None, task=None, **kwargs) -> None:
+    _task_started[task_id] = time.perf_counter()
+
+    sent_at: float | None = getattr(task.request, SENT_AT_HEADER, None)
+    if sent_at is not None:
+        observe_queue_wait(_task_label(task.name), time.time() - sent_at)
+
+
+@task_prerun.connect
+def start_task_span(task_id: str = None, task=None, **kwargs) -> None:
+    if getattr(task.request, PROFILE_HEADER, False):
+        _task_profilers[task_id] = SamplingProfiler().start()
+
+    if not tracing_enabled():
+        return
+
+    task_span: Span = start_span(
+        f"celery.task {_task_label(task.name)}",
+        parent=extract(getattr(task.request, TRACEPARENT_HEADER, None)),
+        attributes={"celery.task_id": task_id, "celery.retries": task.request.retries or 0},
+    )
+
+    sent_at: float | None = getattr(task.request, SENT_AT_HEADER, None)
+    if sent_at is not None:
+        task_span.set_attribute("celery.queue_wait_seconds", max(0.0, time.time() - sent_at))
+
+    ## Spans started while the task runs (i.e. its Pokemon API requests) are its children
+    _task_spans[task_id] = (task_span, activate(task_span))
+
+
+@task_failure.connect
+def record_task_span_failure(task_id: str = None, exception: BaseException = None, **kwargs) -> None:
+    entry: tuple[Span, Token | None] | None = _task_spans.get(task_id)
+
+    if entry is not None:
+        entry[0].record_exception(exception)
+
+
+@task_postrun.connect
+def end_task_span(task_id: str = None, task=None, state: str = None, **kwargs) -> None:
+    profiler: SamplingProfiler | None = _task_profilers.pop(task_id, None)
+    if profiler is not None:
+        profiler.stop()
+        profiler.write(default_profile_dir() / f"{_task_label(task.name)}-{task_id}.folded")
+        log.info(f"Profile of task [{task.name}] ({task_id}):\n{profiler.summary()}")
+
+    entry: tuple[Span, Token | None] | None = _task_spans.pop(task_id, None)
+    if entry is None:
+        return
+
+    task_span, token = entry
+    deactivate(token)
+    task_span.set_attribute("celery.state", state or "UNKNOWN")
+    task_span.end()
+
+
+@task_postrun.connect
+def record_task_duration(task_id: str = None, task=None, state: str = None, **kwargs) -> None:
+    started: float | None = _task_started.pop(task_id, None)
+
+    if started is not None:
+        observe_task(_task_label(task.name), state or "UNKNOWN", time.perf_counter() - started)
+
+
+@worker_init.connect
+def serve_worker_metrics(**kwargs) -> None:
+    """Serve the worker's metrics (every pool process's, with PROMETHEUS_MULTIPROC_DIR set)."""
+    start_metrics_server()
+
+
+@worker_process_shutdown.connect
+def shutdown_http_clients(**kwargs) -> None:
+    """Close the worker process's pooled HTTP & Redis clients & export its last spans before it exits."""
+    close_http_clients()
+    close_redis_clients()
+    flush_spans()
+
+
+@worker_process_shutdown.connect
+def drop_process_metrics(pid: int | None = None, **kwargs) -> None:
+    mark_process_dead(pid)
+
 if __name__ == "__main__":
     app.start()
@@ -1,8 +1,24 @@
 from __future__ import annotations
 
 from . import config
-from .config import Settings, APISettings, CelerySettings
+from .config import (
+    APISettings,
+    CacheSettings,
+    CelerySettings,
+    DatabaseSettings,
+    MetricsSettings,
+    RateLimitSettings,
+    ServerSettings,
+    Settings,
+    TracingSettings,
+)
 
 app_settings = Settings()
 api_settings = APISettings()
+cache_settings = CacheSettings()
 celery_settings = CelerySettings()
+db_settings = DatabaseSettings()
+metrics_settings = MetricsSettings()
+ratelimit_settings = RateLimitSettings()
+server_settings = ServerSettings()
+tracing_settings = TracingSettings()
@@ -7,7 +7,6 @@ from dynaconf import settings
 from pydantic import Field, ValidationError, field_validator
 from pydantic_settings import BaseSettings
 
-
 class Settings(BaseSettings):
     env: str | None = Field(default=settings.ENV or "prod", env="ENV")
     container_env: bool | None = Field(
@@ -32,6 +31,149 @@ class Settings(BaseSettings):
 
 class APISettings(BaseSettings):
     base_url: str | None = Field(default=settings.API_BASE_URL or None)
+    max_concurrency: int | None = Field(
+        default=settings.API_MAX_CONCURRENCY or 20, env="API_MAX_CONCURRENCY"
+    )
+    page_size: int | None = Field(
+        default=settings.API_PAGE_SIZE or 200, env="API_PAGE_SIZE"
+    )
+
+    ## Pooled HTTP client
+    timeout: float | None = Field(default=settings.API_TIMEOUT or 10.0, env="API_TIMEOUT")
+    connect_timeout: float | None = Field(
+        default=settings.API_CONNECT_TIMEOUT or 5.0, env="API_CONNECT_TIMEOUT"
+    )
+    max_connections: int | None = Field(
+        default=settings.API_MAX_CONNECTIONS or 100, env="API_MAX_CONNECTIONS"
+    )
+    max_connections_per_host: int | None = Field(
+        default=settings.API_MAX_CONNECTIONS_PER_HOST or 20,
+        env="API_MAX_CONNECTIONS_PER_HOST",
+    )
+    max_keepalive_connections: int | None = Field(
+        default=settings.API_MAX_KEEPALIVE_CONNECTIONS or 20,
+        env="API_MAX_KEEPALIVE_CONNECTIONS",
+    )
+    keepalive_expiry: float | None = Field(
+        default=settings.API_KEEPALIVE_EXPIRY or 30.0, env="API_KEEPALIVE_EXPIRY"
+    )
+    http2: bool | None = Field(default=settings.API_HTTP2 or False, env="API_HTTP2")
+
+    ## Retries
+    max_retries: int | None = Field(
+        default=settings.API_MAX_RETRIES or 4, env="API_MAX_RETRIES"
+    )
+    backoff_base: float | None = Field(
+        default=settings.API_BACKOFF_BASE or 0.5, env="API_BACKOFF_BASE"
+    )
+    backoff_max: float | None = Field(
+        default=settings.API_BACKOFF_MAX or 30.0, env="API_BACKOFF_MAX"
+    )
+
+
+class RateLimitSettings(BaseSettings):
+    enabled: bool | None = Field(
+        default=settings.RATELIMIT_ENABLED or False, env="RATELIMIT_ENABLED"
+    )
+    backend: str | None = Field(
+        default=settings.RATELIMIT_BACKEND or "redis", env="RATELIMIT_BACKEND"
+    )
+    rate: float | None = Field(
+        default=settings.RATELIMIT_RATE or 20.0, env="RATELIMIT_RATE"
+    )
+    burst: int | None = Field(default=settings.RATELIMIT_BURST or 40, env="RATELIMIT_BURST")
+
+    ## Adaptive concurrency
+    adaptive: bool | None = Field(
+        default=settings.RATELIMIT_ADAPTIVE or False, env="RATELIMIT_ADAPTIVE"
+    )
+    min_concurrency: int | None = Field(
+        default=settings.RATELIMIT_MIN_CONCURRENCY or 2, env="RATELIMIT_MIN_CONCURRENCY"
+    )
+    error_threshold: float | None = Field(
+        default=settings.RATELIMIT_ERROR_THRESHOLD or 0.1,
+        env="RATELIMIT_ERROR_THRESHOLD",
+    )
+    window: int | None = Field(
+        default=settings.RATELIMIT_WINDOW or 20, env="RATELIMIT_WINDOW"
+    )
+
+
+class CacheSettings(BaseSettings):
+    backend: str | None = Field(
+        default=settings.CACHE_BACKEND or "disk", env="CACHE_BACKEND"
+    )
+    ## Not Celery's database 0: clearing the cache would wipe the broker's & results' keys.
+    #  .get(), so an explicit 0 isn't replaced by the default like "or" would.
+    redis_db: int | None = Field(
+        default=settings.get("CACHE_REDIS_DB", 1), env="CACHE_REDIS_DB"
+    )
+    codec: str | None = Field(
+        default=settings.CACHE_CODEC or "msgpack-zstd", env="CACHE_CODEC"
+    )
+    compression_level: int | None = Field(
+        default=settings.CACHE_COMPRESSION_LEVEL or 3, env="CACHE_COMPRESSION_LEVEL"
+    )
+    zstd_dict_path: str | None = Field(
+        default=settings.CACHE_ZSTD_DICT or None, env="CACHE_ZSTD_DICT"
+    )
+
+    ## In-process memory tier
+    memory_max_size: int | None = Field(
+        default=settings.CACHE_MEMORY_MAX_SIZE or 0, env="CACHE_MEMORY_MAX_SIZE"
+    )
+    memory_ttl: float | None = Field(
+        default=settings.CACHE_MEMORY_TTL or None, env="CACHE_MEMORY_TTL"
+    )
+
+    ## Single-flight lease in Redis, shared between processes
+    lock_enabled: bool | None = Field(
+        default=settings.CACHE_LOCK_ENABLED or False, env="CACHE_LOCK_ENABLED"
+    )
+    lock_ttl: float | None = Field(
+        default=settings.CACHE_LOCK_TTL or 30.0, env="CACHE_LOCK_TTL"
+    )
+    lock_poll_interval: float | None = Field(
+        default=settings.CACHE_LOCK_POLL_INTERVAL or 0.1,
+        env="CACHE_LOCK_POLL_INTERVAL",
+    )
+
+    ## Freshness policies & background refresh
+    freshness_enabled: bool | None = Field(
+        default=settings.CACHE_FRESHNESS_ENABLED or False, env="CACHE_FRESHNESS_ENABLED"
+    )
+    pokemon_max_age: float | None = Field(
+        default=settings.CACHE_POKEMON_MAX_AGE or 86400, env="CACHE_POKEMON_MAX_AGE"
+    )
+    pokemon_stale_while_revalidate: float | None = Field(
+        default=settings.CACHE_POKEMON_STALE_WHILE_REVALIDATE or 604800,
+        env="CACHE_POKEMON_STALE_WHILE_REVALIDATE",
+    )
+    resource_max_age: float | None = Field(
+        default=settings.CACHE_RESOURCE_MAX_AGE or 604800, env="CACHE_RESOURCE_MAX_AGE"
+    )
+    resource_stale_while_revalidate: float | None = Field(
+        default=settings.CACHE_RESOURCE_STALE_WHILE_REVALIDATE or 2592000,
+        env="CACHE_RESOURCE_STALE_WHILE_REVALIDATE",
+    )
+    listing_max_age: float | None = Field(
+        default=settings.CACHE_LISTING_MAX_AGE or 3600, env="CACHE_LISTING_MAX_AGE"
+    )
+    listing_stale_while_revalidate: float | None = Field(
+        default=settings.CACHE_LISTING_STALE_WHILE_REVALIDATE or 86400,
+        env="CACHE_LISTING_STALE_WHILE_REVALIDATE",
+    )
+    refresh_backend: str | None = Field(
+        default=settings.CACHE_REFRESH_BACKEND or "local", env="CACHE_REFRESH_BACKEND"
+    )
+
+    ## Snapshot bundles
+    snapshot_dir: str | None = Field(
+        default=settings.CACHE_SNAPSHOT_DIR or None, env="CACHE_SNAPSHOT_DIR"
+    )
+    snapshot_codec: str | None = Field(
+        default=settings.CACHE_SNAPSHOT_CODEC or "msgpack", env="CACHE_SNAPSHOT_CODEC"
+    )
 
 
 class CelerySettings(BaseSettings):
@@ -53,3 +195,81 @@ class CelerySettings(BaseSettings):
     redis_port: Union[str, int] | None = Field(
         default=settings.REDIS_PORT or None, env="REDIS_PORT"
     )
+    refresh_chunk_size: int | None = Field(
+        default=settings.REFRESH_CHUNK_SIZE or 50, env="REFRESH_CHUNK_SIZE"
+    )
+    refresh_task_timeout: float | None = Field(
+        default=settings.REFRESH_TASK_TIMEOUT or 900, env="REFRESH_TASK_TIMEOUT"
+    )
+
+    ## Incremental refresh scheduler
+    refresh_interval: float | None = Field(
+        default=settings.REFRESH_INTERVAL or 3600, env="REFRESH_INTERVAL"
+    )
+    refresh_tick: float | None = Field(
+        default=settings.REFRESH_TICK or 10, env="REFRESH_TICK"
+    )
+    refresh_jitter: float | None = Field(
+        default=settings.REFRESH_JITTER or 0, env="REFRESH_JITTER"
+    )
+    refresh_max_per_cycle: int | None = Field(
+        default=settings.REFRESH_MAX_PER_CYCLE or 2000, env="REFRESH_MAX_PER_CYCLE"
+    )
+
+
+class DatabaseSettings(BaseSettings):
+    url: str | None = Field(default=settings.DB_URL or None, env="DB_URL")
+    echo: bool | None = Field(default=settings.DB_ECHO or False, env="DB_ECHO")
+    sync_enabled: bool | None = Field(
+        default=settings.DB_SYNC_ENABLED or False, env="DB_SYNC_ENABLED"
+    )
+    batch_size: int | None = Field(
+        default=settings.DB_BATCH_SIZE or 200, env="DB_BATCH_SIZE"
+    )
+
+
+class ServerSettings(BaseSettings):
+    host: str | None = Field(default=settings.SERVER_HOST or "0.0.0.0", env="SERVER_HOST")
+    port: int | None = Field(default=settings.SERVER_PORT or 5000, env="SERVER_PORT")
+    workers: int | None = Field(default=settings.SERVER_WORKERS or 1, env="SERVER_WORKERS")
+    cache_only: bool | None = Field(
+        default=settings.SERVER_CACHE_ONLY or False, env="SERVER_CACHE_ONLY"
+    )
+    max_age: int | None = Field(default=settings.SERVER_MAX_AGE or 60, env="SERVER_MAX_AGE")
+    gzip_min_size: int | None = Field(
+        default=settings.SERVER_GZIP_MIN_SIZE or 1024, env="SERVER_GZIP_MIN_SIZE"
+    )
+    gzip_level: int | None = Field(
+        default=settings.SERVER_GZIP_LEVEL or 6, env="SERVER_GZIP_LEVEL"
+    )
+    response_cache_size: int | None = Field(
+        default=settings.SERVER_RESPONSE_CACHE_SIZE or 134217728,
+        env="SERVER_RESPONSE_CACHE_SIZE",
+    )
+    keepalive_timeout: float | None = Field(
+        default=settings.SERVER_KEEPALIVE_TIMEOUT or 15.0, env="SERVER_KEEPALIVE_TIMEOUT"
+    )
+
+
+class MetricsSettings(BaseSettings):
+    enabled: bool | None = Field(
+        default=settings.METRICS_ENABLED or False, env="METRICS_ENABLED"
+    )
+    port: int | None = Field(default=settings.METRICS_PORT or 9100, env="METRICS_PORT")
+
+
+class TracingSettings(BaseSettings):
+    enabled: bool | None = Field(
+        default=settings.TRACING_ENABLED or False, env="TRACING_ENABLED"
+    )
+    exporter: str | None = Field(
+        default=settings.TRACING_EXPORTER or "file", env="TRACING_EXPORTER"
+    )
+    file: str | None = Field(default=settings.TRACING_FILE or "", env="TRACING_FILE")
+    endpoint: str | None = Field(
+        default=settings.TRACING_ENDPOINT or "http://localhost:4318/v1/traces",
+        env="TRACING_ENDPOINT",
+    )
+    service_name: str | None = Field(
+        default=settings.TRACING_SERVICE_NAME or "pokeapi", env="TRACING_SERVICE_NAME"
+    )
@@ -0,0 +1,5 @@
+from __future__ import annotations
+
+from . import background, engine
+from .background import BackgroundRefresher, get_background_refresher, schedule_refresh
+from .engine import as_completed_limited, get_background_loop, run_sync
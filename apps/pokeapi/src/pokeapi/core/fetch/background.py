@@ -0,0 +1,202 @@
+"""Background refreshes of stale cache entries.
+
+Readers serving a stale cached value hand the refresh to schedule_refresh() and return right
+away. The refresh runs on the process-wide background event loop ("local"), or is sent to a
+Celery worker ("celery"). A key already being refreshed isn't scheduled again.
+"""
+from __future__ import annotations
+
+import asyncio
+
+from concurrent.futures import Future
+import os
+import threading
+import time
+from typing import Any, Callable, Coroutine
+
+from pokeapi.core.conf import cache_settings
+
+from .engine import get_background_loop
+
+from loguru import logger as log
+
+REFRESH_BACKENDS: tuple[str, ...] = ("local", "celery")
+
+
+class BackgroundRefresher:
+    """Run refreshes in the background, at most one at a time per key.
+
+    PARAMS:
+    -------
+
+    * backend (str): "local" or "celery". Defaults to cache_settings.refresh_backend.
+    * dedupe_window (float): Seconds a key sent to Celery isn't sent again. Local refreshes
+        are deduplicated until they finish. Defaults to cache_settings.lock_ttl.
+    """
+
+    def __init__(self, backend: str | None = None, dedupe_window: float | None = None) -> None:
+        """Pick the backend background refreshes run on."""
+        backend = backend or cache_settings.refresh_backend
+
+        if backend not in REFRESH_BACKENDS:
+            raise ValueError(
+                f"Invalid refresh backend: {backend}. Must be one of {list(REFRESH_BACKENDS)}"
+            )
+
+        self.backend: str = backend
+        self.dedupe_window: float = dedupe_window or cache_settings.lock_ttl
+
+        ## key -> monotonic time the refresh was scheduled at
+        self._pending: dict[str, float] = {}
+        self._lock = threading.Lock()
+
+        self.scheduled: int = 0
+        self.skipped: int = 0
+        self.failed: int = 0
+
+    def _claim(self, key: str) -> bool:
+        now: float = time.monotonic()
+
+        with self._lock:
+            scheduled_at: float | None = self._pending.get(key)
+
+            if scheduled_at is not None and now - scheduled_at < self.dedupe_window:
+                self.skipped += 1
+
+                return False
+
+            self._pending[key] = now
+            self.scheduled += 1
+
+            return True
+
+    def _release(self, key: str) -> None:
+        with self._lock:
+            self._pending.pop(key, None)
+
+    def schedule(
+        self,
+        key: str = None,
+        local: Callable[[], Coroutine[Any, Any, Any]] = None,
+        task: str | None = None,
+        task_kwargs: dict | None = None,
+    ) -> bool:
+        """Refresh an entry in the background. Returns False if it's already being refreshed.
+
+        PARAMS:
+        -------
+
+        * key (str): Identifies the entry, i.e. "{cache directory}:{cache key}".
+        * local (Callable): Coroutine function doing the refresh in this process.
+        * task (str): Name of the Celery task doing the refresh, for the "celery" backend.
+            Without one, the refresh runs locally.
+        * task_kwargs (dict): Keyword arguments for the Celery task.
+        """
+        if not self._claim(key):
+            return False
+
+        future: Future = asyncio.run_coroutine_threadsafe(
+            self._run(key, local, task, task_kwargs), get_background_loop()
+        )
+        future.add_done_callback(lambda f: self._finished(key, f))
+        log.debug(f"Scheduled background refresh of [{key}]")
+
+        return True
+
+    async def _run(
+        self,
+        key: str,
+        local: Callable[[], Coroutine[Any, Any, Any]],
+        task: str | None,
+        task_kwargs: dict | None,
+    ) -> bool:
+        """Do the refresh. Returns True if it was sent to Celery instead of run here."""
+        if self.backend == "celery" and task is not None:
+            try:
+                ## Sending blocks while the broker is unreachable, keep it off the event loop
+                await asyncio.to_thread(self._send_task, task, task_kwargs)
+                log.debug(f"Sent background refresh of [{key}] to Celery task [{task}]")
+
+                return True
+
+            except Exception as exc:
+                log.warning(
+                    f"Could not send refresh of [{key}] to Celery, refreshing it locally. Details: {exc}"
+                )
+
+        await local()
+
+        return False
+
+    @staticmethod
+    def _send_task(task: str, task_kwargs: dict | None) -> None:
+        ## Imported here, the Celery app isn't needed unless refreshes go through it
+        from pokeapi.celeryapp import app as celery_app
+
+        celery_app.send_task(task, kwargs=task_kwargs or {})
+
+    def _finished(self, key: str, future: Future) -> None:
+        if future.cancelled():
+            self._release(key)
+
+            return
+
+        exc: BaseException | None = future.exception()
+        if exc is not None:
+            self._release(key)
+            self.failed += 1
+            log.warning(f"Background refresh of [{key}] failed. Details: {exc}")
+
+            return
+
+        ## Celery doesn't report back. A key sent to it is released once dedupe_window passes.
+        if not future.result():
+            self._release(key)
+
+    def stats(self) -> dict[str, int]:
+        with self._lock:
+            pending: int = len(self._pending)
+
+        return {
+            "scheduled": self.scheduled,
+            "skipped": self.skipped,
+            "failed": self.failed,
+            "pending": pending,
+        }
+
+
+_refresher: BackgroundRefresher | None = None
+_refresher_lock: threading.Lock = threading.Lock()
+
+
+def get_background_refresher() -> BackgroundRefresher:
+    """Return the process-wide BackgroundRefresher."""
+    global _refresher
+
+    with _refresher_lock:
+        if _refresher is None:
+            _refresher = BackgroundRefresher()
+
+        return _refresher
+
+
+def schedule_refresh(
+    key: str = None,
+    local: Callable[[], Coroutine[Any, Any, Any]] = None,
+    task: str | None = None,
+    task_kwargs: dict | None = None,
+) -> bool:
+    """Refresh an entry in the background with the process-wide BackgroundRefresher."""
+    return get_background_refresher().schedule(
+        key, local, task=task, task_kwargs=task_kwargs
+    )
+
+
+def _reset_after_fork() -> None:
+    global _refresher, _refresher_lock
+
+    _refresher = None
+    _refresher_lock = threading.Lock()
+
+
+os.register_at_fork(after_in_child=_reset_after_fork)
@@ -0,0 +1,235 @@
+"""Asyncio engine for making many Pokemon API requests concurrently.
+
+Work is spread over a fixed number of worker coroutines pulling from a shared
+iterator, so the number of in-flight requests never exceeds the configured
+concurrency, no matter how many items are passed in. Results are yielded in the
+order they complete, not the order they were submitted.
+
+Synchronous code runs coroutines through run_sync(), which hands them to a single
+background event loop owned by the process.
+"""
+from __future__ import annotations
+
+import asyncio
+import contextvars
+import os
+import threading
+
+from typing import (
+    Any,
+    AsyncIterable,
+    AsyncIterator,
+    Awaitable,
+    Callable,
+    Coroutine,
+    Iterable,
+    TypeVar,
+)
+
+from pokeapi.core.conf import api_settings
+
+T = TypeVar("T")
+R = TypeVar("R")
+
+## Marker a worker puts on the results queue when it runs out of items
+_WORKER_DONE = object()
+
+
+async def as_completed_limited(
+    func: Callable[[T], Awaitable[R]] = None,
+    items: Iterable[T] | AsyncIterable[T] = None,
+    concurrency: int | None = None,
+) -> AsyncIterator[tuple[T, R | Exception]]:
+    """Run func over items with bounded concurrency, yielding results as they complete.
+
+    DESCRIPTION:
+    ------------
+
+    Starts [concurrency] worker coroutines that each pull the next item from items, await
+    func(item), and put the result on a queue. Yields (item, result) tuples in completion
+    order. If func raises, the exception is yielded in place of the result so a single
+    failure does not stop the rest of the batch. If items itself raises, the items already
+    pulled are finished, then the exception is raised.
+
+    PARAMS:
+    -------
+
+    * func (Callable): Async function to call once per item.
+    * items (Iterable | AsyncIterable): Items to pass to func. Consumed lazily, so an async
+        generator (i.e. a paginated listing) can still be producing items while func runs.
+    * concurrency (int): Max number of func calls in flight at once. Defaults to api_settings.max_concurrency.
+    """
+    if func is None:
+        raise ValueError("Missing async function to run over items.")
+    if items is None:
+        raise ValueError("Missing items to run function over.")
+
+    if concurrency is None:
+        concurrency = api_settings.max_concurrency
+
+    if concurrency < 1:
+        raise ValueError(f"Concurrency must be at least 1, not {concurrency}")
+
+    results: asyncio.Queue = asyncio.Queue()
+    source_errors: list[Exception] = []
+
+    if isinstance(items, AsyncIterable):
+        aiterator: AsyncIterator[T] = aiter(items)
+        ## Only one worker may await the async iterator at a time
+        pull_lock = asyncio.Lock()
+
+        async def _pull() -> AsyncIterator[T]:
+            while True:
+                async with pull_lock:
+                    try:
+                        item = await anext(aiterator)
+                    except StopAsyncIteration:
+                        return
+
+                yield item
+
+    else:
+        iterator = iter(items)
+
+        async def _pull() -> AsyncIterator[T]:
+            ## Workers share one iterator. next() never awaits, so two workers
+            #  can't receive the same item.
+            for item in iterator:
+                yield item
+
+    async def _worker() -> None:
+        try:
+            async for item in _pull():
+                try:
+                    res = await func(item)
+                except Exception as exc:
+                    res = exc
+
+                results.put_nowait((item, res))
+        except Exception as exc:
+            ## items itself failed, i.e. a listing page couldn't be loaded
+            source_errors.append(exc)
+        finally:
+            results.put_nowait(_WORKER_DONE)
+
+    workers: list[asyncio.Task] = [
+        asyncio.create_task(_worker()) for _ in range(concurrency)
+    ]
+    remaining: int = len(workers)
+
+    try:
+        while remaining > 0:
+            res = await results.get()
+
+            if res is _WORKER_DONE:
+                remaining -= 1
+                continue
+
+            yield res
+
+        if source_errors:
+            raise source_errors[0]
+
+    finally:
+        ## Consumer stopped early (break, exception, cancel). Stop remaining workers.
+        for w in workers:
+            if not w.done():
+                w.cancel()
+
+        await asyncio.gather(*workers, return_exceptions=True)
+
+
+class _BackgroundLoop:
+    """An asyncio event loop running forever in a daemon thread.
+
+    Synchronous callers submit coroutines to this loop instead of spinning up a new loop
+    per call, so loop-bound resources (i.e. the pooled httpx.AsyncClient) live for the
+    whole process.
+    """
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self.loop: asyncio.AbstractEventLoop | None = None
+        self.thread: threading.Thread | None = None
+
+    def get(self) -> asyncio.AbstractEventLoop:
+        with self._lock:
+            if self.loop is None or not self.thread.is_alive():
+                loop = asyncio.new_event_loop()
+                thread = threading.Thread(
+                    target=loop.run_forever, name="pokeapi-event-loop", daemon=True
+                )
+                thread.start()
+
+                self.loop, self.thread = loop, thread
+
+            return self.loop
+
+    def reset(self) -> None:
+        """Forget the loop without stopping it. Used in a forked child, where the thread no longer exists."""
+        self._lock = threading.Lock()
+        self.loop = None
+        self.thread = None
+
+
+_background_loop: _BackgroundLoop = _BackgroundLoop()
+
+## Celery's prefork pool forks workers from the parent process. Threads don't survive a
+#  fork, so make the child start its own loop on first use.
+os.register_at_fork(after_in_child=_background_loop.reset)
+
+
+def get_background_loop() -> asyncio.AbstractEventLoop:
+    """Return the process-wide background event loop, starting it if needed."""
+    return _background_loop.get()
+
+
+def run_sync(coro: Coroutine[Any, Any, R] = None, timeout: float | None = None) -> R:
+    """Run a coroutine to completion from synchronous code & return its result.
+
+    DESCRIPTION:
+    ------------
+
+    Lets the synchronous API (i.e. APIPokemonResource.get()) stay a thin wrapper over
+    the async implementation. The coroutine runs on the process-wide background event
+    loop, which means it can be called from any thread, including one that is already
+    running its own event loop.
+
+    PARAMS:
+    -------
+
+    * coro (Coroutine): The coroutine to run.
+    * timeout (float): Seconds to wait for a result before raising TimeoutError. Waits forever if None.
+    """
+    if coro is None:
+        raise ValueError("Missing coroutine to run.")
+
+    loop: asyncio.AbstractEventLoop = get_background_loop()
+
+    try:
+        running = asyncio.get_running_loop()
+    except RuntimeError:
+        running = None
+
+    if running is loop:
+        coro.close()
+
+        raise RuntimeError(
+            "run_sync() called from the background event loop. Await the coroutine instead."
+        )
+
+    ## Tasks on the loop run in the loop thread's context. Carry the caller's context variables
+    #  (i.e. the current tracing span) over to the coroutine.
+    future = asyncio.run_coroutine_threadsafe(
+        _in_context(coro, contextvars.copy_context()), loop
+    )
+
+    return future.result(timeout=timeout)
+
+
+async def _in_context(coro: Coroutine[Any, Any, R], context: contextvars.Context) -> R:
+    ## The task runs in its own copy of the loop's context, so this doesn't leak to other tasks
+    for var, value in context.items():
+        var.set(value)
+
+    return await coro
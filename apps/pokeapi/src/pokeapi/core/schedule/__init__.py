@@ -0,0 +1,12 @@
+from __future__ import annotations
+
+from . import access, scheduler, wheel
+from .access import (
+    ACCESS_COUNTS_KEY,
+    AccessTracker,
+    get_access_tracker,
+    load_access_counts,
+    record_access,
+)
+from .scheduler import RefreshCandidate, RefreshScheduler, refresh_priority
+from .wheel import TimerWheel
@@ -0,0 +1,163 @@
+"""Approximate, decaying read counts for cache entries.
+
+Reads are counted in memory, and every flush_interval seconds merged into a record stored in
+the cache itself (under ACCESS_COUNTS_KEY), so every process reading a shared cache contributes.
+Counts halve every half_life seconds, which keeps them a measure of recent popularity. Merges
+from several processes may overwrite each other now and then; the counts are only used to rank
+refresh work, so that's acceptable.
+"""
+from __future__ import annotations
+
+import atexit
+
+from collections import Counter
+import os
+import threading
+import time
+from typing import Any
+
+from loguru import logger as log
+
+## Key the merged counts are stored under. Contains "::", so code iterating cached responses skips it.
+ACCESS_COUNTS_KEY: str = "::access_counts"
+## Seconds for a read count to decay to half
+ACCESS_HALF_LIFE: float = 86400.0
+## Counts decayed below this are dropped
+_MIN_COUNT: float = 0.01
+
+
+def decay(
+    counts: dict[str, float] = None,
+    elapsed: float = 0,
+    half_life: float = ACCESS_HALF_LIFE,
+) -> dict[str, float]:
+    """Decay counts by the time elapsed since they were stored, dropping ones that fade out."""
+    if elapsed <= 0:
+        return dict(counts)
+
+    factor: float = 0.5 ** (elapsed / half_life)
+
+    return {k: v * factor for k, v in counts.items() if v * factor >= _MIN_COUNT}
+
+
+def load_access_counts(cache: Any = None, now: float | None = None) -> dict[str, float]:
+    """Read the merged access counts stored in a cache, decayed to now. Keys are cache keys."""
+    record: dict | None = getattr(cache, "backend", cache).get(ACCESS_COUNTS_KEY)
+
+    if not record:
+        return {}
+
+    if now is None:
+        now = time.time()
+
+    return decay(record.get("counts", {}), now - record.get("updated_at", now))
+
+
+class AccessTracker:
+    """Count reads per cache & key in memory, and merge them into each cache periodically.
+
+    PARAMS:
+    -------
+
+    * flush_interval (float): Seconds between merges into a cache.
+    * half_life (float): Seconds for a count to decay to half.
+    """
+
+    def __init__(
+        self, flush_interval: float = 60.0, half_life: float = ACCESS_HALF_LIFE
+    ) -> None:
+        """Start with no pending counts."""
+        self.flush_interval = flush_interval
+        self.half_life = half_life
+
+        ## id(cache) -> (cache, unflushed counts, monotonic time of last flush)
+        self._pending: dict[int, tuple[Any, Counter, float]] = {}
+        self._lock = threading.Lock()
+
+    def record(self, cache: Any = None, key: str = None) -> None:
+        """Count a read of key from cache. Flushes the cache's counts if flush_interval has passed."""
+        now: float = time.monotonic()
+        flush: Counter | None = None
+
+        with self._lock:
+            entry = self._pending.get(id(cache))
+
+            if entry is None:
+                entry = (cache, Counter(), now)
+                self._pending[id(cache)] = entry
+
+            entry[1][key] += 1
+
+            if now - entry[2] >= self.flush_interval:
+                flush = entry[1]
+                self._pending[id(cache)] = (cache, Counter(), now)
+
+        if flush:
+            self._merge(cache, flush)
+
+    def flush(self) -> None:
+        """Merge every cache's unflushed counts now, i.e. before the process exits."""
+        with self._lock:
+            pending = [
+                (cache, counts)
+                for cache, counts, _ in self._pending.values()
+                if counts
+            ]
+            now: float = time.monotonic()
+            self._pending = {id(cache): (cache, Counter(), now) for cache, _ in pending}
+
+        for cache, counts in pending:
+            self._merge(cache, counts)
+
+    def _merge(self, cache: Any, counts: Counter) -> None:
+        now: float = time.time()
+
+        try:
+            record: dict | None = getattr(cache, "backend", cache).get(ACCESS_COUNTS_KEY)
+            merged: dict[str, float] = {}
+
+            if record:
+                merged = decay(
+                    record.get("counts", {}),
+                    now - record.get("updated_at", now),
+                    half_life=self.half_life,
+                )
+
+            for key, count in counts.items():
+                merged[key] = merged.get(key, 0.0) + count
+
+            cache.set(ACCESS_COUNTS_KEY, {"updated_at": now, "counts": merged})
+
+        except Exception as exc:
+            log.warning(f"Could not store cache access counts. Details: {exc}")
+
+
+_tracker: AccessTracker | None = None
+_tracker_lock: threading.Lock = threading.Lock()
+
+
+def get_access_tracker() -> AccessTracker:
+    """Return the process-wide AccessTracker."""
+    global _tracker
+
+    with _tracker_lock:
+        if _tracker is None:
+            _tracker = AccessTracker()
+            atexit.register(_tracker.flush)
+
+        return _tracker
+
+
+def record_access(cache: Any = None, key: str = None) -> None:
+    """Count a read of key from cache with the process-wide AccessTracker."""
+    get_access_tracker().record(cache, key)
+
+
+def _reset_after_fork() -> None:
+    global _tracker, _tracker_lock
+
+    _tracker = None
+    _tracker_lock = threading.Lock()
+
+
+os.register_at_fork(after_in_child=_reset_after_fork)
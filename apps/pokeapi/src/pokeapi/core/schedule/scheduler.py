@@ -0,0 +1,224 @@
+"""Incremental, prioritized refresh of cached responses.
+
+Instead of refetching everything at once every interval, each cycle ranks the cached entries
+by how overdue they are, how often they're read & how often they've changed, picks the ones
+that are due, and spreads them evenly (with jitter) over the cycle on a timer wheel. Every
+tick, the items that came due are handed to a dispatch function in small batches, so the
+load on workers & the upstream API stays flat. A failing plan or batch is logged & skipped;
+the scheduler keeps running.
+"""
+from __future__ import annotations
+
+import math
+import random
+import threading
+import time
+
+from typing import Any, Callable, NamedTuple
+
+from pokeapi.core.conf import celery_settings
+from pokeapi.dependencies import metrics
+
+from .wheel import TimerWheel
+
+from loguru import logger as log
+
+class RefreshCandidate(NamedTuple):
+    """A cache entry that may be refreshed. payload is passed to the dispatch function as-is."""
+
+    key: str
+    priority: float
+    payload: Any
+
+
+def refresh_priority(
+    age: float | None = None,
+    max_age: float = None,
+    accesses: float = 0,
+    checks: int = 0,
+    changes: int = 0,
+) -> float:
+    """Rank a cached entry for refreshing. Entries scoring 1.0 or more are due.
+
+    DESCRIPTION:
+    ------------
+
+    The base score is the entry's age as a fraction of its max age (1.0 when it turns stale).
+    It's scaled up for entries that are read often (by log(1 + accesses)), and scaled between 0.5x
+    & 1.5x by how often revalidating the entry found a change. Popular & volatile entries come due
+    before their max age, rarely read & stable ones a little after it, which also keeps entries
+    cached at the same time from all coming due at once.
+
+    PARAMS:
+    -------
+
+    * age (float): Seconds since the entry was last validated. None (never validated) is always due.
+    * max_age (float): Seconds the entry stays fresh.
+    * accesses (float): Recent (decayed) read count.
+    * checks (int): Times the entry was revalidated.
+    * changes (int): Times a revalidation found a changed response.
+    """
+    if age is None or not max_age:
+        return math.inf
+
+    ## Laplace-smoothed share of revalidations that found a change
+    change_rate: float = (changes + 1) / (checks + 2)
+
+    return (age / max_age) * (1 + math.log1p(accesses)) * (0.5 + change_rate)
+
+
+class RefreshScheduler:
+    """Plan a cycle of refreshes, and dispatch them evenly across the cycle.
+
+    PARAMS:
+    -------
+
+    * plan (Callable): Returns the RefreshCandidates to consider for a cycle.
+    * dispatch (Callable): Called with a list of payloads to refresh, i.e. to send a Celery task.
+    * interval (float): Seconds per cycle. Defaults to celery_settings.refresh_interval.
+    * tick (float): Seconds between dispatches. Defaults to celery_settings.refresh_tick.
+    * jitter (float): Max seconds each item is moved from its evenly spaced slot. Defaults to
+        celery_settings.refresh_jitter.
+    * max_per_cycle (int): Max items refreshed per cycle. The highest priorities win. Defaults
+        to celery_settings.refresh_max_per_cycle.
+    * batch_size (int): Max payloads per dispatch call. Defaults to celery_settings.refresh_chunk_size.
+    * threshold (float): Min priority for a candidate to be refreshed.
+    """
+
+    def __init__(
+        self,
+        plan: Callable[[], list[RefreshCandidate]] = None,
+        dispatch: Callable[[list[Any]], Any] = None,
+        interval: float | None = None,
+        tick: float | None = None,
+        jitter: float | None = None,
+        max_per_cycle: int | None = None,
+        batch_size: int | None = None,
+        threshold: float = 1.0,
+    ) -> None:
+        """Set up the scheduler & its timer wheel. Nothing is planned until plan_cycle()."""
+        if plan is None:
+            raise ValueError("Missing function to plan refresh cycles with.")
+        if dispatch is None:
+            raise ValueError("Missing function to dispatch refreshes with.")
+
+        self.plan = plan
+        self.dispatch = dispatch
+        self.interval: float = interval or celery_settings.refresh_interval
+        self.tick: float = tick or celery_settings.refresh_tick
+        self.jitter: float = celery_settings.refresh_jitter if jitter is None else jitter
+        self.max_per_cycle: int = max_per_cycle or celery_settings.refresh_max_per_cycle
+        self.batch_size: int = batch_size or celery_settings.refresh_chunk_size
+        self.threshold = threshold
+
+        if self.tick > self.interval:
+            raise ValueError(
+                f"Tick ({self.tick}s) can't be longer than the interval ({self.interval}s)"
+            )
+
+        self.wheel: TimerWheel[RefreshCandidate] = TimerWheel(
+            tick=self.tick, slots=math.ceil(self.interval / self.tick) + 1
+        )
+
+        self.cycles: int = 0
+        self.dispatched: int = 0
+        self.failed_batches: int = 0
+
+    def plan_cycle(self) -> int:
+        """Pick the due candidates & spread them over the next interval. Returns how many were scheduled."""
+        candidates: list[RefreshCandidate] = [
+            c for c in self.plan() if c.priority >= self.threshold
+        ]
+        candidates.sort(key=lambda c: c.priority, reverse=True)
+
+        if len(candidates) > self.max_per_cycle:
+            log.warning(
+                f"[{len(candidates)}] entries are due for a refresh, only refreshing the top [{self.max_per_cycle}] this cycle"
+            )
+            candidates = candidates[: self.max_per_cycle]
+
+        ## Leave the last tick free, so a cycle finishes before the next one is planned
+        span: float = max(0.0, self.interval - self.tick)
+        spacing: float = span / len(candidates) if candidates else 0
+
+        for i, candidate in enumerate(candidates):
+            delay: float = i * spacing + random.uniform(-self.jitter, self.jitter)
+            self.wheel.schedule(min(max(0.0, delay), span), candidate)
+
+        self.cycles += 1
+        metrics.REFRESH_CYCLES.inc()
+        metrics.REFRESH_PLANNED.set(len(candidates))
+        metrics.REFRESH_CYCLE_DISPATCHED.set(0)
+        metrics.REFRESH_LAST_CYCLE.set(time.time())
+        log.info(
+            f"[Cycle {self.cycles}] Scheduled [{len(candidates)}] refresh(es) over the next {self.interval}s"
+        )
+
+        return len(candidates)
+
+    def run_due(self, now: float | None = None) -> int:
+        """Dispatch the items that came due. Returns how many were dispatched."""
+        return self._dispatch(self.wheel.advance(now))
+
+    def drain(self) -> int:
+        """Dispatch every scheduled item now, due or not. Returns how many were dispatched."""
+        return self._dispatch(self.wheel.drain())
+
+    def _dispatch(self, due: list[RefreshCandidate]) -> int:
+        sent: int = 0
+
+        for i in range(0, len(due), self.batch_size):
+            batch: list[RefreshCandidate] = due[i : i + self.batch_size]
+
+            try:
+                self.dispatch([c.payload for c in batch])
+                sent += len(batch)
+
+            except Exception as exc:
+                self.failed_batches += 1
+                metrics.REFRESH_FAILED_BATCHES.inc()
+                log.error(
+                    f"Failed to dispatch refresh of [{len(batch)}] entries, they'll be picked up next cycle. Details: {exc}"
+                )
+
+        self.dispatched += sent
+
+        if sent:
+            metrics.REFRESH_DISPATCHED.inc(sent)
+            metrics.REFRESH_CYCLE_DISPATCHED.inc(sent)
+
+        return sent
+
+    def run_forever(self, stop: threading.Event | None = None) -> None:
+        """Plan a cycle every interval & dispatch refreshes every tick, until stop is set."""
+        if stop is None:
+            stop = threading.Event()
+
+        next_plan: float = time.monotonic()
+
+        while not stop.is_set():
+            if time.monotonic() >= next_plan:
+                next_plan += self.interval
+
+                try:
+                    self.plan_cycle()
+                except Exception as exc:
+                    log.error(
+                        f"Failed to plan refresh cycle, retrying next cycle. Details: {exc}"
+                    )
+
+            self.run_due()
+
+            wait: float = min(
+                self.wheel.seconds_until_next_tick(),
+                max(0.0, next_plan - time.monotonic()),
+            )
+            stop.wait(max(wait, 0.01))
+
+    def stats(self) -> dict[str, int]:
+        return {
+            "cycles": self.cycles,
+            "dispatched": self.dispatched,
+            "failed_batches": self.failed_batches,
+            "waiting": len(self.wheel),
+        }
@@ -0,0 +1,103 @@
+"""Hashed timer wheel for spreading scheduled work over time.
+
+Items are dropped into one of [slots] buckets by due time. Advancing the wheel only looks at
+the buckets whose tick has passed, so scheduling & collecting are O(1) per item no matter how
+many items are waiting.
+"""
+from __future__ import annotations
+
+import math
+import time
+
+from typing import Generic, TypeVar
+
+T = TypeVar("T")
+
+
+class TimerWheel(Generic[T]):
+    """Buckets of items, one per tick, reused round-robin.
+
+    PARAMS:
+    -------
+
+    * tick (float): Seconds per bucket. Items are due at the end of their bucket's tick.
+    * slots (int): Number of buckets. Items due further out than slots * tick wait in their
+        bucket for additional turns of the wheel.
+    """
+
+    def __init__(self, tick: float = 1.0, slots: int = 3600) -> None:
+        """Create an empty wheel, starting now."""
+        if tick <= 0:
+            raise ValueError(f"Tick must be greater than 0, not {tick}")
+        if slots < 1:
+            raise ValueError(f"Timer wheel needs at least 1 slot, not {slots}")
+
+        self.tick = tick
+        self.slots = slots
+
+        self._start: float = time.monotonic()
+        ## Next tick to collect. Buckets hold (due tick, item).
+        self._cursor: int = 0
+        self._buckets: list[list[tuple[int, T]]] = [[] for _ in range(slots)]
+        self._count: int = 0
+
+    def __len__(self) -> int:
+        """Count the items waiting on the wheel."""
+        return self._count
+
+    def _tick_at(self, when: float) -> int:
+        return math.ceil((when - self._start) / self.tick)
+
+    def schedule(self, delay: float = 0, item: T = None) -> None:
+        """Add an item, due in [delay] seconds (rounded up to the next tick)."""
+        due: int = max(self._cursor, self._tick_at(time.monotonic() + max(0.0, delay)))
+
+        self._buckets[due % self.slots].append((due, item))
+        self._count += 1
+
+    def advance(self, now: float | None = None) -> list[T]:
+        """Collect the items due by now, in due order."""
+        if now is None:
+            now = time.monotonic()
+
+        due: list[T] = []
+        current: int = math.floor((now - self._start) / self.tick)
+
+        while self._cursor <= current:
+            bucket = self._buckets[self._cursor % self.slots]
+
+            if bucket:
+                waiting: list[tuple[int, T]] = []
+
+                for tick, item in bucket:
+                    if tick <= self._cursor:
+                        due.append(item)
+                    else:
+                        waiting.append((tick, item))
+
+                self._buckets[self._cursor % self.slots] = waiting
+
+            self._cursor += 1
+
+        self._count -= len(due)
+
+        return due
+
+    def drain(self) -> list[T]:
+        """Collect every item, due or not, in due order."""
+        waiting: list[tuple[int, T]] = [entry for bucket in self._buckets for entry in bucket]
+        waiting.sort(key=lambda entry: entry[0])
+
+        self.clear()
+
+        return [item for _, item in waiting]
+
+    def seconds_until_next_tick(self, now: float | None = None) -> float:
+        if now is None:
+            now = time.monotonic()
+
+        return max(0.0, self._start + self._cursor * self.tick - now)
+
+    def clear(self) -> None:
+        self._buckets = [[] for _ in range(self.slots)]
+        self._count = 0
@@ -0,0 +1,83 @@
+"""Warm the cache with the resources cached Pokemon link to (species, abilities, types, moves...).
+
+Usage (from the src/ directory):
+
+    python pokeapi/crawl_resources.py
+    python pokeapi/crawl_resources.py --include type ability pokemon-species
+    python pokeapi/crawl_resources.py --depth 2 --exclude move
+"""
+from __future__ import annotations
+
+import sys
+
+sys.path.append(".")
+
+import argparse
+
+from pokeapi.core.conf import app_settings
+from pokeapi.dependencies import init_cache, loguru_sinks
+from pokeapi.domain.api.responses import APIAllPokemon
+from pokeapi.utils.crawl_utils import CrawlResult, crawl_resources
+from pokeapi.utils.path_utils import ensure_dirs_exist
+
+from loguru import logger as log
+from red_utils.ext.loguru_utils import init_logger
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(
+        description="Cache the resources linked from every Pokemon."
+    )
+    parser.add_argument(
+        "--depth", type=int, default=1, help="Levels of links to follow from each Pokemon"
+    )
+    parser.add_argument(
+        "--include", nargs="+", default=None, help="Only follow links to these endpoints"
+    )
+    parser.add_argument(
+        "--exclude", nargs="+", default=None, help="Never follow links to these endpoints"
+    )
+    parser.add_argument(
+        "--limit", type=int, default=None, help="Only crawl from the first N Pokemon"
+    )
+    parser.add_argument(
+        "--concurrency", type=int, default=None, help="Max number of requests in flight"
+    )
+
+    return parser.parse_args()
+
+
+if __name__ == "__main__":
+    ensure_dirs_exist([app_settings.data_dir, app_settings.cache_dir])
+    init_logger(sinks=loguru_sinks)
+
+    args = parse_args()
+    req_cache = init_cache("requests")
+
+    all_pokemon: APIAllPokemon | None = APIAllPokemon.from_cache(req_cache)
+    if all_pokemon is None:
+        all_pokemon = APIAllPokemon()
+        all_pokemon.get_pokemon(use_cache=True, cache=req_cache)
+
+    if all_pokemon.pokemon_list is None:
+        log.error("Could not load the Pokemon listing.")
+        sys.exit(1)
+
+    start = all_pokemon.pokemon_list
+    if args.limit is not None:
+        start = start[: args.limit]
+
+    result: CrawlResult = crawl_resources(
+        start=start,
+        cache=req_cache,
+        max_depth=args.depth,
+        include=args.include,
+        exclude=args.exclude,
+        concurrency=args.concurrency,
+    )
+
+    for endpoint, count in sorted(result.by_endpoint.items()):
+        print(f"{endpoint}\t{count}")
+
+    if result.failed:
+        log.warning(f"[{len(result.failed)}] resource(s) failed to load")
+        sys.exit(1)
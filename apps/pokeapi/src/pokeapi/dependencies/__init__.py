@@ -0,0 +1,73 @@
+from __future__ import annotations
+
+from . import (
+    caches,
+    codecs,
+    db,
+    metrics,
+    profiling,
+    ratelimit,
+    rediscache,
+    sessions,
+    singleflight,
+    sinks,
+    snapshot,
+    tiered,
+    tracing,
+)
+from .caches import cache_get_many, init_cache
+from .codecs import CodecDisk, get_codec, train_zstd_dictionary
+from .db import close_db_engines, default_db_url, get_engine, get_session_factory
+from .metrics import (
+    mark_process_dead,
+    metrics_enabled,
+    observe_queue_wait,
+    observe_task,
+    observe_upstream,
+    record_cache_lookup,
+    render_metrics,
+    start_metrics_server,
+)
+from .profiling import SamplingProfiler, default_profile_dir
+from .ratelimit import (
+    AdaptiveConcurrency,
+    RateLimiter,
+    get_adaptive_concurrency,
+    get_rate_limiter,
+    send_with_retries,
+)
+from .rediscache import RedisCache
+from .sessions import (
+    close_http_clients,
+    close_redis_clients,
+    get_async_client,
+    get_async_redis,
+    get_redis,
+    new_async_client,
+)
+from .singleflight import RedisLease, SingleFlight, get_single_flight
+from .sinks import loguru_sinks
+from .snapshot import (
+    Snapshot,
+    SnapshotInfo,
+    default_snapshot_dir,
+    restore_snapshot,
+    seed_from_snapshot,
+    snapshot_path,
+    write_snapshot,
+)
+from .tiered import MemoryTier, MemoryTierStats, TieredCache
+from .tracing import (
+    Span,
+    SpanContext,
+    activate,
+    current_span,
+    deactivate,
+    extract,
+    flush_spans,
+    inject,
+    span,
+    start_span,
+    traced,
+    tracing_enabled,
+)
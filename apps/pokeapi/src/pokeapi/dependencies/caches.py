@@ -0,0 +1,118 @@
+from __future__ import annotations
+
+from collections.abc import Iterable
+from typing import Any
+
+from pokeapi.core.conf import app_settings, cache_settings
+
+from .codecs import CodecDisk
+from .rediscache import RedisCache
+from .snapshot import seed_from_snapshot
+from .tiered import TieredCache
+
+import diskcache
+
+from red_utils.ext.diskcache_utils import default_cache_conf, new_cache
+
+def init_cache(
+    cache_name: str,
+    cache_conf: dict | None = default_cache_conf,
+    codec: str | None = None,
+    memory_max_size: int | None = None,
+    memory_ttl: float | None = None,
+    backend: str | None = None,
+    seed: bool = True,
+) -> diskcache.Cache | RedisCache | TieredCache:
+    """Quickly initialize a diskcache.Cache (or a RedisCache).
+
+    DESCRIPTION:
+    ------------
+
+    Quickly initializes a cache at the default cache directory. If cache_conf is not overridden,
+    uses the default configuration from red_utils.ext.diskcache_utils.defaault_cache_conf, replacing
+    the directory name for the cache with the value passed for cache_name.
+
+    With backend="redis", the cache is a RedisCache named cache_name in the shared Redis instance
+    instead, so every process & container uses the same cache (cache_conf is ignored).
+
+    Dict & list values are stored through the codec layer (see pokeapi.dependencies.codecs)
+    instead of pickle. Entries written with any codec, or pickled before the codec layer
+    existed, can still be read.
+
+    Unless memory_max_size is 0, the cache is wrapped in a TieredCache: an in-process, size-bounded
+    LRU that serves repeat reads without touching disk (see pokeapi.dependencies.tiered). Use the
+    cache's get/set/delete methods & the "in" operator on it; red_utils' diskcache helpers only accept
+    a diskcache.Cache.
+
+    When cache_settings.snapshot_dir holds a snapshot of the cache ({cache_name}.pksnap), entries
+    missing from the cache are copied from it the first time the cache is opened (see
+    pokeapi.dependencies.snapshot.seed_from_snapshot), so a new container starts warm.
+
+    PARAMS:
+    -------
+
+    *cache_name (str): Overrides the cache_conf["directory"] value, renaming the directory where the cache is stored.
+    *cache_conf (dict): Cache configuration dict for the DiskCache Cache. Defaults to red_utils.ext.diskcache_utils.default_cache_conf.
+    *codec (str): Codec for new cached values. Defaults to cache_settings.codec. Pass "pickle" to write with
+        diskcache's default serialization (codec-encoded entries stay readable).
+    *memory_max_size (int): Size of the in-process memory tier in bytes. Defaults to cache_settings.memory_max_size.
+        0 disables the memory tier & returns the backend cache itself.
+    *memory_ttl (float): Seconds values stay in the memory tier. Defaults to cache_settings.memory_ttl.
+    *backend (str): "disk" (diskcache) or "redis". Defaults to cache_settings.backend.
+    *seed (bool): Seed the cache from its snapshot, if there is one.
+    """
+    if codec is None:
+        codec = cache_settings.codec
+    if backend is None:
+        backend = cache_settings.backend
+
+    if backend == "redis":
+        cache = RedisCache(cache_name, codec=codec)
+
+    elif backend == "disk":
+        if cache_conf is None:
+            cache_conf = default_cache_conf
+
+        ## Copy, so the shared default conf isn't modified
+        cache_conf = dict(cache_conf)
+
+        cache_conf.setdefault("disk", CodecDisk)
+        cache_conf.setdefault("disk_codec", codec)
+
+        cache_conf["directory"] = f"{app_settings.cache_dir}/{cache_name}"
+        cache = new_cache(cache_conf=cache_conf)
+
+    else:
+        raise ValueError(f"Invalid cache backend: {backend}. Must be 'disk' or 'redis'")
+
+    if seed:
+        seed_from_snapshot(cache, cache_name)
+
+    if memory_max_size is None:
+        memory_max_size = cache_settings.memory_max_size
+    if memory_ttl is None:
+        memory_ttl = cache_settings.memory_ttl
+
+    if not memory_max_size:
+        return cache
+
+    return TieredCache(cache, max_size=memory_max_size, ttl=memory_ttl)
+
+
+def cache_get_many(cache: Any = None, keys: Iterable[Any] = ()) -> dict[Any, Any]:
+    """Get several values from a cache. Missing keys are left out of the result.
+
+    Reads in one batch when the cache supports get_many() (i.e. RedisCache, TieredCache), and key
+    by key otherwise (i.e. a diskcache.Cache, where each read is local).
+    """
+    if hasattr(cache, "get_many"):
+        return cache.get_many(keys)
+
+    values: dict[Any, Any] = {}
+    for key in keys:
+        value = cache.get(key)
+
+        if value is not None:
+            values[key] = value
+
+    return values
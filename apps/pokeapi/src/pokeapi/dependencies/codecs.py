@@ -0,0 +1,285 @@
+"""Compact binary encoding for cached values.
+
+Values are packed with msgpack and (optionally) compressed, then prefixed with a
+small header:
+
+    MAGIC (4 bytes) | format version (1 byte) | codec ID (1 byte) | payload
+
+The header lets a reader pick the right codec for each entry, so changing the
+configured codec never strands entries written with a previous one. Entries written
+before the codec layer existed are plain pickles, which CodecDisk hands back to
+diskcache's default handling.
+"""
+from __future__ import annotations
+
+from pathlib import Path
+from typing import Any, Union
+import zlib
+
+from pokeapi.core.conf import cache_settings
+
+import diskcache
+
+from diskcache.core import MODE_BINARY, MODE_RAW, UNKNOWN
+from loguru import logger as log
+import msgpack
+
+try:
+    import zstandard
+except ImportError:
+    zstandard = None
+
+MAGIC: bytes = b"\x93PKC"
+FORMAT_VERSION: int = 1
+HEADER_SIZE: int = len(MAGIC) + 2
+
+
+class Codec:
+    """Base codec. Subclasses set codec_id & name, and implement compress()/decompress()."""
+
+    codec_id: int = 0
+    name: str = ""
+
+    def __init__(self, **kwargs) -> None:
+        """Accept (& ignore) the settings other codecs take."""
+        pass
+
+    def compress(self, data: bytes) -> bytes:
+        return data
+
+    def decompress(self, data: bytes) -> bytes:
+        return data
+
+    def encode(self, obj: Any) -> bytes:
+        """Pack a value & prefix it with the codec header."""
+        payload: bytes = self.compress(msgpack.packb(obj, use_bin_type=True))
+
+        return MAGIC + bytes((FORMAT_VERSION, self.codec_id)) + payload
+
+    def decode(self, data: bytes) -> Any:
+        """Unpack a value encoded by this codec (header included)."""
+        return msgpack.unpackb(
+            self.decompress(data[HEADER_SIZE:]), raw=False, strict_map_key=False
+        )
+
+
+class MsgpackCodec(Codec):
+    codec_id: int = 1
+    name: str = "msgpack"
+
+
+class MsgpackZlibCodec(Codec):
+    codec_id: int = 2
+    name: str = "msgpack-zlib"
+
+    def __init__(self, level: int = 6, **kwargs) -> None:
+        """Set the zlib compression level."""
+        self.level = level
+
+    def compress(self, data: bytes) -> bytes:
+        return zlib.compress(data, self.level)
+
+    def decompress(self, data: bytes) -> bytes:
+        return zlib.decompress(data)
+
+
+class MsgpackZstdCodec(Codec):
+    """msgpack + zstd, optionally with a trained dictionary.
+
+    A dictionary trained on sample Pokemon responses (see train_zstd_dictionary()) makes
+    a big difference on values this repetitive. Frames record the ID of the dictionary
+    they were written with, so the same dictionary file must be configured to read them.
+    """
+
+    codec_id: int = 3
+    name: str = "msgpack-zstd"
+
+    def __init__(
+        self, level: int = 3, dict_path: Union[str, Path] | None = None, **kwargs
+    ) -> None:
+        """Build the zstd compressor & decompressor, with a dictionary if dict_path is set."""
+        if zstandard is None:
+            raise ImportError(
+                "The msgpack-zstd codec requires the zstandard package. Install with: pip install zstandard"
+            )
+
+        self.level = level
+        self.dict_path = dict_path
+
+        zstd_dict = None
+        if dict_path:
+            zstd_dict = zstandard.ZstdCompressionDict(Path(dict_path).read_bytes())
+
+        self._compressor = zstandard.ZstdCompressor(level=level, dict_data=zstd_dict)
+        self._decompressor = zstandard.ZstdDecompressor(dict_data=zstd_dict)
+
+    def compress(self, data: bytes) -> bytes:
+        return self._compressor.compress(data)
+
+    def decompress(self, data: bytes) -> bytes:
+        return self._decompressor.decompress(data)
+
+
+CODECS: dict[str, type[Codec]] = {
+    MsgpackCodec.name: MsgpackCodec,
+    MsgpackZlibCodec.name: MsgpackZlibCodec,
+    MsgpackZstdCodec.name: MsgpackZstdCodec,
+}
+_CODECS_BY_ID: dict[int, type[Codec]] = {c.codec_id: c for c in CODECS.values()}
+
+## get_codec() runs for every init_cache(), so the zstd fallback is only logged once per process
+_warned_zstd_fallback: bool = False
+
+
+def get_codec(
+    name: str | None = None,
+    level: int | None = None,
+    dict_path: Union[str, Path] | None = None,
+) -> Codec:
+    """Build a codec by name. Defaults come from CacheSettings.
+
+    Falls back to msgpack-zlib if msgpack-zstd is requested but zstandard isn't installed.
+    """
+    if name is None:
+        name = cache_settings.codec
+    if level is None:
+        level = cache_settings.compression_level
+    if dict_path is None:
+        dict_path = cache_settings.zstd_dict_path or None
+
+    if name not in CODECS:
+        raise ValueError(f"Invalid codec: {name}. Must be one of {list(CODECS)}")
+
+    if name == MsgpackZstdCodec.name and zstandard is None:
+        global _warned_zstd_fallback
+
+        if not _warned_zstd_fallback:
+            log.warning(
+                "zstandard is not installed. Falling back to the msgpack-zlib codec. Install with: pip install zstandard"
+            )
+            _warned_zstd_fallback = True
+
+        name = MsgpackZlibCodec.name
+
+    return CODECS[name](level=level, dict_path=dict_path)
+
+
+def is_encoded(data: Any) -> bool:
+    """Return True if data is a bytestring written by a Codec."""
+    return isinstance(data, bytes) and data[: len(MAGIC)] == MAGIC
+
+
+## Codecs built on demand to read entries written with a codec other than the configured one
+_decoders: dict[int, Codec] = {}
+
+
+def decode_value(data: bytes = None, codec: Codec | None = None) -> Any:
+    """Decode a value written by any Codec, using the codec ID in its header.
+
+    PARAMS:
+    -------
+
+    * data (bytes): The encoded value, header included.
+    * codec (Codec): The caller's configured codec. Used when the header matches it, so
+        its dictionary & settings apply.
+    """
+    version, codec_id = data[len(MAGIC)], data[len(MAGIC) + 1]
+
+    if version != FORMAT_VERSION:
+        raise ValueError(f"Unsupported cache entry format version: {version}")
+
+    if codec is not None and codec.codec_id == codec_id:
+        return codec.decode(data)
+
+    if codec_id not in _decoders:
+        if codec_id not in _CODECS_BY_ID:
+            raise ValueError(f"Unknown codec ID in cache entry: {codec_id}")
+
+        _decoders[codec_id] = get_codec(_CODECS_BY_ID[codec_id].name)
+
+    return _decoders[codec_id].decode(data)
+
+
+class CodecDisk(diskcache.Disk):
+    """diskcache Disk that stores dict & list values through a Codec instead of pickle.
+
+    Pass to a Cache with disk=CodecDisk. Options are passed with diskcache's disk_ prefix,
+    i.e. Cache(directory, disk=CodecDisk, disk_codec="msgpack-zstd", disk_compression_level=3).
+    Other value types (and file reads) use diskcache's default handling. With codec="pickle",
+    new values are pickled as usual but codec-encoded entries can still be read.
+    """
+
+    def __init__(
+        self,
+        directory,
+        codec: str | None = None,
+        compression_level: int | None = None,
+        zstd_dict_path: str | None = None,
+        **kwargs,
+    ) -> None:
+        """Set up the Disk & build its codec. codec="pickle" stores new values with pickle."""
+        super().__init__(directory, **kwargs)
+
+        ## Not self.codec: Cache.reset() sets every disk_ setting as an attribute on the Disk
+        self._codec: Codec | None = None
+        if codec != "pickle":
+            self._codec = get_codec(
+                codec, level=compression_level, dict_path=zstd_dict_path
+            )
+
+    def store(self, value, read, key=UNKNOWN):
+        if self._codec is not None and not read and type(value) in (dict, list):
+            value = self._codec.encode(value)
+
+        return super().store(value, read, key=key)
+
+    def fetch(self, mode, filename, value, read):
+        data = super().fetch(mode, filename, value, read)
+
+        if not read and mode in (MODE_RAW, MODE_BINARY) and is_encoded(data):
+            return decode_value(data, codec=self._codec)
+
+        return data
+
+
+def train_zstd_dictionary(
+    cache: diskcache.Cache = None,
+    output_path: Union[str, Path] = None,
+    dict_size: int = 112_640,
+    max_samples: int = 2000,
+) -> Path:
+    """Train a zstd dictionary on values in a cache & write it to output_path.
+
+    Point the cache_zstd_dict setting at the file to use it. Entries compressed with a
+    different dictionary (or none) can't be read with the new one, so clear & re-warm the
+    cache after switching dictionaries.
+    """
+    if zstandard is None:
+        raise ImportError(
+            "Training a dictionary requires the zstandard package. Install with: pip install zstandard"
+        )
+    if cache is None:
+        raise ValueError("Missing cache to sample values from.")
+    if output_path is None:
+        raise ValueError("Missing output path for the trained dictionary.")
+
+    samples: list[bytes] = []
+    for key in cache.iterkeys():
+        value = cache.get(key)
+
+        if type(value) in (dict, list):
+            samples.append(msgpack.packb(value, use_bin_type=True))
+        if len(samples) >= max_samples:
+            break
+
+    if not samples:
+        raise ValueError(f"No dict/list values found in cache at {cache.directory}")
+
+    log.info(f"Training zstd dictionary ({dict_size} bytes) on [{len(samples)}] samples")
+    zstd_dict = zstandard.train_dictionary(dict_size, samples)
+
+    output_path = Path(output_path)
+    output_path.parent.mkdir(parents=True, exist_ok=True)
+    output_path.write_bytes(zstd_dict.as_bytes())
+
+    return output_path
@@ -0,0 +1,98 @@
+"""Process-wide SQLAlchemy engines for the normalized Pokemon store.
+
+One engine (and its connection pool) is kept per database URL. SQLite databases are opened
+in WAL mode, so readers don't block the process writing fetched Pokemon into the store.
+After a fork, the child drops the pooled connections it inherited and opens its own.
+"""
+from __future__ import annotations
+
+import os
+
+from pathlib import Path
+import threading
+
+from pokeapi.core.conf import app_settings, db_settings
+
+from loguru import logger as log
+from sqlalchemy import create_engine, event
+from sqlalchemy.engine import Engine
+from sqlalchemy.orm import Session, sessionmaker
+
+## Filename of the default SQLite database, under app_settings.data_dir
+DEFAULT_DB_FILE: str = "pokeapi.sqlite3"
+
+_engines: dict[str, Engine] = {}
+_engines_lock: threading.Lock = threading.Lock()
+
+
+def default_db_url() -> str:
+    """Return the database URL from db_settings.url, or a SQLite file in the data directory."""
+    if db_settings.url:
+        return db_settings.url
+
+    return f"sqlite:///{Path(app_settings.data_dir) / DEFAULT_DB_FILE}"
+
+
+def _set_sqlite_pragmas(dbapi_conn, _record) -> None:
+    cursor = dbapi_conn.cursor()
+    cursor.execute("PRAGMA journal_mode=WAL")
+    cursor.execute("PRAGMA synchronous=NORMAL")
+    cursor.execute("PRAGMA foreign_keys=ON")
+    cursor.close()
+
+
+def get_engine(url: str | None = None) -> Engine:
+    """Return the process-wide engine for a database URL. Defaults to default_db_url()."""
+    if url is None:
+        url = default_db_url()
+
+    with _engines_lock:
+        engine: Engine | None = _engines.get(url)
+
+        if engine is None:
+            if url.startswith("sqlite:///") and url != "sqlite:///:memory:":
+                Path(url.removeprefix("sqlite:///")).parent.mkdir(
+                    parents=True, exist_ok=True
+                )
+
+            engine = create_engine(url, echo=db_settings.echo)
+
+            if engine.dialect.name == "sqlite":
+                event.listen(engine, "connect", _set_sqlite_pragmas)
+
+            log.debug(f"Created database engine for [{engine.url!r}]")
+            _engines[url] = engine
+
+        return engine
+
+
+def get_session_factory(url: str | None = None) -> sessionmaker[Session]:
+    """Return a sessionmaker bound to get_engine(url).
+
+    Objects stay loaded after a commit (expire_on_commit=False), so query results can be
+    used after their session is closed.
+    """
+    return sessionmaker(bind=get_engine(url), expire_on_commit=False)
+
+
+def close_db_engines() -> None:
+    """Dispose of every engine & close their pooled connections."""
+    with _engines_lock:
+        engines: list[Engine] = list(_engines.values())
+        _engines.clear()
+
+    for engine in engines:
+        engine.dispose()
+
+
+def _reset_after_fork() -> None:
+    global _engines_lock
+
+    _engines_lock = threading.Lock()
+
+    ## Leave the parent's connections open, the parent still owns them
+    for engine in _engines.values():
+        engine.dispose(close=False)
+
+
+os.register_at_fork(after_in_child=_reset_after_fork)
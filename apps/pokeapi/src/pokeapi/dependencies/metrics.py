@@ -0,0 +1,300 @@
+"""Prometheus metrics for the fetch, cache & Celery paths.
+
+Metrics are defined once, here, and recorded through the helpers below (i.e. observe_upstream()),
+so instrumented code doesn't need to know whether metrics are on. Without the prometheus-client
+package, or with metrics_settings.enabled off, every metric is a no-op.
+
+Exposition:
+
+* Celery workers & the refresh job serve metrics over HTTP on metrics_settings.port, see
+    start_metrics_server().
+* The read API serves them on /metrics, see render_metrics().
+
+Celery's prefork pool runs tasks in child processes, each with its own metric values. Set the
+PROMETHEUS_MULTIPROC_DIR environment variable (to an empty, writable directory) before the worker
+starts, and prometheus-client writes every process's values there for the worker's metrics server
+to aggregate.
+"""
+from __future__ import annotations
+
+import os
+
+from pathlib import Path
+import threading
+from typing import Any
+
+from pokeapi.core.conf import metrics_settings
+
+from loguru import logger as log
+
+try:
+    import prometheus_client
+
+    from prometheus_client import multiprocess
+except ImportError:
+    prometheus_client = None
+    multiprocess = None
+
+## Buckets for requests to the Pokemon API, in seconds
+LATENCY_BUCKETS: tuple[float, ...] = (
+    0.025,
+    0.05,
+    0.1,
+    0.25,
+    0.5,
+    1.0,
+    2.5,
+    5.0,
+    10.0,
+    30.0,
+)
+## Buckets for Celery task durations & queue waits, in seconds
+TASK_BUCKETS: tuple[float, ...] = (
+    0.1,
+    0.5,
+    1.0,
+    2.5,
+    5.0,
+    10.0,
+    30.0,
+    60.0,
+    120.0,
+    300.0,
+    600.0,
+    1800.0,
+)
+
+
+def _require_prometheus() -> None:
+    if prometheus_client is None:
+        raise ImportError(
+            "Serving metrics requires the prometheus-client package. Install with: pip install prometheus-client"
+        )
+
+
+def metrics_enabled() -> bool:
+    """Return True if metrics are recorded (prometheus-client is installed & metrics_settings.enabled)."""
+    return prometheus_client is not None and bool(metrics_settings.enabled)
+
+
+def multiprocess_enabled() -> bool:
+    """Return True if metric values are shared between processes through PROMETHEUS_MULTIPROC_DIR."""
+    return bool(os.environ.get("PROMETHEUS_MULTIPROC_DIR"))
+
+
+class _NoopMetric:
+    """Stands in for a metric when metrics are off. Accepts & ignores every call."""
+
+    def labels(self, *args, **kwargs) -> _NoopMetric:
+        return self
+
+    def inc(self, amount: float = 1) -> None:
+        pass
+
+    def dec(self, amount: float = 1) -> None:
+        pass
+
+    def set(self, value: float = 0) -> None:
+        pass
+
+    def observe(self, value: float = 0) -> None:
+        pass
+
+
+def _metric(
+    kind: str, name: str, documentation: str, labels: tuple[str, ...] = (), **kwargs
+) -> Any:
+    if not metrics_enabled():
+        return _NoopMetric()
+
+    if kind != "Gauge":
+        ## multiprocess_mode only applies to gauges
+        kwargs.pop("multiprocess_mode", None)
+
+    return getattr(prometheus_client, kind)(name, documentation, labels, **kwargs)
+
+
+CACHE_REQUESTS = _metric(
+    "Counter",
+    "pokeapi_cache_requests_total",
+    "Cached response lookups, by cache & result (hit, stale, expired or miss)",
+    ("cache", "result"),
+)
+UPSTREAM_LATENCY = _metric(
+    "Histogram",
+    "pokeapi_upstream_request_duration_seconds",
+    "Duration of requests to the Pokemon API (each retry counts), by response status",
+    ("status",),
+    buckets=LATENCY_BUCKETS,
+)
+UPSTREAM_BYTES = _metric(
+    "Counter",
+    "pokeapi_upstream_bytes_total",
+    "Bytes downloaded from the Pokemon API, by response status",
+    ("status",),
+)
+TASK_DURATION = _metric(
+    "Histogram",
+    "pokeapi_task_duration_seconds",
+    "Run time of Celery tasks, by task & final state",
+    ("task", "state"),
+    buckets=TASK_BUCKETS,
+)
+TASK_QUEUE_WAIT = _metric(
+    "Histogram",
+    "pokeapi_task_queue_wait_seconds",
+    "Time Celery tasks waited between being sent & starting, by task",
+    ("task",),
+    buckets=TASK_BUCKETS,
+)
+REFRESH_PLANNED = _metric(
+    "Gauge",
+    "pokeapi_refresh_planned",
+    "Entries scheduled for a refresh in the current refresh cycle",
+    multiprocess_mode="max",
+)
+REFRESH_CYCLE_DISPATCHED = _metric(
+    "Gauge",
+    "pokeapi_refresh_cycle_dispatched",
+    "Entries dispatched for a refresh in the current refresh cycle",
+    multiprocess_mode="max",
+)
+REFRESH_CYCLES = _metric(
+    "Counter",
+    "pokeapi_refresh_cycles_total",
+    "Refresh cycles planned",
+)
+REFRESH_DISPATCHED = _metric(
+    "Counter",
+    "pokeapi_refresh_dispatched_total",
+    "Entries dispatched for a refresh",
+)
+REFRESH_FAILED_BATCHES = _metric(
+    "Counter",
+    "pokeapi_refresh_failed_batches_total",
+    "Refresh batches that could not be dispatched",
+)
+REFRESH_LAST_CYCLE = _metric(
+    "Gauge",
+    "pokeapi_refresh_last_cycle_timestamp_seconds",
+    "Unix time the last refresh cycle was planned",
+    multiprocess_mode="max",
+)
+
+
+def cache_label(cache: Any = None) -> str:
+    """Name of a cache for metric labels, i.e. "requests"."""
+    name: str | None = getattr(cache, "name", None)
+
+    if isinstance(name, str) and name:
+        return name
+
+    directory: str | None = getattr(cache, "directory", None)
+
+    return Path(str(directory)).name if directory else "unknown"
+
+
+def record_cache_lookup(cache: Any = None, result: str = None) -> None:
+    """Count a cached response lookup. result is "hit", "stale", "expired" or "miss"."""
+    CACHE_REQUESTS.labels(cache_label(cache), result).inc()
+
+
+def observe_upstream(status: int | str = None, seconds: float = 0, size: int = 0) -> None:
+    """Record a request to the Pokemon API. Pass status "error" for requests that failed to connect."""
+    status = str(status)
+
+    UPSTREAM_LATENCY.labels(status).observe(seconds)
+    if size:
+        UPSTREAM_BYTES.labels(status).inc(size)
+
+
+def observe_task(task: str = None, state: str = None, seconds: float = 0) -> None:
+    TASK_DURATION.labels(task, state).observe(seconds)
+
+
+def observe_queue_wait(task: str = None, seconds: float = 0) -> None:
+    TASK_QUEUE_WAIT.labels(task).observe(max(0.0, seconds))
+
+
+def _registry():
+    """Return the registry to expose: this process's, or every process's in multiprocess mode."""
+    if not multiprocess_enabled():
+        return prometheus_client.REGISTRY
+
+    registry = prometheus_client.CollectorRegistry()
+    multiprocess.MultiProcessCollector(registry)
+
+    return registry
+
+
+def render_metrics() -> tuple[bytes, str]:
+    """Render every metric in the Prometheus text format. Returns the body & its content type."""
+    _require_prometheus()
+
+    return prometheus_client.generate_latest(_registry()), prometheus_client.CONTENT_TYPE_LATEST
+
+
+## Port this process serves metrics on, once started
+_server_port: int | None = None
+_server_lock = threading.Lock()
+
+
+def start_metrics_server(port: int | None = None) -> bool:
+    """Serve metrics over HTTP from a background thread, once per process.
+
+    Returns True if the server is running. Does nothing (and returns False) when metrics are
+    off. With PROMETHEUS_MULTIPROC_DIR set, serves the values of every process sharing it.
+
+    PARAMS:
+    -------
+
+    * port (int): Port to listen on. Defaults to metrics_settings.port.
+    """
+    global _server_port
+
+    if not metrics_enabled():
+        log.debug(
+            "Metrics are disabled or prometheus-client is not installed, not serving metrics."
+        )
+
+        return False
+
+    if port is None:
+        port = metrics_settings.port
+
+    with _server_lock:
+        if _server_port is not None:
+            return True
+
+        try:
+            prometheus_client.start_http_server(port, registry=_registry())
+        except OSError as exc:
+            log.warning(f"Could not serve metrics on port {port}. Details: {exc}")
+
+            return False
+
+        _server_port = port
+
+    log.info(f"Serving metrics on port {port}")
+
+    return True
+
+
+def mark_process_dead(pid: int | None = None) -> None:
+    """Drop an exited process's live gauges from the shared metrics directory (multiprocess mode only)."""
+    if prometheus_client is None or not multiprocess_enabled():
+        return
+
+    multiprocess.mark_process_dead(pid or os.getpid())
+
+
+def _reset_after_fork() -> None:
+    ## The parent's metrics server thread doesn't exist in the child
+    global _server_port, _server_lock
+
+    _server_port = None
+    _server_lock = threading.Lock()
+
+
+if hasattr(os, "register_at_fork"):
+    os.register_at_fork(after_in_child=_reset_after_fork)
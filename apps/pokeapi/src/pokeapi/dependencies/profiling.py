@@ -0,0 +1,177 @@
+"""Opt-in sampling profiler for diagnosing a single refresh run.
+
+A background thread samples every thread's stack (sys._current_frames()) at a fixed interval.
+Nothing is hooked into the profiled code, so the overhead is the sampling thread alone & the
+profiler is safe to use in production for one run at a time.
+
+Profiles are written in the "folded" format (one "frame;frame;frame count" line per stack), which
+flamegraph.pl, speedscope & most flame graph viewers read. .summary() lists the functions with the
+most samples.
+"""
+from __future__ import annotations
+
+from collections import Counter
+from datetime import datetime
+import os
+
+from pathlib import Path
+import sys
+import threading
+import time
+from types import FrameType
+
+from pokeapi.core.conf import app_settings
+
+from loguru import logger as log
+
+## Seconds between samples
+DEFAULT_INTERVAL: float = 0.005
+
+## Leaf frames of threads blocked waiting (on a lock, event, selector or socket). Skipped unless
+#  include_idle is set, so a profile shows where time is spent instead of where threads sleep.
+_IDLE_FILES: tuple[str, ...] = ("threading.py", "selectors.py", "queue.py")
+
+
+def default_profile_dir() -> Path:
+    return Path(app_settings.data_dir) / "profiles"
+
+
+def _frame_label(frame: FrameType) -> str:
+    code = frame.f_code
+
+    return f"{code.co_name} ({Path(code.co_filename).name}:{code.co_firstlineno})"
+
+
+class SamplingProfiler:
+    """Sample the stacks of every thread in this process while running.
+
+    PARAMS:
+    -------
+
+    * interval (float): Seconds between samples.
+    * include_idle (bool): Keep samples of threads blocked waiting, i.e. an idle event loop.
+
+    Usage:
+
+        with SamplingProfiler() as profiler:
+            run_refresh()
+
+        profiler.write("refresh.folded")
+        log.info(profiler.summary())
+    """
+
+    def __init__(self, interval: float = DEFAULT_INTERVAL, include_idle: bool = False) -> None:
+        """Configure the profiler. Sampling starts with .start()."""
+        if interval <= 0:
+            raise ValueError(f"Invalid interval: {interval}. Must be greater than 0")
+
+        self.interval = interval
+        self.include_idle = include_idle
+
+        ## Samples by folded stack ("thread;outermost;...;innermost")
+        self.stacks: Counter[str] = Counter()
+        self.samples: int = 0
+        self.started_at: float | None = None
+        self.seconds: float = 0.0
+
+        self._stop = threading.Event()
+        self._thread: threading.Thread | None = None
+
+    def start(self) -> SamplingProfiler:
+        if self._thread is not None:
+            return self
+
+        self._stop.clear()
+        self.started_at = time.time()
+        self._started: float = time.perf_counter()
+        self._thread = threading.Thread(
+            target=self._run, name="pokeapi-profiler", daemon=True
+        )
+        self._thread.start()
+
+        log.info(f"Sampling profiler started, every {self.interval * 1000:.1f}ms")
+
+        return self
+
+    def stop(self) -> SamplingProfiler:
+        if self._thread is None:
+            return self
+
+        self._stop.set()
+        self._thread.join()
+        self._thread = None
+        self.seconds += time.perf_counter() - self._started
+
+        log.info(f"Sampling profiler stopped after [{self.samples}] samples in {self.seconds:.1f}s")
+
+        return self
+
+    def __enter__(self) -> SamplingProfiler:
+        """Start sampling."""
+        return self.start()
+
+    def __exit__(self, *exc) -> None:
+        """Stop sampling."""
+        self.stop()
+
+    def _run(self) -> None:
+        own: int = threading.get_ident()
+
+        while not self._stop.wait(self.interval):
+            names: dict[int, str] = {t.ident: t.name for t in threading.enumerate()}
+
+            for ident, frame in sys._current_frames().items():
+                if ident == own:
+                    continue
+                if not self.include_idle and frame.f_code.co_filename.endswith(_IDLE_FILES):
+                    continue
+
+                stack: list[str] = []
+                while frame is not None:
+                    stack.append(_frame_label(frame))
+                    frame = frame.f_back
+
+                stack.append(names.get(ident, f"thread-{ident}"))
+                self.stacks[";".join(reversed(stack))] += 1
+
+            self.samples += 1
+
+    def top(self, limit: int = 20) -> list[tuple[str, int, int]]:
+        """Functions with the most samples: (function, samples as the leaf frame, samples on the stack)."""
+        own: Counter[str] = Counter()
+        total: Counter[str] = Counter()
+
+        for folded, count in self.stacks.items():
+            frames: list[str] = folded.split(";")[1:]
+            own[frames[-1]] += count
+            ## Count recursive functions once per stack
+            for frame in set(frames):
+                total[frame] += count
+
+        return [(frame, own[frame], count) for frame, count in total.most_common(limit)]
+
+    def summary(self, limit: int = 20) -> str:
+        stacks: int = sum(self.stacks.values()) or 1
+        lines: list[str] = [
+            f"[{self.samples}] samples over {self.seconds:.1f}s. Top functions by samples on the stack:",
+            f"{'total %':>8} {'self %':>7}  function",
+        ]
+        lines.extend(
+            f"{total / stacks * 100:>7.1f}% {own / stacks * 100:>6.1f}%  {frame}"
+            for frame, own, total in self.top(limit)
+        )
+
+        return "\n".join(lines)
+
+    def write(self, path: str | Path | None = None) -> Path:
+        """Write the samples in the folded format. Defaults to [data_dir]/profiles/profile-[time]-[pid].folded."""
+        if path is None:
+            path = default_profile_dir() / f"profile-{datetime.now():%Y%m%d-%H%M%S}-{os.getpid()}.folded"
+
+        path = Path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text("".join(f"{stack} {count}\n" for stack, count in self.stacks.most_common()))
+
+        log.info(f"Wrote profile of [{self.samples}] samples to {path}")
+
+        return path
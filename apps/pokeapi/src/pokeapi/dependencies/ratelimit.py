@@ -0,0 +1,517 @@
+"""Rate limiting, retries & adaptive concurrency for requests to the Pokemon API.
+
+Every request made through send_with_retries():
+
+- Takes a token from a token bucket per host. With the "redis" backend the bucket lives
+  in Redis, so every worker process & container shares one request rate.
+- Holds a slot from an AdaptiveConcurrency limiter, which halves the number of requests
+  in flight when the recent error rate rises & grows it back one at a time.
+- Is retried on 429/5xx responses & connection errors, waiting for the Retry-After header
+  when there is one, or a jittered exponential backoff when there isn't. A 429's
+  Retry-After also pauses the host's bucket for every process.
+"""
+from __future__ import annotations
+
+import asyncio
+
+from collections import deque
+from contextlib import asynccontextmanager, nullcontext
+from email.utils import parsedate_to_datetime
+import os
+import random
+import threading
+import time
+from typing import AsyncIterator
+import weakref
+
+from pokeapi.core.conf import api_settings, ratelimit_settings
+
+from .metrics import observe_upstream
+from .sessions import get_async_redis
+
+import httpx
+
+from loguru import logger as log
+import redis.asyncio as aioredis
+from redis.exceptions import RedisError
+
+## Responses worth retrying. Anything else (including 404) is returned to the caller as-is.
+RETRY_STATUSES: frozenset[int] = frozenset({429, 500, 502, 503, 504})
+
+## Seconds to keep using the local bucket after Redis fails, before trying Redis again
+REDIS_RETRY_INTERVAL: float = 60.0
+
+## KEYS[1]: bucket hash, KEYS[2]: "blocked" key set after a 429.
+#  ARGV[1]: rate (tokens/second), ARGV[2]: burst (bucket size).
+#  Takes a token & returns "0", or returns the seconds to wait before trying again.
+#  Redis' own clock is used, so hosts with drifting clocks still share one rate.
+_TOKEN_BUCKET_SCRIPT: str = """
+local blocked = redis.call('PTTL', KEYS[2])
+if blocked > 0 then
+    return tostring(blocked / 1000)
+end
+
+local rate = tonumber(ARGV[1])
+local burst = tonumber(ARGV[2])
+local t = redis.call('TIME')
+local now = tonumber(t[1]) + tonumber(t[2]) / 1000000
+
+local state = redis.call('HMGET', KEYS[1], 'tokens', 'ts')
+local tokens = tonumber(state[1]) or burst
+local ts = tonumber(state[2]) or now
+
+tokens = math.min(burst, tokens + math.max(0, now - ts) * rate)
+
+local wait = 0
+if tokens >= 1 then
+    tokens = tokens - 1
+else
+    wait = (1 - tokens) / rate
+end
+
+redis.call('HSET', KEYS[1], 'tokens', tostring(tokens), 'ts', tostring(now))
+redis.call('PEXPIRE', KEYS[1], math.ceil(burst / rate * 1000) + 1000)
+
+return tostring(wait)
+"""
+
+
+def parse_retry_after(value: str | None = None) -> float | None:
+    """Parse a Retry-After header (seconds or an HTTP date) into seconds from now."""
+    if not value:
+        return None
+
+    value = value.strip()
+
+    if value.isdigit():
+        return float(value)
+
+    try:
+        retry_at = parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+
+    return max(0.0, retry_at.timestamp() - time.time())
+
+
+def backoff_delay(
+    attempt: int = 0, base: float | None = None, cap: float | None = None
+) -> float:
+    """Exponential backoff with full jitter: a random delay between 0 & min(cap, base * 2^attempt)."""
+    if base is None:
+        base = api_settings.backoff_base
+    if cap is None:
+        cap = api_settings.backoff_max
+
+    return random.uniform(0, min(cap, base * 2**attempt))
+
+
+class LocalTokenBucket:
+    """Token bucket shared by every event loop in this process."""
+
+    def __init__(self, rate: float = None, burst: int = None) -> None:
+        """Create a bucket of [burst] tokens, refilled at [rate] tokens per second."""
+        self.rate = rate
+        self.burst = burst
+
+        self._buckets: dict[str, tuple[float, float]] = {}
+        self._blocked_until: dict[str, float] = {}
+        self._lock = threading.Lock()
+
+    def take(self, key: str = None) -> float:
+        """Take a token & return 0, or return the seconds to wait before trying again."""
+        with self._lock:
+            now: float = time.monotonic()
+
+            blocked: float = self._blocked_until.get(key, 0) - now
+            if blocked > 0:
+                return blocked
+
+            tokens, ts = self._buckets.get(key, (self.burst, now))
+            tokens = min(self.burst, tokens + (now - ts) * self.rate)
+
+            if tokens >= 1:
+                self._buckets[key] = (tokens - 1, now)
+
+                return 0.0
+
+            self._buckets[key] = (tokens, now)
+
+            return (1 - tokens) / self.rate
+
+    def block(self, key: str = None, seconds: float = 0) -> None:
+        with self._lock:
+            until: float = time.monotonic() + seconds
+            self._blocked_until[key] = max(until, self._blocked_until.get(key, 0))
+
+
+class RedisTokenBucket:
+    """Token bucket stored in Redis & shared by every process using the same Redis instance."""
+
+    def __init__(
+        self, rate: float = None, burst: int = None, prefix: str = "pokeapi:ratelimit"
+    ) -> None:
+        """Create a bucket of [burst] tokens, refilled at [rate] tokens per second, stored in Redis."""
+        self.rate = rate
+        self.burst = burst
+        self.prefix = prefix
+
+        ## Scripts are registered per client, and there is one client per event loop
+        self._scripts: weakref.WeakKeyDictionary = weakref.WeakKeyDictionary()
+
+    def _script(self, client: aioredis.Redis):
+        script = self._scripts.get(client)
+
+        if script is None:
+            script = client.register_script(_TOKEN_BUCKET_SCRIPT)
+            self._scripts[client] = script
+
+        return script
+
+    async def take(self, key: str = None) -> float:
+        client: aioredis.Redis = get_async_redis()
+        wait = await self._script(client)(
+            keys=[f"{self.prefix}:{key}", f"{self.prefix}:{key}:blocked"],
+            args=[self.rate, self.burst],
+        )
+
+        return float(wait)
+
+    async def block(self, key: str = None, seconds: float = 0) -> None:
+        client: aioredis.Redis = get_async_redis()
+        await client.set(
+            f"{self.prefix}:{key}:blocked", 1, px=max(1, int(seconds * 1000))
+        )
+
+
+class RateLimiter:
+    """Token-bucket rate limiter, keyed by host.
+
+    DESCRIPTION:
+    ------------
+
+    With the "redis" backend, tokens come from a bucket in Redis. If Redis can't be reached,
+    the limiter logs a warning and uses a per-process bucket instead, trying Redis again
+    after REDIS_RETRY_INTERVAL seconds.
+
+    PARAMS:
+    -------
+
+    * rate (float): Tokens (requests) added per second. Defaults to ratelimit_settings.rate.
+    * burst (int): Bucket size, i.e. how many requests can be made at once after a pause.
+        Defaults to ratelimit_settings.burst.
+    * backend (str): "redis" or "local". Defaults to ratelimit_settings.backend.
+    """
+
+    def __init__(
+        self, rate: float | None = None, burst: int | None = None, backend: str | None = None
+    ) -> None:
+        """Build the limiter's token buckets. Defaults come from ratelimit_settings."""
+        rate = rate or ratelimit_settings.rate
+        burst = burst or ratelimit_settings.burst
+        backend = backend or ratelimit_settings.backend
+
+        if rate <= 0:
+            raise ValueError(f"Rate must be greater than 0, not {rate}")
+        if burst < 1:
+            raise ValueError(f"Burst must be at least 1, not {burst}")
+        if backend not in ("redis", "local"):
+            raise ValueError(f"Invalid rate limit backend: {backend}. Must be 'redis' or 'local'")
+
+        self.rate = rate
+        self.burst = burst
+        self.backend = backend
+
+        self._local = LocalTokenBucket(rate=rate, burst=burst)
+        self._redis: RedisTokenBucket | None = None
+        self._redis_retry_at: float = 0
+        ## Redis answered since it last failed. Until it has, one request at a time tries it.
+        self._redis_ok: bool = False
+        self._redis_probing: bool = False
+
+        if backend == "redis":
+            self._redis = RedisTokenBucket(rate=rate, burst=burst)
+
+    def _use_redis(self) -> bool:
+        if self._redis is None or time.monotonic() < self._redis_retry_at:
+            return False
+
+        ## Requests arriving while Redis is being tried don't wait on it too, i.e. on a connect timeout
+        return self._redis_ok or not self._redis_probing
+
+    def _redis_failed(self, exc: Exception) -> None:
+        self._redis_ok = False
+
+        if time.monotonic() < self._redis_retry_at:
+            ## Another request already switched to the local bucket
+            return
+
+        log.warning(
+            f"Redis rate limiter unavailable, using a per-process limit for the next {REDIS_RETRY_INTERVAL}s. Details: {exc}"
+        )
+        self._redis_retry_at = time.monotonic() + REDIS_RETRY_INTERVAL
+
+    async def _take(self, key: str) -> float:
+        if self._use_redis():
+            probe: bool = not self._redis_ok
+
+            if probe:
+                self._redis_probing = True
+
+            try:
+                wait: float = await self._redis.take(key)
+                self._redis_ok = True
+
+                return wait
+            except (RedisError, OSError) as exc:
+                self._redis_failed(exc)
+            finally:
+                if probe:
+                    self._redis_probing = False
+
+        return self._local.take(key)
+
+    async def acquire(self, key: str = None) -> None:
+        """Wait until a token is available for key (i.e. a hostname), then take it."""
+        while True:
+            wait: float = await self._take(key)
+
+            if wait <= 0:
+                return
+
+            await asyncio.sleep(wait)
+
+    async def block(self, key: str = None, seconds: float = 0) -> None:
+        """Stop handing out tokens for key for a number of seconds, i.e. after a 429."""
+        self._local.block(key, seconds)
+
+        if self._use_redis():
+            try:
+                await self._redis.block(key, seconds)
+            except (RedisError, OSError) as exc:
+                self._redis_failed(exc)
+
+
+class AdaptiveConcurrency:
+    """Cap on in-flight requests that shrinks when requests fail & grows back when they don't.
+
+    DESCRIPTION:
+    ------------
+
+    Outcomes are counted in windows of [window] requests. When more than [error_threshold] of a
+    window failed, the limit is halved (down to min_limit). When a full window stays under the
+    threshold, the limit goes up by 1 (up to max_limit).
+
+    Bound to the event loop it is first used on. Use get_adaptive_concurrency() to get the
+    limiter for the running loop.
+
+    PARAMS:
+    -------
+
+    * max_limit (int): Starting & maximum limit. Defaults to api_settings.max_concurrency.
+    * min_limit (int): Minimum limit. Defaults to ratelimit_settings.min_concurrency.
+    * error_threshold (float): Share of failed requests in a window that triggers a decrease.
+    * window (int): Number of requests per window.
+    """
+
+    def __init__(
+        self,
+        max_limit: int | None = None,
+        min_limit: int | None = None,
+        error_threshold: float | None = None,
+        window: int | None = None,
+    ) -> None:
+        """Start at max_limit. Defaults come from api_settings & ratelimit_settings."""
+        self.max_limit: int = max_limit or api_settings.max_concurrency
+        self.min_limit: int = min(
+            min_limit or ratelimit_settings.min_concurrency, self.max_limit
+        )
+        self.error_threshold: float = (
+            error_threshold
+            if error_threshold is not None
+            else ratelimit_settings.error_threshold
+        )
+        self.window: int = window or ratelimit_settings.window
+
+        self.limit: int = self.max_limit
+        self._in_flight: int = 0
+        self._outcomes: deque[bool] = deque(maxlen=self.window)
+        self._condition = asyncio.Condition()
+
+    @property
+    def in_flight(self) -> int:
+        return self._in_flight
+
+    @asynccontextmanager
+    async def slot(self) -> AsyncIterator[None]:
+        """Hold one of [limit] in-flight slots for the duration of the block."""
+        async with self._condition:
+            await self._condition.wait_for(lambda: self._in_flight < self.limit)
+            self._in_flight += 1
+
+        try:
+            yield
+        finally:
+            async with self._condition:
+                self._in_flight -= 1
+                self._condition.notify_all()
+
+    def record(self, ok: bool = True) -> None:
+        """Record a request's outcome & adjust the limit at the end of a window."""
+        self._outcomes.append(ok)
+
+        if len(self._outcomes) < self.window:
+            return
+
+        errors: int = self._outcomes.count(False)
+        self._outcomes.clear()
+
+        if errors / self.window > self.error_threshold:
+            limit: int = max(self.min_limit, self.limit // 2)
+
+            if limit < self.limit:
+                log.warning(
+                    f"[{errors}/{self.window}] recent requests failed. Reducing concurrency from [{self.limit}] to [{limit}]"
+                )
+                self.limit = limit
+
+        elif self.limit < self.max_limit:
+            self.limit += 1
+            log.debug(f"Increasing concurrency to [{self.limit}]")
+
+
+_rate_limiter: RateLimiter | None = None
+_rate_limiter_lock: threading.Lock = threading.Lock()
+
+## One AdaptiveConcurrency per event loop (asyncio.Condition is bound to a loop)
+_concurrency_limiters: weakref.WeakKeyDictionary[
+    asyncio.AbstractEventLoop, AdaptiveConcurrency
+] = weakref.WeakKeyDictionary()
+
+
+def get_rate_limiter() -> RateLimiter | None:
+    """Return the process-wide RateLimiter, or None if rate limiting is disabled."""
+    global _rate_limiter
+
+    if not ratelimit_settings.enabled:
+        return None
+
+    with _rate_limiter_lock:
+        if _rate_limiter is None:
+            _rate_limiter = RateLimiter()
+
+        return _rate_limiter
+
+
+def get_adaptive_concurrency() -> AdaptiveConcurrency | None:
+    """Return the AdaptiveConcurrency for the running event loop, or None if it is disabled."""
+    if not ratelimit_settings.adaptive:
+        return None
+
+    loop: asyncio.AbstractEventLoop = asyncio.get_running_loop()
+
+    with _rate_limiter_lock:
+        limiter: AdaptiveConcurrency | None = _concurrency_limiters.get(loop)
+
+        if limiter is None:
+            limiter = AdaptiveConcurrency()
+            _concurrency_limiters[loop] = limiter
+
+        return limiter
+
+
+async def send_with_retries(
+    client: httpx.AsyncClient = None,
+    url: str = None,
+    params: dict | None = None,
+    headers: dict | None = None,
+    max_retries: int | None = None,
+) -> httpx.Response:
+    """Make a rate limited GET request, retrying 429/5xx responses & connection errors.
+
+    PARAMS:
+    -------
+
+    * client (httpx.AsyncClient): The client to send the request with.
+    * url (str): The URL to request.
+    * params (dict): Query params.
+    * headers (dict): Request headers.
+    * max_retries (int): Retries after the first attempt. Defaults to api_settings.max_retries.
+
+    Returns the last response once it is not retryable or retries run out. Raises the last
+    httpx.TransportError if the final attempt couldn't connect.
+    """
+    if max_retries is None:
+        max_retries = api_settings.max_retries
+
+    host: str = httpx.URL(url).host
+    limiter: RateLimiter | None = get_rate_limiter()
+    concurrency: AdaptiveConcurrency | None = get_adaptive_concurrency()
+
+    attempt: int = 0
+
+    while True:
+        async with concurrency.slot() if concurrency is not None else nullcontext():
+            if limiter is not None:
+                await limiter.acquire(host)
+
+            start: float = time.perf_counter()
+
+            try:
+                res: httpx.Response = await client.get(
+                    url, params=params, headers=headers
+                )
+
+            except httpx.TransportError as exc:
+                observe_upstream("error", time.perf_counter() - start)
+
+                if concurrency is not None:
+                    concurrency.record(False)
+                if attempt >= max_retries:
+                    raise
+
+                delay: float = backoff_delay(attempt)
+                log.warning(
+                    f"Request to {url} failed ({type(exc).__name__}). Retry [{attempt + 1}/{max_retries}] in {delay:.2f}s"
+                )
+
+            else:
+                observe_upstream(
+                    res.status_code, time.perf_counter() - start, res.num_bytes_downloaded
+                )
+                retryable: bool = res.status_code in RETRY_STATUSES
+
+                if concurrency is not None:
+                    concurrency.record(not retryable)
+                if not retryable or attempt >= max_retries:
+                    return res
+
+                retry_after: float | None = parse_retry_after(
+                    res.headers.get("Retry-After")
+                )
+                delay: float = (
+                    retry_after if retry_after is not None else backoff_delay(attempt)
+                )
+
+                if res.status_code == 429 and limiter is not None:
+                    await limiter.block(host, delay)
+
+                await res.aclose()
+                log.warning(
+                    f"[{res.status_code}: {res.reason_phrase}] from {url}. Retry [{attempt + 1}/{max_retries}] in {delay:.2f}s"
+                )
+
+        await asyncio.sleep(delay)
+        attempt += 1
+
+
+def _reset_after_fork() -> None:
+    """Start the child process with fresh limiters (and unheld locks)."""
+    global _rate_limiter, _rate_limiter_lock
+
+    _rate_limiter = None
+    _rate_limiter_lock = threading.Lock()
+    _concurrency_limiters.clear()
+
+
+os.register_at_fork(after_in_child=_reset_after_fork)
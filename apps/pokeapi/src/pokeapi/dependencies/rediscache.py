@@ -0,0 +1,224 @@
+"""Cache backend stored in the shared Redis instance.
+
+RedisCache implements the parts of the diskcache.Cache API this app uses (get/set/delete, "in",
+iterkeys, clear), so init_cache(backend="redis") can be used anywhere a disk cache is. Every
+process & container pointed at the same Redis shares one copy of the cache.
+"""
+from __future__ import annotations
+
+import pickle
+
+from typing import Any, Iterable, Iterator
+
+from pokeapi.core.conf import cache_settings
+
+from .codecs import Codec, decode_value, get_codec, is_encoded
+from .sessions import get_redis, redis_url
+
+from loguru import logger as log
+import redis
+
+## Number of keys sent per SCAN/UNLINK round trip
+_BATCH_SIZE: int = 500
+
+
+class RedisCache:
+    """Named cache in Redis, with the get/set/exists contract of diskcache.Cache.
+
+    DESCRIPTION:
+    ------------
+
+    Keys are namespaced as "{prefix}:{name}:{key}", so several caches share one Redis database.
+    Dict & list values are encoded with the codec layer (see pokeapi.dependencies.codecs), other
+    values are pickled. get_many(), set_many() & delete_many() send a batch of keys in one round trip.
+
+    PARAMS:
+    -------
+
+    * name (str): Cache name, i.e. "requests".
+    * client (redis.Redis): Client to use. Defaults to the process-wide client for cache_settings.redis_db.
+    * codec (str): Codec for dict/list values. Defaults to cache_settings.codec.
+    * prefix (str): Key prefix shared by every RedisCache.
+    """
+
+    def __init__(
+        self,
+        name: str = None,
+        client: redis.Redis | None = None,
+        codec: str | None = None,
+        prefix: str = "pokeapi:cache",
+    ) -> None:
+        """Connect to the cache's keys in Redis. Defaults to the shared client."""
+        if not name:
+            raise ValueError("Missing cache name.")
+
+        self.name = name
+        self.prefix = f"{prefix}:{name}:"
+        self._client = client
+
+        ## "pickle" writes everything with pickle, like CodecDisk
+        self._codec: Codec | None = None
+        if codec != "pickle":
+            self._codec = get_codec(codec)
+
+    @property
+    def client(self) -> redis.Redis:
+        ## Resolved on use, so a cache created before a fork uses the child's client
+        if self._client is not None:
+            return self._client
+
+        return get_redis(cache_settings.redis_db)
+
+    @property
+    def directory(self) -> str:
+        """Where the cache lives. Named like diskcache's attribute, for log messages."""
+        return f"{redis_url(cache_settings.redis_db)}/{self.prefix}*"
+
+    def __repr__(self) -> str:
+        """Show the cache's name."""
+        return f"RedisCache(name={self.name!r})"
+
+    def _key(self, key: Any) -> str:
+        return f"{self.prefix}{key}"
+
+    def _encode(self, value: Any) -> bytes:
+        if self._codec is not None and type(value) in (dict, list):
+            return self._codec.encode(value)
+
+        return pickle.dumps(value, protocol=pickle.HIGHEST_PROTOCOL)
+
+    def _decode(self, data: bytes) -> Any:
+        if is_encoded(data):
+            return decode_value(data, codec=self._codec)
+
+        return pickle.loads(data)
+
+    def __enter__(self) -> RedisCache:
+        """Use the cache as a context manager, like a diskcache.Cache."""
+        return self
+
+    def __exit__(self, *exc) -> None:
+        """Leave the context manager. The shared connection pool stays open."""
+        ## Connections belong to the shared pool, nothing to close
+        pass
+
+    def __contains__(self, key: Any) -> bool:
+        """Return True if a key is in the cache."""
+        return self.client.exists(self._key(key)) == 1
+
+    def __getitem__(self, key: Any) -> Any:
+        """Get a value, raising KeyError if the key is missing."""
+        data: bytes | None = self.client.get(self._key(key))
+
+        if data is None:
+            raise KeyError(key)
+
+        return self._decode(data)
+
+    def __setitem__(self, key: Any, value: Any) -> None:
+        """Set a value, without an expiration."""
+        self.set(key, value)
+
+    def __delitem__(self, key: Any) -> None:
+        """Delete a key, raising KeyError if it's missing."""
+        if not self.delete(key):
+            raise KeyError(key)
+
+    def __iter__(self) -> Iterator[str]:
+        """Iterate over the cache's keys."""
+        return self.iterkeys()
+
+    def __len__(self) -> int:
+        """Count the cache's keys."""
+        return sum(1 for _ in self.iterkeys())
+
+    def get(self, key: Any, default: Any = None, **kwargs) -> Any:
+        """Get a value, or default if the key is missing. diskcache-only kwargs are ignored."""
+        data: bytes | None = self.client.get(self._key(key))
+
+        if data is None:
+            return default
+
+        return self._decode(data)
+
+    def set(self, key: Any, value: Any, expire: float | None = None, **kwargs) -> bool:
+        """Set a value, optionally expiring after [expire] seconds. diskcache-only kwargs are ignored."""
+        px: int | None = max(1, int(expire * 1000)) if expire else None
+
+        return bool(self.client.set(self._key(key), self._encode(value), px=px))
+
+    def delete(self, key: Any, **kwargs) -> bool:
+        return self.client.delete(self._key(key)) > 0
+
+    def touch(self, key: Any, expire: float | None = None, **kwargs) -> bool:
+        """Change a key's expiration. expire=None removes it."""
+        if expire is None:
+            return bool(self.client.persist(self._key(key)))
+
+        return bool(self.client.pexpire(self._key(key), max(1, int(expire * 1000))))
+
+    def get_many(self, keys: Iterable[Any] = ()) -> dict[Any, Any]:
+        """Get several values in one round trip. Missing keys are left out of the result."""
+        keys = list(keys)
+
+        if not keys:
+            return {}
+
+        values: list[bytes | None] = self.client.mget([self._key(k) for k in keys])
+
+        return {
+            key: self._decode(data)
+            for key, data in zip(keys, values)
+            if data is not None
+        }
+
+    def set_many(self, mapping: dict[Any, Any] = None, expire: float | None = None) -> None:
+        """Set several values in one round trip."""
+        if not mapping:
+            return
+
+        px: int | None = max(1, int(expire * 1000)) if expire else None
+
+        with self.client.pipeline(transaction=False) as pipe:
+            for key, value in mapping.items():
+                pipe.set(self._key(key), self._encode(value), px=px)
+
+            pipe.execute()
+
+    def delete_many(self, keys: Iterable[Any] = ()) -> int:
+        keys = [self._key(k) for k in keys]
+
+        if not keys:
+            return 0
+
+        return self.client.delete(*keys)
+
+    def iterkeys(self) -> Iterator[str]:
+        """Iterate over the cache's keys, in no particular order."""
+        start: int = len(self.prefix)
+
+        for key in self.client.scan_iter(match=f"{self.prefix}*", count=_BATCH_SIZE):
+            yield key.decode("utf-8")[start:]
+
+    def clear(self, **kwargs) -> int:
+        """Delete every key in this cache. Returns the number of keys deleted."""
+        count: int = 0
+        batch: list[bytes] = []
+
+        for key in self.client.scan_iter(match=f"{self.prefix}*", count=_BATCH_SIZE):
+            batch.append(key)
+
+            if len(batch) >= _BATCH_SIZE:
+                count += self.client.unlink(*batch)
+                batch = []
+
+        if batch:
+            count += self.client.unlink(*batch)
+
+        log.debug(f"Cleared [{count}] key(s) from Redis cache [{self.name}]")
+
+        return count
+
+    def close(self) -> None:
+        ## Connections belong to the shared pool, nothing to close
+        pass
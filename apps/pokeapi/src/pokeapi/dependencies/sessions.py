@@ -0,0 +1,300 @@
+"""Process-wide pooled HTTP & Redis clients.
+
+An httpx.AsyncClient is bound to the event loop it was first used on, so one client
+is kept per loop (the same goes for redis.asyncio clients). Synchronous code goes through pokeapi.core.fetch.run_sync(), which
+always uses the same background loop, meaning a CLI run or a Celery worker process
+shares a single pooled client (and its keep-alive connections) for every request.
+"""
+from __future__ import annotations
+
+import asyncio
+import atexit
+import os
+import threading
+
+from typing import AsyncIterator
+import weakref
+
+from pokeapi.core.conf import api_settings, celery_settings
+
+import httpx
+
+from loguru import logger as log
+import redis
+import redis.asyncio as aioredis
+
+class _ReleasingStream(httpx.AsyncByteStream):
+    """Wrap a response stream and call release() once the stream is closed."""
+
+    def __init__(self, stream: httpx.AsyncByteStream, release) -> None:
+        self._stream = stream
+        self._release = release
+        self._released = False
+
+    async def __aiter__(self) -> AsyncIterator[bytes]:
+        async for chunk in self._stream:
+            yield chunk
+
+    async def aclose(self) -> None:
+        try:
+            await self._stream.aclose()
+        finally:
+            if not self._released:
+                self._released = True
+                self._release()
+
+
+class PerHostLimitTransport(httpx.AsyncBaseTransport):
+    """Transport wrapper that caps the number of open requests to each host.
+
+    httpx.Limits only caps the pool as a whole. A slot is held from sending the
+    request until the response body has been read and closed.
+    """
+
+    def __init__(self, transport: httpx.AsyncBaseTransport, limit: int) -> None:
+        """Wrap a transport, allowing [limit] requests per host at once."""
+        if limit < 1:
+            raise ValueError(f"Per-host connection limit must be at least 1, not {limit}")
+
+        self._transport = transport
+        self._limit = limit
+        self._semaphores: dict[str, asyncio.Semaphore] = {}
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        host: str = request.url.host
+        if host not in self._semaphores:
+            self._semaphores[host] = asyncio.Semaphore(self._limit)
+
+        semaphore: asyncio.Semaphore = self._semaphores[host]
+
+        await semaphore.acquire()
+        try:
+            response = await self._transport.handle_async_request(request)
+        except BaseException:
+            semaphore.release()
+            raise
+
+        if isinstance(response.stream, httpx.ByteStream):
+            ## Body is already in memory (i.e. a mocked transport), nothing left to hold the slot for
+            semaphore.release()
+
+            return response
+
+        response.stream = _ReleasingStream(response.stream, semaphore.release)
+
+        return response
+
+    async def aclose(self) -> None:
+        await self._transport.aclose()
+
+
+def _http2_enabled() -> bool:
+    if not api_settings.http2:
+        return False
+
+    try:
+        import h2  # noqa: F401
+    except ImportError:
+        log.warning(
+            "HTTP/2 is enabled in settings, but the h2 package is not installed. Falling back to HTTP/1.1. Install with: pip install httpx[http2]"
+        )
+
+        return False
+
+    return True
+
+
+def new_async_client() -> httpx.AsyncClient:
+    """Create an httpx.AsyncClient configured from APISettings.
+
+    Prefer get_async_client(), which reuses one client per event loop. Use this only
+    when a client with its own connection pool is needed.
+    """
+    limits = httpx.Limits(
+        max_connections=api_settings.max_connections,
+        max_keepalive_connections=api_settings.max_keepalive_connections,
+        keepalive_expiry=api_settings.keepalive_expiry,
+    )
+    timeout = httpx.Timeout(api_settings.timeout, connect=api_settings.connect_timeout)
+    http2: bool = _http2_enabled()
+
+    transport = PerHostLimitTransport(
+        httpx.AsyncHTTPTransport(limits=limits, http2=http2),
+        limit=api_settings.max_connections_per_host,
+    )
+
+    return httpx.AsyncClient(transport=transport, timeout=timeout, follow_redirects=True)
+
+
+## One client per event loop. Entries disappear when their loop is garbage collected.
+_clients: weakref.WeakKeyDictionary[
+    asyncio.AbstractEventLoop, httpx.AsyncClient
+] = weakref.WeakKeyDictionary()
+_clients_lock: threading.Lock = threading.Lock()
+
+
+def get_async_client() -> httpx.AsyncClient:
+    """Return the pooled httpx.AsyncClient for the running event loop, creating it if needed.
+
+    Must be called from inside a coroutine.
+    """
+    loop: asyncio.AbstractEventLoop = asyncio.get_running_loop()
+
+    with _clients_lock:
+        client: httpx.AsyncClient | None = _clients.get(loop)
+
+        if client is None or client.is_closed:
+            log.debug(f"Creating pooled HTTP client for event loop [{id(loop)}]")
+            client = new_async_client()
+            _clients[loop] = client
+
+        return client
+
+
+def close_http_clients(timeout: float = 5) -> None:
+    """Close every pooled client. Safe to call more than once.
+
+    Called at interpreter exit & by the Celery worker_process_shutdown signal. Clients
+    whose loop has already stopped are dropped without closing, since their
+    connections can't be awaited anymore.
+    """
+    with _clients_lock:
+        clients = list(_clients.items())
+        _clients.clear()
+
+    try:
+        running = asyncio.get_running_loop()
+    except RuntimeError:
+        running = None
+
+    for loop, client in clients:
+        if client.is_closed or loop.is_closed() or not loop.is_running():
+            continue
+
+        if loop is running:
+            ## Can't block on our own loop. Schedule the close instead.
+            loop.create_task(client.aclose())
+            continue
+
+        try:
+            asyncio.run_coroutine_threadsafe(client.aclose(), loop).result(
+                timeout=timeout
+            )
+        except Exception as exc:
+            log.warning(f"Error closing pooled HTTP client. Details: {exc}")
+
+
+def redis_url(db: int | None = None) -> str:
+    """URL of the Redis instance Celery stores results in, optionally selecting a database number."""
+    url: str = f"redis://{celery_settings.redis_host}:{celery_settings.redis_port}"
+
+    if db is not None:
+        url = f"{url}/{db}"
+
+    return url
+
+
+## Synchronous clients are thread-safe (each command takes a connection from the pool),
+#  so one per database is shared by the whole process.
+_sync_redis_clients: dict[int | None, redis.Redis] = {}
+
+
+def get_redis(db: int | None = None) -> redis.Redis:
+    """Return the process-wide synchronous Redis client for a database, creating it if needed.
+
+    Connections are opened lazily, so this does not fail if Redis is down.
+    """
+    with _clients_lock:
+        client: redis.Redis | None = _sync_redis_clients.get(db)
+
+        if client is None:
+            client = redis.Redis.from_url(
+                redis_url(db),
+                socket_connect_timeout=api_settings.connect_timeout,
+                socket_timeout=api_settings.timeout,
+            )
+            _sync_redis_clients[db] = client
+
+        return client
+
+
+## One Redis client per event loop, like _clients
+_redis_clients: weakref.WeakKeyDictionary[
+    asyncio.AbstractEventLoop, aioredis.Redis
+] = weakref.WeakKeyDictionary()
+
+
+def get_async_redis() -> aioredis.Redis:
+    """Return the redis.asyncio client for the running event loop, creating it if needed.
+
+    Must be called from inside a coroutine. Connections are opened lazily, so this does
+    not fail if Redis is down. The first command does.
+    """
+    loop: asyncio.AbstractEventLoop = asyncio.get_running_loop()
+
+    with _clients_lock:
+        client: aioredis.Redis | None = _redis_clients.get(loop)
+
+        if client is None:
+            client = aioredis.Redis.from_url(
+                redis_url(),
+                socket_connect_timeout=api_settings.connect_timeout,
+                socket_timeout=api_settings.timeout,
+            )
+            _redis_clients[loop] = client
+
+        return client
+
+
+def close_redis_clients(timeout: float = 5) -> None:
+    """Close every Redis client. Safe to call more than once."""
+    with _clients_lock:
+        clients = list(_redis_clients.items())
+        _redis_clients.clear()
+
+        sync_clients = list(_sync_redis_clients.values())
+        _sync_redis_clients.clear()
+
+    for client in sync_clients:
+        try:
+            client.close()
+        except Exception as exc:
+            log.warning(f"Error closing Redis client. Details: {exc}")
+
+    try:
+        running = asyncio.get_running_loop()
+    except RuntimeError:
+        running = None
+
+    for loop, client in clients:
+        if loop.is_closed() or not loop.is_running():
+            continue
+
+        if loop is running:
+            loop.create_task(client.aclose())
+            continue
+
+        try:
+            asyncio.run_coroutine_threadsafe(client.aclose(), loop).result(
+                timeout=timeout
+            )
+        except Exception as exc:
+            log.warning(f"Error closing Redis client. Details: {exc}")
+
+
+def _reset_after_fork() -> None:
+    """Drop clients inherited from the parent process.
+
+    Their sockets belong to the parent, so they are forgotten rather than closed.
+    """
+    global _clients_lock
+
+    _clients_lock = threading.Lock()
+    _clients.clear()
+    _redis_clients.clear()
+    _sync_redis_clients.clear()
+
+
+os.register_at_fork(after_in_child=_reset_after_fork)
+atexit.register(close_http_clients)
+atexit.register(close_redis_clients)
@@ -0,0 +1,314 @@
+"""Single-flight coalescing of concurrent fetches for the same cache key.
+
+Two levels:
+
+- In-process: the first caller for a key runs the fetch, and callers arriving while it's in
+  flight await the same future instead of starting their own.
+- Across processes: the caller running the fetch holds a short lease in Redis. A process that
+  finds the lease taken waits for it to be released, then reads the result from the (shared)
+  cache instead of going upstream. If the lease holder dies, the lease expires & the waiter
+  fetches the value itself.
+
+Without Redis, fetches are coalesced in-process only. Until Redis has answered, one call at a time
+tries the lease while the others skip it, and after a Redis error the lease is skipped for
+REDIS_RETRY_INTERVAL seconds, so a cache miss never waits out a connect timeout that another
+call is already waiting on.
+"""
+from __future__ import annotations
+
+import asyncio
+import os
+import secrets
+import threading
+import time
+
+from typing import Any, Awaitable, Callable, TypeVar
+import weakref
+
+from pokeapi.core.conf import cache_settings
+
+from .sessions import get_async_redis
+
+from loguru import logger as log
+import redis.asyncio as aioredis
+
+from redis.exceptions import RedisError
+
+T = TypeVar("T")
+
+## Seconds to skip the Redis lease after Redis fails, before trying it again
+REDIS_RETRY_INTERVAL: float = 60.0
+
+## Delete the lease only if it's still ours (it may have expired & been taken by another process)
+_RELEASE_SCRIPT: str = """
+if redis.call('GET', KEYS[1]) == ARGV[1] then
+    return redis.call('DEL', KEYS[1])
+end
+return 0
+"""
+
+
+class RedisLease:
+    """Short-lived lock in Redis, held by one process at a time & released by its holder or by expiring.
+
+    PARAMS:
+    -------
+
+    * ttl (float): Seconds until an unreleased lease expires. Defaults to cache_settings.lock_ttl.
+    * poll_interval (float): Seconds between checks while waiting for a lease to be released.
+    * prefix (str): Key prefix for leases.
+    """
+
+    def __init__(
+        self,
+        ttl: float | None = None,
+        poll_interval: float | None = None,
+        prefix: str = "pokeapi:flight",
+    ) -> None:
+        """Configure the lease. Defaults come from cache_settings."""
+        self.ttl: float = ttl or cache_settings.lock_ttl
+        self.poll_interval: float = poll_interval or cache_settings.lock_poll_interval
+        self.prefix = prefix
+
+        self._scripts: weakref.WeakKeyDictionary = weakref.WeakKeyDictionary()
+
+    def _key(self, name: str) -> str:
+        return f"{self.prefix}:{name}"
+
+    async def acquire(self, name: str = None) -> str | None:
+        """Take the lease. Returns a token to release it with, or None if another process holds it."""
+        token: str = secrets.token_hex(8)
+        client: aioredis.Redis = get_async_redis()
+
+        acquired = await client.set(
+            self._key(name), token, nx=True, px=int(self.ttl * 1000)
+        )
+
+        return token if acquired else None
+
+    async def release(self, name: str = None, token: str = None) -> None:
+        client: aioredis.Redis = get_async_redis()
+        script = self._scripts.get(client)
+
+        if script is None:
+            script = client.register_script(_RELEASE_SCRIPT)
+            self._scripts[client] = script
+
+        await script(keys=[self._key(name)], args=[token])
+
+    async def wait(self, name: str = None, timeout: float | None = None) -> bool:
+        """Wait until the lease is released (or expires). Returns False if timeout passed first."""
+        if timeout is None:
+            timeout = self.ttl
+
+        client: aioredis.Redis = get_async_redis()
+        deadline: float = time.monotonic() + timeout
+
+        while await client.exists(self._key(name)):
+            if time.monotonic() >= deadline:
+                return False
+
+            await asyncio.sleep(self.poll_interval)
+
+        return True
+
+
+class SingleFlight:
+    """Coalesce concurrent calls with the same key, in-process & (optionally) across processes.
+
+    Use get_single_flight() for the process-wide instance.
+
+    PARAMS:
+    -------
+
+    * lease (RedisLease): Lease for cross-process coalescing. None coalesces in-process only.
+    """
+
+    def __init__(self, lease: RedisLease | None = None) -> None:
+        """Create a group. Without a lease, calls are only coalesced within this process."""
+        self.lease = lease
+
+        ## In-flight calls per event loop (futures are bound to a loop)
+        self._flights: weakref.WeakKeyDictionary[
+            asyncio.AbstractEventLoop, dict[str, asyncio.Future]
+        ] = weakref.WeakKeyDictionary()
+        self._lock = threading.Lock()
+        self._lease_retry_at: float = 0
+        ## Redis answered since it last failed. Until it has, one call at a time tries the lease.
+        self._lease_ok: bool = False
+        self._lease_probing: bool = False
+
+        self.leaders: int = 0
+        self.shared: int = 0
+        self.lease_waits: int = 0
+
+    def _loop_flights(self) -> dict[str, asyncio.Future]:
+        loop: asyncio.AbstractEventLoop = asyncio.get_running_loop()
+
+        with self._lock:
+            flights = self._flights.get(loop)
+
+            if flights is None:
+                flights = {}
+                self._flights[loop] = flights
+
+            return flights
+
+    def _use_lease(self) -> bool:
+        if self.lease is None or time.monotonic() < self._lease_retry_at:
+            return False
+
+        ## Calls arriving while Redis is being tried don't wait on it too, i.e. on a connect timeout
+        return self._lease_ok or not self._lease_probing
+
+    def _lease_failed(self, exc: Exception) -> None:
+        self._lease_ok = False
+
+        if time.monotonic() < self._lease_retry_at:
+            ## Another call already backed off
+            return
+
+        log.warning(
+            f"Redis unavailable, coalescing fetches in-process only for the next {REDIS_RETRY_INTERVAL}s. Details: {exc}"
+        )
+        self._lease_retry_at = time.monotonic() + REDIS_RETRY_INTERVAL
+
+    async def do(
+        self,
+        key: str = None,
+        fn: Callable[[], Awaitable[T]] = None,
+        check: Callable[[], Any] | None = None,
+    ) -> T:
+        """Run fn() once for every concurrent caller with the same key, and give each the result.
+
+        PARAMS:
+        -------
+
+        * key (str): Identifies the call, i.e. a cache key.
+        * fn (Callable): Coroutine function making the call.
+        * check (Callable): Returns the call's result from the shared cache, or None if it isn't there.
+            Enables the cross-process lease: after waiting on another process's lease, check()
+            is tried before running fn().
+        """
+        flights: dict[str, asyncio.Future] = self._loop_flights()
+        future: asyncio.Future | None = flights.get(key)
+
+        if future is not None:
+            self.shared += 1
+
+            try:
+                return await asyncio.shield(future)
+            except asyncio.CancelledError:
+                ## The leader was cancelled, not us. Try again (possibly as the new leader).
+                if future.cancelled() and not asyncio.current_task().cancelling():
+                    return await self.do(key, fn, check=check)
+
+                raise
+
+        future = asyncio.get_running_loop().create_future()
+        flights[key] = future
+        self.leaders += 1
+
+        try:
+            result = await self._run(key, fn, check)
+
+        except asyncio.CancelledError:
+            future.cancel()
+            raise
+
+        except BaseException as exc:
+            future.set_exception(exc)
+            ## Mark as retrieved, in case nobody else was waiting
+            future.exception()
+            raise
+
+        else:
+            future.set_result(result)
+
+            return result
+
+        finally:
+            flights.pop(key, None)
+
+    async def _run(
+        self, key: str, fn: Callable[[], Awaitable[T]], check: Callable[[], Any] | None
+    ) -> T:
+        if check is None or not self._use_lease():
+            return await fn()
+
+        token: str | None = None
+        probe: bool = not self._lease_ok
+
+        if probe:
+            self._lease_probing = True
+
+        try:
+            token = await self.lease.acquire(key)
+            self._lease_ok = True
+
+            if token is None:
+                self.lease_waits += 1
+                log.debug(f"[{key}] is being fetched by another process. Waiting for it.")
+
+                await self.lease.wait(key)
+                result = check()
+
+                if result is not None:
+                    return result
+
+                ## The other process failed or timed out. Fetch it ourselves.
+                token = await self.lease.acquire(key)
+
+        except (RedisError, OSError) as exc:
+            self._lease_failed(exc)
+
+        finally:
+            if probe:
+                self._lease_probing = False
+
+        try:
+            return await fn()
+
+        finally:
+            if token is not None:
+                try:
+                    await self.lease.release(key, token)
+                except (RedisError, OSError) as exc:
+                    ## It expires on its own
+                    log.debug(f"Could not release lease for [{key}]. Details: {exc}")
+
+    def stats(self) -> dict[str, int]:
+        """Count the calls that ran (leaders), joined an in-flight call (shared), and waited on another process (lease_waits)."""
+        return {
+            "leaders": self.leaders,
+            "shared": self.shared,
+            "lease_waits": self.lease_waits,
+        }
+
+
+_single_flight: SingleFlight | None = None
+_single_flight_lock: threading.Lock = threading.Lock()
+
+
+def get_single_flight() -> SingleFlight:
+    """Return the process-wide SingleFlight. Uses a Redis lease unless cache_settings.lock_enabled is off."""
+    global _single_flight
+
+    with _single_flight_lock:
+        if _single_flight is None:
+            lease: RedisLease | None = (
+                RedisLease() if cache_settings.lock_enabled else None
+            )
+            _single_flight = SingleFlight(lease=lease)
+
+        return _single_flight
+
+
+def _reset_after_fork() -> None:
+    global _single_flight, _single_flight_lock
+
+    _single_flight = None
+    _single_flight_lock = threading.Lock()
+
+
+os.register_at_fork(after_in_child=_reset_after_fork)
@@ -0,0 +1,16 @@
+from __future__ import annotations
+
+from pokeapi.core.conf import app_settings
+
+from red_utils.ext.loguru_utils import (
+    LoguruSinkAppFile,
+    LoguruSinkErrFile,
+    LoguruSinkStdOut,
+)
+
+## List default sinks. Include stdout, stderr, & app.log file
+loguru_sinks: list = [
+    LoguruSinkStdOut(level=app_settings.log_level).as_dict(),
+    LoguruSinkAppFile(level=app_settings.log_level).as_dict(),
+    LoguruSinkErrFile(level=app_settings.log_level).as_dict(),
+]
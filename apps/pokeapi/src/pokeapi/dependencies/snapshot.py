@@ -0,0 +1,477 @@
+"""Immutable, memory-mapped snapshots of a whole cache.
+
+A snapshot is one file holding every entry of a cache, read in place through mmap: opening one
+costs a header read, and a lookup is a binary search over a sorted offset index followed by a
+slice of the mapped file. Nothing is copied until a value is decoded, and values written with the
+plain msgpack codec are decoded straight from the mapping. New containers can serve warm data from
+a snapshot baked into the image (or mounted from a volume) instead of rebuilding their cache from
+the Pokemon API, and init_cache() seeds an empty cache from one (see seed_from_snapshot()).
+
+Layout (little-endian):
+
+    header (64 bytes) | payload | keys | index
+
+* header: MAGIC, format version, entry count, offsets of the keys & index regions, creation time,
+    and a 16-byte snapshot ID (a digest of every key & encoded value, so identical contents share
+    an ID).
+* payload: values, each encoded with a Codec (see pokeapi.dependencies.codecs).
+* keys: UTF-8 keys, in sorted order.
+* index: one fixed-size record per entry, sorted by key:
+    value offset (u64) | key offset (u64) | value length (u32) | key length (u32)
+"""
+from __future__ import annotations
+
+import bisect
+
+from contextlib import nullcontext
+import hashlib
+import mmap
+import os
+from pathlib import Path
+import struct
+import time
+from typing import Any, Iterable, Iterator, NamedTuple, Union
+
+from pokeapi.core.conf import app_settings, cache_settings
+
+from .codecs import Codec, decode_value, get_codec
+from .tiered import TieredCache
+
+import diskcache
+
+from loguru import logger as log
+
+MAGIC: bytes = b"\x93PKSNAP"
+FORMAT_VERSION: int = 1
+SNAPSHOT_SUFFIX: str = ".pksnap"
+## Stores the ID of the snapshot a cache was seeded from, so it's only seeded once
+SNAPSHOT_MARKER_KEY: str = "snapshot::id"
+
+## magic | version | count | keys offset | index offset | created at | snapshot ID | padding
+_HEADER = struct.Struct("<7sBIQQd16s12x")
+## value offset | key offset | value length | key length
+_RECORD = struct.Struct("<QQII")
+
+
+class SnapshotInfo(NamedTuple):
+    path: Path
+    snapshot_id: str
+    count: int
+    size: int
+    created_at: float
+
+
+def default_snapshot_dir() -> Path:
+    """cache_settings.snapshot_dir, or a snapshots/ directory in the data directory."""
+    return Path(cache_settings.snapshot_dir or f"{app_settings.data_dir}/snapshots")
+
+
+def snapshot_path(cache_name: str = None, directory: Union[str, Path] | None = None) -> Path:
+    """Path of a cache's snapshot, i.e. {directory}/requests.pksnap."""
+    if directory is None:
+        directory = default_snapshot_dir()
+
+    return Path(directory) / f"{cache_name}{SNAPSHOT_SUFFIX}"
+
+
+class Snapshot:
+    """Read-only, memory-mapped view of a snapshot file.
+
+    Supports the read side of the cache API (get, get_many, "in", iteration & len()), so it can
+    stand in for a cache that's only read from, i.e. ReadAPI(cache=Snapshot(path)). Writes raise
+    TypeError.
+
+    PARAMS:
+    -------
+
+    * path (str | Path): Path to a snapshot written by write_snapshot().
+    """
+
+    def __init__(self, path: Union[str, Path] = None) -> None:
+        """Map a snapshot file & read its header. Raises ValueError if it isn't a valid snapshot."""
+        if path is None:
+            raise ValueError("Missing path to a snapshot file.")
+
+        self.path: Path = Path(path)
+
+        with open(self.path, "rb") as f:
+            ## The mapping stays valid after the file is closed
+            self._mmap = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+
+        self._view = memoryview(self._mmap)
+
+        try:
+            (
+                magic,
+                version,
+                self.count,
+                self._keys_offset,
+                self._index_offset,
+                self.created_at,
+                snapshot_id,
+            ) = _HEADER.unpack_from(self._view, 0)
+        except struct.error:
+            self.close()
+            raise ValueError(f"Not a cache snapshot (too short): {self.path}")
+
+        if magic != MAGIC:
+            self.close()
+            raise ValueError(f"Not a cache snapshot: {self.path}")
+        if version != FORMAT_VERSION:
+            self.close()
+            raise ValueError(f"Unsupported snapshot format version {version}: {self.path}")
+        if self._index_offset + self.count * _RECORD.size > len(self._view):
+            self.close()
+            raise ValueError(f"Truncated cache snapshot: {self.path}")
+
+        self.snapshot_id: str = snapshot_id.hex()
+
+    @property
+    def directory(self) -> str:
+        return str(self.path)
+
+    @property
+    def info(self) -> SnapshotInfo:
+        return SnapshotInfo(
+            path=self.path,
+            snapshot_id=self.snapshot_id,
+            count=self.count,
+            size=len(self._view),
+            created_at=self.created_at,
+        )
+
+    def __repr__(self) -> str:
+        """Show the snapshot's path, entry count & ID."""
+        return f"Snapshot({str(self.path)!r}, count={self.count}, id={self.snapshot_id[:12]})"
+
+    def __enter__(self) -> Snapshot:
+        """Use the snapshot as a context manager, unmapped on exit."""
+        return self
+
+    def __exit__(self, *exc) -> None:
+        """Unmap the file."""
+        self.close()
+
+    def close(self) -> None:
+        """Unmap the file. Views returned by get_raw() must be released first."""
+        if self._mmap.closed:
+            return
+
+        self._view.release()
+        self._mmap.close()
+
+    def _record(self, position: int) -> tuple[int, int, int, int]:
+        return _RECORD.unpack_from(self._view, self._index_offset + position * _RECORD.size)
+
+    def _key_at(self, position: int) -> bytes:
+        _, key_offset, _, key_length = self._record(position)
+
+        return self._view[key_offset : key_offset + key_length].tobytes()
+
+    def _find(self, key: Any) -> int | None:
+        if not isinstance(key, str):
+            return None
+
+        target: bytes = key.encode()
+        position: int = bisect.bisect_left(range(self.count), target, key=self._key_at)
+
+        if position < self.count and self._key_at(position) == target:
+            return position
+
+        return None
+
+    def __len__(self) -> int:
+        """Count the snapshot's entries."""
+        return self.count
+
+    def __contains__(self, key: Any) -> bool:
+        """Return True if a key is in the snapshot."""
+        return self._find(key) is not None
+
+    def __iter__(self) -> Iterator[str]:
+        """Iterate over the snapshot's keys, in sorted order."""
+        for position in range(self.count):
+            yield self._key_at(position).decode()
+
+    def iterkeys(self) -> Iterator[str]:
+        return iter(self)
+
+    def get_raw(self, key: Any) -> memoryview | None:
+        """Return the encoded value for a key, as a view of the mapped file (no copy), or None."""
+        position: int | None = self._find(key)
+
+        if position is None:
+            return None
+
+        value_offset, _, value_length, _ = self._record(position)
+
+        return self._view[value_offset : value_offset + value_length]
+
+    def get(self, key: Any, default: Any = None, **kwargs) -> Any:
+        raw: memoryview | None = self.get_raw(key)
+
+        if raw is None:
+            return default
+
+        with raw:
+            return decode_value(raw)
+
+    def __getitem__(self, key: Any) -> Any:
+        """Get a value, raising KeyError if the key is missing."""
+        raw: memoryview | None = self.get_raw(key)
+
+        if raw is None:
+            raise KeyError(key)
+
+        with raw:
+            return decode_value(raw)
+
+    def get_many(self, keys: Iterable[Any] = ()) -> dict[Any, Any]:
+        found: dict[Any, Any] = {}
+
+        for key in keys:
+            value = self.get(key)
+
+            if value is not None:
+                found[key] = value
+
+        return found
+
+    def items(self) -> Iterator[tuple[str, Any]]:
+        """Every key & decoded value, in key order."""
+        for position in range(self.count):
+            value_offset, key_offset, value_length, key_length = self._record(position)
+
+            with self._view[value_offset : value_offset + value_length] as raw:
+                value = decode_value(raw)
+
+            yield self._view[key_offset : key_offset + key_length].tobytes().decode(), value
+
+    def _read_only(self, *args, **kwargs) -> None:
+        raise TypeError(f"Snapshots are read-only: {self.path}")
+
+    set = delete = clear = __setitem__ = __delitem__ = _read_only
+
+
+def write_snapshot(
+    cache: diskcache.Cache = None,
+    path: Union[str, Path] = None,
+    codec: str | None = None,
+) -> SnapshotInfo:
+    """Write every entry of a cache to a snapshot file.
+
+    DESCRIPTION:
+    ------------
+
+    Values are streamed to the file as they're read, so only the keys & offsets are held in
+    memory. Entries with non-string keys, or values msgpack can't encode, are skipped. The file
+    is written next to its destination & moved into place when it's complete, so readers never
+    see a partial snapshot.
+
+    PARAMS:
+    -------
+
+    * cache (diskcache.Cache): The cache to snapshot.
+    * path (str | Path): Snapshot file to write.
+    * codec (str): Codec for the values. Defaults to cache_settings.snapshot_codec.
+    """
+    if cache is None:
+        raise ValueError("Missing cache to snapshot.")
+    if path is None:
+        raise ValueError("Missing path to write the snapshot to.")
+
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path: Path = path.with_name(f".{path.name}.tmp")
+
+    encoder: Codec = get_codec(codec or cache_settings.snapshot_codec)
+    ## (key, value offset, value length, digest of the value)
+    entries: list[tuple[bytes, int, int, bytes]] = []
+    skipped: int = 0
+
+    try:
+        with open(tmp_path, "wb") as f:
+            f.write(bytes(_HEADER.size))
+            offset: int = _HEADER.size
+
+            for key in cache:
+                if not isinstance(key, str) or key == SNAPSHOT_MARKER_KEY:
+                    skipped += 1
+                    continue
+
+                value = cache.get(key)
+                if value is None:
+                    continue
+
+                try:
+                    data: bytes = encoder.encode(value)
+                except (TypeError, ValueError):
+                    skipped += 1
+                    continue
+
+                f.write(data)
+                entries.append(
+                    (
+                        key.encode(),
+                        offset,
+                        len(data),
+                        hashlib.blake2b(data, digest_size=16).digest(),
+                    )
+                )
+                offset += len(data)
+
+            entries.sort()
+
+            keys_offset: int = offset
+            records: list[bytes] = []
+            ## Digest in key order, so the ID doesn't depend on the order the cache was read in
+            digest = hashlib.blake2b(digest_size=16)
+
+            for key_bytes, value_offset, value_length, value_digest in entries:
+                digest.update(struct.pack("<I", len(key_bytes)) + key_bytes + value_digest)
+                f.write(key_bytes)
+                records.append(_RECORD.pack(value_offset, offset, value_length, len(key_bytes)))
+                offset += len(key_bytes)
+
+            ## 8-byte align the index records
+            padding: int = -offset % 8
+            f.write(bytes(padding))
+            index_offset: int = offset + padding
+            f.write(b"".join(records))
+
+            created_at: float = time.time()
+            f.seek(0)
+            f.write(
+                _HEADER.pack(
+                    MAGIC,
+                    FORMAT_VERSION,
+                    len(entries),
+                    keys_offset,
+                    index_offset,
+                    created_at,
+                    digest.digest(),
+                )
+            )
+            f.flush()
+            os.fsync(f.fileno())
+
+        os.replace(tmp_path, path)
+
+    finally:
+        tmp_path.unlink(missing_ok=True)
+
+    info = SnapshotInfo(
+        path=path,
+        snapshot_id=digest.hexdigest(),
+        count=len(entries),
+        size=path.stat().st_size,
+        created_at=created_at,
+    )
+    log.info(
+        f"Wrote snapshot of [{info.count}] entries ({info.size} bytes) to {path}"
+        + (f", skipped [{skipped}]" if skipped else "")
+    )
+
+    return info
+
+
+def restore_snapshot(
+    cache: diskcache.Cache = None,
+    snapshot: Snapshot = None,
+    overwrite: bool = False,
+    batch_size: int = 500,
+) -> int:
+    """Copy a snapshot's entries into a cache. Returns the number of entries written.
+
+    PARAMS:
+    -------
+
+    * cache (diskcache.Cache): The cache to restore into.
+    * snapshot (Snapshot): An open Snapshot.
+    * overwrite (bool): Replace entries already in the cache. By default they're kept, since
+        they're at least as recent as the snapshot.
+    * batch_size (int): Entries written per transaction (on diskcache caches).
+    """
+    if cache is None:
+        raise ValueError("Missing cache to restore into.")
+    if snapshot is None:
+        raise ValueError("Missing snapshot to restore.")
+
+    ## Write to the persistent cache directly, instead of filling the memory tier on the way
+    if isinstance(cache, TieredCache):
+        cache = cache.backend
+
+    transact = getattr(cache, "transact", None)
+    written: int = 0
+    entries: Iterator[tuple[str, Any]] = iter(snapshot.items())
+
+    while True:
+        with transact() if transact is not None else nullcontext():
+            batch: int = 0
+
+            for key, value in entries:
+                if not overwrite and key in cache:
+                    continue
+
+                cache.set(key, value)
+                written += 1
+                batch += 1
+
+                if batch >= batch_size:
+                    break
+            else:
+                break
+
+    return written
+
+
+## Caches seeded (or checked) by this process
+_seeded: set[str] = set()
+
+
+def seed_from_snapshot(
+    cache: diskcache.Cache = None,
+    cache_name: str = None,
+    directory: Union[str, Path] | None = None,
+) -> int:
+    """Fill a cache's missing entries from its snapshot, once per snapshot.
+
+    DESCRIPTION:
+    ------------
+
+    Looks for {directory}/{cache_name}.pksnap (directory defaults to cache_settings.snapshot_dir,
+    and nothing happens when that's unset). The ID of the snapshot is stored in the cache, so a
+    cache is seeded from a given snapshot only once, even when it's shared between containers.
+    Returns the number of entries written.
+    """
+    if directory is None:
+        directory = cache_settings.snapshot_dir
+
+    if not directory or cache_name in _seeded:
+        return 0
+
+    _seeded.add(cache_name)
+    path: Path = snapshot_path(cache_name, directory)
+
+    if not path.exists():
+        return 0
+
+    try:
+        with Snapshot(path) as snapshot:
+            if cache.get(SNAPSHOT_MARKER_KEY) == snapshot.snapshot_id:
+                return 0
+
+            start: float = time.perf_counter()
+            written: int = restore_snapshot(cache, snapshot)
+            cache.set(SNAPSHOT_MARKER_KEY, snapshot.snapshot_id)
+
+    except (OSError, ValueError) as exc:
+        log.warning(f"Could not seed cache [{cache_name}] from snapshot {path}. Details: {exc}")
+
+        return 0
+
+    log.info(
+        f"Seeded cache [{cache_name}] with [{written}] entries from {path} in {time.perf_counter() - start:.2f}s"
+    )
+
+    return written
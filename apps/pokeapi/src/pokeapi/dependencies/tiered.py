@@ -0,0 +1,362 @@
+"""In-process memory tier in front of a persistent cache.
+
+TieredCache wraps any cache with the diskcache get/set/delete/"in" API (the caches returned by
+init_cache()). Reads are served from a byte-bounded LRU in memory when possible, and fill it
+from the wrapped cache on a miss. Writes go to both.
+
+Values handed out by the memory tier are shared between readers. Treat them as read-only;
+copy a value before changing it.
+"""
+from __future__ import annotations
+
+from collections import OrderedDict
+import threading
+import time
+
+from typing import Any, Iterable, Iterator, NamedTuple
+
+from loguru import logger as log
+import msgpack
+
+_MISSING = object()
+
+
+def estimate_size(value: Any = None) -> int:
+    """Approximate size of a cached value in bytes.
+
+    Dicts & lists are measured by their msgpack-packed length, which is cheap to compute
+    (and tracks the real in-memory size closely enough to budget with).
+    """
+    if isinstance(value, (bytes, bytearray, memoryview)):
+        return len(value)
+    if isinstance(value, str):
+        return len(value.encode("utf-8", errors="ignore"))
+
+    try:
+        return len(msgpack.packb(value, use_bin_type=True))
+    except (TypeError, ValueError):
+        return 64
+
+
+class MemoryTierStats(NamedTuple):
+    hits: int
+    misses: int
+    evictions: int
+    expirations: int
+    entries: int
+    size: int
+    max_size: int
+
+    @property
+    def hit_rate(self) -> float:
+        total: int = self.hits + self.misses
+
+        return self.hits / total if total else 0.0
+
+
+class MemoryTier:
+    """Thread-safe LRU of cached values, bounded by total (estimated) size in bytes.
+
+    PARAMS:
+    -------
+
+    * max_size (int): Max total size of stored values, in bytes. Values larger than this
+        are not stored.
+    * ttl (float): Seconds a value stays in memory after it was stored. None keeps values
+        until they're evicted.
+    """
+
+    def __init__(self, max_size: int = None, ttl: float | None = None) -> None:
+        """Create an empty tier of up to [max_size] bytes."""
+        if max_size is None or max_size < 1:
+            raise ValueError(f"Memory tier size must be at least 1 byte, not {max_size}")
+
+        self.max_size: int = max_size
+        self.ttl: float | None = ttl or None
+
+        ## key -> (value, size, expires_at)
+        self._entries: OrderedDict[Any, tuple[Any, int, float | None]] = OrderedDict()
+        self._size: int = 0
+        self._lock = threading.Lock()
+
+        self.hits: int = 0
+        self.misses: int = 0
+        self.evictions: int = 0
+        self.expirations: int = 0
+
+    def __len__(self) -> int:
+        """Count the entries in memory."""
+        return len(self._entries)
+
+    def __contains__(self, key: Any) -> bool:
+        """Return True if a key is in memory & hasn't expired."""
+        return self.get(key, _MISSING, count=False) is not _MISSING
+
+    @property
+    def size(self) -> int:
+        return self._size
+
+    def _drop(self, key: Any) -> None:
+        _, size, _ = self._entries.pop(key)
+        self._size -= size
+
+    def get(self, key: Any, default: Any = None, count: bool = True) -> Any:
+        with self._lock:
+            entry = self._entries.get(key)
+
+            if entry is not None:
+                value, _, expires_at = entry
+
+                if expires_at is None or expires_at > time.monotonic():
+                    self._entries.move_to_end(key)
+                    if count:
+                        self.hits += 1
+
+                    return value
+
+                self._drop(key)
+                self.expirations += 1
+
+            if count:
+                self.misses += 1
+
+            return default
+
+    def set(self, key: Any, value: Any, expire: float | None = None) -> bool:
+        """Store a value. Returns False if it's too large to keep in memory."""
+        size: int = estimate_size(value)
+
+        ttl: float | None = self.ttl
+        if expire is not None:
+            ttl = expire if ttl is None else min(ttl, expire)
+
+        expires_at: float | None = None if ttl is None else time.monotonic() + ttl
+
+        with self._lock:
+            if key in self._entries:
+                self._drop(key)
+
+            if size > self.max_size:
+                return False
+
+            self._entries[key] = (value, size, expires_at)
+            self._size += size
+
+            while self._size > self.max_size:
+                oldest = next(iter(self._entries))
+                self._drop(oldest)
+                self.evictions += 1
+
+        return True
+
+    def delete(self, key: Any) -> bool:
+        with self._lock:
+            if key not in self._entries:
+                return False
+
+            self._drop(key)
+
+            return True
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self._size = 0
+
+    def stats(self, reset: bool = False) -> MemoryTierStats:
+        """Hit, miss & eviction counts, and current size. Optionally reset the counters."""
+        with self._lock:
+            stats = MemoryTierStats(
+                hits=self.hits,
+                misses=self.misses,
+                evictions=self.evictions,
+                expirations=self.expirations,
+                entries=len(self._entries),
+                size=self._size,
+                max_size=self.max_size,
+            )
+
+            if reset:
+                self.hits = self.misses = self.evictions = self.expirations = 0
+
+        return stats
+
+
+class TieredCache:
+    """A MemoryTier in front of a persistent cache (i.e. a diskcache.Cache).
+
+    DESCRIPTION:
+    ------------
+
+    .get() reads from memory first, and fills memory from the wrapped cache on a miss. .set()
+    writes through to the wrapped cache, then memory. .delete() & .clear() apply to both.
+    Everything else (i.e. .directory, .iterkeys(), .close()) is passed to the wrapped cache.
+
+    Other processes writing to the wrapped cache aren't seen until the memory copy expires,
+    so keep the memory tier's TTL short where that matters.
+
+    PARAMS:
+    -------
+
+    * backend: The cache to wrap.
+    * max_size (int): Max size of the memory tier in bytes.
+    * ttl (float): Seconds values stay in the memory tier. None keeps them until evicted.
+    """
+
+    def __init__(self, backend=None, max_size: int = None, ttl: float | None = None) -> None:
+        """Wrap a cache in a memory tier."""
+        if backend is None:
+            raise ValueError("Missing cache to wrap.")
+
+        self.backend = backend
+        self.memory = MemoryTier(max_size=max_size, ttl=ttl)
+
+    def __getattr__(self, name: str) -> Any:
+        """Pass attributes TieredCache doesn't have through to the wrapped cache."""
+        ## Only called for attributes not found on TieredCache itself
+        if name == "backend":
+            raise AttributeError(name)
+
+        return getattr(self.backend, name)
+
+    def __repr__(self) -> str:
+        """Show the wrapped cache & the memory tier's settings."""
+        return f"TieredCache({self.backend!r}, max_size={self.memory.max_size}, ttl={self.memory.ttl})"
+
+    def __enter__(self) -> TieredCache:
+        """Use the cache as a context manager."""
+        return self
+
+    def __exit__(self, *exc) -> None:
+        """Close the wrapped cache."""
+        self.backend.__exit__(*exc)
+
+    def __contains__(self, key: Any) -> bool:
+        """Return True if a key is in memory or in the wrapped cache."""
+        return key in self.memory or key in self.backend
+
+    def __getitem__(self, key: Any) -> Any:
+        """Get a value, raising KeyError if the key is missing."""
+        value = self.get(key, _MISSING)
+
+        if value is _MISSING:
+            raise KeyError(key)
+
+        return value
+
+    def __setitem__(self, key: Any, value: Any) -> None:
+        """Set a value in both tiers."""
+        self.set(key, value)
+
+    def __delitem__(self, key: Any) -> None:
+        """Delete a key from both tiers, raising KeyError if it's missing."""
+        if not self.delete(key):
+            raise KeyError(key)
+
+    def __iter__(self) -> Iterator:
+        """Iterate over the wrapped cache's keys."""
+        return iter(self.backend)
+
+    def __len__(self) -> int:
+        """Count the wrapped cache's keys."""
+        return len(self.backend)
+
+    def get(self, key: Any, default: Any = None, **kwargs) -> Any:
+        """Get a value from memory, or the wrapped cache. Extra kwargs (i.e. expire_time=True) skip the memory tier."""
+        if any(kwargs.values()):
+            return self.backend.get(key, default, **kwargs)
+
+        value = self.memory.get(key, _MISSING)
+        if value is not _MISSING:
+            return value
+
+        value = self.backend.get(key, _MISSING)
+        if value is _MISSING:
+            return default
+
+        self.memory.set(key, value)
+
+        return value
+
+    def set(self, key: Any, value: Any, expire: float | None = None, **kwargs) -> bool:
+        result = self.backend.set(key, value, expire=expire, **kwargs)
+
+        if kwargs.get("read"):
+            ## value is a file handle the backend just consumed
+            self.memory.delete(key)
+        else:
+            self.memory.set(key, value, expire=expire)
+
+        return result
+
+    def delete(self, key: Any, **kwargs) -> bool:
+        self.memory.delete(key)
+
+        return self.backend.delete(key, **kwargs)
+
+    def get_many(self, keys: Iterable[Any] = ()) -> dict[Any, Any]:
+        """Get several values. Missing keys are left out of the result.
+
+        Keys missing from memory are read from the wrapped cache in one batch when it supports
+        get_many() (i.e. RedisCache).
+        """
+        found: dict[Any, Any] = {}
+        missing: list[Any] = []
+
+        for key in keys:
+            value = self.memory.get(key, _MISSING)
+
+            if value is _MISSING:
+                missing.append(key)
+            else:
+                found[key] = value
+
+        if not missing:
+            return found
+
+        if hasattr(self.backend, "get_many"):
+            fetched: dict[Any, Any] = self.backend.get_many(missing)
+        else:
+            fetched = {}
+            for key in missing:
+                value = self.backend.get(key, _MISSING)
+
+                if value is not _MISSING:
+                    fetched[key] = value
+
+        for key, value in fetched.items():
+            self.memory.set(key, value)
+            found[key] = value
+
+        return found
+
+    def set_many(self, mapping: dict[Any, Any] = None, expire: float | None = None) -> None:
+        """Set several values, in one batch (or one transaction, for a diskcache.Cache)."""
+        if not mapping:
+            return
+
+        if hasattr(self.backend, "set_many"):
+            self.backend.set_many(mapping, expire=expire)
+        else:
+            with self.backend.transact():
+                for key, value in mapping.items():
+                    self.backend.set(key, value, expire=expire)
+
+        for key, value in mapping.items():
+            self.memory.set(key, value, expire=expire)
+
+    def clear(self, **kwargs) -> int:
+        self.memory.clear()
+
+        return self.backend.clear(**kwargs)
+
+    def memory_stats(self, reset: bool = False) -> MemoryTierStats:
+        """Hit, miss & eviction counts of the memory tier."""
+        return self.memory.stats(reset=reset)
+
+    def log_memory_stats(self) -> None:
+        stats: MemoryTierStats = self.memory.stats()
+        log.info(
+            f"Memory cache: [{stats.hits}] hits, [{stats.misses}] misses ({stats.hit_rate:.0%} hit rate), "
+            f"[{stats.evictions}] evictions, [{stats.entries}] entries using [{stats.size}/{stats.max_size}] bytes"
+        )
@@ -0,0 +1,475 @@
+"""Opt-in tracing spans for the refresh path.
+
+A span times one step of a refresh (i.e. a Celery task, a Pokemon API request or a cache write).
+Spans started while another is current become its children, so a trace shows where a refresh's
+time went, from the refresh job through the broker, Celery tasks & HTTP requests down to JSON
+decoding & cache writes.
+
+* span() is a context manager timing a block, traced() a decorator timing a function.
+* The current span follows the code through run_sync() & asyncio tasks (it's a ContextVar), and
+    through Celery: inject() writes it to a task's headers as a W3C traceparent, and extract()
+    reads it back in the worker.
+* Finished spans are exported in batches from a background thread: appended as JSON lines to
+    tracing_settings.file ("file" exporter), or sent to an OpenTelemetry collector's OTLP/HTTP
+    endpoint ("otlp" exporter).
+
+With tracing_settings.enabled off (the default), spans are no-ops & cost one function call.
+"""
+from __future__ import annotations
+
+import asyncio
+import atexit
+
+from contextvars import ContextVar, Token
+import functools
+import json
+import os
+from pathlib import Path
+import random
+import threading
+import time
+from typing import Any, Callable, NamedTuple
+
+from pokeapi.core.conf import app_settings, tracing_settings
+
+import httpx
+
+from loguru import logger as log
+
+EXPORTERS: tuple[str, ...] = ("file", "otlp")
+
+## Message header carrying the parent span of a Celery task
+TRACEPARENT_HEADER: str = "traceparent"
+
+## Export finished spans every this many seconds, or as soon as this many are waiting
+EXPORT_INTERVAL: float = 2.0
+EXPORT_BATCH_SIZE: int = 512
+
+
+def tracing_enabled() -> bool:
+    return bool(tracing_settings.enabled)
+
+
+class SpanContext(NamedTuple):
+    """The IDs identifying a span, i.e. a parent received from another process."""
+
+    trace_id: str
+    span_id: str
+
+
+def _new_id(bits: int) -> str:
+    return f"{random.getrandbits(bits):0{bits // 4}x}"
+
+
+class Span:
+    """One timed step of a trace. Start with span() or start_span(), not directly.
+
+    Used as a context manager, the span is current inside the block & ends when it exits.
+    """
+
+    __slots__ = (
+        "name",
+        "context",
+        "parent_id",
+        "start_ns",
+        "end_ns",
+        "attributes",
+        "status",
+        "_started",
+        "_token",
+    )
+
+    def __init__(
+        self,
+        name: str = None,
+        parent: SpanContext | None = None,
+        attributes: dict[str, Any] | None = None,
+    ) -> None:
+        """Start a span, timed from now. Ends with .end() (or when its context manager exits)."""
+        self.name = name
+        self.context = SpanContext(
+            trace_id=parent.trace_id if parent is not None else _new_id(128),
+            span_id=_new_id(64),
+        )
+        self.parent_id: str | None = parent.span_id if parent is not None else None
+        self.attributes: dict[str, Any] = dict(attributes) if attributes else {}
+        self.status: str = "ok"
+
+        self.start_ns: int = time.time_ns()
+        self.end_ns: int | None = None
+        ## Durations come from the monotonic clock, wall clock only anchors the start
+        self._started: int = time.perf_counter_ns()
+        self._token: Token | None = None
+
+    def __enter__(self) -> Span:
+        """Make the span current."""
+        self._token = _current.set(self)
+
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        """Record an exception raised in the span, end it & restore the previous current span."""
+        if exc is not None:
+            self.record_exception(exc)
+
+        _current.reset(self._token)
+        self._token = None
+        self.end()
+
+    @property
+    def duration(self) -> float | None:
+        """Seconds the span took, or None while it's running."""
+        if self.end_ns is None:
+            return None
+
+        return (self.end_ns - self.start_ns) / 1e9
+
+    def set_attribute(self, key: str = None, value: Any = None) -> None:
+        self.attributes[key] = value
+
+    def set_attributes(self, **attributes) -> None:
+        self.attributes.update(attributes)
+
+    def record_exception(self, exc: BaseException = None) -> None:
+        self.status = "error"
+        self.attributes["error.type"] = type(exc).__name__
+        self.attributes["error.message"] = str(exc)
+
+    def end(self) -> None:
+        if self.end_ns is not None:
+            return
+
+        self.end_ns = self.start_ns + (time.perf_counter_ns() - self._started)
+        _get_exporter().add(self)
+
+    def as_dict(self) -> dict[str, Any]:
+        return {
+            "trace_id": self.context.trace_id,
+            "span_id": self.context.span_id,
+            "parent_id": self.parent_id,
+            "name": self.name,
+            "service": tracing_settings.service_name,
+            "pid": os.getpid(),
+            "start_ns": self.start_ns,
+            "end_ns": self.end_ns,
+            "duration_ms": round(self.duration * 1000, 3) if self.end_ns else None,
+            "status": self.status,
+            "attributes": self.attributes,
+        }
+
+
+class _NoopSpan:
+    """Stands in for a span when tracing is off. Accepts & ignores every call."""
+
+    context: SpanContext | None = None
+    duration: float | None = None
+
+    def set_attribute(self, key: str = None, value: Any = None) -> None:
+        pass
+
+    def set_attributes(self, **attributes) -> None:
+        pass
+
+    def record_exception(self, exc: BaseException = None) -> None:
+        pass
+
+    def end(self) -> None:
+        pass
+
+    def __enter__(self) -> _NoopSpan:
+        return self
+
+    def __exit__(self, *exc) -> None:
+        pass
+
+
+_NOOP_SPAN = _NoopSpan()
+
+_current: ContextVar[Span | None] = ContextVar("pokeapi_span", default=None)
+
+
+def current_span() -> Span | _NoopSpan:
+    """Return the span of the running step, or a no-op span if there isn't one."""
+    return _current.get() or _NOOP_SPAN
+
+
+def start_span(
+    name: str = None,
+    parent: SpanContext | None = None,
+    attributes: dict[str, Any] | None = None,
+) -> Span | _NoopSpan:
+    """Start a span without making it current. End it with .end().
+
+    PARAMS:
+    -------
+
+    * name (str): What the span times, i.e. "http.get".
+    * parent (SpanContext): The parent span. Defaults to the current span.
+    * attributes (dict): Attributes to start the span with.
+    """
+    if not tracing_enabled():
+        return _NOOP_SPAN
+
+    if parent is None and _current.get() is not None:
+        parent = _current.get().context
+
+    return Span(name, parent=parent, attributes=attributes)
+
+
+def activate(span: Span | _NoopSpan = None) -> Token | None:
+    """Make a span current, i.e. for the length of a Celery task. Undo by passing the returned token to deactivate."""
+    if isinstance(span, _NoopSpan):
+        return None
+
+    return _current.set(span)
+
+
+def deactivate(token: Token | None = None) -> None:
+    if token is not None:
+        _current.reset(token)
+
+
+def span(name: str = None, **attributes) -> Span | _NoopSpan:
+    """Time a block as a child of the current span. Exceptions mark the span as failed.
+
+    Usage:
+
+        with span("cache.set", cache_key=key) as s:
+            cache.set(key, value)
+            s.set_attribute("bytes", size)
+    """
+    return start_span(name, attributes=attributes)
+
+
+def traced(name: str = None) -> Callable[[Callable], Callable]:
+    """Time every call of the decorated function (sync or async) in a span. name defaults to the function's name."""
+
+    def decorator(func: Callable) -> Callable:
+        span_name: str = name or func.__qualname__
+
+        if asyncio.iscoroutinefunction(func):
+
+            @functools.wraps(func)
+            async def async_wrapper(*args, **kwargs):
+                if not tracing_enabled():
+                    return await func(*args, **kwargs)
+
+                with span(span_name):
+                    return await func(*args, **kwargs)
+
+            return async_wrapper
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            if not tracing_enabled():
+                return func(*args, **kwargs)
+
+            with span(span_name):
+                return func(*args, **kwargs)
+
+        return wrapper
+
+    return decorator
+
+
+def inject(headers: dict | None = None, parent: Span | None = None) -> None:
+    """Write a span (default: the current span) to message headers as a W3C traceparent."""
+    if headers is None or not tracing_enabled():
+        return
+
+    context: SpanContext | None = (parent or current_span()).context
+    if context is None:
+        return
+
+    headers[TRACEPARENT_HEADER] = f"00-{context.trace_id}-{context.span_id}-01"
+
+
+def extract(traceparent: str | None = None) -> SpanContext | None:
+    """Read the parent span from a traceparent header value. None if it's missing or malformed."""
+    if not traceparent:
+        return None
+
+    parts: list[str] = traceparent.strip().split("-")
+    if len(parts) != 4 or len(parts[1]) != 32 or len(parts[2]) != 16:
+        return None
+
+    try:
+        int(parts[1], 16), int(parts[2], 16)
+    except ValueError:
+        return None
+
+    return SpanContext(trace_id=parts[1], span_id=parts[2])
+
+
+def default_trace_file() -> Path:
+    if tracing_settings.file:
+        return Path(tracing_settings.file)
+
+    return Path(app_settings.data_dir) / "traces" / "spans.jsonl"
+
+
+def _otlp_value(value: Any) -> dict[str, Any]:
+    if isinstance(value, bool):
+        return {"boolValue": value}
+    if isinstance(value, int):
+        return {"intValue": str(value)}
+    if isinstance(value, float):
+        return {"doubleValue": value}
+
+    return {"stringValue": str(value)}
+
+
+def otlp_payload(spans: list[Span] = None) -> dict[str, Any]:
+    """Spans in the OTLP/JSON format an OpenTelemetry collector accepts on /v1/traces."""
+    return {
+        "resourceSpans": [
+            {
+                "resource": {
+                    "attributes": [
+                        {"key": "service.name", "value": _otlp_value(tracing_settings.service_name)},
+                        {"key": "process.pid", "value": _otlp_value(os.getpid())},
+                    ]
+                },
+                "scopeSpans": [
+                    {
+                        "scope": {"name": "pokeapi"},
+                        "spans": [
+                            {
+                                "traceId": s.context.trace_id,
+                                "spanId": s.context.span_id,
+                                "parentSpanId": s.parent_id or "",
+                                "name": s.name,
+                                ## SPAN_KIND_INTERNAL
+                                "kind": 1,
+                                "startTimeUnixNano": str(s.start_ns),
+                                "endTimeUnixNano": str(s.end_ns),
+                                "attributes": [
+                                    {"key": k, "value": _otlp_value(v)}
+                                    for k, v in s.attributes.items()
+                                ],
+                                ## STATUS_CODE_OK / STATUS_CODE_ERROR
+                                "status": {"code": 2 if s.status == "error" else 1},
+                            }
+                            for s in spans
+                        ],
+                    }
+                ],
+            }
+        ]
+    }
+
+
+class SpanExporter:
+    """Collects finished spans & exports them in batches from a background thread.
+
+    PARAMS:
+    -------
+
+    * exporter (str): "file" or "otlp". Defaults to tracing_settings.exporter.
+    * path (str | Path): JSON lines file spans are appended to ("file" exporter). Defaults to
+        tracing_settings.file, or [data_dir]/traces/spans.jsonl.
+    * endpoint (str): OTLP/HTTP traces endpoint ("otlp" exporter). Defaults to tracing_settings.endpoint.
+    """
+
+    def __init__(
+        self,
+        exporter: str | None = None,
+        path: str | Path | None = None,
+        endpoint: str | None = None,
+    ) -> None:
+        """Configure the exporter. Defaults come from tracing_settings."""
+        exporter = exporter or tracing_settings.exporter
+        if exporter not in EXPORTERS:
+            raise ValueError(f"Invalid tracing exporter: {exporter}. Must be one of {list(EXPORTERS)}")
+
+        self.exporter = exporter
+        self.path: Path = Path(path) if path else default_trace_file()
+        self.endpoint: str = endpoint or tracing_settings.endpoint
+
+        self._pending: list[Span] = []
+        self._lock = threading.Lock()
+        self._wake = threading.Event()
+        self._thread: threading.Thread | None = None
+
+    def add(self, span: Span = None) -> None:
+        with self._lock:
+            self._pending.append(span)
+            full: bool = len(self._pending) >= EXPORT_BATCH_SIZE
+
+            if self._thread is None:
+                self._thread = threading.Thread(
+                    target=self._run, name="pokeapi-span-exporter", daemon=True
+                )
+                self._thread.start()
+
+        if full:
+            self._wake.set()
+
+    def _run(self) -> None:
+        while True:
+            self._wake.wait(EXPORT_INTERVAL)
+            self._wake.clear()
+            self.flush()
+
+    def flush(self) -> None:
+        """Export every finished span now."""
+        with self._lock:
+            spans: list[Span] = self._pending
+            self._pending = []
+
+        if not spans:
+            return
+
+        try:
+            if self.exporter == "otlp":
+                httpx.post(self.endpoint, json=otlp_payload(spans), timeout=5).raise_for_status()
+            else:
+                self._write(spans)
+        except Exception as exc:
+            log.warning(f"Could not export [{len(spans)}] span(s) with the {self.exporter} exporter. Details: {exc}")
+
+    def _write(self, spans: list[Span]) -> None:
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        lines: bytes = "".join(json.dumps(s.as_dict(), default=str) + "\n" for s in spans).encode()
+
+        ## One O_APPEND write per batch, so batches from processes sharing the file don't interleave
+        fd: int = os.open(self.path, os.O_WRONLY | os.O_APPEND | os.O_CREAT, 0o644)
+        try:
+            os.write(fd, lines)
+        finally:
+            os.close(fd)
+
+
+_exporter: SpanExporter | None = None
+_exporter_lock = threading.Lock()
+
+
+def _get_exporter() -> SpanExporter:
+    global _exporter
+
+    with _exporter_lock:
+        if _exporter is None:
+            _exporter = SpanExporter()
+
+        return _exporter
+
+
+def flush_spans() -> None:
+    """Export every finished span now, i.e. before a process exits."""
+    if _exporter is not None:
+        _exporter.flush()
+
+
+atexit.register(flush_spans)
+
+
+def _reset_after_fork() -> None:
+    ## The exporter thread doesn't exist in the child, and the parent exports its own spans
+    global _exporter, _exporter_lock
+
+    _exporter = None
+    _exporter_lock = threading.Lock()
+
+
+if hasattr(os, "register_at_fork"):
+    os.register_at_fork(after_in_child=_reset_after_fork)
@@ -1,4 +1,27 @@
 from __future__ import annotations
 
-from . import schemas
-from .schemas import APIAllPokemon, APIPokemonResource
+from . import links, schemas
+from .links import (
+    iter_resource_links,
+    iter_resource_refs,
+    parse_resource_url,
+    resource_endpoint,
+    resource_key,
+)
+from .schemas import (
+    APIAllPokemon,
+    APIPokemonResource,
+    APIResource,
+    CacheMeta,
+    FreshnessPolicy,
+    PokemonListing,
+    aiter_resources,
+    entry_key,
+    get_freshness_policy,
+    iter_resources,
+    load_cache_meta,
+    load_cache_metas,
+    meta_key,
+    page_key,
+    profile_key,
+)
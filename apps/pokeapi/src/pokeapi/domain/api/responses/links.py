@@ -0,0 +1,70 @@
+"""Parse Pokemon API resource URLs, and find the resources a response links to.
+
+Responses reference other resources as {"name": ..., "url": ...} objects, i.e. a Pokemon's
+species.url, abilities[].ability.url, types[].type.url and moves[].move.url.
+"""
+from __future__ import annotations
+
+import re
+
+from typing import Any, Iterator
+
+## i.e. https://pokeapi.co/api/v2/pokemon-species/25/ -> ("pokemon-species", "25")
+_RESOURCE_URL_PATTERN = re.compile(r"/api/v2/([a-z0-9-]+)/([^/?#]+)/?$")
+
+
+def parse_resource_url(url: str | None = None) -> tuple[str, str] | None:
+    """Split a resource URL into (endpoint, ID or name). Returns None for other URLs, i.e. list endpoints."""
+    if not url:
+        return None
+
+    match = _RESOURCE_URL_PATTERN.search(url)
+
+    if match is None:
+        return None
+
+    return match.group(1), match.group(2)
+
+
+def resource_endpoint(url: str | None = None) -> str | None:
+    """Return the endpoint a resource URL belongs to, i.e. "type" for https://pokeapi.co/api/v2/type/13/."""
+    parsed = parse_resource_url(url)
+
+    return None if parsed is None else parsed[0]
+
+
+def resource_key(url: str | None = None) -> str | None:
+    """Cache key of a resource, i.e. "type/13". Identifies the resource no matter how its URL is written."""
+    parsed = parse_resource_url(url)
+
+    return None if parsed is None else f"{parsed[0]}/{parsed[1]}"
+
+
+def iter_resource_refs(response: Any = None) -> Iterator[tuple[str | None, str]]:
+    """Yield (name, URL) of every resource a response references, in document order (may repeat).
+
+    The name is None for references without one.
+    """
+    stack: list[Any] = [response]
+
+    while stack:
+        value = stack.pop()
+
+        if isinstance(value, dict):
+            url = value.get("url")
+
+            if isinstance(url, str) and parse_resource_url(url) is not None:
+                name = value.get("name")
+                yield (name if isinstance(name, str) else None), url
+
+            ## Reversed, so values are visited in document order
+            stack.extend(v for v in reversed(value.values()) if isinstance(v, (dict, list)))
+
+        elif isinstance(value, list):
+            stack.extend(v for v in reversed(value) if isinstance(v, (dict, list)))
+
+
+def iter_resource_links(response: Any = None) -> Iterator[str]:
+    """Yield the URL of every resource a response references, in document order (may repeat)."""
+    for _, url in iter_resource_refs(response):
+        yield url
@@ -1,21 +1,543 @@
 from __future__ import annotations
 
+from collections.abc import AsyncIterator, Iterable, Iterator, Sequence
 import json
 
 from pathlib import Path
-from typing import Union
-
-from pokeapi.core.conf import api_settings
+import time
+from typing import Any, Callable, ClassVar, Union
+
+from pokeapi.core.conf import api_settings, cache_settings
+from pokeapi.core.fetch import run_sync, schedule_refresh
+from pokeapi.core.schedule import record_access
+from pokeapi.dependencies import (
+    cache_get_many,
+    current_span,
+    get_async_client,
+    get_codec,
+    get_single_flight,
+    record_cache_lookup,
+    send_with_retries,
+    span,
+    traced,
+)
+from pokeapi.domain.enums.cache_enums import Freshness
+from pokeapi.domain.pokemon import PROFILES, PokemonProfile, get_profile
+
+from .links import iter_resource_links, resource_endpoint, resource_key
 
 import diskcache
 import httpx
 
 from loguru import logger as log
-from pydantic import BaseModel, Field, ValidationError, field_validator
-from red_utils.ext.diskcache_utils import check_cache_key_exists, get_val, set_val
-from red_utils.ext.msgpack_utils import msgpack_serialize
+from pydantic import (
+    BaseModel,
+    ConfigDict,
+    Field,
+    GetCoreSchemaHandler,
+    ValidationError,
+    field_validator,
+)
+from pydantic_core import core_schema
+
+def meta_key(cache_key: str = None) -> str:
+    """Return the key a response's CacheMeta is stored under, next to the response itself."""
+    return f"{cache_key}::meta"
+
+
+def profile_key(cache_key: str = None, profile: str | None = None) -> str:
+    """Return the key a response projected to a profile is stored under.
+
+    Without a profile, this is the key the full response is stored under.
+    """
+    if profile is None:
+        return cache_key
+
+    return f"{cache_key}::{profile}"
+
+
+class CacheMeta(BaseModel):
+    """Validators & freshness info for a cached Pokemon API response.
+
+    DESCRIPTION:
+    ------------
+
+    Stored under its own key (see meta_key()) instead of inside the response, so answering
+    a 304 Not Modified only rewrites this small record and never touches the response body.
+
+    PARAMS:
+    -------
+
+    * url (str): The URL the response was requested from.
+    * etag (str): ETag header from the last 200 response.
+    * last_modified (str): Last-Modified header from the last 200 response.
+    * fetched_at (float): Unix timestamp of the last full (200) download.
+    * validated_at (float): Unix timestamp of the last time the upstream confirmed the cached response (200 or 304).
+    * max_age (float): Seconds after validated_at the response is fresh, from the FreshnessPolicy it was written with.
+    * stale_while_revalidate (float): Seconds after max_age the response may still be served while it's refreshed.
+    * checks (int): Times the cached response was revalidated.
+    * changes (int): Times a revalidation found the response had changed.
+    """
+
+    url: str | None = Field(default=None)
+    etag: str | None = Field(default=None)
+    last_modified: str | None = Field(default=None)
+    fetched_at: float | None = Field(default=None)
+    validated_at: float | None = Field(default=None)
+    max_age: float | None = Field(default=None)
+    stale_while_revalidate: float | None = Field(default=None)
+    checks: int = Field(default=0)
+    changes: int = Field(default=0)
+
+    @property
+    def conditional_headers(self) -> dict[str, str]:
+        """Request headers to revalidate the cached response with."""
+        headers: dict[str, str] = {}
+
+        if self.etag:
+            headers["If-None-Match"] = self.etag
+        if self.last_modified:
+            headers["If-Modified-Since"] = self.last_modified
+
+        return headers
+
+
+class FreshnessPolicy(BaseModel):
+    """How long a type of cached response is served before it's refreshed.
+
+    DESCRIPTION:
+    ------------
+
+    Within max_age of its last validation a response is fresh. For stale_while_revalidate
+    seconds after that it's stale: served right away, and refreshed in the background. After
+    both windows pass it's expired, and revalidated before it's served.
+
+    The policy is stored in each entry's CacheMeta when it's written, and the stored values
+    win over the policy an entry is later read with.
+
+    PARAMS:
+    -------
 
-class APIPokemonResource(BaseModel):
+    * max_age (float): Seconds a response stays fresh.
+    * stale_while_revalidate (float): Seconds after max_age a stale response may still be served.
+    """
+
+    max_age: float = Field(default=0)
+    stale_while_revalidate: float = Field(default=0)
+
+    def freshness(self, meta: CacheMeta | None = None, now: float | None = None) -> Freshness:
+        """Classify a cached response by its CacheMeta. Responses without one are stale."""
+        if meta is None or meta.validated_at is None:
+            return Freshness.STALE
+
+        if now is None:
+            now = time.time()
+
+        max_age: float = self.max_age if meta.max_age is None else meta.max_age
+        swr: float = (
+            self.stale_while_revalidate
+            if meta.stale_while_revalidate is None
+            else meta.stale_while_revalidate
+        )
+        age: float = now - meta.validated_at
+
+        if age <= max_age:
+            return Freshness.FRESH
+        if age <= max_age + swr:
+            return Freshness.STALE
+
+        return Freshness.EXPIRED
+
+    def apply(self, meta: CacheMeta = None) -> CacheMeta:
+        """Store the policy in a CacheMeta."""
+        meta.max_age = self.max_age
+        meta.stale_while_revalidate = self.stale_while_revalidate
+
+        return meta
+
+
+def get_freshness_policy(resource_type: str = None) -> FreshnessPolicy | None:
+    """Return the FreshnessPolicy for a type of resource ("pokemon", "resource" or "listing").
+
+    Returns None when freshness policies are disabled (cache_settings.freshness_enabled),
+    which keeps cached responses until they're revalidated explicitly.
+    """
+    if not cache_settings.freshness_enabled:
+        return None
+
+    if resource_type == "pokemon":
+        return FreshnessPolicy(
+            max_age=cache_settings.pokemon_max_age,
+            stale_while_revalidate=cache_settings.pokemon_stale_while_revalidate,
+        )
+
+    if resource_type == "resource":
+        return FreshnessPolicy(
+            max_age=cache_settings.resource_max_age,
+            stale_while_revalidate=cache_settings.resource_stale_while_revalidate,
+        )
+
+    if resource_type == "listing":
+        return FreshnessPolicy(
+            max_age=cache_settings.listing_max_age,
+            stale_while_revalidate=cache_settings.listing_stale_while_revalidate,
+        )
+
+    raise ValueError(f"No freshness policy for resource type: {resource_type}")
+
+
+def entry_key(cache: diskcache.Cache = None, cache_key: str = None) -> str:
+    """Identify a cache entry across caches, i.e. for coalescing or scheduling work on it."""
+    return f"{getattr(cache, 'directory', id(cache))}:{cache_key}"
+
+
+def load_cache_meta(cache: diskcache.Cache = None, cache_key: str = None) -> CacheMeta | None:
+    """Load the CacheMeta stored for a cache key, or None if there isn't one."""
+    meta: dict | None = cache.get(meta_key(cache_key))
+
+    if meta is None:
+        return None
+
+    return CacheMeta.model_validate(meta)
+
+
+def load_cache_metas(
+    cache: diskcache.Cache = None, cache_keys: Iterable[str] = ()
+) -> dict[str, CacheMeta]:
+    """Load the CacheMeta stored for several cache keys at once. Keys without one are left out."""
+    keys: dict[str, str] = {meta_key(cache_key): cache_key for cache_key in cache_keys}
+
+    return {
+        keys[key]: CacheMeta.model_validate(meta)
+        for key, meta in cache_get_many(cache, keys).items()
+    }
+
+
+@traced("http.get")
+async def _arequest(
+    url: str = None,
+    params: dict | None = None,
+    headers: dict | None = None,
+    client: httpx.AsyncClient | None = None,
+) -> httpx.Response:
+    """Make a GET request to the Pokemon API.
+
+    If no client is passed, the pooled client from pokeapi.dependencies.get_async_client() is used.
+    Requests are rate limited & retried, see pokeapi.dependencies.ratelimit.send_with_retries().
+    """
+    if client is None:
+        client = get_async_client()
+
+    res = await send_with_retries(client, url, params=params, headers=headers)
+
+    log.debug(f"Response: [{res.status_code}: {res.reason_phrase}]")
+    current_span().set_attributes(
+        url=url, status=res.status_code, bytes=res.num_bytes_downloaded
+    )
+
+    return res
+
+
+@traced("pokeapi.fetch")
+async def _afetch_cached(
+    url: str = None,
+    params: dict | None = None,
+    use_cache: bool = False,
+    cache: diskcache.Cache = None,
+    cache_key: str = None,
+    revalidate: bool = False,
+    client: httpx.AsyncClient | None = None,
+    transform: Callable[[dict], dict] | None = None,
+    full_cache_key: str | None = None,
+    policy: FreshnessPolicy | None = None,
+    on_stale: Callable[[], Any] | None = None,
+) -> dict | None:
+    """Request a Pokemon API URL, reading from & writing to the cache when enabled.
+
+    DESCRIPTION:
+    ------------
+
+    Without revalidate, a cached response is returned as-is. With revalidate, a cached response
+    is checked against the upstream with a conditional request (If-None-Match/If-Modified-Since).
+    A 304 only bumps the entry's CacheMeta.validated_at, and the cached response is returned without
+    downloading or parsing the body again. A 200 replaces the response & its validators.
+
+    When a transform is passed (i.e. a profile's .project()), a downloaded response is transformed
+    before it is cached under cache_key & returned. Pass full_cache_key to also cache the untransformed
+    response under that key.
+
+    With a FreshnessPolicy, a cached response is only returned as-is while it's fresh. A stale
+    response is returned right away & on_stale() is called to refresh it in the background. An
+    expired response is revalidated first. The policy is stored in the CacheMeta of responses
+    written by this call.
+
+    With the cache enabled, concurrent calls missing (or revalidating) the same entry share one
+    request, see pokeapi.dependencies.singleflight.
+
+    Returns None if the response status is not 200 or 304.
+    """
+    headers: dict[str, str] = {}
+    meta: CacheMeta | None = None
+    cached: dict | None = None
+
+    fetch_span = current_span()
+    fetch_span.set_attributes(cache_key=cache_key, revalidate=revalidate)
+
+    if not use_cache:
+        log.info(f"Cache is disabled, making live request.")
+
+    else:
+        log.info(f"Cache is enabled, attempting cached request")
+
+        ## Only reads count towards refresh_priority. The refreshes themselves revalidate, and
+        #  counting them would rank entries higher for having been refreshed.
+        if not revalidate:
+            record_access(cache, cache_key)
+
+        with span("cache.get", cache_key=cache_key):
+            cached = cache.get(cache_key)
+
+            if cached is not None:
+                meta = load_cache_meta(cache=cache, cache_key=cache_key)
+
+        if cached is not None:
+            if not revalidate:
+                freshness: Freshness = (
+                    Freshness.FRESH if policy is None else policy.freshness(meta)
+                )
+
+                if freshness is Freshness.FRESH:
+                    log.info("Found response in cache. Loading from cache.")
+                    record_cache_lookup(cache, "hit")
+                    fetch_span.set_attribute("cache.result", "hit")
+
+                    return cached
+
+                if freshness is Freshness.STALE:
+                    log.info("Found stale response in cache. Loading from cache & refreshing it in the background.")
+                    record_cache_lookup(cache, "stale")
+                    fetch_span.set_attribute("cache.result", "stale")
+
+                    if on_stale is not None:
+                        on_stale()
+
+                    return cached
+
+                log.info(f"Cached response for [{cache_key}] expired. Revalidating it.")
+                record_cache_lookup(cache, "expired")
+                fetch_span.set_attribute("cache.result", "expired")
+                revalidate = True
+
+            if meta is not None:
+                headers = meta.conditional_headers
+
+            if headers:
+                log.debug(f"Revalidating cached response for [{cache_key}]")
+            else:
+                log.debug(
+                    f"No validators stored for [{cache_key}]. Making full request."
+                )
+
+        else:
+            log.warning("Did not find response in cache. Making live request.")
+            record_cache_lookup(cache, "miss")
+            fetch_span.set_attribute("cache.result", "miss")
+
+    async def _fetch() -> dict | None:
+        if use_cache and not revalidate:
+            ## Another call may have filled the entry since it was read above
+            filled = cache.get(cache_key)
+            if filled is not None:
+                return filled
+
+        res: httpx.Response = await _arequest(
+            url, params=params, headers=headers, client=client
+        )
+        now: float = time.time()
+
+        if res.status_code == 304 and headers:
+            log.debug(f"[{cache_key}] Not modified. Using cached response.")
+
+            meta.validated_at = now
+            meta.checks += 1
+            if policy is not None:
+                policy.apply(meta)
+            with span("cache.set", cache_key=meta_key(cache_key)):
+                cache.set(meta_key(cache_key), meta.model_dump())
+
+            return cached
+
+        if res.status_code != 200:
+            log.warning(
+                f"Non-200 status code in response: [{res.status_code}: {res.reason_phrase}] {res.text}"
+            )
+
+            return None
+
+        ## json.loads() reads the bytes directly, without decoding a copy of the body to a str first
+        with span("json.decode", bytes=len(res.content), transform=transform is not None):
+            content = json.loads(res.content)
+            value = content if transform is None else transform(content)
+
+        if use_cache:
+            fetched_meta = CacheMeta(
+                url=url,
+                etag=res.headers.get("ETag"),
+                last_modified=res.headers.get("Last-Modified"),
+                fetched_at=now,
+                validated_at=now,
+            )
+            if meta is not None:
+                ## Replacing a cached response, keep its change history
+                fetched_meta.checks = meta.checks + 1
+                fetched_meta.changes = meta.changes + int(value != cached)
+            if policy is not None:
+                policy.apply(fetched_meta)
+
+            with span("cache.set", cache_key=cache_key):
+                cache.set(cache_key, value)
+                cache.set(meta_key(cache_key), fetched_meta.model_dump())
+
+                if full_cache_key is not None and full_cache_key != cache_key:
+                    cache.set(full_cache_key, content)
+                    cache.set(meta_key(full_cache_key), fetched_meta.model_dump())
+
+        return value
+
+    if not use_cache:
+        return await _fetch()
+
+    ## Concurrent misses for the same entry (in this process, or others sharing the cache) make one request
+    return await get_single_flight().do(
+        entry_key(cache, cache_key), _fetch, check=lambda: cache.get(cache_key)
+    )
+
+
+class APIResource(BaseModel):
+    """Any resource from the Pokemon API, identified by its URL (i.e. a type, ability, move or species).
+
+    DESCRIPTION:
+    ------------
+
+    Responses are cached under the resource's endpoint & ID (see links.resource_key()), i.e. "type/13",
+    and follow the "resource" FreshnessPolicy. APIPokemonResource extends this for /pokemon resources,
+    which are cached by name & support projection profiles.
+
+    PARAMS:
+    -------
+
+    * name (str): The resource's name.
+    * request_url (str): The resource's Pokemon API URL.
+    * response (dict): Response from the Pokemon API. Empty until .get() is ran.
+
+    PROPERTIES:
+    -----------
+
+    * .endpoint (str): The endpoint the resource belongs to, i.e. "type".
+    * .cache_key (str): Key the response is cached under.
+    * .links (list[str]): URLs of the resources the response references, without duplicates.
+    """
+
+    ## Accept "request_url" as well as the "url" alias, so .model_dump() output (i.e. a Celery
+    #  task argument) validates back into the same object.
+    model_config = ConfigDict(populate_by_name=True)
+
+    name: str | None = Field(default=None)
+    request_url: str | None = Field(default=None, alias="url")
+    response: dict | None = Field(default=None)
+
+    ## FreshnessPolicy applied to the cached response, see get_freshness_policy()
+    resource_type: ClassVar[str] = "resource"
+
+    @property
+    def endpoint(self) -> str | None:
+        return resource_endpoint(self.request_url)
+
+    @property
+    def cache_key(self) -> str:
+        key: str | None = resource_key(self.request_url)
+
+        if key is None:
+            raise ValueError(f"Not a Pokemon API resource URL: {self.request_url}")
+
+        return key
+
+    @property
+    def links(self) -> list[str]:
+        if self.response is None:
+            return []
+
+        return list(dict.fromkeys(iter_resource_links(self.response)))
+
+    async def aget(
+        self,
+        use_cache: bool = False,
+        cache: diskcache.Cache = None,
+        client: httpx.AsyncClient | None = None,
+        revalidate: bool = False,
+    ) -> dict | None:
+        """Request the resource from the Pokemon API asynchronously.
+
+        PARAMS:
+        -------
+
+        * use_cache (bool): When True, enables caching if a diskcache.Cache instance is passed to the function.
+        * cache (diskcache.Cache): Provide a cache for storing responses from the Pokemon API.
+        * client (httpx.AsyncClient): Client to make the request with. Defaults to the pooled,
+            process-wide client.
+        * revalidate (bool): When True, check a cached response against the Pokemon API with a
+            conditional request instead of returning it as-is.
+        """
+        if cache is None:
+            use_cache = False
+
+        content = await _afetch_cached(
+            self.request_url,
+            use_cache=use_cache,
+            cache=cache,
+            cache_key=self.cache_key,
+            revalidate=revalidate,
+            client=client,
+            policy=get_freshness_policy(self.resource_type),
+            on_stale=lambda: self._refresh_in_background(cache=cache),
+        )
+
+        if content is None:
+            return None
+
+        if self.name is None:
+            self.name = content.get("name")
+        self.response = content
+
+        return content
+
+    def _refresh_in_background(self, cache: diskcache.Cache = None) -> None:
+        """Revalidate this resource's cache entry in the background (see pokeapi.core.fetch.background)."""
+        refresh: APIResource = self.model_copy(update={"response": None})
+
+        schedule_refresh(
+            entry_key(cache, self.cache_key),
+            lambda: refresh.aget(use_cache=True, cache=cache, revalidate=True),
+            task="pokeapi.celery_tasks.refresh_resource",
+            task_kwargs={
+                "resource_dict": refresh.model_dump(by_alias=True, exclude={"response"})
+            },
+        )
+
+    def get(
+        self,
+        use_cache: bool = False,
+        cache: diskcache.Cache = None,
+        revalidate: bool = False,
+    ) -> dict | None:
+        """Request the resource from the Pokemon API.
+
+        Synchronous wrapper around .aget().
+        """
+        return run_sync(self.aget(use_cache=use_cache, cache=cache, revalidate=revalidate))
+
+
+class APIPokemonResource(APIResource):
     """Class representation of a Pokemon resource from the Pokemon API.
 
     PARAMS:
@@ -24,26 +546,54 @@ class APIPokemonResource(BaseModel):
     * name (str): The Pokemon's name.
     * request_url (str): The Pokemon API endpoint for this Pokemon.
     * response (dict): Response from the Pokemon API endpoint. This value is empty until
-        .get() is ran.
+        .get() is ran. When a profile is set, only the profile's fields are kept.
+    * profile (str): Name of a projection profile from pokeapi.domain.pokemon.PROFILES (i.e. "summary").
+        The response is stripped to the profile's fields before it is cached or returned. Defaults to
+        None, which keeps the full response.
 
     Methods
     -------
     * .get(): Request Pokemon data from the Pokemon API. Optionally enable cachine by passing a diskcache.Cache object.
+    * .aget(): Async version of .get(). Accepts a shared httpx.AsyncClient.
 
     PROPERTIES:
     -----------
 
-    * .serialized (bytes): Return a msgpack-serialized bytestring representation of Pokemon.
+    * .serialized (bytes): Return a codec-encoded (msgpack + compression) bytestring representation of Pokemon.
+        Decode with pokeapi.dependencies.codecs.decode_value().
+    * .cache_key (str): Key the response is cached under. Each profile has its own key, so projections
+        never overwrite the full response.
+    * .projection (PokemonProfile): The response as an instance of the profile's model.
+
     """
 
-    name: str | None = Field(default=None)
-    request_url: str | None = Field(default=None, alias="url")
-    response: dict | None = Field(default=None)
+    profile: str | None = Field(default=None)
+
+    resource_type: ClassVar[str] = "pokemon"
+
+    @field_validator("profile")
+    @classmethod
+    def valid_profile(cls, v) -> str | None:
+        if v is not None and v not in PROFILES:
+            raise ValueError(f"Invalid profile: {v}. Must be one of {list(PROFILES)}")
+
+        return v
+
+    @property
+    def cache_key(self) -> str:
+        return profile_key(str(self.name), self.profile)
+
+    @property
+    def projection(self) -> PokemonProfile | None:
+        if self.response is None or self.profile is None:
+            return None
+
+        return get_profile(self.profile).model_validate(self.response)
 
     @property
     def serialized(self) -> bytes:
         try:
-            _serialized = msgpack_serialize(self.model_dump_json())
+            _serialized = get_codec().encode(self.model_dump(by_alias=True))
 
             return _serialized
 
@@ -52,11 +602,28 @@ class APIPokemonResource(BaseModel):
                 f"Unhandled exception serializing APIPokemonResponse. Details: {exc}"
             )
 
-    def get(
+    async def aget(
         self,
         use_cache: bool = False,
         cache: diskcache.Cache = None,
+        client: httpx.AsyncClient | None = None,
+        revalidate: bool = False,
+        store_full: bool = False,
     ) -> dict[str, str]:
+        """Request Pokemon data from the Pokemon API asynchronously.
+
+        PARAMS:
+        -------
+
+        * use_cache (bool): When True, enables caching if a diskcache.Cache instance is passed to the function.
+        * cache (diskcache.Cache): Provide a cache for storing responses from the Pokemon API.
+        * client (httpx.AsyncClient): Client to make the request with. Defaults to the pooled,
+            process-wide client.
+        * revalidate (bool): When True, check a cached response against the Pokemon API with a
+            conditional request instead of returning it as-is. Without it, cached responses follow
+            the "pokemon" FreshnessPolicy: stale ones are returned & refreshed in the background.
+        * store_full (bool): When a profile is set, also cache the full response under the Pokemon's name.
+        """
         if cache is None:
             if use_cache:
                 log.error(
@@ -67,70 +634,259 @@ class APIPokemonResource(BaseModel):
 
                 use_cache = False
 
-        cache_key: str = str(self.name)
-
-        client = httpx.Client()
+        cache_key: str = self.cache_key
+        full_cache_key: str = str(self.name)
+        transform: Callable[[dict], dict] | None = None
+
+        if self.profile is not None:
+            transform = get_profile(self.profile).project
+
+            if use_cache and not revalidate:
+                self._project_from_full(cache=cache)
+
+        content = await _afetch_cached(
+            self.request_url,
+            use_cache=use_cache,
+            cache=cache,
+            cache_key=cache_key,
+            revalidate=revalidate,
+            client=client,
+            transform=transform,
+            full_cache_key=full_cache_key if store_full else None,
+            policy=get_freshness_policy(self.resource_type),
+            on_stale=lambda: self._refresh_in_background(cache=cache, store_full=store_full),
+        )
+
+        if content is None:
+            return None
+
+        self.response = content
+
+        return content
+
+    def _refresh_in_background(
+        self, cache: diskcache.Cache = None, store_full: bool = False
+    ) -> None:
+        """Revalidate this Pokemon's cache entry in the background (see pokeapi.core.fetch.background)."""
+        refresh: APIPokemonResource = self.model_copy(update={"response": None})
+
+        schedule_refresh(
+            entry_key(cache, self.cache_key),
+            lambda: refresh.aget(
+                use_cache=True, cache=cache, revalidate=True, store_full=store_full
+            ),
+            task="pokeapi.celery_tasks.refresh_single_pokemon",
+            task_kwargs={
+                "pokemon_dict": refresh.model_dump(by_alias=True, exclude={"response"})
+            },
+        )
+
+    def _project_from_full(self, cache: diskcache.Cache = None) -> None:
+        """Fill a missing profile cache entry from a cached full response, instead of requesting it again."""
+        cache_key: str = self.cache_key
+        full_cache_key: str = str(self.name)
+
+        if cache_key in cache:
+            return
+
+        full: dict | None = cache.get(full_cache_key)
+        if full is None:
+            return
+
+        log.debug(f"Projecting cached response [{full_cache_key}] to profile [{self.profile}]")
+        cache.set(cache_key, get_profile(self.profile).project(full))
+
+        meta: CacheMeta | None = load_cache_meta(cache=cache, cache_key=full_cache_key)
+        if meta is not None:
+            cache.set(meta_key(cache_key), meta.model_dump())
 
-        if not use_cache:
-            log.info(f"Cache is disabled, making live request.")
-            with client as c:
-                res = c.get(self.request_url)
-
-            log.debug(f"Response: [{res.status_code}: {res.reason_phrase}]")
-
-            if res.status_code == 200:
-                log.info(f"Success requesting all Pokemon")
-                content = json.loads(res.content.decode("utf-8"))
-
-                self.response = content
+    def get(
+        self,
+        use_cache: bool = False,
+        cache: diskcache.Cache = None,
+        revalidate: bool = False,
+        store_full: bool = False,
+    ) -> dict[str, str]:
+        """Request Pokemon data from the Pokemon API.
 
-                return content
+        Synchronous wrapper around .aget().
+        """
+        return run_sync(
+            self.aget(
+                use_cache=use_cache,
+                cache=cache,
+                revalidate=revalidate,
+                store_full=store_full,
+            )
+        )
 
-            else:
-                log.warning(
-                    f"Non-200 status code in response: [{res.status_code}: {res.reason_phrase}] {res.text}"
-                )
 
-                return None
+class PokemonListing(Sequence):
+    """Compact, lazy container for the Pokemon listing returned by the /pokemon endpoint.
 
-        else:
-            log.info(f"Cache is enabled, attempting cached request")
+    DESCRIPTION:
+    ------------
 
-            if not check_cache_key_exists(cache=cache, key=cache_key):
-                log.warning("Did not find response in cache. Making live request.")
+    Holds the listing as parallel tuples of names & URLs. An APIPokemonResource is only built
+    (without validation) the first time its index is accessed, then kept, so changes to it (i.e.
+    a response loaded by .get()) stick. Behaves like a read-only list of APIPokemonResource.
 
-                with client as c:
-                    res = c.get(self.request_url)
+    As a pydantic field, a PokemonListing validates from a list of APIPokemonResource objects or
+    dicts (i.e. a Celery task argument) and serializes back to a list of dicts.
 
-                log.debug(f"Response: [{res.status_code}: {res.reason_phrase}]")
+    PARAMS:
+    -------
 
-                if res.status_code == 200:
-                    content = json.loads(res.content.decode("utf-8"))
+    * names (Iterable[str]): Pokemon names.
+    * urls (Iterable[str]): Pokemon API endpoints, in the same order as names.
+    * profile (str): Projection profile set on resources built from the listing.
 
-                    self.response = content
+    Methods
+    -------
+    * .from_results(): Build from the "results" of a /pokemon response, without validation.
+    * .from_resources(): Build from existing APIPokemonResource objects.
+    * .to_dicts(): Name/URL/profile dicts for every Pokemon, without building resources.
 
-                    set_val(
-                        cache=cache,
-                        key=cache_key,
-                        val=content,
-                    )
+    """
 
-                    return content
+    __slots__ = ("_names", "_urls", "profile", "_resources")
 
-                else:
-                    log.info(
-                        f"Non-200 success response: [{res.status_code}: {res.reason_phrase}]: {res.text}"
-                    )
+    def __init__(
+        self,
+        names: Iterable[str] = (),
+        urls: Iterable[str] = (),
+        profile: str | None = None,
+    ) -> None:
+        """Store the listing's names & URLs as parallel lists."""
+        self._names: tuple[str, ...] = tuple(names)
+        self._urls: tuple[str, ...] = tuple(urls)
+
+        if len(self._names) != len(self._urls):
+            raise ValueError(
+                f"Listing has [{len(self._names)}] names but [{len(self._urls)}] URLs."
+            )
 
-                    return None
+        self.profile: str | None = profile
+        ## Resources built so far, by index
+        self._resources: dict[int, APIPokemonResource] = {}
+
+    @classmethod
+    def from_results(
+        cls, results: list[dict] = None, profile: str | None = None
+    ) -> PokemonListing:
+        """Build a listing from trusted "results" dicts (i.e. a cached /pokemon response) without validation."""
+        if results is None:
+            raise ValueError("Missing list of results.")
+
+        return cls(
+            names=[r["name"] for r in results],
+            urls=[r["url"] for r in results],
+            profile=profile,
+        )
+
+    @classmethod
+    def from_resources(
+        cls, resources: Iterable[APIPokemonResource] = None
+    ) -> PokemonListing:
+        """Build a listing that holds existing APIPokemonResource objects."""
+        if resources is None:
+            raise ValueError("Missing list of APIPokemonResource objects.")
+
+        resources = list(resources)
+        listing = cls(
+            names=[p.name for p in resources], urls=[p.request_url for p in resources]
+        )
+        listing._resources = dict(enumerate(resources))
+
+        return listing
 
-            else:
-                log.info("Found response in cache. Loading from cache.")
+    @property
+    def names(self) -> tuple[str, ...]:
+        return self._names
 
-                res: dict = get_val(cache=cache, key=cache_key)
-                self.response = res
+    @property
+    def urls(self) -> tuple[str, ...]:
+        return self._urls
+
+    def __len__(self) -> int:
+        """Count the Pokemon in the listing."""
+        return len(self._names)
+
+    def __getitem__(self, index: int | slice) -> APIPokemonResource:
+        """Build the APIPokemonResource (or list of them) at an index or slice."""
+        if isinstance(index, slice):
+            return [self[i] for i in range(*index.indices(len(self)))]
+
+        if index < 0:
+            index += len(self)
+        if not 0 <= index < len(self):
+            raise IndexError("PokemonListing index out of range")
+
+        resource: APIPokemonResource | None = self._resources.get(index)
+
+        if resource is None:
+            resource = APIPokemonResource.model_construct(
+                name=self._names[index],
+                request_url=self._urls[index],
+                response=None,
+                profile=self.profile,
+            )
+            self._resources[index] = resource
+
+        return resource
+
+    def __iter__(self) -> Iterator[APIPokemonResource]:
+        """Iterate over the listing as APIPokemonResource objects."""
+        for i in range(len(self)):
+            yield self[i]
+
+    def __repr__(self) -> str:
+        """Show the listing's length & profile."""
+        return f"PokemonListing(len={len(self)}, profile={self.profile!r})"
+
+    def to_dicts(self) -> list[dict]:
+        """Name/URL/profile dicts for every Pokemon, i.e. to send as Celery task arguments."""
+        return [
+            {"name": name, "url": url, "profile": self.profile}
+            for name, url in zip(self._names, self._urls)
+        ]
+
+    def _serialize(self) -> list[dict]:
+        return [
+            self._resources[i].model_dump(by_alias=True)
+            if i in self._resources
+            else {"name": self._names[i], "url": self._urls[i], "profile": self.profile}
+            for i in range(len(self))
+        ]
+
+    @classmethod
+    def _validate(cls, value) -> PokemonListing:
+        if isinstance(value, PokemonListing):
+            return value
+
+        if not isinstance(value, (list, tuple)):
+            raise ValueError(
+                f"Expected a list of Pokemon resources, not {type(value).__name__}"
+            )
 
-                return res
+        return cls.from_resources(
+            p
+            if isinstance(p, APIPokemonResource)
+            else APIPokemonResource.model_validate(p)
+            for p in value
+        )
+
+    @classmethod
+    def __get_pydantic_core_schema__(
+        cls, source_type: Any, handler: GetCoreSchemaHandler
+    ) -> core_schema.CoreSchema:
+        """Validate PokemonListing fields from a PokemonListing or a list of resources, & serialize them as dicts."""
+        return core_schema.no_info_plain_validator_function(
+            cls._validate,
+            serialization=core_schema.plain_serializer_function_ser_schema(
+                cls._serialize
+            ),
+        )
 
 
 class APIAllPokemon(BaseModel):
@@ -150,134 +906,365 @@ class APIAllPokemon(BaseModel):
     * url (str): URL to request all Pokemon from.
     * params (dict[str, int]): Params to set request limit=100000, offset=0.
         This is what facilitates returning all Pokemon from the /pokemon endpoint.
-    * pokemon_list (list[APIPokemonResource]): Variable containing all Pokemon responses.
-        This value is empty until .get_pokemon() is run.
+    * pokemon_list (PokemonListing): Variable containing all Pokemon resources, built lazily as
+        they're accessed. This value is empty until .get_pokemon() is run.
+    * profile (str): Projection profile set on each APIPokemonResource in pokemon_list. Defaults to
+        None (full responses).
 
     PROPERTIES:
     -----------
 
-    * names_list (list[str]): A list of all Pokemon name strings found in object's pokemon_list variable. List
-        will be empty until .get_pokemon() is run.
+    * names_list (Sequence[str]): All Pokemon name strings found in object's pokemon_list variable. Empty
+        until .get_pokemon() is run.
 
     Methods
     -------
     * .get_pokemon(): Request all Pokemon resources and their URL from the Pokemon API, optionally caching requests if a
         diskcache.Cache instance is passed to the function.
+    * .aget_pokemon(): Async version of .get_pokemon().
+    * .from_cache(): Load the listing from a cached /pokemon response, without validation or a request.
+    * .aiter_pokemon(): Stream the Pokemon page by page instead of loading them all at once.
+    * .iter_pokemon(): Synchronous version of .aiter_pokemon().
+
     """
 
     url: str | None = Field(default=f"{api_settings.base_url}/pokemon")
     params: dict[str, int] | None = Field(default={"limit": 100000, "offset": 0})
-    pokemon_list: list[APIPokemonResource] | None = Field(default=None)
+    pokemon_list: PokemonListing | None = Field(default=None)
+    profile: str | None = Field(default=None)
+
+    @field_validator("profile")
+    @classmethod
+    def valid_profile(cls, v) -> str | None:
+        if v is not None and v not in PROFILES:
+            raise ValueError(f"Invalid profile: {v}. Must be one of {list(PROFILES)}")
+
+        return v
 
     @property
-    def names_list(self) -> list[str]:
-        """List of all Pokemon names returned from the Pokemon API."""
+    def names_list(self) -> Sequence[str]:
+        """All Pokemon names returned from the Pokemon API."""
         if self.pokemon_list is None:
             log.error(
                 "Pokemon list is empty. Run .get_pokemon() function to populate list, then try .names_list again."
             )
 
-        names: list[str] = []
+            return []
 
-        for pk in self.pokemon_list:
-            names.append(pk.name)
+        if isinstance(self.pokemon_list, PokemonListing):
+            return self.pokemon_list.names
 
-        return names
+        return [pk.name for pk in self.pokemon_list]
 
-    def get_pokemon(
-        self,
-        use_cache: bool = False,
+    def _load_results(self, content: dict = None) -> None:
+        """Load the "results" list of a /pokemon response into a PokemonListing."""
+        with span("listing.load", count=len(content["results"])):
+            self.pokemon_list = PokemonListing.from_results(
+                content["results"], profile=self.profile
+            )
+
+    @classmethod
+    def from_cache(
+        cls,
         cache: diskcache.Cache = None,
-    ) -> dict[str, str]:
-        """Request all Pokemon resources from the Pokemon API.
+        profile: str | None = None,
+        cache_key: str = "all_pokemon",
+    ) -> APIAllPokemon | None:
+        """Load the listing from a cached /pokemon response, skipping validation & the request.
+
+        Returns None if the response isn't cached.
 
         PARAMS:
         -------
 
-        * use_cache (bool): When True, enables caching if a diskcache.Cache instance is passed to the function.
-        * cache (discache.Cache): Provide a cache for storing responses from the Pokemon API.
+        * cache (diskcache.Cache): The cache .get_pokemon() stored the response in.
+        * profile (str): Projection profile set on the listing's resources.
+        * cache_key (str): Key the /pokemon response is cached under.
         """
-        client = httpx.Client()
-
-        if not use_cache:
-            log.info(f"Cache is disabled, making live request.")
-            with client as c:
-                res = c.get(self.url, params=self.params)
-
-            log.debug(f"Response: [{res.status_code}: {res.reason_phrase}]")
-
-            if res.status_code == 200:
-                log.info(f"Success requesting all Pokemon")
-                content = json.loads(res.content.decode("utf-8"))
-
-                all_pokemon_dict: list[dict] = content["results"]
-                all_pokemon: list[APIPokemonResource] = []
-
-                for p in all_pokemon_dict:
-                    pk: APIPokemonResource = APIPokemonResource.model_validate(p)
-                    all_pokemon.append(pk)
+        if cache is None:
+            raise ValueError("Missing cache to load the Pokemon listing from.")
+        if profile is not None and profile not in PROFILES:
+            raise ValueError(f"Invalid profile: {profile}. Must be one of {list(PROFILES)}")
 
-                self.pokemon_list = all_pokemon
+        content: dict | None = cache.get(cache_key)
 
-                return content
+        if content is None:
+            return None
 
-            else:
-                log.warning(
-                    f"Non-200 status code in response: [{res.status_code}: {res.reason_phrase}] {res.text}"
-                )
+        return cls.model_construct(
+            pokemon_list=PokemonListing.from_results(content["results"], profile=profile),
+            profile=profile,
+        )
 
-                return None
+    async def aget_pokemon(
+        self,
+        use_cache: bool = False,
+        cache: diskcache.Cache = None,
+        client: httpx.AsyncClient | None = None,
+        revalidate: bool = False,
+    ) -> dict[str, str]:
+        """Request all Pokemon resources from the Pokemon API asynchronously.
 
-        else:
-            log.info(f"Cache is enabled, attempting cached request")
+        PARAMS:
+        -------
 
-            if not check_cache_key_exists(cache=cache, key="all_pokemon"):
-                log.warning("Did not find response in cache. Making live request.")
+        * use_cache (bool): When True, enables caching if a diskcache.Cache instance is passed to the function.
+        * cache (discache.Cache): Provide a cache for storing responses from the Pokemon API.
+        * client (httpx.AsyncClient): Client to make the request with. Defaults to the pooled,
+            process-wide client.
+        * revalidate (bool): When True, check a cached response against the Pokemon API with a
+            conditional request instead of returning it as-is.
+        """
+        if cache is None:
+            use_cache = False
+
+        content = await _afetch_cached(
+            self.url,
+            params=self.params,
+            use_cache=use_cache,
+            cache=cache,
+            cache_key="all_pokemon",
+            revalidate=revalidate,
+            client=client,
+            policy=get_freshness_policy("listing"),
+            on_stale=lambda: self._refresh_in_background(cache=cache),
+        )
+
+        if content is None:
+            return None
+
+        self._load_results(content)
+
+        return content
+
+    def _refresh_in_background(self, cache: diskcache.Cache = None) -> None:
+        """Revalidate the cached listing in the background (see pokeapi.core.fetch.background)."""
+        refresh: APIAllPokemon = APIAllPokemon(
+            url=self.url, params=self.params, profile=self.profile
+        )
+
+        schedule_refresh(
+            entry_key(cache, "all_pokemon"),
+            lambda: refresh.aget_pokemon(use_cache=True, cache=cache, revalidate=True),
+            task="pokeapi.celery_tasks.refresh_all_pokemon",
+            task_kwargs={"all_pokemon_dict": refresh.model_dump()},
+        )
+
+    def aiter_pokemon(
+        self,
+        page_size: int | None = None,
+        use_cache: bool = False,
+        cache: diskcache.Cache = None,
+        client: httpx.AsyncClient | None = None,
+        revalidate: bool = False,
+    ) -> AsyncIterator[APIPokemonResource]:
+        """Stream every Pokemon from the Pokemon API, one page at a time. See aiter_resources().
 
-                with client as c:
-                    res = c.get(self.url, params=self.params)
+        Doesn't fill .pokemon_list, so memory use stays flat however many Pokemon there are.
+        """
+        return aiter_resources(
+            self.url,
+            page_size=page_size,
+            use_cache=use_cache,
+            cache=cache,
+            client=client,
+            revalidate=revalidate,
+            profile=self.profile,
+        )
+
+    def iter_pokemon(
+        self,
+        page_size: int | None = None,
+        use_cache: bool = False,
+        cache: diskcache.Cache = None,
+        revalidate: bool = False,
+    ) -> Iterator[APIPokemonResource]:
+        """Stream every Pokemon from the Pokemon API, one page at a time. See iter_resources()."""
+        return iter_resources(
+            self.url,
+            page_size=page_size,
+            use_cache=use_cache,
+            cache=cache,
+            revalidate=revalidate,
+            profile=self.profile,
+        )
 
-                log.debug(f"Response: [{res.status_code}: {res.reason_phrase}]")
+    def get_pokemon(
+        self,
+        use_cache: bool = False,
+        cache: diskcache.Cache = None,
+        revalidate: bool = False,
+    ) -> dict[str, str]:
+        """Request all Pokemon resources from the Pokemon API.
 
-                if res.status_code == 200:
-                    content = json.loads(res.content.decode("utf-8"))
+        Synchronous wrapper around .aget_pokemon().
 
-                    all_pokemon_dict: list[dict] = content["results"]
-                    all_pokemon: list[APIPokemonResource] = []
+        PARAMS:
+        -------
 
-                    for p in all_pokemon_dict:
-                        pk: APIPokemonResource = APIPokemonResource.model_validate(p)
-                        all_pokemon.append(pk)
+        * use_cache (bool): When True, enables caching if a diskcache.Cache instance is passed to the function.
+        * cache (discache.Cache): Provide a cache for storing responses from the Pokemon API.
+        * revalidate (bool): When True, check a cached response against the Pokemon API with a
+            conditional request instead of returning it as-is.
+        """
+        return run_sync(
+            self.aget_pokemon(use_cache=use_cache, cache=cache, revalidate=revalidate)
+        )
+
+
+def page_key(url: str = None, limit: int = None, offset: int = 0) -> str:
+    """Cache key of one page of a list endpoint, i.e. "pokemon?limit=200&offset=400"."""
+    endpoint: str = url.rstrip("/").rsplit("/", 1)[-1]
+
+    return f"{endpoint}?limit={limit}&offset={offset}"
+
+
+def _refresh_page_in_background(
+    url: str,
+    params: dict,
+    cache: diskcache.Cache,
+    cache_key: str,
+    policy: FreshnessPolicy | None,
+) -> None:
+    schedule_refresh(
+        entry_key(cache, cache_key),
+        lambda: _afetch_cached(
+            url,
+            params=params,
+            use_cache=True,
+            cache=cache,
+            cache_key=cache_key,
+            revalidate=True,
+            policy=policy,
+        ),
+    )
+
+
+async def aiter_resources(
+    url: str = None,
+    page_size: int | None = None,
+    use_cache: bool = False,
+    cache: diskcache.Cache = None,
+    client: httpx.AsyncClient | None = None,
+    revalidate: bool = False,
+    profile: str | None = None,
+) -> AsyncIterator[APIResource]:
+    """Stream every resource of a Pokemon API list endpoint, one page at a time.
 
-                    self.pokemon_list = all_pokemon
+    DESCRIPTION:
+    ------------
 
-                    set_val(
-                        cache=cache,
-                        key="all_pokemon",
-                        val=content,
-                    )
+    Requests [page_size] results at a time (following the "next" link until it runs out) and yields
+    each result as an APIResource, or an APIPokemonResource for /pokemon. Only one page is held in
+    memory at a time, and consumers can start on the first resources before the rest of the listing
+    has loaded (i.e. by passing this to pokeapi.core.fetch.as_completed_limited()).
 
-                    return content
+    Each page is cached under page_key() & follows the "listing" FreshnessPolicy.
 
-                else:
-                    log.info(
-                        f"Non-200 success response: [{res.status_code}: {res.reason_phrase}]: {res.text}"
-                    )
+    Raises an Exception if a page can't be loaded, instead of silently stopping early.
 
-                    return None
+    PARAMS:
+    -------
 
+    * url (str): The list endpoint, i.e. f"{api_settings.base_url}/type".
+    * page_size (int): Results per request. Defaults to api_settings.page_size.
+    * use_cache (bool): When True, enables caching if a diskcache.Cache instance is passed to the function.
+    * cache (diskcache.Cache): Provide a cache for storing the pages.
+    * client (httpx.AsyncClient): Client to make the requests with. Defaults to the pooled,
+        process-wide client.
+    * revalidate (bool): When True, revalidate cached pages instead of trusting them as-is.
+    * profile (str): Projection profile set on each APIPokemonResource. Only valid for /pokemon.
+    """
+    if url is None:
+        raise ValueError("Missing list endpoint URL.")
+
+    if page_size is None:
+        page_size = api_settings.page_size
+    if page_size < 1:
+        raise ValueError(f"Page size must be at least 1, not {page_size}")
+
+    if cache is None:
+        use_cache = False
+
+    is_pokemon: bool = url.rstrip("/").rsplit("/", 1)[-1] == "pokemon"
+    if profile is not None and not is_pokemon:
+        raise ValueError("Projection profiles only apply to the /pokemon endpoint.")
+
+    policy: FreshnessPolicy | None = get_freshness_policy("listing")
+    offset: int = 0
+
+    while True:
+        params: dict[str, int] = {"limit": page_size, "offset": offset}
+        cache_key: str = page_key(url, page_size, offset)
+
+        page: dict | None = await _afetch_cached(
+            url,
+            params=params,
+            use_cache=use_cache,
+            cache=cache,
+            cache_key=cache_key,
+            revalidate=revalidate,
+            client=client,
+            policy=policy,
+            on_stale=lambda: _refresh_page_in_background(
+                url, params, cache, cache_key, policy
+            ),
+        )
+
+        if page is None:
+            raise Exception(f"Could not load page [{cache_key}] of {url}")
+
+        results: list[dict] = page.get("results") or []
+
+        for result in results:
+            if is_pokemon:
+                yield APIPokemonResource.model_construct(
+                    name=result.get("name"),
+                    request_url=result.get("url"),
+                    response=None,
+                    profile=profile,
+                )
             else:
-                log.info("Found response in cache. Loading from cache.")
+                yield APIResource.model_construct(
+                    name=result.get("name"), request_url=result.get("url"), response=None
+                )
 
-                res: dict = get_val(cache=cache, key="all_pokemon")
+        if not results or not page.get("next"):
+            return
 
-                all_pokemon_dict: list[dict] = res["results"]
-                all_pokemon: list[APIPokemonResource] = []
+        offset += len(results)
 
-                for p in all_pokemon_dict:
-                    pk: APIPokemonResource = APIPokemonResource.model_validate(p)
-                    all_pokemon.append(pk)
 
-                self.pokemon_list = all_pokemon
+def iter_resources(
+    url: str = None,
+    page_size: int | None = None,
+    use_cache: bool = False,
+    cache: diskcache.Cache = None,
+    revalidate: bool = False,
+    profile: str | None = None,
+) -> Iterator[APIResource]:
+    """Stream every resource of a Pokemon API list endpoint, one page at a time.
 
-                return res
+    Synchronous wrapper around aiter_resources().
+    """
+    resources: AsyncIterator[APIResource] = aiter_resources(
+        url,
+        page_size=page_size,
+        use_cache=use_cache,
+        cache=cache,
+        revalidate=revalidate,
+        profile=profile,
+    )
+
+    async def _next() -> APIResource:
+        return await anext(resources)
+
+    try:
+        while True:
+            try:
+                yield run_sync(_next())
+            except StopAsyncIteration:
+                return
+
+    finally:
+        run_sync(resources.aclose())
@@ -1 +1,3 @@
-from . import celery_enums
+from __future__ import annotations
+
+from . import cache_enums, celery_enums
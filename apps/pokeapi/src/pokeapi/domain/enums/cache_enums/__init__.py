@@ -0,0 +1,4 @@
+from __future__ import annotations
+
+from . import enums
+from .enums import Freshness
@@ -0,0 +1,11 @@
+from __future__ import annotations
+
+from enum import Enum
+
+class Freshness(Enum):
+    ## Younger than its max-age, served as-is
+    FRESH = "FRESH"
+    ## Past its max-age but inside the stale-while-revalidate window. Served, then refreshed in the background
+    STALE = "STALE"
+    ## Past both windows. Revalidated before it's served
+    EXPIRED = "EXPIRED"
@@ -1 +1,32 @@
 from __future__ import annotations
+
+from . import index, models, schemas, store
+from .index import (
+    IndexDiff,
+    IndexEntry,
+    PokemonIndex,
+    pokemon_id_from_url,
+)
+from .models import (
+    AbilityModel,
+    Base,
+    PokemonAbilityModel,
+    PokemonModel,
+    PokemonStatModel,
+    PokemonTypeModel,
+    TypeModel,
+)
+from .schemas import (
+    PROFILES,
+    NamedAPIResource,
+    PokemonAbility,
+    PokemonBattleProfile,
+    PokemonCoreProfile,
+    PokemonProfile,
+    PokemonSprites,
+    PokemonStat,
+    PokemonSummaryProfile,
+    PokemonType,
+    get_profile,
+)
+from .store import PokemonStore, get_pokemon_store
@@ -0,0 +1,260 @@
+"""Lookup index over the Pokemon listing.
+
+Answers name & ID lookups, prefix (autocomplete) searches and fuzzy matches without walking
+the full listing. Built from the /pokemon listing, updated in place when the listing changes,
+and stored as a plain dict (see .to_dict()) so it can be cached.
+"""
+from __future__ import annotations
+
+from bisect import bisect_left, insort
+import difflib
+import re
+
+from typing import Iterable, NamedTuple
+
+from loguru import logger as log
+
+## Resource URLs end with the resource's numeric ID, i.e. https://pokeapi.co/api/v2/pokemon/25/
+_URL_ID_PATTERN = re.compile(r"/(\d+)/?$")
+
+INDEX_FORMAT_VERSION: int = 1
+
+
+def pokemon_id_from_url(url: str | None = None) -> int | None:
+    """Parse the numeric ID from the end of a Pokemon API resource URL."""
+    if not url:
+        return None
+
+    match = _URL_ID_PATTERN.search(url)
+
+    if match is None:
+        return None
+
+    return int(match.group(1))
+
+
+class IndexEntry(NamedTuple):
+    name: str
+    id: int | None
+    url: str
+
+
+class IndexDiff(NamedTuple):
+    """Names added, removed & changed (new URL/ID) by PokemonIndex.update()."""
+
+    added: list[str]
+    removed: list[str]
+    changed: list[str]
+
+    @property
+    def is_empty(self) -> bool:
+        return not (self.added or self.removed or self.changed)
+
+
+class PokemonIndex:
+    """Name, ID & prefix index over the Pokemon listing.
+
+    DESCRIPTION:
+    ------------
+
+    Keeps a dict of name -> (ID, URL), a dict of ID -> name, and a sorted list of names. Name &
+    ID lookups are O(1). Prefix searches bisect the sorted names, so they're O(log n + matches).
+    Names are matched case-insensitively, the same way the Pokemon API stores them (lowercase).
+
+    PARAMS:
+    -------
+
+    * names (Iterable[str]): Pokemon names.
+    * urls (Iterable[str]): Pokemon API endpoints, in the same order as names.
+
+    Methods
+    -------
+    * .from_listing(): Build from an APIAllPokemon.pokemon_list (or any object with .names & .urls).
+    * .get(): Look up a Pokemon by name or ID.
+    * .prefix(): Names starting with a string, in sorted order.
+    * .fuzzy(): Names closest to a (possibly misspelled) string.
+    * .update(): Apply a new listing in place & return what changed.
+    * .to_dict() / .from_dict(): Convert to & from a cacheable dict.
+
+    """
+
+    __slots__ = ("_entries", "_by_id", "_sorted_names")
+
+    def __init__(self, names: Iterable[str] = (), urls: Iterable[str] = ()) -> None:
+        """Index a listing's names & URLs."""
+        self._entries: dict[str, tuple[int | None, str]] = {}
+        self._by_id: dict[int, str] = {}
+
+        for name, url in zip(names, urls, strict=True):
+            self._add(name.lower(), url)
+
+        self._sorted_names: list[str] = sorted(self._entries)
+
+    @classmethod
+    def from_listing(cls, listing=None) -> PokemonIndex:
+        """Build an index from a PokemonListing, or a list of APIPokemonResource objects."""
+        if listing is None:
+            raise ValueError("Missing Pokemon listing to index.")
+
+        if hasattr(listing, "names") and hasattr(listing, "urls"):
+            return cls(listing.names, listing.urls)
+
+        return cls([p.name for p in listing], [p.request_url for p in listing])
+
+    def __len__(self) -> int:
+        """Count the indexed Pokemon."""
+        return len(self._entries)
+
+    def __contains__(self, key: str | int) -> bool:
+        """Return True if a name or ID is indexed."""
+        return self.get(key) is not None
+
+    def __repr__(self) -> str:
+        """Show the index's length."""
+        return f"PokemonIndex(len={len(self)})"
+
+    @property
+    def names(self) -> list[str]:
+        """All indexed names, sorted. Don't modify the returned list."""
+        return self._sorted_names
+
+    def _add(self, name: str, url: str) -> None:
+        pokemon_id: int | None = pokemon_id_from_url(url)
+        self._entries[name] = (pokemon_id, url)
+
+        if pokemon_id is not None:
+            if pokemon_id in self._by_id and self._by_id[pokemon_id] != name:
+                log.warning(
+                    f"Pokemon ID [{pokemon_id}] is used by both [{self._by_id[pokemon_id]}] and [{name}]. Indexing [{name}]."
+                )
+
+            self._by_id[pokemon_id] = name
+
+    def _remove(self, name: str) -> None:
+        pokemon_id, _ = self._entries.pop(name)
+
+        if pokemon_id is not None and self._by_id.get(pokemon_id) == name:
+            del self._by_id[pokemon_id]
+
+    def by_name(self, name: str = None) -> IndexEntry | None:
+        if name is None:
+            return None
+
+        name = name.strip().lower()
+        entry = self._entries.get(name)
+
+        if entry is None:
+            return None
+
+        return IndexEntry(name, *entry)
+
+    def by_id(self, pokemon_id: int = None) -> IndexEntry | None:
+        name: str | None = self._by_id.get(pokemon_id)
+
+        if name is None:
+            return None
+
+        return IndexEntry(name, *self._entries[name])
+
+    def get(self, key: str | int = None) -> IndexEntry | None:
+        """Look up a Pokemon by name or ID. Numeric strings (i.e. "25") are looked up as IDs."""
+        if isinstance(key, int):
+            return self.by_id(key)
+
+        if isinstance(key, str) and key.strip().isdigit():
+            return self.by_id(int(key))
+
+        return self.by_name(key)
+
+    def prefix(self, prefix: str = "", limit: int | None = 10) -> list[str]:
+        """Names starting with prefix, sorted. Returns at most [limit] names (all of them if limit is None)."""
+        prefix = prefix.strip().lower()
+        names: list[str] = self._sorted_names
+        start: int = bisect_left(names, prefix)
+
+        matches: list[str] = []
+        for i in range(start, len(names)):
+            if not names[i].startswith(prefix):
+                break
+            if limit is not None and len(matches) >= limit:
+                break
+
+            matches.append(names[i])
+
+        return matches
+
+    def fuzzy(self, query: str = None, limit: int = 5, cutoff: float = 0.6) -> list[str]:
+        """Names closest to query, best match first. See difflib.get_close_matches() for cutoff."""
+        if not query:
+            return []
+
+        return difflib.get_close_matches(
+            query.strip().lower(), self._sorted_names, n=limit, cutoff=cutoff
+        )
+
+    def update(self, names: Iterable[str] = (), urls: Iterable[str] = ()) -> IndexDiff:
+        """Replace the indexed listing with a new one, only touching entries that changed."""
+        incoming: dict[str, str] = {
+            name.lower(): url for name, url in zip(names, urls, strict=True)
+        }
+
+        removed: list[str] = [name for name in self._entries if name not in incoming]
+        added: list[str] = []
+        changed: list[str] = []
+
+        for name in removed:
+            self._remove(name)
+            self._sorted_names.pop(bisect_left(self._sorted_names, name))
+
+        for name, url in incoming.items():
+            entry = self._entries.get(name)
+
+            if entry is None:
+                self._add(name, url)
+                insort(self._sorted_names, name)
+                added.append(name)
+
+            elif entry[1] != url:
+                self._remove(name)
+                self._add(name, url)
+                changed.append(name)
+
+        return IndexDiff(added=added, removed=removed, changed=changed)
+
+    def update_from_listing(self, listing=None) -> IndexDiff:
+        """.update() from a PokemonListing, or a list of APIPokemonResource objects."""
+        if listing is None:
+            raise ValueError("Missing Pokemon listing to index.")
+
+        if hasattr(listing, "names") and hasattr(listing, "urls"):
+            return self.update(listing.names, listing.urls)
+
+        return self.update([p.name for p in listing], [p.request_url for p in listing])
+
+    def to_dict(self) -> dict:
+        """Cacheable representation. Names are stored sorted & IDs pre-parsed, so .from_dict() doesn't redo either."""
+        return {
+            "version": INDEX_FORMAT_VERSION,
+            "names": list(self._sorted_names),
+            "urls": [self._entries[name][1] for name in self._sorted_names],
+            "ids": [self._entries[name][0] for name in self._sorted_names],
+        }
+
+    @classmethod
+    def from_dict(cls, data: dict = None) -> PokemonIndex:
+        if data is None:
+            raise ValueError("Missing index data.")
+        if data.get("version") != INDEX_FORMAT_VERSION:
+            raise ValueError(f"Unsupported index format version: {data.get('version')}")
+
+        names: list[str] = data["names"]
+        ids: list[int | None] = data["ids"]
+
+        index = cls.__new__(cls)
+        index._entries = dict(zip(names, zip(ids, data["urls"], strict=True), strict=True))
+        index._by_id = {
+            pokemon_id: name for name, pokemon_id in zip(names, ids) if pokemon_id is not None
+        }
+        index._sorted_names = list(names)
+
+        return index
@@ -0,0 +1,117 @@
+"""SQLAlchemy models for the normalized Pokemon store.
+
+Each Pokemon is a row in "pokemon", with its stats, types & abilities in child tables. Types &
+abilities are lookup tables keyed by their Pokemon API IDs. The columns queries filter on (type,
+ability & stat name, base stat, stat total) are indexed.
+"""
+from __future__ import annotations
+
+from sqlalchemy import Boolean, Float, ForeignKey, Index, Integer, String
+from sqlalchemy.orm import DeclarativeBase, Mapped, mapped_column, relationship
+
+class Base(DeclarativeBase):
+    pass
+
+
+class TypeModel(Base):
+    __tablename__ = "types"
+
+    id: Mapped[int] = mapped_column(Integer, primary_key=True)
+    name: Mapped[str] = mapped_column(String(50), unique=True, index=True)
+
+
+class AbilityModel(Base):
+    __tablename__ = "abilities"
+
+    id: Mapped[int] = mapped_column(Integer, primary_key=True)
+    name: Mapped[str] = mapped_column(String(100), unique=True, index=True)
+
+
+class PokemonModel(Base):
+    __tablename__ = "pokemon"
+
+    id: Mapped[int] = mapped_column(Integer, primary_key=True)
+    name: Mapped[str] = mapped_column(String(100), unique=True, index=True)
+    height: Mapped[int | None] = mapped_column(Integer, nullable=True)
+    weight: Mapped[int | None] = mapped_column(Integer, nullable=True)
+    base_experience: Mapped[int | None] = mapped_column(Integer, nullable=True)
+    species: Mapped[str | None] = mapped_column(String(100), nullable=True)
+    sprite: Mapped[str | None] = mapped_column(String(255), nullable=True)
+    ## Sum of base stats, NULL until the Pokemon's stats are stored
+    stat_total: Mapped[int | None] = mapped_column(Integer, nullable=True, index=True)
+    ## Unix timestamp of the last upsert
+    updated_at: Mapped[float] = mapped_column(Float)
+
+    stats: Mapped[list[PokemonStatModel]] = relationship(
+        back_populates="pokemon", cascade="all, delete-orphan", lazy="selectin"
+    )
+    types: Mapped[list[PokemonTypeModel]] = relationship(
+        back_populates="pokemon",
+        cascade="all, delete-orphan",
+        lazy="selectin",
+        order_by="PokemonTypeModel.slot",
+    )
+    abilities: Mapped[list[PokemonAbilityModel]] = relationship(
+        back_populates="pokemon",
+        cascade="all, delete-orphan",
+        lazy="selectin",
+        order_by="PokemonAbilityModel.slot",
+    )
+
+    @property
+    def type_names(self) -> list[str]:
+        return [t.type.name for t in self.types]
+
+    @property
+    def ability_names(self) -> list[str]:
+        return [a.ability.name for a in self.abilities]
+
+    @property
+    def base_stats(self) -> dict[str, int]:
+        return {s.stat: s.base_stat for s in self.stats}
+
+    def __repr__(self) -> str:
+        """Show the Pokemon's ID & name."""
+        return f"PokemonModel(id={self.id!r}, name={self.name!r})"
+
+
+class PokemonStatModel(Base):
+    __tablename__ = "pokemon_stats"
+    __table_args__ = (Index("ix_pokemon_stats_stat_base_stat", "stat", "base_stat"),)
+
+    pokemon_id: Mapped[int] = mapped_column(
+        ForeignKey("pokemon.id", ondelete="CASCADE"), primary_key=True
+    )
+    ## Stat name, i.e. "speed" or "special-attack"
+    stat: Mapped[str] = mapped_column(String(50), primary_key=True)
+    base_stat: Mapped[int] = mapped_column(Integer)
+    effort: Mapped[int] = mapped_column(Integer, default=0)
+
+    pokemon: Mapped[PokemonModel] = relationship(back_populates="stats")
+
+
+class PokemonTypeModel(Base):
+    __tablename__ = "pokemon_types"
+
+    pokemon_id: Mapped[int] = mapped_column(
+        ForeignKey("pokemon.id", ondelete="CASCADE"), primary_key=True
+    )
+    slot: Mapped[int] = mapped_column(Integer, primary_key=True)
+    type_id: Mapped[int] = mapped_column(ForeignKey("types.id"), index=True)
+
+    pokemon: Mapped[PokemonModel] = relationship(back_populates="types")
+    type: Mapped[TypeModel] = relationship(lazy="selectin")
+
+
+class PokemonAbilityModel(Base):
+    __tablename__ = "pokemon_abilities"
+
+    pokemon_id: Mapped[int] = mapped_column(
+        ForeignKey("pokemon.id", ondelete="CASCADE"), primary_key=True
+    )
+    slot: Mapped[int] = mapped_column(Integer, primary_key=True)
+    ability_id: Mapped[int] = mapped_column(ForeignKey("abilities.id"), index=True)
+    is_hidden: Mapped[bool] = mapped_column(Boolean, default=False)
+
+    pokemon: Mapped[PokemonModel] = relationship(back_populates="abilities")
+    ability: Mapped[AbilityModel] = relationship(lazy="selectin")
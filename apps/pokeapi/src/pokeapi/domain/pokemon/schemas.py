@@ -0,0 +1,116 @@
+"""Typed projections of a /pokemon/{name} response.
+
+A raw response is mostly moves[].version_group_details & game_indices. A profile declares
+only the fields a consumer reads. Validating a response against a profile drops everything
+else, so the slimmed dict can be cached & passed around in place of the full response.
+"""
+from __future__ import annotations
+
+from typing import Any
+
+from pydantic import BaseModel, Field
+
+class NamedAPIResource(BaseModel):
+    name: str | None = Field(default=None)
+    url: str | None = Field(default=None)
+
+
+class PokemonStat(BaseModel):
+    base_stat: int | None = Field(default=None)
+    effort: int | None = Field(default=None)
+    stat: NamedAPIResource | None = Field(default=None)
+
+
+class PokemonType(BaseModel):
+    slot: int | None = Field(default=None)
+    type: NamedAPIResource | None = Field(default=None)
+
+
+class PokemonAbility(BaseModel):
+    ability: NamedAPIResource | None = Field(default=None)
+    is_hidden: bool | None = Field(default=None)
+    slot: int | None = Field(default=None)
+
+
+class PokemonSprites(BaseModel):
+    """Top-level sprite URLs. The nested "other" & "versions" sprite sets are not kept."""
+
+    front_default: str | None = Field(default=None)
+    front_shiny: str | None = Field(default=None)
+    front_female: str | None = Field(default=None)
+    front_shiny_female: str | None = Field(default=None)
+    back_default: str | None = Field(default=None)
+    back_shiny: str | None = Field(default=None)
+    back_female: str | None = Field(default=None)
+    back_shiny_female: str | None = Field(default=None)
+
+
+class PokemonProfile(BaseModel):
+    """Base class for projection profiles.
+
+    DESCRIPTION:
+    ------------
+
+    Subclasses declare the response fields to keep. Fields not declared on the profile
+    are ignored when validating, which is what strips them from the response.
+
+    Methods
+    -------
+    * .project(): Strip a raw response dict down to this profile's fields.
+
+    """
+
+    id: int | None = Field(default=None)
+    name: str | None = Field(default=None)
+
+    @classmethod
+    def project(cls, response: dict[str, Any] = None) -> dict[str, Any]:
+        """Return a copy of a raw response with only this profile's fields."""
+        if response is None:
+            raise ValueError("Missing response to project.")
+
+        return cls.model_validate(response).model_dump()
+
+
+class PokemonCoreProfile(PokemonProfile):
+    """Identity & physical attributes."""
+
+    height: int | None = Field(default=None)
+    weight: int | None = Field(default=None)
+    base_experience: int | None = Field(default=None)
+    types: list[PokemonType] = Field(default_factory=list)
+
+
+class PokemonBattleProfile(PokemonProfile):
+    """What a battle calculator needs."""
+
+    stats: list[PokemonStat] = Field(default_factory=list)
+    types: list[PokemonType] = Field(default_factory=list)
+    abilities: list[PokemonAbility] = Field(default_factory=list)
+
+
+class PokemonSummaryProfile(PokemonProfile):
+    """Stats, types, abilities & sprites. Covers most consumers."""
+
+    height: int | None = Field(default=None)
+    weight: int | None = Field(default=None)
+    base_experience: int | None = Field(default=None)
+    stats: list[PokemonStat] = Field(default_factory=list)
+    types: list[PokemonType] = Field(default_factory=list)
+    abilities: list[PokemonAbility] = Field(default_factory=list)
+    sprites: PokemonSprites | None = Field(default=None)
+
+
+PROFILES: dict[str, type[PokemonProfile]] = {
+    "core": PokemonCoreProfile,
+    "battle": PokemonBattleProfile,
+    "summary": PokemonSummaryProfile,
+}
+
+
+def get_profile(name: str = None) -> type[PokemonProfile]:
+    """Look up a projection profile by name."""
+    if name not in PROFILES:
+        raise ValueError(f"Invalid profile: {name}. Must be one of {list(PROFILES)}")
+
+    return PROFILES[name]
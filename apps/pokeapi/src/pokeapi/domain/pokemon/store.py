@@ -0,0 +1,440 @@
+"""Normalized, queryable store of fetched Pokemon.
+
+Responses are upserted in bulk, one INSERT ... ON CONFLICT DO UPDATE per table per batch (on
+SQLite & PostgreSQL), so refreshing a batch of Pokemon costs a handful of statements instead of
+one per row. Partial responses (i.e. a projection profile) only overwrite the columns & child
+tables they contain.
+"""
+from __future__ import annotations
+
+import threading
+import time
+
+from typing import Any, Iterable, Iterator
+
+from pokeapi.core.conf import db_settings
+from pokeapi.dependencies.db import get_session_factory
+
+from .index import pokemon_id_from_url
+from .models import (
+    AbilityModel,
+    Base,
+    PokemonAbilityModel,
+    PokemonModel,
+    PokemonStatModel,
+    PokemonTypeModel,
+    TypeModel,
+)
+
+from loguru import logger as log
+from sqlalchemy import delete, func, insert, select
+from sqlalchemy.orm import Session, sessionmaker
+
+## Columns find() can sort by. Any other order_by is treated as a stat name.
+_ORDER_COLUMNS: dict[str, Any] = {
+    "id": PokemonModel.id,
+    "name": PokemonModel.name,
+    "height": PokemonModel.height,
+    "weight": PokemonModel.weight,
+    "base_experience": PokemonModel.base_experience,
+    "stat_total": PokemonModel.stat_total,
+}
+
+
+def _dialect_insert(dialect: str):
+    """Return the dialect's INSERT construct supporting ON CONFLICT, or None."""
+    if dialect == "sqlite":
+        from sqlalchemy.dialects.sqlite import insert as dialect_insert
+    elif dialect == "postgresql":
+        from sqlalchemy.dialects.postgresql import insert as dialect_insert
+    else:
+        return None
+
+    return dialect_insert
+
+
+def _upsert(
+    session: Session, model: type[Base], rows: list[dict], keep_existing: bool = False
+) -> None:
+    """Insert rows, updating the rows already stored (matched on the primary key).
+
+    With keep_existing, NULL values don't overwrite stored values.
+    """
+    if not rows:
+        return
+
+    table = model.__table__
+    dialect_insert = _dialect_insert(session.get_bind().dialect.name)
+
+    if dialect_insert is None:
+        for row in rows:
+            if keep_existing:
+                row = {k: v for k, v in row.items() if v is not None}
+            session.merge(model(**row))
+
+        return
+
+    keys: list[str] = [c.name for c in table.primary_key.columns]
+    stmt = dialect_insert(table).values(rows)
+    updates: dict = {}
+
+    for column in rows[0]:
+        if column in keys:
+            continue
+
+        updates[column] = (
+            func.coalesce(stmt.excluded[column], table.c[column])
+            if keep_existing
+            else stmt.excluded[column]
+        )
+
+    if updates:
+        stmt = stmt.on_conflict_do_update(index_elements=keys, set_=updates)
+    else:
+        stmt = stmt.on_conflict_do_nothing(index_elements=keys)
+
+    session.execute(stmt)
+
+
+def _replace_children(
+    session: Session, model: type[Base], pokemon_ids: list[int], rows: list[dict]
+) -> None:
+    """Replace the child rows of some Pokemon, i.e. their stats."""
+    if not pokemon_ids:
+        return
+
+    session.execute(delete(model).where(model.pokemon_id.in_(pokemon_ids)))
+
+    if rows:
+        session.execute(insert(model), rows)
+
+
+def _resource_id(resource: dict | None) -> tuple[int, str] | None:
+    """(ID, name) of a NamedAPIResource dict, or None if either is missing."""
+    if not resource or not resource.get("name"):
+        return None
+
+    resource_id: int | None = pokemon_id_from_url(resource.get("url"))
+
+    if resource_id is None:
+        return None
+
+    return resource_id, resource["name"]
+
+
+class PokemonStore:
+    """Bulk upserts & indexed queries over a relational store of Pokemon.
+
+    PARAMS:
+    -------
+
+    * session_factory (sessionmaker): Sessions to use. Defaults to pokeapi.dependencies.get_session_factory().
+    * batch_size (int): Max Pokemon per upsert statement. Defaults to db_settings.batch_size.
+    * create_tables (bool): Create missing tables & indexes on init.
+
+    Methods
+    -------
+    * .upsert(): Store Pokemon responses.
+    * .sync_from_cache(): Store every full Pokemon response in a cache.
+    * .find(): Query Pokemon by type, ability & stats.
+    * .get(): Load a Pokemon by name or ID.
+
+    """
+
+    def __init__(
+        self,
+        session_factory: sessionmaker[Session] | None = None,
+        batch_size: int | None = None,
+        create_tables: bool = True,
+    ) -> None:
+        """Set up the store. Defaults to a session factory for db_settings."""
+        self.session_factory = session_factory or get_session_factory()
+        self.batch_size: int = batch_size or db_settings.batch_size
+
+        if create_tables:
+            Base.metadata.create_all(self.session_factory.kw["bind"])
+
+    def upsert(self, responses: Iterable[dict] = None) -> int:
+        """Store (or update) Pokemon from raw or projected /pokemon responses. Returns how many were stored.
+
+        Responses without an ID & name are skipped. Stats, types & abilities are only replaced for
+        responses that include them.
+        """
+        if responses is None:
+            raise ValueError("Missing Pokemon responses to store.")
+
+        batch: list[dict] = []
+        stored: int = 0
+
+        for response in responses:
+            if not isinstance(response, dict):
+                continue
+            if response.get("id") is None or not response.get("name"):
+                continue
+
+            batch.append(response)
+
+            if len(batch) >= self.batch_size:
+                stored += self._upsert_batch(batch)
+                batch = []
+
+        if batch:
+            stored += self._upsert_batch(batch)
+
+        return stored
+
+    def _upsert_batch(self, responses: list[dict]) -> int:
+        now: float = time.time()
+
+        pokemon_rows: list[dict] = []
+        type_rows: dict[int, dict] = {}
+        ability_rows: dict[int, dict] = {}
+        stat_rows: list[dict] = []
+        pokemon_type_rows: list[dict] = []
+        pokemon_ability_rows: list[dict] = []
+        ## IDs of the Pokemon whose stats/types/abilities are replaced
+        with_stats: list[int] = []
+        with_types: list[int] = []
+        with_abilities: list[int] = []
+
+        ## Last response wins for Pokemon repeated in a batch
+        for response in {r["id"]: r for r in responses}.values():
+            pokemon_id: int = response["id"]
+            stats: list[dict] | None = response.get("stats")
+            sprites: dict | None = response.get("sprites")
+            species: dict | None = response.get("species")
+
+            pokemon_rows.append(
+                {
+                    "id": pokemon_id,
+                    "name": response["name"],
+                    "height": response.get("height"),
+                    "weight": response.get("weight"),
+                    "base_experience": response.get("base_experience"),
+                    "species": species.get("name") if species else None,
+                    "sprite": sprites.get("front_default") if sprites else None,
+                    "stat_total": (
+                        sum(s.get("base_stat") or 0 for s in stats) if stats else None
+                    ),
+                    "updated_at": now,
+                }
+            )
+
+            if stats is not None:
+                with_stats.append(pokemon_id)
+                stat_rows.extend(
+                    {
+                        "pokemon_id": pokemon_id,
+                        "stat": s["stat"]["name"],
+                        "base_stat": s.get("base_stat") or 0,
+                        "effort": s.get("effort") or 0,
+                    }
+                    for s in stats
+                    if s.get("stat") and s["stat"].get("name")
+                )
+
+            if response.get("types") is not None:
+                with_types.append(pokemon_id)
+
+                for t in response["types"]:
+                    resource = _resource_id(t.get("type"))
+
+                    if resource is None:
+                        continue
+
+                    type_rows[resource[0]] = {"id": resource[0], "name": resource[1]}
+                    pokemon_type_rows.append(
+                        {
+                            "pokemon_id": pokemon_id,
+                            "slot": t.get("slot") or 0,
+                            "type_id": resource[0],
+                        }
+                    )
+
+            if response.get("abilities") is not None:
+                with_abilities.append(pokemon_id)
+
+                for a in response["abilities"]:
+                    resource = _resource_id(a.get("ability"))
+
+                    if resource is None:
+                        continue
+
+                    ability_rows[resource[0]] = {"id": resource[0], "name": resource[1]}
+                    pokemon_ability_rows.append(
+                        {
+                            "pokemon_id": pokemon_id,
+                            "slot": a.get("slot") or 0,
+                            "ability_id": resource[0],
+                            "is_hidden": bool(a.get("is_hidden")),
+                        }
+                    )
+
+        with self.session_factory.begin() as session:
+            _upsert(session, TypeModel, list(type_rows.values()))
+            _upsert(session, AbilityModel, list(ability_rows.values()))
+            _upsert(session, PokemonModel, pokemon_rows, keep_existing=True)
+            _replace_children(session, PokemonStatModel, with_stats, stat_rows)
+            _replace_children(session, PokemonTypeModel, with_types, pokemon_type_rows)
+            _replace_children(
+                session, PokemonAbilityModel, with_abilities, pokemon_ability_rows
+            )
+
+        log.debug(f"Stored [{len(pokemon_rows)}] Pokemon")
+
+        return len(pokemon_rows)
+
+    def sync_from_cache(self, cache: Any = None) -> int:
+        """Store every full Pokemon response in a cache (i.e. the "requests" cache). Returns how many were stored."""
+        if cache is None:
+            raise ValueError("Missing cache to read Pokemon responses from.")
+
+        def _responses() -> Iterator[dict]:
+            for key in cache:
+                ## Profiles, metadata, pages & other resources
+                if not isinstance(key, str) or "::" in key or "/" in key or "?" in key:
+                    continue
+
+                value = cache.get(key)
+
+                if isinstance(value, dict) and "stats" in value and "types" in value:
+                    yield value
+
+        stored: int = self.upsert(_responses())
+        log.info(f"Stored [{stored}] cached Pokemon")
+
+        return stored
+
+    def find(
+        self,
+        types: Iterable[str] | None = None,
+        abilities: Iterable[str] | None = None,
+        min_stats: dict[str, int] | None = None,
+        max_stats: dict[str, int] | None = None,
+        name_prefix: str | None = None,
+        order_by: str = "id",
+        descending: bool = False,
+        limit: int | None = None,
+        offset: int = 0,
+    ) -> list[PokemonModel]:
+        """Query stored Pokemon. Every filter given must match.
+
+        DESCRIPTION:
+        ------------
+
+        i.e. Fire types with a base speed over 100, fastest first:
+
+            store.find(types=["fire"], min_stats={"speed": 101}, order_by="speed", descending=True)
+
+        Results are loaded with their stats, types & abilities, and can be used after the query.
+
+        PARAMS:
+        -------
+
+        * types (Iterable[str]): Type names the Pokemon must all have.
+        * abilities (Iterable[str]): Ability names the Pokemon must all have.
+        * min_stats (dict[str, int]): Stat name -> min base stat (inclusive), i.e. {"speed": 100}.
+        * max_stats (dict[str, int]): Stat name -> max base stat (inclusive).
+        * name_prefix (str): Only Pokemon whose name starts with this.
+        * order_by (str): A column (id, name, height, weight, base_experience, stat_total) or a stat name.
+        * descending (bool): Sort in descending order.
+        * limit (int): Max number of results.
+        * offset (int): Number of results to skip.
+        """
+        stmt = select(PokemonModel)
+
+        for type_name in types or ():
+            stmt = stmt.where(
+                PokemonModel.id.in_(
+                    select(PokemonTypeModel.pokemon_id)
+                    .join(TypeModel)
+                    .where(TypeModel.name == type_name)
+                )
+            )
+
+        for ability_name in abilities or ():
+            stmt = stmt.where(
+                PokemonModel.id.in_(
+                    select(PokemonAbilityModel.pokemon_id)
+                    .join(AbilityModel)
+                    .where(AbilityModel.name == ability_name)
+                )
+            )
+
+        for stat, value in (min_stats or {}).items():
+            stmt = stmt.where(
+                PokemonModel.id.in_(
+                    select(PokemonStatModel.pokemon_id).where(
+                        PokemonStatModel.stat == stat,
+                        PokemonStatModel.base_stat >= value,
+                    )
+                )
+            )
+
+        for stat, value in (max_stats or {}).items():
+            stmt = stmt.where(
+                PokemonModel.id.in_(
+                    select(PokemonStatModel.pokemon_id).where(
+                        PokemonStatModel.stat == stat,
+                        PokemonStatModel.base_stat <= value,
+                    )
+                )
+            )
+
+        if name_prefix:
+            stmt = stmt.where(PokemonModel.name.startswith(name_prefix.lower()))
+
+        order = _ORDER_COLUMNS.get(order_by)
+
+        if order is None:
+            order = (
+                select(PokemonStatModel.base_stat)
+                .where(
+                    PokemonStatModel.pokemon_id == PokemonModel.id,
+                    PokemonStatModel.stat == order_by,
+                )
+                .scalar_subquery()
+            )
+
+        stmt = stmt.order_by(order.desc() if descending else order, PokemonModel.id)
+
+        if offset:
+            stmt = stmt.offset(offset)
+        if limit is not None:
+            stmt = stmt.limit(limit)
+
+        with self.session_factory() as session:
+            return list(session.scalars(stmt))
+
+    def get(self, name_or_id: str | int = None) -> PokemonModel | None:
+        """Load a stored Pokemon by name or ID."""
+        if name_or_id is None:
+            raise ValueError("Missing Pokemon name or ID.")
+
+        with self.session_factory() as session:
+            if isinstance(name_or_id, int) or str(name_or_id).isdigit():
+                return session.get(PokemonModel, int(name_or_id))
+
+            return session.scalars(
+                select(PokemonModel).where(PokemonModel.name == name_or_id.lower())
+            ).first()
+
+    def count(self) -> int:
+        """Count the stored Pokemon."""
+        with self.session_factory() as session:
+            return session.scalar(select(func.count()).select_from(PokemonModel))
+
+
+_store: PokemonStore | None = None
+_store_lock: threading.Lock = threading.Lock()
+
+
+def get_pokemon_store() -> PokemonStore:
+    """Return the process-wide PokemonStore, backed by the default database."""
+    global _store
+
+    with _store_lock:
+        if _store is None:
+            _store = PokemonStore()
+
+        return _store
@@ -0,0 +1,58 @@
+"""Export the cached Pokemon to columnar files (stats, types, abilities, sprites & moves tables).
+
+Usage (from the src/ directory):
+
+    python pokeapi/export_pokemon.py
+    python pokeapi/export_pokemon.py --format parquet --output ./export
+    python pokeapi/export_pokemon.py --full
+
+Only Pokemon whose cached response changed since the last export are re-flattened. Load a
+table with pokeapi.utils.export_utils.load_export_table(), i.e. load_export_table("moves").
+Requires the pyarrow package (pip install pyarrow).
+"""
+from __future__ import annotations
+
+import sys
+
+sys.path.append(".")
+
+import argparse
+
+from pokeapi.core.conf import app_settings
+from pokeapi.dependencies import init_cache, loguru_sinks
+from pokeapi.utils.export_utils import EXPORT_FORMATS, ExportResult, export_pokemon
+from pokeapi.utils.path_utils import ensure_dirs_exist
+
+from loguru import logger as log
+from red_utils.ext.loguru_utils import init_logger
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Export cached Pokemon to columnar files.")
+    parser.add_argument(
+        "--format", choices=EXPORT_FORMATS, default="arrow", help="File format to write"
+    )
+    parser.add_argument(
+        "--output", default=None, help="Directory to write to. Defaults to [data_dir]/export"
+    )
+    parser.add_argument(
+        "--full", action="store_true", help="Re-export every Pokemon, not just changed ones"
+    )
+
+    return parser.parse_args()
+
+
+if __name__ == "__main__":
+    ensure_dirs_exist([app_settings.data_dir, app_settings.cache_dir])
+    init_logger(sinks=loguru_sinks)
+
+    args = parse_args()
+
+    result: ExportResult = export_pokemon(
+        cache=init_cache("requests"),
+        directory=args.output,
+        format=args.format,
+        full=args.full,
+    )
+
+    if not result.rows.get("stats"):
+        log.warning("No cached Pokemon were exported. Run pokeapi/main.py to cache Pokemon first.")
@@ -0,0 +1,84 @@
+"""Look up Pokemon by name, ID, prefix, or a fuzzy match, using the cached Pokemon index.
+
+Usage (from the src/ directory):
+
+    python pokeapi/find_pokemon.py pikachu
+    python pokeapi/find_pokemon.py 25
+    python pokeapi/find_pokemon.py pika --prefix
+    python pokeapi/find_pokemon.py pikchu --fuzzy
+"""
+from __future__ import annotations
+
+import sys
+
+sys.path.append(".")
+
+import argparse
+
+from pokeapi.core.conf import app_settings
+from pokeapi.dependencies import init_cache, loguru_sinks
+from pokeapi.domain.api.responses import APIAllPokemon
+from pokeapi.domain.pokemon import IndexEntry, PokemonIndex
+from pokeapi.utils.path_utils import ensure_dirs_exist
+from pokeapi.utils.pokemon_utils import load_pokemon_index, update_pokemon_index
+
+from loguru import logger as log
+from red_utils.ext.loguru_utils import init_logger
+
+def get_index() -> PokemonIndex | None:
+    """Load the index from the app cache, building it from the cached listing if it's missing."""
+    app_cache = init_cache("app")
+    index: PokemonIndex | None = load_pokemon_index(cache=app_cache)
+
+    if index is not None:
+        return index
+
+    all_pokemon: APIAllPokemon | None = APIAllPokemon.from_cache(init_cache("requests"))
+    if all_pokemon is None:
+        log.error(
+            "No cached Pokemon listing to build the index from. Run pokeapi/main.py first."
+        )
+
+        return None
+
+    return update_pokemon_index(all_pokemon, cache=app_cache)
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Look up Pokemon in the cached index.")
+    parser.add_argument("query", help="Pokemon name, ID, or search string")
+    mode = parser.add_mutually_exclusive_group()
+    mode.add_argument("--prefix", action="store_true", help="List names starting with query")
+    mode.add_argument("--fuzzy", action="store_true", help="List names closest to query")
+    parser.add_argument("--limit", type=int, default=10, help="Max number of matches to list")
+
+    return parser.parse_args()
+
+
+if __name__ == "__main__":
+    ensure_dirs_exist([app_settings.data_dir, app_settings.cache_dir])
+    init_logger(sinks=loguru_sinks)
+
+    args = parse_args()
+    index: PokemonIndex | None = get_index()
+
+    if index is None:
+        sys.exit(1)
+
+    if args.prefix:
+        matches: list[str] = index.prefix(args.query, limit=args.limit)
+    elif args.fuzzy:
+        matches: list[str] = index.fuzzy(args.query, limit=args.limit)
+    else:
+        entry: IndexEntry | None = index.get(args.query)
+
+        if entry is None:
+            log.warning(f"No Pokemon found for [{args.query}]. Close matches: {index.fuzzy(args.query)}")
+            sys.exit(1)
+
+        print(f"{entry.id}\t{entry.name}\t{entry.url}")
+        sys.exit(0)
+
+    for name in matches:
+        entry = index.by_name(name)
+        print(f"{entry.id}\t{entry.name}\t{entry.url}")
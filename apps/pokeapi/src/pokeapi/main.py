@@ -8,7 +8,7 @@ from pokeapi.core.conf import api_settings, app_settings
 from pokeapi.dependencies import init_cache, loguru_sinks
 from pokeapi.domain.api.responses import APIAllPokemon, APIPokemonResource
 from pokeapi.utils.path_utils import ensure_dirs_exist
-from pokeapi.utils.pokemon_utils import cache_all_pokemon
+from pokeapi.utils.pokemon_utils import cache_all_pokemon, update_pokemon_index
 
 from loguru import logger as log
 from red_utils.ext.loguru_utils import init_logger
@@ -28,3 +28,6 @@ if __name__ == "__main__":
     all_pokemon: APIAllPokemon = APIAllPokemon()
     ## Retrieve all pokemon, using cached responses if available
     all_pokemon.get_pokemon(use_cache=True, cache=req_cache)
+    ## Index the listing for name/ID/prefix lookups
+    if all_pokemon.pokemon_list is not None:
+        update_pokemon_index(all_pokemon, cache=app_cache)
@@ -0,0 +1,92 @@
+"""Query the normalized Pokemon store by type, ability & base stats.
+
+Usage (from the src/ directory):
+
+    python pokeapi/query_pokemon.py --sync
+    python pokeapi/query_pokemon.py --type fire --min speed=101 --order-by speed --desc
+    python pokeapi/query_pokemon.py --type water --type ground --max attack=80
+    python pokeapi/query_pokemon.py --ability levitate --order-by stat_total --desc --limit 5
+"""
+from __future__ import annotations
+
+import sys
+
+sys.path.append(".")
+
+import argparse
+
+from pokeapi.core.conf import app_settings
+from pokeapi.dependencies import init_cache, loguru_sinks
+from pokeapi.domain.pokemon import PokemonModel, PokemonStore, get_pokemon_store
+from pokeapi.utils.path_utils import ensure_dirs_exist
+
+from loguru import logger as log
+from red_utils.ext.loguru_utils import init_logger
+
+def parse_stat(value: str) -> tuple[str, int]:
+    """Parse a "stat=value" argument, i.e. "speed=100"."""
+    stat, _, base = value.partition("=")
+
+    if not stat or not base.isdigit():
+        raise argparse.ArgumentTypeError(f"Expected stat=value, i.e. speed=100, not {value!r}")
+
+    return stat, int(base)
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Query the normalized Pokemon store.")
+    parser.add_argument(
+        "--sync",
+        action="store_true",
+        help="Store every Pokemon in the requests cache before querying",
+    )
+    parser.add_argument("--type", action="append", default=[], help="Type the Pokemon must have")
+    parser.add_argument(
+        "--ability", action="append", default=[], help="Ability the Pokemon must have"
+    )
+    parser.add_argument(
+        "--min", action="append", default=[], type=parse_stat, help="Min base stat, i.e. speed=100"
+    )
+    parser.add_argument(
+        "--max", action="append", default=[], type=parse_stat, help="Max base stat, i.e. attack=80"
+    )
+    parser.add_argument("--prefix", default=None, help="Name prefix")
+    parser.add_argument(
+        "--order-by", default="id", help="Column (id, name, stat_total...) or stat name to sort by"
+    )
+    parser.add_argument("--desc", action="store_true", help="Sort in descending order")
+    parser.add_argument("--limit", type=int, default=20, help="Max number of results")
+
+    return parser.parse_args()
+
+
+if __name__ == "__main__":
+    ensure_dirs_exist([app_settings.data_dir, app_settings.cache_dir])
+    init_logger(sinks=loguru_sinks)
+
+    args = parse_args()
+    store: PokemonStore = get_pokemon_store()
+
+    if args.sync:
+        store.sync_from_cache(init_cache("requests"))
+
+    if not store.count():
+        log.error("The Pokemon store is empty. Run with --sync after caching Pokemon.")
+        sys.exit(1)
+
+    results: list[PokemonModel] = store.find(
+        types=args.type,
+        abilities=args.ability,
+        min_stats=dict(args.min),
+        max_stats=dict(args.max),
+        name_prefix=args.prefix,
+        order_by=args.order_by,
+        descending=args.desc,
+        limit=args.limit,
+    )
+
+    for pokemon in results:
+        stats: str = " ".join(f"{k}={v}" for k, v in pokemon.base_stats.items())
+        print(
+            f"{pokemon.id}\t{pokemon.name}\t{'/'.join(pokemon.type_names)}\t{pokemon.stat_total}\t{stats}"
+        )
@@ -1,52 +1,61 @@
+from __future__ import annotations
+
 import sys
 
 sys.path.append(".")
 
+import argparse
+import functools
+import random
+
+from pokeapi.celery_tasks import (
+    refresh_all_pokemon,
+    refresh_pokemon_batch,
+    refresh_pokemon_in_batches,
+    refresh_single_pokemon,
+)
+from pokeapi.celeryapp import (
+    app as celery_app,
+    profile_sent_tasks,
+)
 from pokeapi.core.conf import app_settings, celery_settings
-from pokeapi.dependencies import init_cache, loguru_sinks
+from pokeapi.core.schedule import RefreshCandidate, RefreshScheduler
+from pokeapi.dependencies import (
+    SamplingProfiler,
+    init_cache,
+    loguru_sinks,
+    metrics,
+    span,
+    start_metrics_server,
+    traced,
+)
+from pokeapi.dependencies.profiling import DEFAULT_INTERVAL
 from pokeapi.domain.api.responses import APIAllPokemon, APIPokemonResource
 from pokeapi.domain.enums.celery_enums import CeleryTaskState
+from pokeapi.utils.celery_utils import iter_completed_results
 from pokeapi.utils.path_utils import ensure_dirs_exist
-from pokeapi.utils.pokemon_utils import cache_all_pokemon
+from pokeapi.utils.pokemon_utils import cache_all_pokemon, plan_pokemon_refresh
 
-from loguru import logger as log
+from celery.exceptions import TimeoutError as CeleryTimeoutError
+from celery.result import AsyncResult
 import diskcache
 
+from dynaconf import settings
+from loguru import logger as log
+from red_utils.ext.context_managers.cli_spinners import SimpleSpinner
 from red_utils.ext.diskcache_utils import check_cache_key_exists, get_val, set_val
 from red_utils.ext.loguru_utils import init_logger
-from red_utils.ext.context_managers.cli_spinners import SimpleSpinner
-
-from pokeapi.celery_tasks import refresh_all_pokemon, refresh_single_pokemon
-from pokeapi.celeryapp import app as celery_app
-from celery.result import AsyncResult
-
-import random
-
-from dynaconf import settings
-
-import time
-
-CONTINUUOUS: bool = True
-LOOP_SLEEP: int = 3600
-
-
-def check_task(task_id: str | None = None) -> AsyncResult:
-    if task_id is None:
-        raise ValueError("Missing task_id to check.")
-
-    task = AsyncResult(task_id)
-
-    # log.debug(f"Task ID [{task_id}] state: {task.state}")
-
-    return task.state, task.result
-
 
+@traced("refresh.listing")
 def run_all_pokemon_refresh(
     all_pokemon: APIAllPokemon = APIAllPokemon(),
-    task_sleep: int = 10,
-) -> None:
+    timeout: float | None = None,
+) -> APIAllPokemon | None:
     log.info("Refreshing cache of all Pokemon resources")
 
+    if timeout is None:
+        timeout = celery_settings.refresh_task_timeout
+
     try:
         with SimpleSpinner("Refreshing all Pokemon resource objects in cache... "):
             all_pokemon_res: AsyncResult = refresh_all_pokemon.delay(
@@ -58,146 +67,234 @@ def run_all_pokemon_refresh(
         )
         log.error(msg)
 
-    while True:
-        all_pokemon_state, result = check_task(all_pokemon_res.id)
-        log.debug(f"Refreshed state: {all_pokemon_state}")
+        return None
 
-        if all_pokemon_state == "SUCCESS":
-            # log.debug(f"Result: {result}")
-            all_pokemon_res = APIAllPokemon.model_validate(result)
-            log.info("Refresh all Pokemon resources task completed successfully!")
+    try:
+        with SimpleSpinner(f"Waiting on task [{all_pokemon_res.id}]... "):
+            for task_id, meta in iter_completed_results([all_pokemon_res], timeout=timeout):
+                if meta["status"] == CeleryTaskState.SUCCESS.value:
+                    log.info("Refresh all Pokemon resources task completed successfully!")
 
-            return all_pokemon_res
-            break
-        elif all_pokemon_state in ("FAILURE", "REVOKED"):
-            log.error(
-                f"Task [{all_pokemon_res.id}] failed or revoked. State: {all_pokemon_state}."
-            )
-            break
-        else:
-            with SimpleSpinner(
-                f"Task [{all_pokemon_res.id}] is still in progress. Waiting for {task_sleep} second(s)..."
-            ):
-                time.sleep(task_sleep)
+                    return APIAllPokemon.model_validate(meta["result"])
+
+                log.error(f"Task [{task_id}] failed or revoked. State: {meta['status']}.")
+    except CeleryTimeoutError:
+        log.error(
+            f"Timed out waiting on refresh_all_pokemon task [{all_pokemon_res.id}] after {timeout}s"
+        )
 
+    return None
+
+
+@traced("refresh.batches")
+def loop_refresh_pokemon_resources(
+    all_pokemon: APIAllPokemon = None,
+    chunk_size: int | None = None,
+    timeout: float | None = None,
+) -> list[APIPokemonResource]:
+    if all_pokemon is None or all_pokemon.pokemon_list is None:
+        raise ValueError("Missing APIAllPokemon object with a populated pokemon_list.")
 
-def loop_refresh_pokemon_resources(all_pokemon: APIAllPokemon = None):
     all_pokemon_list: list[APIPokemonResource] = all_pokemon.pokemon_list
     log.debug(f"Refreshing [{len(all_pokemon_list)}] Pokemon...")
 
-    refresh_pokemon_tasks: list[AsyncResult] = []
+    if timeout is None:
+        timeout = celery_settings.refresh_task_timeout
 
-    with SimpleSpinner("Refreshing cached Pokemon resources"):
-        for p in all_pokemon_list:
-            try:
-                refresh_pokemon_res: AsyncResult = refresh_single_pokemon.delay(
-                    pokemon_dict=p.model_dump()
-                )
-            except Exception as exc:
-                msg = Exception(
-                    f"Unhandled exception running Celery task, refresh_all_pokemon(). Details: {exc}"
-                )
-                log.error(msg)
+    try:
+        with SimpleSpinner("Sending Pokemon refresh batches... "):
+            refresh_res: AsyncResult = refresh_pokemon_in_batches(
+                pokemon_list=all_pokemon_list, chunk_size=chunk_size
+            )
+    except Exception as exc:
+        msg = Exception(
+            f"Unhandled exception running Celery task, refresh_pokemon_batch(). Details: {exc}"
+        )
+        log.error(msg)
 
-            refresh_pokemon_tasks.append(refresh_pokemon_res)
+        return []
 
     return_pokemon: list[APIPokemonResource] = []
+    ## The chord's header group holds the batch task results
+    batch_results: list[AsyncResult] = refresh_res.parent.results
 
-    for refresh_task in refresh_pokemon_tasks:
-        task_id: int = refresh_task.id
-        log.debug(f"Working on task [{task_id}]")
+    metrics.REFRESH_CYCLES.inc()
+    metrics.REFRESH_PLANNED.set(len(all_pokemon_list))
+    metrics.REFRESH_CYCLE_DISPATCHED.set(len(all_pokemon_list))
+    metrics.REFRESH_DISPATCHED.inc(len(all_pokemon_list))
 
-        while True:
-            refresh_pokemon_state, result = check_task(refresh_task.id)
-            log.debug(
-                f"Task [{refresh_task.id}] refreshed state: {refresh_pokemon_state}"
-            )
-
-            if refresh_pokemon_state == "SUCCESS":
-                # log.debug(f"Result: {result}")
-                refresh_pokemon_res = APIPokemonResource.model_validate(result)
-                log.info(f"Refresh Pokemon resource task completed successfully!")
-
-                return_pokemon.append(refresh_pokemon_res)
-                break
+    try:
+        with SimpleSpinner(f"Collecting [{len(batch_results)}] refresh batch(es)... "):
+            for _, meta in iter_completed_results(batch_results, timeout=timeout):
+                if meta["status"] != CeleryTaskState.SUCCESS.value:
+                    continue
+
+                with span("pydantic.validate", model="APIPokemonResource", count=len(meta["result"])):
+                    return_pokemon.extend(
+                        APIPokemonResource.model_validate(p) for p in meta["result"]
+                    )
+                log.info(
+                    f"Refreshed [{len(return_pokemon)}/{len(all_pokemon_list)}] Pokemon"
+                )
 
-            elif refresh_pokemon_state in ("FAILURE", "REVOKED"):
-                log.error(
-                    f"Task [{refresh_task.id}] failed or revoked. State: {refresh_pokemon_state}."
+        for _, meta in iter_completed_results([refresh_res], timeout=timeout):
+            if meta["status"] == CeleryTaskState.SUCCESS.value:
+                log.info(
+                    f"Refreshed [{meta['result']['refreshed_count']}] Pokemon in [{meta['result']['batches']}] batch(es)."
                 )
-                break
             else:
-                with SimpleSpinner(
-                    f"Task [{refresh_task.id}] is still in progress. Waiting for 5 second(s)..."
-                ):
-                    time.sleep(5)
+                log.error(
+                    f"Refresh aggregation task [{refresh_res.id}] failed or revoked. State: {meta['status']}."
+                )
+    except CeleryTimeoutError:
+        ## Keep the Pokemon of the batches that did finish
+        log.error(
+            f"Timed out waiting on refresh batches after {timeout}s. Collected [{len(return_pokemon)}/{len(all_pokemon_list)}] Pokemon."
+        )
 
     return return_pokemon
 
 
+@traced("refresh.plan")
+def plan_refresh_cycle(cache: diskcache.Cache = None) -> list[RefreshCandidate]:
+    """Revalidate the Pokemon listing, then rank every cached Pokemon for a refresh."""
+    all_pokemon: APIAllPokemon | None = run_all_pokemon_refresh()
+
+    if all_pokemon is None or all_pokemon.pokemon_list is None:
+        log.warning("Could not refresh the Pokemon listing. Planning from the cached listing.")
+        all_pokemon = APIAllPokemon.from_cache(cache)
+
+    if all_pokemon is None:
+        log.error("No Pokemon listing cached yet. Nothing to refresh this cycle.")
+
+        return []
+
+    return plan_pokemon_refresh(all_pokemon=all_pokemon, cache=cache)
+
+
+@traced("refresh.dispatch")
+def dispatch_refresh(pokemon_dicts: list[dict] = None) -> AsyncResult:
+    """Send a batch of due Pokemon to a refresh_pokemon_batch task, without waiting on it."""
+    log.debug(f"Dispatching refresh of [{len(pokemon_dicts)}] Pokemon")
+
+    return refresh_pokemon_batch.delay(pokemon_dicts)
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Keep the Pokemon cache fresh.")
+    parser.add_argument(
+        "--full",
+        action="store_true",
+        help="Refresh every Pokemon once, then exit, instead of running the incremental scheduler",
+    )
+    parser.add_argument(
+        "--profile",
+        action="store_true",
+        help="Profile a single refresh run (with --full, the full refresh, otherwise one scheduler cycle), "
+        "here & in the Celery workers running its tasks, then exit",
+    )
+    parser.add_argument(
+        "--profile-out",
+        default=None,
+        help="File the refresh job's profile is written to. Defaults to [data_dir]/profiles/",
+    )
+    parser.add_argument(
+        "--profile-interval",
+        type=float,
+        default=DEFAULT_INTERVAL,
+        help="Seconds between profiler samples",
+    )
+
+    return parser.parse_args()
+
+
 if __name__ == "__main__":
+    args = parse_args()
+
     ensure_dirs_exist([app_settings.data_dir, app_settings.cache_dir])
     init_logger(sinks=loguru_sinks)
+    start_metrics_server()
 
     req_cache = init_cache("requests")
     app_cache = init_cache("app")
 
-    log.info("Starting background cache refresh tasks")
+    profiler: SamplingProfiler | None = None
+    if args.profile:
+        profiler = SamplingProfiler(interval=args.profile_interval).start()
+        profile_sent_tasks()
 
-    if CONTINUUOUS:
-        loop: bool = True
-        loop_count: int = 0
+    if args.full:
+        log.info("Refreshing every cached Pokemon")
 
-        while loop:
-            log.info(f"[Loop {loop_count}] Starting background cache refresh tasks")
+        refreshed_pokemon: list[APIPokemonResource] = []
 
-            try:
-                all_pokemon: APIAllPokemon = run_all_pokemon_refresh(task_sleep=5)
-            except Exception as exc:
-                log.error(
-                    Exception(f"Unhandled exception refreshing all pokemon: {exc}")
+        with span("refresh.full"):
+            all_pokemon: APIAllPokemon | None = run_all_pokemon_refresh()
+
+            if all_pokemon is None or all_pokemon.pokemon_list is None:
+                log.warning(
+                    "Could not refresh the Pokemon listing. Refreshing from the cached listing."
                 )
+                all_pokemon = APIAllPokemon.from_cache(req_cache)
 
-                loop = False
-                break
+            if all_pokemon is None or all_pokemon.pokemon_list is None:
+                log.error("No Pokemon listing cached yet. Nothing to refresh.")
+            else:
+                refreshed_pokemon = loop_refresh_pokemon_resources(all_pokemon=all_pokemon)
+        log.debug(f"Refreshed [{len(refreshed_pokemon)}]")
 
-            try:
-                refreshed_pokemon: list[
-                    APIPokemonResource
-                ] = loop_refresh_pokemon_resources(all_pokemon=all_pokemon)
-            except Exception as exc:
-                log.error(
-                    Exception(
-                        f"Unhandled exception refreshing individual Pokemon. Details: {exc}"
-                    )
-                )
-                loop = False
-                break
+        if len(refreshed_pokemon) > 0:
+            rand_index: int = random.randint(0, len(refreshed_pokemon) - 1)
+            refreshed: APIPokemonResource = refreshed_pokemon[rand_index]
 
-            log.debug(f"Refreshed [{len(refreshed_pokemon)}]")
+            log.debug(f"(Sample) Refreshed Pokemon [{refreshed.name}]")
 
-            if len(refreshed_pokemon) > 0:
-                rand_index: int = random.randint(0, len(refreshed_pokemon) - 1)
-                refreshed: APIPokemonResource = refreshed_pokemon[rand_index]
+    else:
+        ## A profiled cycle keeps its tasks' results, to profile until they're done
+        dispatched: list[AsyncResult] = []
 
-                log.debug(f"(Sample) Refreshed Pokemon [{refreshed.name}]")
+        def _dispatch(pokemon_dicts: list[dict] = None) -> AsyncResult:
+            result: AsyncResult = dispatch_refresh(pokemon_dicts)
+            if args.profile:
+                dispatched.append(result)
 
-            log.info("Finished refreshing cache.")
-            with SimpleSpinner(
-                f"[Loop {loop_count}] Finished refreshing cache. Sleeping for {LOOP_SLEEP} second(s)..."
-            ):
-                time.sleep(LOOP_SLEEP)
-                loop_count += 1
+            return result
 
-    else:
-        all_pokemon: APIAllPokemon = run_all_pokemon_refresh(task_sleep=5)
-        refreshed_pokemon: list[APIPokemonResource] = loop_refresh_pokemon_resources(
-            all_pokemon=all_pokemon
+        scheduler = RefreshScheduler(
+            plan=functools.partial(plan_refresh_cycle, cache=req_cache),
+            dispatch=_dispatch,
         )
-        log.debug(f"Refreshed [{len(refreshed_pokemon)}]")
 
-        if len(refreshed_pokemon) > 0:
-            rand_index: int = random.randint(0, len(refreshed_pokemon) - 1)
-            refreshed: APIPokemonResource = refreshed_pokemon[rand_index]
+        if args.profile:
+            log.info("Running a single refresh scheduler cycle")
 
-            log.debug(f"(Sample) Refreshed Pokemon [{refreshed.name}]")
+            scheduler.plan_cycle()
+            ## The cycle is spread over the whole interval, dispatch all of it now
+            scheduler.drain()
+
+            try:
+                with SimpleSpinner(f"Waiting on [{len(dispatched)}] refresh batch(es)... "):
+                    for task_id, meta in iter_completed_results(
+                        dispatched, timeout=celery_settings.refresh_task_timeout
+                    ):
+                        if meta["status"] != CeleryTaskState.SUCCESS.value:
+                            log.error(
+                                f"Refresh batch [{task_id}] failed or revoked. State: {meta['status']}."
+                            )
+            except CeleryTimeoutError:
+                log.error(
+                    f"Timed out waiting on refresh batches after {celery_settings.refresh_task_timeout}s"
+                )
+
+        else:
+            log.info("Starting incremental cache refresh scheduler")
+
+            try:
+                scheduler.run_forever()
+            except KeyboardInterrupt:
+                log.info(f"Stopping refresh scheduler. Stats: {scheduler.stats()}")
+
+    if profiler is not None:
+        profiler.stop()
+        profiler.write(args.profile_out)
+        log.info(profiler.summary())
@@ -0,0 +1,6 @@
+from __future__ import annotations
+
+from . import app, http, representations
+from .app import ReadAPI
+from .http import HTTPServer, Request, Response
+from .representations import Representation, RepresentationCache
@@ -0,0 +1,423 @@
+"""Read API over the cached Pokemon API responses.
+
+Routes:
+
+* GET /pokemon/{name or ID}[?profile=summary]: A Pokemon, as cached (optionally a projection profile).
+* GET /pokemon[?limit=20&offset=0]: A page of the Pokemon listing, shaped like the Pokemon API's.
+* GET /index/{name or ID}: Name, ID & URL of a Pokemon, from the Pokemon index.
+* GET /index?prefix=pika | ?fuzzy=pikchu[&limit=10]: Names from the Pokemon index.
+* GET /health: Server status & response cache stats.
+* GET /metrics: Prometheus metrics (see pokeapi.dependencies.metrics).
+
+Responses carry a weak ETag & answer If-None-Match with 304 Not Modified. Bodies are served from
+a RepresentationCache, gzip-compressed ahead of time for clients accepting gzip.
+
+In cache-only mode, only cached responses are served. Otherwise, follows the freshness policies:
+a missing or expired response is requested (& cached) before it's served, and a stale one is
+served right away & refreshed in the background.
+"""
+from __future__ import annotations
+
+import asyncio
+import time
+
+from typing import Any, Awaitable, Callable
+
+from pokeapi.core.conf import api_settings, server_settings
+from pokeapi.dependencies import metrics_enabled, render_metrics
+from pokeapi.domain.api.responses import (
+    APIAllPokemon,
+    APIPokemonResource,
+    CacheMeta,
+    get_freshness_policy,
+    load_cache_meta,
+    profile_key,
+)
+from pokeapi.domain.enums.cache_enums import Freshness
+from pokeapi.domain.pokemon import PROFILES, IndexEntry, PokemonIndex
+from pokeapi.utils.pokemon_utils import load_pokemon_index, response_fingerprint
+
+from .http import Request, Response
+from .representations import Representation, RepresentationCache
+
+import diskcache
+
+from loguru import logger as log
+
+## Key the /pokemon listing is cached under
+LISTING_KEY: str = "all_pokemon"
+## Max Pokemon per listing page
+MAX_PAGE_SIZE: int = 100000
+
+
+class ReadAPI:
+    """Serve cached Pokemon API responses over HTTP. Pass .handle to an HTTPServer.
+
+    PARAMS:
+    -------
+
+    * cache (diskcache.Cache): Cache of Pokemon API responses, i.e. the "requests" cache.
+    * app_cache (diskcache.Cache): Cache the Pokemon index is stored in, i.e. the "app" cache.
+    * cache_only (bool): Never request the Pokemon API. Defaults to server_settings.cache_only.
+    * representations (RepresentationCache): Cache of encoded responses. Defaults to one of
+        server_settings.response_cache_size bytes.
+    * recheck_interval (float): Seconds a response without a CacheMeta (so without a fingerprint)
+        is served from its encoded copy before the cache is read again. Also how often the Pokemon
+        index is reloaded.
+    """
+
+    def __init__(
+        self,
+        cache: diskcache.Cache = None,
+        app_cache: diskcache.Cache | None = None,
+        cache_only: bool | None = None,
+        representations: RepresentationCache | None = None,
+        recheck_interval: float = 30.0,
+    ) -> None:
+        """Set up the API. Responses are encoded on their first request."""
+        if cache is None:
+            raise ValueError("Missing cache to serve responses from.")
+
+        self.cache = cache
+        self.app_cache = app_cache
+        self.cache_only: bool = (
+            server_settings.cache_only if cache_only is None else cache_only
+        )
+        self.representations: RepresentationCache = (
+            representations or RepresentationCache(server_settings.response_cache_size)
+        )
+        self.recheck_interval = recheck_interval
+
+        self._index: PokemonIndex | None = None
+        self._index_loaded_at: float | None = None
+        ## Keys being refreshed in the background
+        self._refreshing: set[str] = set()
+        self._tasks: set[asyncio.Task] = set()
+
+        self.requests: int = 0
+        self.not_modified: int = 0
+        self.upstream_fetches: int = 0
+
+    async def handle(self, request: Request) -> Response:
+        self.requests += 1
+        parts: list[str] = [p for p in request.path.split("/") if p]
+
+        if parts == ["pokemon"]:
+            return await self.listing(request)
+        if len(parts) == 2 and parts[0] == "pokemon":
+            return await self.pokemon(request, parts[1])
+        if parts == ["index"]:
+            return await self.search_index(request)
+        if len(parts) == 2 and parts[0] == "index":
+            return await self.lookup_index(parts[1])
+        if parts == ["health"]:
+            return Response.json(self.stats(), headers={"Cache-Control": "no-store"})
+        if parts == ["metrics"]:
+            return await self.metrics()
+
+        return Response.error(404, f"No route for [{request.path}]")
+
+    ##############
+    # Responses  #
+    ##############
+
+    def _send(self, request: Request, rep: Representation) -> Response:
+        """Respond with a representation, compressed if accepted, or 304 if the client has it."""
+        headers: dict[str, str] = {
+            "Content-Type": "application/json",
+            "ETag": rep.etag,
+            "Vary": "Accept-Encoding",
+            "Cache-Control": f"public, max-age={server_settings.max_age}",
+        }
+
+        if _etag_matches(request.headers.get("if-none-match"), rep.etag):
+            self.not_modified += 1
+
+            return Response(304, headers=headers)
+
+        if rep.gzip_body is not None and request.accepts_gzip():
+            headers["Content-Encoding"] = "gzip"
+
+            return Response(200, rep.gzip_body, headers)
+
+        return Response(200, rep.body, headers)
+
+    def _schedule_refresh(self, key: str, fetch: Callable[[], Awaitable[Any]]) -> None:
+        if key in self._refreshing:
+            return
+
+        self._refreshing.add(key)
+
+        async def _refresh() -> None:
+            try:
+                await fetch()
+            except Exception as exc:
+                log.warning(f"Background refresh of [{key}] failed. Details: {exc}")
+            finally:
+                self._refreshing.discard(key)
+
+        task: asyncio.Task = asyncio.create_task(_refresh())
+        ## Keep a reference, so the task isn't garbage collected before it finishes
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+
+    async def _load_meta(self, cache_key: str) -> CacheMeta | None:
+        """Load a response's CacheMeta off the event loop, like the response itself."""
+        return await asyncio.to_thread(load_cache_meta, self.cache, cache_key)
+
+    async def _fetch(self, fetch: Callable[[], Awaitable[Any]]) -> Any:
+        self.upstream_fetches += 1
+
+        return await fetch()
+
+    async def representation(
+        self,
+        cache_key: str = None,
+        resource_type: str = "pokemon",
+        fetch: Callable[[], Awaitable[Any]] | None = None,
+        rep_key: str | None = None,
+        transform: Callable[[Any], Any] | None = None,
+    ) -> Representation | None:
+        """Return the encoded response for a cache key, or None if it isn't cached (& can't be fetched).
+
+        PARAMS:
+        -------
+
+        * cache_key (str): Key the response is cached under.
+        * resource_type (str): FreshnessPolicy to follow ("pokemon", "resource" or "listing").
+        * fetch (Callable): Requests & caches the response. Not called in cache-only mode.
+        * rep_key (str): Key of the representation. Defaults to cache_key.
+        * transform (Callable): Builds the body from the cached response, i.e. a listing page.
+        """
+        rep_key = rep_key or cache_key
+        meta: CacheMeta | None = await self._load_meta(cache_key)
+
+        if not self.cache_only and fetch is not None and meta is not None:
+            policy = get_freshness_policy(resource_type)
+            freshness: Freshness = (
+                Freshness.FRESH if policy is None else policy.freshness(meta)
+            )
+
+            if freshness == Freshness.EXPIRED:
+                await self._fetch(fetch)
+                meta = await self._load_meta(cache_key)
+            elif freshness == Freshness.STALE:
+                self._schedule_refresh(cache_key, lambda: self._fetch(fetch))
+
+        fingerprint: str | None = None
+        if meta is not None and (meta.etag or meta.fetched_at):
+            fingerprint = response_fingerprint(meta)
+
+        rep: Representation | None = self.representations.get(rep_key)
+
+        if rep is not None:
+            if fingerprint is not None and rep.fingerprint == fingerprint:
+                return rep
+            if (
+                fingerprint is None
+                and time.monotonic() - rep.built_at < self.recheck_interval
+            ):
+                return rep
+
+        content: Any = await asyncio.to_thread(self.cache.get, cache_key)
+
+        if content is None:
+            if self.cache_only or fetch is None:
+                return None
+
+            content = await self._fetch(fetch)
+
+            if content is None:
+                return None
+
+            meta = await self._load_meta(cache_key)
+            if meta is not None and (meta.etag or meta.fetched_at):
+                fingerprint = response_fingerprint(meta)
+
+        if transform is not None:
+            content = transform(content)
+
+        rep = await asyncio.to_thread(
+            Representation.build,
+            content,
+            fingerprint,
+            server_settings.gzip_min_size,
+            server_settings.gzip_level,
+        )
+        self.representations.set(rep_key, rep)
+
+        return rep
+
+    ##########
+    # Routes #
+    ##########
+
+    def _resolve_name(self, name_or_id: str) -> str | None:
+        index: PokemonIndex | None = self.index()
+
+        if index is not None:
+            entry: IndexEntry | None = index.get(name_or_id)
+
+            if entry is not None:
+                return entry.name
+
+        if name_or_id.isdigit():
+            ## Pokemon are cached by name, an ID can't be served without the index
+            return None
+
+        return name_or_id.lower()
+
+    async def pokemon(self, request: Request, name_or_id: str) -> Response:
+        profile: str | None = request.query.get("profile")
+
+        if profile is not None and profile not in PROFILES:
+            return Response.error(
+                400, f"Invalid profile [{profile}]. Must be one of {list(PROFILES)}"
+            )
+
+        name: str | None = self._resolve_name(name_or_id)
+
+        if name is None:
+            return Response.error(404, f"Unknown Pokemon [{name_or_id}]")
+
+        resource: APIPokemonResource = APIPokemonResource(
+            name=name, url=f"{api_settings.base_url}/pokemon/{name}/", profile=profile
+        )
+
+        rep: Representation | None = await self.representation(
+            cache_key=profile_key(name, profile),
+            resource_type="pokemon",
+            fetch=lambda: resource.aget(use_cache=True, cache=self.cache),
+        )
+
+        if rep is None:
+            return Response.error(404, f"Pokemon [{name_or_id}] is not cached")
+
+        return self._send(request, rep)
+
+    async def listing(self, request: Request) -> Response:
+        try:
+            limit: int = int(request.query.get("limit", 20))
+            offset: int = int(request.query.get("offset", 0))
+        except ValueError:
+            return Response.error(400, "limit & offset must be integers")
+
+        if not 0 < limit <= MAX_PAGE_SIZE or offset < 0:
+            return Response.error(
+                400, f"limit must be between 1 & {MAX_PAGE_SIZE}, offset at least 0"
+            )
+
+        def _page(content: dict) -> dict:
+            results: list[dict] = content.get("results") or []
+            count: int = len(results)
+
+            return {
+                "count": count,
+                "next": (
+                    f"/pokemon?offset={offset + limit}&limit={limit}"
+                    if offset + limit < count
+                    else None
+                ),
+                "previous": (
+                    f"/pokemon?offset={max(0, offset - limit)}&limit={limit}"
+                    if offset > 0
+                    else None
+                ),
+                "results": results[offset : offset + limit],
+            }
+
+        rep: Representation | None = await self.representation(
+            cache_key=LISTING_KEY,
+            resource_type="listing",
+            fetch=lambda: APIAllPokemon().aget_pokemon(use_cache=True, cache=self.cache),
+            rep_key=f"{LISTING_KEY}?limit={limit}&offset={offset}",
+            transform=_page,
+        )
+
+        if rep is None:
+            return Response.error(404, "The Pokemon listing is not cached")
+
+        return self._send(request, rep)
+
+    def index(self) -> PokemonIndex | None:
+        """Return the Pokemon index from the app cache, reloaded every recheck_interval seconds."""
+        if self.app_cache is None:
+            return None
+
+        now: float = time.monotonic()
+
+        if (
+            self._index_loaded_at is None
+            or now - self._index_loaded_at >= self.recheck_interval
+        ):
+            self._index = load_pokemon_index(cache=self.app_cache)
+            self._index_loaded_at = now
+
+        return self._index
+
+    async def lookup_index(self, query: str) -> Response:
+        index: PokemonIndex | None = self.index()
+
+        if index is None:
+            return Response.error(503, "The Pokemon index is not built yet")
+
+        entry: IndexEntry | None = index.get(query)
+
+        if entry is None:
+            return Response.error(404, f"Unknown Pokemon [{query}]")
+
+        return Response.json({"name": entry.name, "id": entry.id, "url": entry.url})
+
+    async def search_index(self, request: Request) -> Response:
+        index: PokemonIndex | None = self.index()
+
+        if index is None:
+            return Response.error(503, "The Pokemon index is not built yet")
+
+        try:
+            limit: int = int(request.query.get("limit", 10))
+        except ValueError:
+            return Response.error(400, "limit must be an integer")
+
+        if "prefix" in request.query:
+            names: list[str] = index.prefix(request.query["prefix"], limit=limit)
+        elif "fuzzy" in request.query:
+            names: list[str] = index.fuzzy(request.query["fuzzy"], limit=limit)
+        else:
+            return Response.error(400, "Pass a prefix or fuzzy query")
+
+        return Response.json({"results": names})
+
+    async def metrics(self) -> Response:
+        if not metrics_enabled():
+            return Response.error(404, "Metrics are disabled")
+
+        body, content_type = await asyncio.to_thread(render_metrics)
+
+        return Response(200, body, {"Content-Type": content_type, "Cache-Control": "no-store"})
+
+    def stats(self) -> dict:
+        return {
+            "status": "ok",
+            "cache_only": self.cache_only,
+            "requests": self.requests,
+            "not_modified": self.not_modified,
+            "upstream_fetches": self.upstream_fetches,
+            "refreshing": len(self._refreshing),
+            "representations": self.representations.stats(),
+        }
+
+
+def _etag_matches(if_none_match: str | None, etag: str) -> bool:
+    """Weak comparison of an If-None-Match header against an ETag."""
+    if not if_none_match:
+        return False
+
+    if if_none_match.strip() == "*":
+        return True
+
+    opaque: str = etag.removeprefix("W/")
+
+    return any(
+        tag.strip().removeprefix("W/") == opaque for tag in if_none_match.split(",")
+    )
@@ -0,0 +1,264 @@
+"""Minimal asyncio HTTP/1.1 server for the read API.
+
+Handles GET & HEAD requests with keep-alive, and hands each parsed Request to an async handler
+returning a Response. Request bodies are read & discarded. There's no TLS, chunked encoding or
+HTTP/2: the server is meant to sit on an internal network (or behind a proxy).
+"""
+from __future__ import annotations
+
+import asyncio
+
+from http import HTTPStatus
+import json
+import socket
+from typing import Any, Awaitable, Callable, NamedTuple
+from urllib.parse import parse_qsl, unquote, urlsplit
+
+from loguru import logger as log
+
+## Max size of a request line & headers
+MAX_HEADER_SIZE: int = 16384
+
+
+class Request(NamedTuple):
+    method: str
+    path: str
+    query: dict[str, str]
+    ## Header names are lowercased
+    headers: dict[str, str]
+    version: str
+
+    def accepts_gzip(self) -> bool:
+        """Return True if the client accepts gzip-encoded responses."""
+        for coding in self.headers.get("accept-encoding", "").split(","):
+            name, _, params = coding.strip().partition(";")
+
+            if name.strip().lower() in ("gzip", "*"):
+                return params.replace(" ", "").lower() not in ("q=0", "q=0.0", "q=0.00", "q=0.000")
+
+        return False
+
+
+class Response:
+    """An HTTP response with a complete body (sent with a Content-Length)."""
+
+    __slots__ = ("status", "body", "headers")
+
+    def __init__(
+        self,
+        status: int = 200,
+        body: bytes = b"",
+        headers: dict[str, str] | None = None,
+    ) -> None:
+        """Create a response with a complete body."""
+        self.status = status
+        self.body = body
+        self.headers: dict[str, str] = headers or {}
+
+    @classmethod
+    def json(
+        cls, content: Any = None, status: int = 200, headers: dict[str, str] | None = None
+    ) -> Response:
+        return cls(
+            status=status,
+            body=json.dumps(content, separators=(",", ":")).encode(),
+            headers={"Content-Type": "application/json", **(headers or {})},
+        )
+
+    @classmethod
+    def error(cls, status: int = 500, detail: str | None = None) -> Response:
+        return cls.json({"detail": detail or HTTPStatus(status).phrase}, status=status)
+
+    def encode(self, head_only: bool = False, keep_alive: bool = True) -> bytes:
+        lines: list[str] = [f"HTTP/1.1 {self.status} {HTTPStatus(self.status).phrase}"]
+        lines.extend(f"{k}: {v}" for k, v in self.headers.items())
+
+        ## 304s & HEAD responses describe the body they'd send, 304s without a Content-Length
+        if self.status != 304:
+            lines.append(f"Content-Length: {len(self.body)}")
+        if not keep_alive:
+            lines.append("Connection: close")
+
+        head: bytes = ("\r\n".join(lines) + "\r\n\r\n").encode("latin-1")
+
+        if head_only or self.status == 304:
+            return head
+
+        return head + self.body
+
+
+Handler = Callable[[Request], Awaitable[Response]]
+
+
+def parse_request(head: bytes) -> Request:
+    """Parse a request line & headers. Raises ValueError for malformed requests."""
+    lines: list[str] = head.decode("latin-1").split("\r\n")
+    method, target, version = lines[0].split(" ")
+
+    if not version.startswith("HTTP/1."):
+        raise ValueError(f"Unsupported HTTP version: {version}")
+
+    headers: dict[str, str] = {}
+
+    for line in lines[1:]:
+        if not line:
+            continue
+
+        name, sep, value = line.partition(":")
+
+        if not sep:
+            raise ValueError(f"Malformed header: {line!r}")
+
+        headers[name.strip().lower()] = value.strip()
+
+    url = urlsplit(target)
+
+    return Request(
+        method=method.upper(),
+        path=unquote(url.path),
+        query=dict(parse_qsl(url.query)),
+        headers=headers,
+        version=version,
+    )
+
+
+class HTTPServer:
+    """Serve a handler over HTTP/1.1.
+
+    PARAMS:
+    -------
+
+    * handler (Callable): Async function taking a Request & returning a Response.
+    * host (str): Address to listen on.
+    * port (int): Port to listen on.
+    * keepalive_timeout (float): Seconds an idle keep-alive connection stays open.
+    * reuse_port (bool): Set SO_REUSEPORT, so several processes can accept on the same port.
+    """
+
+    def __init__(
+        self,
+        handler: Handler = None,
+        host: str = "0.0.0.0",
+        port: int = 5000,
+        keepalive_timeout: float = 15.0,
+        reuse_port: bool = False,
+    ) -> None:
+        """Configure the server. Listening starts with .start()."""
+        if handler is None:
+            raise ValueError("Missing handler to serve.")
+
+        self.handler = handler
+        self.host = host
+        self.port = port
+        self.keepalive_timeout = keepalive_timeout
+        self.reuse_port = reuse_port
+
+        self._server: asyncio.Server | None = None
+        ## Open connections, closed by .close() instead of waiting out their keep-alive
+        self._connections: dict[asyncio.Task, asyncio.StreamWriter] = {}
+
+    async def start(self) -> asyncio.Server:
+        self._server = await asyncio.start_server(
+            self._serve_connection,
+            host=self.host,
+            port=self.port,
+            limit=MAX_HEADER_SIZE,
+            reuse_port=self.reuse_port or None,
+        )
+
+        ## Port 0 picks a free port
+        self.port = self._server.sockets[0].getsockname()[1]
+        log.info(f"Serving HTTP on {self.host}:{self.port}")
+
+        return self._server
+
+    async def serve_forever(self) -> None:
+        if self._server is None:
+            await self.start()
+
+        async with self._server:
+            await self._server.serve_forever()
+
+    async def close(self) -> None:
+        """Stop accepting connections & close the open ones."""
+        if self._server is not None:
+            self._server.close()
+
+        ## Idle keep-alive connections see EOF & end their loop, busy ones once their handler returns
+        connections: dict[asyncio.Task, asyncio.StreamWriter] = dict(self._connections)
+        for writer in connections.values():
+            writer.close()
+
+        await asyncio.gather(*connections, return_exceptions=True)
+
+        if self._server is not None:
+            await self._server.wait_closed()
+
+    async def _serve_connection(
+        self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter
+    ) -> None:
+        task: asyncio.Task | None = asyncio.current_task()
+        if task is not None:
+            self._connections[task] = writer
+
+        sock: socket.socket | None = writer.get_extra_info("socket")
+        if sock is not None and sock.family in (socket.AF_INET, socket.AF_INET6):
+            sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+
+        try:
+            while True:
+                try:
+                    head: bytes = await asyncio.wait_for(
+                        reader.readuntil(b"\r\n\r\n"), timeout=self.keepalive_timeout
+                    )
+                except asyncio.LimitOverrunError:
+                    writer.write(Response.error(431).encode(keep_alive=False))
+                    break
+                except (asyncio.IncompleteReadError, asyncio.TimeoutError, ConnectionError):
+                    break
+
+                try:
+                    request: Request = parse_request(head)
+                except ValueError as exc:
+                    writer.write(Response.error(400, str(exc)).encode(keep_alive=False))
+                    break
+
+                body_size: int = int(request.headers.get("content-length") or 0)
+                if body_size:
+                    await reader.readexactly(body_size)
+
+                keep_alive: bool = _keep_alive(request)
+
+                if request.method not in ("GET", "HEAD"):
+                    response = Response.error(405)
+                    response.headers["Allow"] = "GET, HEAD"
+                else:
+                    try:
+                        response = await self.handler(request)
+                    except Exception as exc:
+                        log.exception(f"Unhandled error serving [{request.path}]: {exc}")
+                        response = Response.error(500)
+
+                writer.write(
+                    response.encode(head_only=request.method == "HEAD", keep_alive=keep_alive)
+                )
+                await writer.drain()
+
+                if not keep_alive:
+                    break
+
+        except (ConnectionError, asyncio.IncompleteReadError):
+            pass
+
+        finally:
+            self._connections.pop(task, None)
+            writer.close()
+
+
+def _keep_alive(request: Request) -> bool:
+    connection: str = request.headers.get("connection", "").lower()
+
+    if request.version == "HTTP/1.0":
+        return connection == "keep-alive"
+
+    return connection != "close"
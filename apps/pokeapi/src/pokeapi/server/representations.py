@@ -0,0 +1,126 @@
+"""Encoded responses, ready to send.
+
+Decoding a cached response, encoding it to JSON & compressing it costs far more than sending it,
+so each response is encoded (and gzipped, past a size threshold) once, and kept in a size-bounded
+LRU along with its ETag. A representation is tied to the fingerprint of the cached response it
+was built from, and rebuilt when the response changes.
+"""
+from __future__ import annotations
+
+from collections import OrderedDict
+import gzip
+import hashlib
+import json
+import threading
+import time
+
+from typing import Any, NamedTuple
+
+class Representation(NamedTuple):
+    """A response body, encoded once.
+
+    * body (bytes): JSON body.
+    * gzip_body (bytes | None): gzip-compressed body, or None for small bodies.
+    * etag (str): Weak ETag of the body.
+    * fingerprint (str | None): Fingerprint of the cached response it was built from.
+    * built_at (float): Monotonic time it was built.
+    """
+
+    body: bytes
+    gzip_body: bytes | None
+    etag: str
+    fingerprint: str | None
+    built_at: float
+
+    @classmethod
+    def build(
+        cls,
+        content: Any = None,
+        fingerprint: str | None = None,
+        gzip_min_size: int = 1024,
+        gzip_level: int = 6,
+    ) -> Representation:
+        body: bytes = json.dumps(content, separators=(",", ":")).encode()
+        gzip_body: bytes | None = None
+
+        if len(body) >= gzip_min_size:
+            ## mtime=0 keeps the compressed bytes identical across builds
+            gzip_body = gzip.compress(body, compresslevel=gzip_level, mtime=0)
+
+        return cls(
+            body=body,
+            gzip_body=gzip_body,
+            etag=f'W/"{hashlib.blake2b(body, digest_size=12).hexdigest()}"',
+            fingerprint=fingerprint,
+            built_at=time.monotonic(),
+        )
+
+    @property
+    def size(self) -> int:
+        return len(self.body) + len(self.gzip_body or b"")
+
+
+class RepresentationCache:
+    """Size-bounded LRU of Representations by key.
+
+    PARAMS:
+    -------
+
+    * max_size (int): Max total size of the kept bodies, in bytes.
+    """
+
+    def __init__(self, max_size: int = 134217728) -> None:
+        """Create an empty cache of up to [max_size] bytes."""
+        self.max_size = max_size
+
+        self._items: OrderedDict[str, Representation] = OrderedDict()
+        self._size: int = 0
+        self._lock = threading.Lock()
+
+        self.hits: int = 0
+        self.misses: int = 0
+        self.evictions: int = 0
+
+    def __len__(self) -> int:
+        """Count the cached representations."""
+        return len(self._items)
+
+    def get(self, key: str = None) -> Representation | None:
+        with self._lock:
+            rep: Representation | None = self._items.get(key)
+
+            if rep is None:
+                self.misses += 1
+
+                return None
+
+            self._items.move_to_end(key)
+            self.hits += 1
+
+            return rep
+
+    def set(self, key: str = None, rep: Representation = None) -> None:
+        if rep.size > self.max_size:
+            return
+
+        with self._lock:
+            old: Representation | None = self._items.pop(key, None)
+            if old is not None:
+                self._size -= old.size
+
+            self._items[key] = rep
+            self._size += rep.size
+
+            while self._size > self.max_size:
+                _, evicted = self._items.popitem(last=False)
+                self._size -= evicted.size
+                self.evictions += 1
+
+    def stats(self) -> dict[str, int]:
+        return {
+            "entries": len(self._items),
+            "size": self._size,
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+        }
@@ -0,0 +1,100 @@
+"""Export & import whole caches as memory-mapped snapshot files.
+
+Usage (from the src/ directory):
+
+    python pokeapi/snapshot_cache.py export
+    python pokeapi/snapshot_cache.py export --cache requests --dir ./snapshots --codec msgpack-zstd
+    python pokeapi/snapshot_cache.py import --dir ./snapshots
+    python pokeapi/snapshot_cache.py info
+
+Snapshots are written to [dir]/[cache name].pksnap (the directory defaults to the
+cache_snapshot_dir setting, or [data_dir]/snapshots). Bake them into an image or mount them,
+and point cache_snapshot_dir at them to seed new containers' caches on startup, or serve one
+directly with start_server.py --snapshot-dir.
+"""
+from __future__ import annotations
+
+import sys
+
+sys.path.append(".")
+
+import argparse
+
+from pathlib import Path
+
+from pokeapi.core.conf import app_settings
+from pokeapi.dependencies import (
+    Snapshot,
+    default_snapshot_dir,
+    init_cache,
+    loguru_sinks,
+    restore_snapshot,
+    snapshot_path,
+    write_snapshot,
+)
+from pokeapi.dependencies.codecs import CODECS
+from pokeapi.utils.path_utils import ensure_dirs_exist
+
+from loguru import logger as log
+from red_utils.ext.loguru_utils import init_logger
+
+## Caches snapshotted when no --cache is passed
+DEFAULT_CACHES: list[str] = ["requests", "app"]
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Export & import cache snapshots.")
+    parser.add_argument("action", choices=["export", "import", "info"])
+    parser.add_argument(
+        "--cache",
+        action="append",
+        default=None,
+        help=f"Cache to snapshot. Repeat for several. Defaults to {DEFAULT_CACHES}",
+    )
+    parser.add_argument(
+        "--dir",
+        default=None,
+        help="Snapshot directory. Defaults to the cache_snapshot_dir setting, or [data_dir]/snapshots",
+    )
+    parser.add_argument(
+        "--codec",
+        choices=list(CODECS),
+        default=None,
+        help="Codec for exported values. Defaults to the cache_snapshot_codec setting",
+    )
+    parser.add_argument(
+        "--overwrite",
+        action="store_true",
+        help="On import, replace entries already in the cache",
+    )
+
+    return parser.parse_args()
+
+
+if __name__ == "__main__":
+    ensure_dirs_exist([app_settings.data_dir, app_settings.cache_dir])
+    init_logger(sinks=loguru_sinks)
+
+    args = parse_args()
+    directory: Path = Path(args.dir) if args.dir else default_snapshot_dir()
+
+    for cache_name in args.cache or DEFAULT_CACHES:
+        path: Path = snapshot_path(cache_name, directory)
+
+        if args.action == "export":
+            write_snapshot(init_cache(cache_name, seed=False), path, codec=args.codec)
+            continue
+
+        if not path.exists():
+            log.warning(f"No snapshot of cache [{cache_name}] at {path}")
+            continue
+
+        with Snapshot(path) as snapshot:
+            if args.action == "info":
+                log.info(snapshot.info)
+                continue
+
+            written: int = restore_snapshot(
+                init_cache(cache_name, seed=False), snapshot, overwrite=args.overwrite
+            )
+            log.info(f"Imported [{written}/{snapshot.count}] entries into cache [{cache_name}]")
@@ -1,3 +1,10 @@
 from __future__ import annotations
 
-from . import path_utils, pokemon_utils
+from . import (
+    celery_utils,
+    crawl_utils,
+    export_utils,
+    path_utils,
+    pokemon_utils,
+    stats_utils,
+)
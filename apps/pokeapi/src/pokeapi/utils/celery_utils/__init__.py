@@ -0,0 +1,4 @@
+from __future__ import annotations
+
+from . import operations
+from .operations import iter_completed_results
@@ -0,0 +1,53 @@
+from __future__ import annotations
+
+from typing import Iterator
+
+from pokeapi.domain.enums.celery_enums import CeleryTaskState
+
+from celery.result import AsyncResult, ResultSet
+from loguru import logger as log
+
+def iter_completed_results(
+    results: list[AsyncResult] = None, timeout: float | None = None
+) -> Iterator[tuple[str, dict]]:
+    """Yield (task_id, meta) for each Celery task result in the order the tasks finish.
+
+    DESCRIPTION:
+    ------------
+
+    Uses the result backend's native iteration instead of polling each result in turn.
+    With the Redis backend, results arrive through pub/sub as soon as a task finishes,
+    so one slow task doesn't hold up collecting the others. Logs a progress count as
+    each result arrives.
+
+    The meta dict has the task's "status" (see CeleryTaskState) and "result". Failed tasks
+    are yielded like any other; check meta["status"].
+
+    PARAMS:
+    -------
+
+    * results (list[AsyncResult]): The task results to wait on.
+    * timeout (float): Seconds to wait for all results before raising celery.exceptions.TimeoutError.
+        Waits forever if None.
+    """
+    if results is None:
+        raise ValueError("Missing list of AsyncResult objects to collect.")
+
+    total: int = len(results)
+    if total == 0:
+        return
+
+    result_set: ResultSet = ResultSet(results)
+    completed: int = 0
+
+    for task_id, meta in result_set.iter_native(timeout=timeout):
+        completed += 1
+
+        if meta["status"] == CeleryTaskState.SUCCESS.value:
+            log.debug(f"[{completed}/{total}] Task [{task_id}] completed successfully.")
+        else:
+            log.warning(
+                f"[{completed}/{total}] Task [{task_id}] finished with state: {meta['status']}"
+            )
+
+        yield task_id, meta
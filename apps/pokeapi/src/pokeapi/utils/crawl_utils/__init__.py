@@ -0,0 +1,4 @@
+from __future__ import annotations
+
+from . import operations
+from .operations import CrawlResult, acrawl_resources, crawl_resources
@@ -0,0 +1,202 @@
+from __future__ import annotations
+
+from collections import Counter
+from typing import Iterable, NamedTuple
+
+from pokeapi.core.fetch import as_completed_limited, run_sync
+from pokeapi.dependencies import get_async_client
+from pokeapi.domain.api.responses import (
+    APIPokemonResource,
+    APIResource,
+    iter_resource_refs,
+    resource_endpoint,
+    resource_key,
+)
+
+import diskcache
+import httpx
+
+from loguru import logger as log
+
+class CrawlResult(NamedTuple):
+    """Summary of a crawl.
+
+    * fetched (int): Resources loaded (from the cache or the Pokemon API).
+    * failed (list[str]): URLs of resources that could not be loaded.
+    * by_endpoint (dict[str, int]): Resources loaded per endpoint.
+    * depth (int): Deepest level of links followed.
+    """
+
+    fetched: int
+    failed: list[str]
+    by_endpoint: dict[str, int]
+    depth: int
+
+
+def _link_resource(url: str = None, name: str | None = None) -> APIResource | None:
+    """Return the resource a link points to. None for Pokemon links without a name."""
+    if resource_endpoint(url) != "pokemon":
+        return APIResource(url=url)
+
+    if name is None:
+        log.debug(f"Skipping Pokemon link without a name [{url}]")
+
+        return None
+
+    return APIPokemonResource(name=name, url=url)
+
+
+async def acrawl_resources(
+    start: Iterable[APIResource | str] = None,
+    cache: diskcache.Cache | None = None,
+    max_depth: int = 1,
+    include: Iterable[str] | None = None,
+    exclude: Iterable[str] | None = None,
+    concurrency: int | None = None,
+    revalidate: bool = False,
+) -> CrawlResult:
+    """Load resources & the resources they link to, breadth-first, caching every response.
+
+    DESCRIPTION:
+    ------------
+
+    Level 0 is the start resources. Each following level is every resource linked from the
+    previous level's responses (see links.iter_resource_links()) that hasn't been seen yet, so
+    a resource shared by many others (i.e. a type referenced by hundreds of Pokemon) is loaded
+    once. Links are followed up to max_depth levels deep, and only to endpoints passing the
+    include & exclude filters. Each level is loaded with at most [concurrency] requests in
+    flight, through the pooled client.
+
+    Start resources are loaded as-is. Pass APIPokemonResource objects without a profile to crawl
+    from Pokemon, profiles strip the links out of the response. Linked Pokemon are loaded as
+    APIPokemonResource objects, so they're cached by name like the rest of the app expects. Pokemon
+    without a name (including start URLs) are skipped, the Pokemon listing covers them.
+
+    PARAMS:
+    -------
+
+    * start (Iterable[APIResource | str]): Resources, or resource URLs, to start from.
+    * cache (diskcache.Cache): Cache to read responses from & store them in.
+    * max_depth (int): Levels of links to follow. 0 only loads the start resources.
+    * include (Iterable[str]): Only follow links to these endpoints, i.e. ["type", "ability"].
+        Defaults to every endpoint.
+    * exclude (Iterable[str]): Never follow links to these endpoints.
+    * concurrency (int): Max number of requests in flight at once. Defaults to api_settings.max_concurrency.
+    * revalidate (bool): When True, revalidate cached responses instead of trusting them as-is.
+    """
+    if start is None:
+        raise ValueError("Missing resources to start crawling from.")
+    if max_depth < 0:
+        raise ValueError(f"Max depth can't be negative, not {max_depth}")
+
+    include = None if include is None else set(include)
+    exclude = set(exclude or ())
+
+    def _follow(url: str) -> bool:
+        endpoint: str | None = resource_endpoint(url)
+
+        if endpoint is None or endpoint in exclude:
+            return False
+
+        return include is None or endpoint in include
+
+    ## The frontier holds resources not loaded yet. seen holds every resource key ever queued.
+    frontier: list[APIResource] = []
+    seen: set[str] = set()
+
+    for item in start:
+        resource: APIResource | None = (
+            _link_resource(item) if isinstance(item, str) else item
+        )
+        if resource is None:
+            continue
+
+        ## Pokemon are cached by name, but are linked to by URL
+        key: str = resource_key(resource.request_url) or resource.cache_key
+
+        if key not in seen:
+            seen.add(key)
+            frontier.append(resource)
+
+    client: httpx.AsyncClient = get_async_client()
+    use_cache: bool = cache is not None
+
+    async def _load(resource: APIResource) -> dict | None:
+        return await resource.aget(
+            use_cache=use_cache, cache=cache, client=client, revalidate=revalidate
+        )
+
+    fetched: int = 0
+    failed: list[str] = []
+    by_endpoint: Counter = Counter()
+    depth: int = 0
+
+    while frontier:
+        log.info(f"[Depth {depth}] Loading [{len(frontier)}] resource(s)")
+        next_frontier: list[APIResource] = []
+
+        async for resource, res in as_completed_limited(
+            _load, frontier, concurrency=concurrency
+        ):
+            if isinstance(res, Exception) or res is None:
+                log.warning(f"Could not load [{resource.request_url}]. Details: {res}")
+                failed.append(resource.request_url)
+
+                continue
+
+            fetched += 1
+            by_endpoint[resource.endpoint] += 1
+
+            if depth >= max_depth:
+                continue
+
+            for name, url in iter_resource_refs(res):
+                key: str | None = resource_key(url)
+
+                if key is None or key in seen or not _follow(url):
+                    continue
+
+                seen.add(key)
+                linked: APIResource | None = _link_resource(url, name)
+                if linked is not None:
+                    next_frontier.append(linked)
+
+        if not next_frontier:
+            break
+
+        frontier = next_frontier
+        depth += 1
+
+    log.info(
+        f"Crawled [{fetched}] resource(s) [{dict(by_endpoint)}], [{len(failed)}] failed, [{depth}] level(s) deep"
+    )
+
+    return CrawlResult(
+        fetched=fetched, failed=failed, by_endpoint=dict(by_endpoint), depth=depth
+    )
+
+
+def crawl_resources(
+    start: Iterable[APIResource | str] = None,
+    cache: diskcache.Cache | None = None,
+    max_depth: int = 1,
+    include: Iterable[str] | None = None,
+    exclude: Iterable[str] | None = None,
+    concurrency: int | None = None,
+    revalidate: bool = False,
+) -> CrawlResult:
+    """Load resources & the resources they link to, breadth-first, caching every response.
+
+    Synchronous wrapper around acrawl_resources().
+    """
+    return run_sync(
+        acrawl_resources(
+            start=start,
+            cache=cache,
+            max_depth=max_depth,
+            include=include,
+            exclude=exclude,
+            concurrency=concurrency,
+            revalidate=revalidate,
+        )
+    )
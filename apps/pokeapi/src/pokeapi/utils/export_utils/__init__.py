@@ -0,0 +1,10 @@
+from __future__ import annotations
+
+from . import operations
+from .operations import (
+    EXPORT_FORMATS,
+    ExportResult,
+    default_export_dir,
+    export_pokemon,
+    load_export_table,
+)
@@ -0,0 +1,400 @@
+"""Export cached Pokemon as columnar tables, for notebooks & batch jobs.
+
+Each cached /pokemon response is flattened into rows of 5 tables:
+
+* stats: One row per Pokemon. ID, name, physical attributes, each base stat & their total.
+* types: One row per Pokemon type slot.
+* abilities: One row per Pokemon ability slot.
+* sprites: One row per Pokemon, with the top-level sprite URLs.
+* moves: One row per move, version group & learn method (moves[].version_group_details exploded).
+
+Tables are written as uncompressed Arrow IPC files by default, which load with a memory map
+and no copying (see load_export_table()), or as zstd-compressed Parquet files.
+
+Exports are incremental. A manifest next to the tables records a fingerprint of each exported
+response (its ETag & download time from the CacheMeta). The next export only decodes & flattens
+the Pokemon whose fingerprint changed; rows for unchanged Pokemon are carried over from the
+existing files as-is, and nothing is written when nothing changed.
+
+Requires the pyarrow package (pip install pyarrow).
+"""
+from __future__ import annotations
+
+import json
+import os
+
+from pathlib import Path
+from typing import Any, NamedTuple, Union
+
+from pokeapi.core.conf import app_settings
+from pokeapi.domain.api.responses import CacheMeta, load_cache_meta
+from pokeapi.utils.pokemon_utils import (
+    is_pokemon_response,
+    iter_pokemon_cache_keys,
+    response_fingerprint,
+)
+
+import diskcache
+
+from loguru import logger as log
+
+try:
+    import pyarrow as pa
+    import pyarrow.compute as pc
+    import pyarrow.ipc as ipc
+    import pyarrow.parquet as pq
+except ImportError:
+    pa = None
+
+EXPORT_FORMATS: tuple[str, ...] = ("arrow", "parquet")
+## Stat names in the order they're exported, mapped to their column names
+EXPORT_STATS: dict[str, str] = {
+    "hp": "hp",
+    "attack": "attack",
+    "defense": "defense",
+    "special-attack": "special_attack",
+    "special-defense": "special_defense",
+    "speed": "speed",
+}
+EXPORT_SPRITES: tuple[str, ...] = (
+    "front_default",
+    "front_shiny",
+    "front_female",
+    "front_shiny_female",
+    "back_default",
+    "back_shiny",
+    "back_female",
+    "back_shiny_female",
+)
+MANIFEST_FILE: str = "manifest.json"
+
+
+def _require_pyarrow() -> None:
+    if pa is None:
+        raise ImportError(
+            "Exporting Pokemon requires the pyarrow package. Install with: pip install pyarrow"
+        )
+
+
+def _int_fields(*names: str) -> list[pa.Field]:
+    return [pa.field(n, pa.int32()) for n in names]
+
+
+def _schemas() -> dict[str, pa.Schema]:
+    return {
+        "stats": pa.schema(
+            [
+                pa.field("pokemon_id", pa.int32()),
+                pa.field("name", pa.string()),
+                *_int_fields("height", "weight", "base_experience"),
+                *_int_fields(*EXPORT_STATS.values()),
+                pa.field("total", pa.int32()),
+            ]
+        ),
+        "types": pa.schema(
+            [*_int_fields("pokemon_id", "slot"), pa.field("type", pa.string())]
+        ),
+        "abilities": pa.schema(
+            [
+                *_int_fields("pokemon_id", "slot"),
+                pa.field("ability", pa.string()),
+                pa.field("is_hidden", pa.bool_()),
+            ]
+        ),
+        "sprites": pa.schema(
+            [
+                pa.field("pokemon_id", pa.int32()),
+                *[pa.field(s, pa.string()) for s in EXPORT_SPRITES],
+            ]
+        ),
+        "moves": pa.schema(
+            [
+                pa.field("pokemon_id", pa.int32()),
+                pa.field("move", pa.string()),
+                pa.field("version_group", pa.string()),
+                pa.field("learn_method", pa.string()),
+                pa.field("level_learned_at", pa.int32()),
+            ]
+        ),
+    }
+
+
+class ExportResult(NamedTuple):
+    """Summary of an export.
+
+    * directory (Path): Directory the tables were written to.
+    * exported (int): Pokemon (re)flattened in this export.
+    * removed (int): Pokemon dropped because they're no longer cached.
+    * unchanged (int): Pokemon carried over from the previous export.
+    * rows (dict[str, int]): Row count of each table.
+    * written (bool): False if nothing changed & no files were written.
+    """
+
+    directory: Path
+    exported: int
+    removed: int
+    unchanged: int
+    rows: dict[str, int]
+    written: bool
+
+
+def default_export_dir() -> Path:
+    return Path(app_settings.data_dir) / "export"
+
+
+def _table_path(directory: Path, table: str, format: str) -> Path:
+    return directory / f"{table}.{format}"
+
+
+def _name(resource: dict | None) -> str | None:
+    return resource.get("name") if resource else None
+
+
+def _flatten(response: dict, columns: dict[str, dict[str, list]]) -> None:
+    """Append a /pokemon response's rows to each table's columns."""
+    pokemon_id: int = response["id"]
+
+    stats: dict[str, int] = {
+        _name(s.get("stat")): s.get("base_stat") for s in response.get("stats") or ()
+    }
+    row: dict[str, Any] = {
+        "pokemon_id": pokemon_id,
+        "name": response.get("name"),
+        "height": response.get("height"),
+        "weight": response.get("weight"),
+        "base_experience": response.get("base_experience"),
+        **{column: stats.get(stat) for stat, column in EXPORT_STATS.items()},
+        "total": sum(v for v in stats.values() if v is not None) if stats else None,
+    }
+    for column, value in row.items():
+        columns["stats"][column].append(value)
+
+    for t in response.get("types") or ():
+        columns["types"]["pokemon_id"].append(pokemon_id)
+        columns["types"]["slot"].append(t.get("slot"))
+        columns["types"]["type"].append(_name(t.get("type")))
+
+    for a in response.get("abilities") or ():
+        columns["abilities"]["pokemon_id"].append(pokemon_id)
+        columns["abilities"]["slot"].append(a.get("slot"))
+        columns["abilities"]["ability"].append(_name(a.get("ability")))
+        columns["abilities"]["is_hidden"].append(bool(a.get("is_hidden")))
+
+    sprites: dict = response.get("sprites") or {}
+    columns["sprites"]["pokemon_id"].append(pokemon_id)
+    for sprite in EXPORT_SPRITES:
+        columns["sprites"][sprite].append(sprites.get(sprite))
+
+    moves: dict[str, list] = columns["moves"]
+    for m in response.get("moves") or ():
+        move: str | None = _name(m.get("move"))
+
+        for detail in m.get("version_group_details") or ():
+            moves["pokemon_id"].append(pokemon_id)
+            moves["move"].append(move)
+            moves["version_group"].append(_name(detail.get("version_group")))
+            moves["learn_method"].append(_name(detail.get("move_learn_method")))
+            moves["level_learned_at"].append(detail.get("level_learned_at"))
+
+
+def _read_table(path: Path, format: str) -> pa.Table:
+    if format == "arrow":
+        with ipc.open_file(pa.memory_map(str(path))) as reader:
+            return reader.read_all()
+
+    return pq.read_table(path, memory_map=True)
+
+
+def _num_rows(path: Path, format: str) -> int:
+    if format == "arrow":
+        with ipc.open_file(pa.memory_map(str(path))) as reader:
+            return sum(
+                reader.get_batch(i).num_rows for i in range(reader.num_record_batches)
+            )
+
+    return pq.read_metadata(path).num_rows
+
+
+def _write_table(table: pa.Table, path: Path, format: str) -> None:
+    """Write a table next to path & move it into place, so readers never see a partial file."""
+    tmp: Path = path.with_name(f".{path.name}.tmp")
+
+    if format == "arrow":
+        with pa.OSFile(str(tmp), "wb") as sink:
+            with ipc.new_file(sink, table.schema) as writer:
+                writer.write_table(table)
+    else:
+        pq.write_table(table, tmp, compression="zstd")
+
+    os.replace(tmp, path)
+
+
+def load_export_table(
+    table: str = None, directory: Union[str, Path] | None = None, format: str = "arrow"
+) -> pa.Table:
+    """Load an exported table. Arrow files are memory-mapped, so columns aren't copied into memory.
+
+    PARAMS:
+    -------
+
+    * table (str): One of stats, types, abilities, sprites, moves.
+    * directory (str | Path): Export directory. Defaults to [data_dir]/export.
+    * format (str): "arrow" or "parquet".
+    """
+    _require_pyarrow()
+
+    if table is None:
+        raise ValueError("Missing name of the table to load.")
+
+    path: Path = _table_path(Path(directory or default_export_dir()), table, format)
+
+    if not path.exists():
+        raise FileNotFoundError(f"No exported [{table}] table at {path}")
+
+    return _read_table(path, format)
+
+
+def export_pokemon(
+    cache: diskcache.Cache = None,
+    directory: Union[str, Path] | None = None,
+    format: str = "arrow",
+    full: bool = False,
+) -> ExportResult:
+    """Export every cached Pokemon response to columnar tables, incrementally.
+
+    DESCRIPTION:
+    ------------
+
+    Only Pokemon whose cached response changed since the last export are decoded & flattened.
+    Their old rows are dropped from each table, the new rows added, and the tables (sorted by
+    pokemon_id) are written back. Pokemon no longer in the cache are dropped.
+
+    PARAMS:
+    -------
+
+    * cache (diskcache.Cache): The cache the Pokemon responses are stored in, i.e. the "requests" cache.
+    * directory (str | Path): Directory to write the tables & manifest to. Defaults to [data_dir]/export.
+    * format (str): "arrow" (memory-mappable Arrow IPC files) or "parquet".
+    * full (bool): Ignore the previous export & flatten every Pokemon.
+    """
+    _require_pyarrow()
+
+    if cache is None:
+        raise ValueError("Missing cache to export Pokemon from.")
+    if format not in EXPORT_FORMATS:
+        raise ValueError(f"Unknown export format [{format}]. Use one of {EXPORT_FORMATS}")
+
+    directory = Path(directory or default_export_dir())
+    directory.mkdir(parents=True, exist_ok=True)
+    schemas: dict[str, pa.Schema] = _schemas()
+
+    ## Cache key -> [pokemon ID (None for non-Pokemon entries), fingerprint]
+    previous: dict[str, list] = {}
+    manifest_path: Path = directory / MANIFEST_FILE
+
+    if not full and manifest_path.exists():
+        manifest: dict = json.loads(manifest_path.read_text())
+
+        tables_exist: bool = all(
+            _table_path(directory, t, format).exists() for t in schemas
+        )
+        if manifest.get("format") == format and tables_exist:
+            previous = manifest.get("pokemon", {})
+
+    current: dict[str, list] = {}
+    columns: dict[str, dict[str, list]] = {
+        name: {field: [] for field in schema.names} for name, schema in schemas.items()
+    }
+    exported: int = 0
+
+    for key in iter_pokemon_cache_keys(cache):
+        meta: CacheMeta | None = load_cache_meta(cache=cache, cache_key=key)
+        response: Any = None
+
+        if meta is None:
+            response = cache.get(key)
+
+        fingerprint: str = response_fingerprint(meta, response)
+        old: list | None = previous.get(key)
+
+        if old is not None and old[1] == fingerprint:
+            current[key] = old
+
+            continue
+
+        if response is None:
+            response = cache.get(key)
+
+        if not is_pokemon_response(response):
+            current[key] = [None, fingerprint]
+
+            continue
+
+        _flatten(response, columns)
+        current[key] = [response["id"], fingerprint]
+        exported += 1
+
+    ## Rows of Pokemon that changed or are gone are replaced
+    stale_ids: list[int] = [
+        entry[0]
+        for key, entry in previous.items()
+        if entry[0] is not None and current.get(key) != entry
+    ]
+    removed: int = sum(
+        1
+        for key, entry in previous.items()
+        if entry[0] is not None and key not in current
+    )
+    unchanged: int = sum(
+        1
+        for key, entry in current.items()
+        if entry[0] is not None and previous.get(key) == entry
+    )
+
+    if previous and not exported and not stale_ids:
+        log.info(f"Pokemon export in {directory} is up to date")
+
+        return ExportResult(
+            directory=directory,
+            exported=0,
+            removed=0,
+            unchanged=unchanged,
+            rows={t: _num_rows(_table_path(directory, t, format), format) for t in schemas},
+            written=False,
+        )
+
+    rows: dict[str, int] = {}
+
+    for name, schema in schemas.items():
+        path: Path = _table_path(directory, name, format)
+        table: pa.Table = pa.table(columns[name], schema=schema)
+
+        if previous:
+            existing: pa.Table = _read_table(path, format)
+
+            if stale_ids:
+                stale = pc.is_in(existing["pokemon_id"], pa.array(stale_ids, pa.int32()))
+                existing = existing.filter(pc.invert(stale))
+
+            table = pa.concat_tables([existing, table])
+
+        table = table.sort_by("pokemon_id")
+        _write_table(table, path, format)
+        rows[name] = table.num_rows
+
+    tmp: Path = manifest_path.with_name(f".{MANIFEST_FILE}.tmp")
+    tmp.write_text(json.dumps({"format": format, "pokemon": current}))
+    os.replace(tmp, manifest_path)
+
+    log.info(
+        f"Exported Pokemon to {directory}: [{exported}] updated, [{removed}] removed, [{unchanged}] unchanged. Rows: {rows}"
+    )
+
+    return ExportResult(
+        directory=directory,
+        exported=exported,
+        removed=removed,
+        unchanged=unchanged,
+        rows=rows,
+        written=True,
+    )
@@ -1,4 +1,15 @@
 from __future__ import annotations
 
 from . import operations
-from .operations import cache_all_pokemon
+from .operations import (
+    POKEMON_INDEX_KEY,
+    acache_all_pokemon,
+    aiter_cache_all_pokemon,
+    cache_all_pokemon,
+    is_pokemon_response,
+    iter_pokemon_cache_keys,
+    load_pokemon_index,
+    plan_pokemon_refresh,
+    response_fingerprint,
+    update_pokemon_index,
+)
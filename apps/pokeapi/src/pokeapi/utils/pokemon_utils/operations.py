@@ -1,30 +1,99 @@
 from __future__ import annotations
 
-from pokeapi.domain.api.responses import APIPokemonResource
+import asyncio
+import hashlib
+import json
+import time
+
+from typing import Any, AsyncIterable, AsyncIterator, Iterator
+
+from pokeapi.core.conf import cache_settings
+from pokeapi.core.fetch import as_completed_limited, run_sync
+from pokeapi.core.schedule import RefreshCandidate, load_access_counts, refresh_priority
+from pokeapi.dependencies import cache_get_many, get_async_client
+from pokeapi.domain.api.responses import (
+    APIAllPokemon,
+    APIPokemonResource,
+    CacheMeta,
+    load_cache_metas,
+    profile_key,
+)
+from pokeapi.domain.pokemon import PROFILES, IndexDiff, PokemonIndex, PokemonStore
 
 import diskcache
+import httpx
 
 from loguru import logger as log
 
-def cache_all_pokemon(
-    pokemon_list: list[APIPokemonResource] = None,
+## Key the PokemonIndex is stored under in the app cache
+POKEMON_INDEX_KEY: str = "pokemon_index"
+
+
+def iter_pokemon_cache_keys(cache: Any = None) -> Iterator[str]:
+    """Keys in a cache that may hold a full /pokemon response.
+
+    Skips metadata, profiles, pages & other resources. Check values with is_pokemon_response().
+    """
+    for key in cache:
+        if isinstance(key, str) and not any(c in key for c in ("::", "/", "?")):
+            yield key
+
+
+def is_pokemon_response(value: Any = None) -> bool:
+    """Return True if a cached value is a full /pokemon response."""
+    return (
+        isinstance(value, dict)
+        and value.get("id") is not None
+        and "stats" in value
+        and "types" in value
+    )
+
+
+def response_fingerprint(meta: CacheMeta | None = None, response: Any = None) -> str:
+    """Identify a version of a cached response, to tell if it changed since it was last read.
+
+    Uses the ETag & download time from the response's CacheMeta, and hashes the response itself
+    when it has no CacheMeta (i.e. entries cached before CacheMeta existed).
+    """
+    if meta is not None and (meta.etag or meta.fetched_at):
+        return f"{meta.etag}|{meta.fetched_at}"
+
+    return hashlib.sha1(
+        json.dumps(response, sort_keys=True, default=str).encode()
+    ).hexdigest()
+
+
+async def aiter_cache_all_pokemon(
+    pokemon_list: list[APIPokemonResource] | AsyncIterable[APIPokemonResource] = None,
     use_cache: bool = False,
     cache: diskcache.Cache | None = None,
-) -> None:
-    """Loop over list of APIPokemonResource objects and make request, caching the response.
+    concurrency: int | None = None,
+    revalidate: bool = False,
+    store_full: bool = False,
+    store: PokemonStore | None = None,
+) -> AsyncIterator[APIPokemonResource]:
+    """Request every APIPokemonResource in a list concurrently, yielding each one as it completes.
 
     DESCRIPTION:
     ------------
 
-    This function can be run periodically (or scheduled, i.e. with Celery), to keep a cached response
-    for all Pokemon served by the Pokemon API.
+    All requests share the pooled, process-wide httpx.AsyncClient. At most [concurrency]
+    requests are in flight at once. Pokemon that fail to load are logged and skipped.
 
     PARAMS:
     -------
 
-    * pokemon_list (list[APIPokemonResource]): A list of APIPokemonResource instances to be cached.
+    * pokemon_list (list[APIPokemonResource] | AsyncIterable[APIPokemonResource]): APIPokemonResource
+        instances to be cached. Pass APIAllPokemon.aiter_pokemon() to start requesting Pokemon while the
+        listing is still being paged through.
     * use_cache (bool): When True, will try to use the cache.
     * cache (diskcache.Cache): An instantiated diskcache.Cache object for storing the key/value.
+    * concurrency (int): Max number of requests in flight at once. Defaults to api_settings.max_concurrency.
+    * revalidate (bool): When True, revalidate cached responses with conditional requests instead
+        of trusting them as-is.
+    * store_full (bool): For Pokemon with a projection profile set, also cache the full response.
+    * store (PokemonStore): When set, loaded Pokemon are also upserted into this store, in batches
+        of store.batch_size. Failed upserts are logged & don't stop the fetch.
     """
     if pokemon_list is None:
         raise ValueError("Missing list of APIPokemonResource objects.")
@@ -34,13 +103,282 @@ def cache_all_pokemon(
     else:
         use_cache = False
 
-    for pokemon in pokemon_list:
+    client: httpx.AsyncClient = get_async_client()
+
+    async def _request(pokemon: APIPokemonResource) -> APIPokemonResource:
         log.debug(f"Requesting Pokemon [{pokemon.name}] from: {pokemon.request_url}")
+        await pokemon.aget(
+            use_cache=use_cache,
+            cache=cache,
+            client=client,
+            revalidate=revalidate,
+            store_full=store_full,
+        )
+
+        return pokemon
+
+    pending: list[dict] = []
+
+    async def _store_pending() -> None:
+        batch: list[dict] = pending.copy()
+        pending.clear()
+
         try:
-            pokemon.get(use_cache=use_cache, cache=cache)
+            ## Off the event loop, so requests keep flowing while the batch is written
+            await asyncio.to_thread(store.upsert, batch)
         except Exception as exc:
-            log.error(
-                Exception(
-                    f"Unhandled exception requesting Pokemon [{pokemon.name}]. Details: {exc}"
+            log.error(f"Failed to store [{len(batch)}] Pokemon. Details: {exc}")
+
+    try:
+        async for pokemon, res in as_completed_limited(
+            _request, pokemon_list, concurrency=concurrency
+        ):
+            if isinstance(res, Exception):
+                log.error(
+                    Exception(
+                        f"Unhandled exception requesting Pokemon [{pokemon.name}]. Details: {res}"
+                    )
                 )
+
+                continue
+
+            if store is not None and isinstance(res.response, dict):
+                pending.append(res.response)
+
+                if len(pending) >= store.batch_size:
+                    await _store_pending()
+
+            yield res
+
+    finally:
+        if pending:
+            await _store_pending()
+
+
+async def acache_all_pokemon(
+    pokemon_list: list[APIPokemonResource] = None,
+    use_cache: bool = False,
+    cache: diskcache.Cache | None = None,
+    concurrency: int | None = None,
+    revalidate: bool = False,
+    store_full: bool = False,
+    store: PokemonStore | None = None,
+) -> list[APIPokemonResource]:
+    """Request every APIPokemonResource in a list concurrently & return the ones that loaded.
+
+    Results are in completion order. See aiter_cache_all_pokemon() for details.
+    """
+    return [
+        pokemon
+        async for pokemon in aiter_cache_all_pokemon(
+            pokemon_list=pokemon_list,
+            use_cache=use_cache,
+            cache=cache,
+            concurrency=concurrency,
+            revalidate=revalidate,
+            store_full=store_full,
+            store=store,
+        )
+    ]
+
+
+def cache_all_pokemon(
+    pokemon_list: list[APIPokemonResource] = None,
+    use_cache: bool = False,
+    cache: diskcache.Cache | None = None,
+    concurrency: int | None = None,
+    revalidate: bool = False,
+    store_full: bool = False,
+    store: PokemonStore | None = None,
+) -> list[APIPokemonResource]:
+    """Loop over list of APIPokemonResource objects and make request, caching the response.
+
+    DESCRIPTION:
+    ------------
+
+    This function can be run periodically (or scheduled, i.e. with Celery), to keep a cached response
+    for all Pokemon served by the Pokemon API.
+
+    Synchronous wrapper around acache_all_pokemon(). Requests are made concurrently, up to
+    [concurrency] at a time.
+
+    PARAMS:
+    -------
+
+    * pokemon_list (list[APIPokemonResource]): A list of APIPokemonResource instances to be cached.
+    * use_cache (bool): When True, will try to use the cache.
+    * cache (diskcache.Cache): An instantiated diskcache.Cache object for storing the key/value.
+    * concurrency (int): Max number of requests in flight at once. Defaults to api_settings.max_concurrency.
+    * revalidate (bool): When True, revalidate cached responses with conditional requests instead
+        of trusting them as-is.
+    * store_full (bool): For Pokemon with a projection profile set, also cache the full response.
+    * store (PokemonStore): When set, loaded Pokemon are also upserted into this store.
+    """
+    return run_sync(
+        acache_all_pokemon(
+            pokemon_list=pokemon_list,
+            use_cache=use_cache,
+            cache=cache,
+            concurrency=concurrency,
+            revalidate=revalidate,
+            store_full=store_full,
+            store=store,
+        )
+    )
+
+
+def load_pokemon_index(cache: diskcache.Cache = None) -> PokemonIndex | None:
+    """Load the PokemonIndex stored in a cache, or None if there isn't one (or it's unreadable)."""
+    if cache is None:
+        raise ValueError("Missing cache to load the Pokemon index from.")
+
+    data: dict | None = cache.get(POKEMON_INDEX_KEY)
+
+    if data is None:
+        return None
+
+    try:
+        return PokemonIndex.from_dict(data)
+
+    except Exception as exc:
+        log.warning(f"Could not load Pokemon index, it will be rebuilt. Details: {exc}")
+
+        return None
+
+
+def update_pokemon_index(
+    all_pokemon: APIAllPokemon = None, cache: diskcache.Cache = None
+) -> PokemonIndex:
+    """Build or update the PokemonIndex in a cache from a fetched Pokemon listing.
+
+    DESCRIPTION:
+    ------------
+
+    If an index is already cached, only the entries that changed in the listing are updated, and the
+    index is only written back if something changed. Run after APIAllPokemon.get_pokemon().
+
+    PARAMS:
+    -------
+
+    * all_pokemon (APIAllPokemon): An APIAllPokemon with a populated pokemon_list.
+    * cache (diskcache.Cache): The cache to store the index in, i.e. the "app" cache.
+    """
+    if all_pokemon is None or all_pokemon.pokemon_list is None:
+        raise ValueError("Missing APIAllPokemon object with a populated pokemon_list.")
+    if cache is None:
+        raise ValueError("Missing cache to store the Pokemon index in.")
+
+    index: PokemonIndex | None = load_pokemon_index(cache=cache)
+
+    if index is None:
+        index = PokemonIndex.from_listing(all_pokemon.pokemon_list)
+        log.info(f"Built Pokemon index with [{len(index)}] Pokemon")
+
+    else:
+        diff: IndexDiff = index.update_from_listing(all_pokemon.pokemon_list)
+
+        if diff.is_empty:
+            log.debug("Pokemon index is up to date")
+
+            return index
+
+        log.info(
+            f"Updated Pokemon index: [{len(diff.added)}] added, [{len(diff.removed)}] removed, [{len(diff.changed)}] changed"
+        )
+
+    cache.set(POKEMON_INDEX_KEY, index.to_dict())
+
+    return index
+
+
+def plan_pokemon_refresh(
+    all_pokemon: APIAllPokemon = None,
+    cache: diskcache.Cache = None,
+    now: float | None = None,
+) -> list[RefreshCandidate]:
+    """Rank the cached responses of every Pokemon in a listing for a refresh.
+
+    DESCRIPTION:
+    ------------
+
+    Every cached response (the full response & each cached profile) is a candidate, scored with
+    pokeapi.core.schedule.refresh_priority() from its CacheMeta & the cache's access counts. Pokemon
+    without a cached full response, and responses without a CacheMeta, are always due. Each candidate's
+    payload is a name/URL/profile dict for the refresh_pokemon_batch Celery task.
+
+    PARAMS:
+    -------
+
+    * all_pokemon (APIAllPokemon): An APIAllPokemon with a populated pokemon_list.
+    * cache (diskcache.Cache): The cache the Pokemon responses are stored in, i.e. the "requests" cache.
+    * now (float): Unix timestamp to measure ages from. Defaults to the current time.
+    """
+    if all_pokemon is None or all_pokemon.pokemon_list is None:
+        raise ValueError("Missing APIAllPokemon object with a populated pokemon_list.")
+    if cache is None:
+        raise ValueError("Missing cache to plan a refresh of.")
+
+    if now is None:
+        now = time.time()
+
+    accesses: dict[str, float] = load_access_counts(cache, now=now)
+    listing = all_pokemon.pokemon_list
+
+    ## (cache key, name, URL, profile) of every response a Pokemon may have cached
+    entries: list[tuple[str, str, str, str | None]] = [
+        (profile_key(name, profile), name, url, profile)
+        for name, url in zip(listing.names, listing.urls)
+        for profile in (None, *PROFILES)
+    ]
+
+    ## Read past the memory tier, so planning doesn't evict the entries readers use. Every
+    #  CacheMeta is read in one batch (one round trip with Redis) instead of key by key.
+    backend = getattr(cache, "backend", cache)
+    metas: dict[str, CacheMeta] = load_cache_metas(
+        cache=backend, cache_keys=[cache_key for cache_key, *_ in entries]
+    )
+    ## Profiles cached without a CacheMeta, i.e. before CacheMeta existed
+    cached_profiles: set[str] = set(
+        cache_get_many(
+            backend,
+            [
+                cache_key
+                for cache_key, _, _, profile in entries
+                if profile is not None and cache_key not in metas
+            ],
+        )
+    )
+
+    candidates: list[RefreshCandidate] = []
+
+    for cache_key, name, url, profile in entries:
+        meta: CacheMeta | None = metas.get(cache_key)
+
+        if meta is None and profile is not None and cache_key not in cached_profiles:
+            ## Nobody requested this profile
+            continue
+
+        if meta is None:
+            meta = CacheMeta()
+
+        age: float | None = None
+        if meta.validated_at is not None:
+            age = now - meta.validated_at
+
+        priority: float = refresh_priority(
+            age=age,
+            max_age=meta.max_age or cache_settings.pokemon_max_age,
+            accesses=accesses.get(cache_key, 0),
+            checks=meta.checks,
+            changes=meta.changes,
+        )
+
+        candidates.append(
+            RefreshCandidate(
+                key=cache_key,
+                priority=priority,
+                payload={"name": name, "url": url, "profile": profile},
             )
+        )
+
+    return candidates
@@ -0,0 +1,11 @@
+from __future__ import annotations
+
+from . import operations
+from .operations import (
+    STAT_NAMES,
+    TYPE_NAMES,
+    PokemonArrays,
+    StatsEngine,
+    get_stats_engine,
+    type_key,
+)
@@ -0,0 +1,585 @@
+"""Array-backed stats & type matchups over the cached Pokemon.
+
+Every cached /pokemon response is reduced to a row of a base-stat matrix (one column per stat)
+and a row of a type one-hot matrix (one column per type). Cached /type responses fill an 18x18
+damage multiplier matrix. Totals, percentile ranks, filters, nearest neighbours & counters are
+answered with whole-array NumPy operations instead of looping over response dicts.
+
+The arrays are rebuilt lazily: at most every check_interval seconds, a read compares the
+fingerprints of the cached responses (see pokemon_utils.response_fingerprint()) to the ones the
+arrays were built from, and only re-reads the responses that changed.
+
+Requires the numpy package (pip install numpy).
+"""
+from __future__ import annotations
+
+import asyncio
+import threading
+import time
+
+from typing import Any, Iterable, NamedTuple
+
+from pokeapi.core.conf import api_settings
+from pokeapi.core.fetch import run_sync
+from pokeapi.domain.api.responses import APIResource, CacheMeta, load_cache_meta
+from pokeapi.domain.pokemon import pokemon_id_from_url
+from pokeapi.utils.pokemon_utils import (
+    is_pokemon_response,
+    iter_pokemon_cache_keys,
+    response_fingerprint,
+)
+
+import diskcache
+
+from loguru import logger as log
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+## Column order of the base-stat matrix
+STAT_NAMES: tuple[str, ...] = (
+    "hp",
+    "attack",
+    "defense",
+    "special-attack",
+    "special-defense",
+    "speed",
+)
+## Column order of the type one-hot & effectiveness matrices. A type's Pokemon API ID is its index + 1.
+TYPE_NAMES: tuple[str, ...] = (
+    "normal",
+    "fighting",
+    "flying",
+    "poison",
+    "ground",
+    "rock",
+    "bug",
+    "ghost",
+    "steel",
+    "fire",
+    "water",
+    "grass",
+    "electric",
+    "psychic",
+    "ice",
+    "dragon",
+    "dark",
+    "fairy",
+)
+
+_STAT_INDEX: dict[str, int] = {name: i for i, name in enumerate(STAT_NAMES)}
+_TYPE_INDEX: dict[str, int] = {name: i for i, name in enumerate(TYPE_NAMES)}
+## damage_relations key -> (multiplier, True if the type in the list is the attacker)
+_DAMAGE_RELATIONS: dict[str, tuple[float, bool]] = {
+    "double_damage_to": (2.0, False),
+    "half_damage_to": (0.5, False),
+    "no_damage_to": (0.0, False),
+    "double_damage_from": (2.0, True),
+    "half_damage_from": (0.5, True),
+    "no_damage_from": (0.0, True),
+}
+
+
+def _require_numpy() -> None:
+    if np is None:
+        raise ImportError(
+            "The stats engine requires the numpy package. Install with: pip install numpy"
+        )
+
+
+def type_key(type_name: str = None) -> str:
+    """Cache key of a type's /type response, i.e. "type/10" for fire."""
+    return f"type/{_TYPE_INDEX[type_name] + 1}"
+
+
+class _Row(NamedTuple):
+    id: int
+    name: str
+    stats: tuple[int, ...]
+    types: tuple[int, ...]
+
+
+def _parse_row(response: dict) -> _Row:
+    stats: list[int] = [0] * len(STAT_NAMES)
+
+    for s in response.get("stats") or ():
+        i: int | None = _STAT_INDEX.get((s.get("stat") or {}).get("name"))
+
+        if i is not None:
+            stats[i] = s.get("base_stat") or 0
+
+    types: list[int] = []
+
+    for t in sorted(response.get("types") or (), key=lambda t: t.get("slot") or 0):
+        i: int | None = _TYPE_INDEX.get((t.get("type") or {}).get("name"))
+
+        if i is not None:
+            types.append(i)
+
+    return _Row(
+        id=response["id"], name=response["name"], stats=tuple(stats), types=tuple(types)
+    )
+
+
+class PokemonArrays(NamedTuple):
+    """A snapshot of the cached Pokemon as arrays. Row i of each matrix is the Pokemon names[i].
+
+    * ids (np.ndarray): Pokemon IDs, shape (N,).
+    * names (list[str]): Pokemon names, sorted by ID.
+    * stats (np.ndarray): Base stats, shape (N, 6), columns in STAT_NAMES order.
+    * types (np.ndarray): Type one-hot (bool), shape (N, 18), columns in TYPE_NAMES order.
+    * type_slots (np.ndarray): Type indexes by slot, shape (N, 2). -1 for Pokemon with one type.
+    * effectiveness (np.ndarray): Damage multipliers, shape (18, 18), [attacking type, defending type].
+    * defense (np.ndarray): Damage multiplier of each attacking type against each Pokemon, shape (18, N).
+    """
+
+    ids: np.ndarray
+    names: list[str]
+    stats: np.ndarray
+    types: np.ndarray
+    type_slots: np.ndarray
+    effectiveness: np.ndarray
+    defense: np.ndarray
+
+
+class StatsEngine:
+    """Vectorized stat & type matchup queries over the Pokemon in a cache.
+
+    PARAMS:
+    -------
+
+    * cache (diskcache.Cache): The cache the /pokemon & /type responses are stored in, i.e. the "requests" cache.
+    * check_interval (float): Min seconds between checks of the cache for changed responses.
+    * fetch_types (bool): Request /type resources missing from the cache (& cache them) when building
+        the effectiveness matrix. Types that can't be loaded leave their rows & columns at 1.0.
+
+    Methods
+    -------
+    * .arrays: The current PokemonArrays, rebuilt if the cache changed.
+    * .totals(): Base stat totals.
+    * .percentile_ranks(): Percentile rank of each Pokemon's stats.
+    * .filter(): Pokemon matching type & stat filters.
+    * .nearest(): Pokemon with the most similar stats & types.
+    * .counters(): Pokemon that match up best against a team.
+
+    """
+
+    def __init__(
+        self,
+        cache: diskcache.Cache = None,
+        check_interval: float = 30.0,
+        fetch_types: bool = True,
+    ) -> None:
+        """Set up the engine. The arrays are built on first read."""
+        _require_numpy()
+
+        if cache is None:
+            raise ValueError("Missing cache to read Pokemon from.")
+
+        self.cache = cache
+        self.check_interval = check_interval
+        self.fetch_types = fetch_types
+
+        ## Cache key -> (fingerprint, parsed row, or None for values that aren't a Pokemon)
+        self._rows: dict[str, tuple[str, _Row | None]] = {}
+        ## Type key -> fingerprint the effectiveness matrix was built from
+        self._type_fingerprints: dict[str, str | None] = {}
+        ## Type keys already requested once, so a type that can't be loaded isn't re-requested on every check
+        self._requested_types: set[str] = set()
+        self._arrays: PokemonArrays | None = None
+        self._checked_at: float | None = None
+        self._lock = threading.Lock()
+
+        self.builds: int = 0
+
+    @property
+    def arrays(self) -> PokemonArrays:
+        """The arrays, rebuilt first if check_interval has passed & any cached response changed."""
+        with self._lock:
+            now: float = time.monotonic()
+
+            if (
+                self._arrays is None
+                or self._checked_at is None
+                or now - self._checked_at >= self.check_interval
+            ):
+                self._checked_at = now
+                self._refresh()
+
+            return self._arrays
+
+    def invalidate(self) -> None:
+        """Check the cache for changes on the next read, instead of waiting for check_interval."""
+        with self._lock:
+            self._checked_at = None
+
+    def _scan_pokemon(self) -> bool:
+        """Re-read changed Pokemon responses. Returns True if any were added, changed or removed."""
+        rows: dict[str, tuple[str, _Row | None]] = {}
+        changed: bool = False
+
+        for key in iter_pokemon_cache_keys(self.cache):
+            meta: CacheMeta | None = load_cache_meta(cache=self.cache, cache_key=key)
+            value: Any = None
+
+            if meta is None:
+                value = self.cache.get(key)
+
+            fingerprint: str = response_fingerprint(meta, value)
+            old = self._rows.get(key)
+
+            if old is not None and old[0] == fingerprint:
+                rows[key] = old
+
+                continue
+
+            if value is None:
+                value = self.cache.get(key)
+
+            rows[key] = (
+                fingerprint,
+                _parse_row(value) if is_pokemon_response(value) else None,
+            )
+            changed = True
+
+        if rows.keys() != self._rows.keys():
+            changed = True
+
+        self._rows = rows
+
+        return changed
+
+    def _type_fingerprint(self, key: str) -> str | None:
+        meta: CacheMeta | None = load_cache_meta(cache=self.cache, cache_key=key)
+
+        if meta is not None:
+            return response_fingerprint(meta)
+
+        value: Any = self.cache.get(key)
+
+        return None if value is None else response_fingerprint(None, value)
+
+    def _scan_types(self) -> bool:
+        fingerprints: dict[str, str | None] = {
+            type_key(name): self._type_fingerprint(type_key(name)) for name in TYPE_NAMES
+        }
+
+        missing: list[str] = [
+            k for k, v in fingerprints.items() if v is None and k not in self._requested_types
+        ]
+
+        if self.fetch_types and missing:
+            self._requested_types.update(missing)
+            self._fetch_missing_types(missing)
+            fingerprints.update({k: self._type_fingerprint(k) for k in missing})
+
+        changed: bool = fingerprints != self._type_fingerprints
+        self._type_fingerprints = fingerprints
+
+        return changed
+
+    def _fetch_missing_types(self, keys: list[str]) -> None:
+        resources: list[APIResource] = [
+            APIResource(url=f"{api_settings.base_url}/{key}/") for key in keys
+        ]
+        log.info(f"Requesting [{len(resources)}] type(s) missing from the cache")
+
+        async def _fetch_all() -> list:
+            return await asyncio.gather(
+                *(r.aget(use_cache=True, cache=self.cache) for r in resources),
+                return_exceptions=True,
+            )
+
+        for resource, res in zip(resources, run_sync(_fetch_all())):
+            if isinstance(res, Exception) or res is None:
+                log.warning(f"Could not load type [{resource.request_url}]. Details: {res}")
+
+    def _build_effectiveness(self) -> np.ndarray:
+        effectiveness: np.ndarray = np.ones((len(TYPE_NAMES), len(TYPE_NAMES)), dtype=np.float32)
+
+        for name in TYPE_NAMES:
+            response: dict | None = self.cache.get(type_key(name))
+
+            if not isinstance(response, dict):
+                log.warning(f"No cached /type response for [{name}], treating its matchups as neutral")
+
+                continue
+
+            i: int = _TYPE_INDEX[name]
+
+            for relation, (multiplier, other_attacks) in _DAMAGE_RELATIONS.items():
+                for other in (response.get("damage_relations") or {}).get(relation) or ():
+                    j: int | None = _TYPE_INDEX.get(other.get("name"))
+
+                    ## Fall back to the ID in the URL, in case the name isn't a standard one
+                    if j is None:
+                        type_id: int | None = pokemon_id_from_url(other.get("url"))
+                        if type_id is None or not 1 <= type_id <= len(TYPE_NAMES):
+                            continue
+                        j = type_id - 1
+
+                    if other_attacks:
+                        effectiveness[j, i] = multiplier
+                    else:
+                        effectiveness[i, j] = multiplier
+
+        return effectiveness
+
+    def _refresh(self) -> None:
+        pokemon_changed: bool = self._scan_pokemon()
+        types_changed: bool = self._scan_types()
+
+        if self._arrays is not None and not pokemon_changed and not types_changed:
+            return
+
+        rows: list[_Row] = sorted(
+            (row for _, row in self._rows.values() if row is not None), key=lambda r: r.id
+        )
+        n: int = len(rows)
+
+        ids: np.ndarray = np.fromiter((r.id for r in rows), dtype=np.int32, count=n)
+        stats: np.ndarray = np.array(
+            [r.stats for r in rows], dtype=np.float32
+        ).reshape(n, len(STAT_NAMES))
+
+        type_slots: np.ndarray = np.full((n, 2), -1, dtype=np.int8)
+        for i, row in enumerate(rows):
+            type_slots[i, : len(row.types[:2])] = row.types[:2]
+
+        types: np.ndarray = np.zeros((n, len(TYPE_NAMES)), dtype=bool)
+        for slot in range(2):
+            has_type = type_slots[:, slot] >= 0
+            types[np.nonzero(has_type)[0], type_slots[has_type, slot]] = True
+
+        effectiveness: np.ndarray = (
+            self._build_effectiveness()
+            if types_changed or self._arrays is None
+            else self._arrays.effectiveness
+        )
+
+        ## Pad with a neutral column, so index -1 (no second type) multiplies by 1
+        padded: np.ndarray = np.hstack(
+            [effectiveness, np.ones((len(TYPE_NAMES), 1), dtype=np.float32)]
+        )
+        defense: np.ndarray = padded[:, type_slots[:, 0]] * padded[:, type_slots[:, 1]]
+
+        self._arrays = PokemonArrays(
+            ids=ids,
+            names=[r.name for r in rows],
+            stats=stats,
+            types=types,
+            type_slots=type_slots,
+            effectiveness=effectiveness,
+            defense=defense,
+        )
+        self.builds += 1
+
+        log.debug(f"Built stats arrays for [{n}] Pokemon")
+
+    def _indexes(self, arrays: PokemonArrays, names: Iterable[str]) -> np.ndarray:
+        lookup: dict[str, int] = {name: i for i, name in enumerate(arrays.names)}
+        missing: list[str] = [name for name in names if name not in lookup]
+
+        if missing:
+            raise KeyError(f"Pokemon not in the cache: {missing}")
+
+        return np.array([lookup[name] for name in names], dtype=np.intp)
+
+    def totals(self) -> dict[str, int]:
+        """Return the base stat total of each Pokemon."""
+        arrays: PokemonArrays = self.arrays
+
+        return dict(zip(arrays.names, arrays.stats.sum(axis=1).astype(int).tolist()))
+
+    def percentile_ranks(self, names: Iterable[str] | None = None) -> dict[str, dict[str, float]]:
+        """Percentage of Pokemon with a base stat (& total) lower than or equal to each Pokemon's.
+
+        PARAMS:
+        -------
+
+        * names (Iterable[str]): Pokemon to rank. Defaults to every Pokemon.
+        """
+        arrays: PokemonArrays = self.arrays
+        n: int = len(arrays.names)
+
+        if n == 0:
+            return {}
+
+        values: np.ndarray = np.hstack([arrays.stats, arrays.stats.sum(axis=1, keepdims=True)])
+        rows: np.ndarray = (
+            np.arange(n) if names is None else self._indexes(arrays, list(names))
+        )
+
+        ranks: np.ndarray = np.empty((len(rows), values.shape[1]), dtype=np.float64)
+        for col in range(values.shape[1]):
+            ordered: np.ndarray = np.sort(values[:, col])
+            ranks[:, col] = np.searchsorted(ordered, values[rows, col], side="right")
+        ranks *= 100.0 / n
+
+        columns: tuple[str, ...] = (*STAT_NAMES, "total")
+
+        return {
+            arrays.names[r]: dict(zip(columns, ranks[i].round(2).tolist()))
+            for i, r in enumerate(rows)
+        }
+
+    def filter(
+        self,
+        types: Iterable[str] | None = None,
+        min_stats: dict[str, int] | None = None,
+        max_stats: dict[str, int] | None = None,
+        min_total: int | None = None,
+    ) -> list[str]:
+        """Names of the Pokemon matching every filter, by ID.
+
+        PARAMS:
+        -------
+
+        * types (Iterable[str]): Types the Pokemon must all have.
+        * min_stats (dict[str, int]): Stat name -> min base stat (inclusive), i.e. {"speed": 100}.
+        * max_stats (dict[str, int]): Stat name -> max base stat (inclusive).
+        * min_total (int): Min base stat total (inclusive).
+        """
+        arrays: PokemonArrays = self.arrays
+        mask: np.ndarray = np.ones(len(arrays.names), dtype=bool)
+
+        if types:
+            mask &= arrays.types[:, [_TYPE_INDEX[t] for t in types]].all(axis=1)
+
+        for stat, value in (min_stats or {}).items():
+            mask &= arrays.stats[:, _STAT_INDEX[stat]] >= value
+
+        for stat, value in (max_stats or {}).items():
+            mask &= arrays.stats[:, _STAT_INDEX[stat]] <= value
+
+        if min_total is not None:
+            mask &= arrays.stats.sum(axis=1) >= min_total
+
+        return [arrays.names[i] for i in np.flatnonzero(mask)]
+
+    def nearest(
+        self, names: Iterable[str] = None, k: int = 5, type_weight: float = 1.0
+    ) -> dict[str, list[tuple[str, float]]]:
+        """Find the k Pokemon closest to each of names, by standardized base stats & shared types.
+
+        Stats are scaled to zero mean & unit variance per stat, so each stat counts equally.
+        type_weight scales the type one-hot columns (0 compares stats only).
+        """
+        if names is None:
+            raise ValueError("Missing Pokemon to find neighbours of.")
+
+        arrays: PokemonArrays = self.arrays
+        rows: np.ndarray = self._indexes(arrays, list(names))
+
+        std: np.ndarray = arrays.stats.std(axis=0)
+        features: np.ndarray = np.hstack(
+            [
+                (arrays.stats - arrays.stats.mean(axis=0)) / np.where(std > 0, std, 1),
+                arrays.types.astype(np.float32) * type_weight,
+            ]
+        )
+
+        ## Squared distances between the queried rows & every row, (Q, N)
+        sq_norms: np.ndarray = (features**2).sum(axis=1)
+        distances: np.ndarray = np.maximum(
+            sq_norms[rows, None] + sq_norms[None, :] - 2 * features[rows] @ features.T, 0
+        )
+        distances[np.arange(len(rows)), rows] = np.inf
+
+        k = min(k, len(arrays.names) - 1)
+        if k <= 0:
+            return {arrays.names[r]: [] for r in rows}
+
+        nearest: np.ndarray = np.argpartition(distances, k - 1, axis=1)[:, :k]
+        results: dict[str, list[tuple[str, float]]] = {}
+
+        for q, r in enumerate(rows):
+            ordered = nearest[q][np.argsort(distances[q, nearest[q]])]
+            results[arrays.names[r]] = [
+                (arrays.names[j], float(np.sqrt(distances[q, j]))) for j in ordered
+            ]
+
+        return results
+
+    def counters(
+        self, team: Iterable[str] = None, k: int = 10, stat_weight: float = 0.25
+    ) -> list[tuple[str, float]]:
+        """Find the k Pokemon that match up best against a team, best first.
+
+        DESCRIPTION:
+        ------------
+
+        For each candidate & team member, offense is the best multiplier of the candidate's types
+        against the member, and threat is the best multiplier of the member's types against the
+        candidate. A candidate scores the mean of offense - threat over the team, plus its base
+        stat total relative to the strongest Pokemon times stat_weight. Team members are excluded.
+
+        PARAMS:
+        -------
+
+        * team (Iterable[str]): Names of the Pokemon to counter.
+        * k (int): Number of counters to return.
+        * stat_weight (float): How much raw stats count next to type matchups.
+        """
+        if team is None:
+            raise ValueError("Missing team to find counters for.")
+
+        arrays: PokemonArrays = self.arrays
+        members: np.ndarray = self._indexes(arrays, list(team))
+
+        if len(arrays.names) == 0 or len(members) == 0:
+            return []
+
+        ## Multiplier of each type against each team member, plus a row of 0s for "no second type"
+        vs_team: np.ndarray = np.vstack(
+            [arrays.defense[:, members], np.zeros((1, len(members)), dtype=np.float32)]
+        )
+        ## (N, M): best of each candidate's (up to) 2 types against each member
+        offense: np.ndarray = np.maximum(
+            vs_team[arrays.type_slots[:, 0]], vs_team[arrays.type_slots[:, 1]]
+        )
+
+        member_slots: np.ndarray = arrays.type_slots[members]
+        padded_defense: np.ndarray = np.vstack(
+            [arrays.defense, np.zeros((1, len(arrays.names)), dtype=np.float32)]
+        )
+        ## (N, M): best of each member's types against each candidate
+        threat: np.ndarray = np.maximum(
+            padded_defense[member_slots[:, 0]], padded_defense[member_slots[:, 1]]
+        ).T
+
+        totals: np.ndarray = arrays.stats.sum(axis=1)
+        scores: np.ndarray = (offense - threat).mean(axis=1) + stat_weight * (
+            totals / max(float(totals.max()), 1.0)
+        )
+        scores[members] = -np.inf
+
+        k = min(k, len(arrays.names) - len(members))
+        if k <= 0:
+            return []
+
+        best: np.ndarray = np.argpartition(-scores, k - 1)[:k]
+        best = best[np.argsort(-scores[best], kind="stable")]
+
+        return [(arrays.names[i], round(float(scores[i]), 4)) for i in best]
+
+
+_engines: dict[int, StatsEngine] = {}
+_engines_lock: threading.Lock = threading.Lock()
+
+
+def get_stats_engine(cache: diskcache.Cache = None) -> StatsEngine:
+    """Return the process-wide StatsEngine for a cache, so its arrays are built once per process."""
+    if cache is None:
+        raise ValueError("Missing cache to read Pokemon from.")
+
+    with _engines_lock:
+        engine: StatsEngine | None = _engines.get(id(cache))
+
+        if engine is None or engine.cache is not cache:
+            engine = StatsEngine(cache=cache)
+            _engines[id(cache)] = engine
+
+        return engine
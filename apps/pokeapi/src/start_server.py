@@ -0,0 +1,123 @@
+"""Start the read API over the cached Pokemon API responses (see pokeapi.server).
+
+Usage (from the src/ directory):
+
+    python start_server.py
+    python start_server.py --port 8080 --workers 4 --cache-only
+    python start_server.py --snapshot-dir ./snapshots
+"""
+from __future__ import annotations
+
+import sys
+
+sys.path.append(".")
+
+import argparse
+import asyncio
+import multiprocessing
+
+from pathlib import Path
+
+from loguru import logger as log
+from pokeapi.core.conf import app_settings, server_settings
+from pokeapi.dependencies import Snapshot, init_cache, loguru_sinks, snapshot_path
+from pokeapi.server import HTTPServer, ReadAPI
+from pokeapi.utils.path_utils import ensure_dirs_exist
+from red_utils.ext.loguru_utils import init_logger
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Serve cached Pokemon API responses over HTTP.")
+    parser.add_argument("--host", default=server_settings.host, help="Address to listen on")
+    parser.add_argument("--port", type=int, default=server_settings.port, help="Port to listen on")
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=server_settings.workers,
+        help="Processes accepting connections on the port",
+    )
+    parser.add_argument(
+        "--cache-only",
+        action="store_true",
+        default=server_settings.cache_only,
+        help="Only serve cached responses, never request the Pokemon API",
+    )
+    parser.add_argument(
+        "--snapshot-dir",
+        default=None,
+        help="Serve the cache snapshots in a directory (read in place, implies --cache-only)",
+    )
+
+    return parser.parse_args()
+
+
+def open_snapshot_or_cache(cache_name: str, snapshot_dir: str | None = None):
+    if snapshot_dir:
+        path: Path = snapshot_path(cache_name, snapshot_dir)
+
+        if path.exists():
+            return Snapshot(path)
+
+        log.warning(f"No snapshot of cache [{cache_name}] at {path}, serving the cache instead")
+
+    return init_cache(cache_name)
+
+
+async def serve(
+    host: str, port: int, cache_only: bool, reuse_port: bool, snapshot_dir: str | None = None
+) -> None:
+    api: ReadAPI = ReadAPI(
+        cache=open_snapshot_or_cache("requests", snapshot_dir),
+        app_cache=open_snapshot_or_cache("app", snapshot_dir),
+        cache_only=cache_only or bool(snapshot_dir),
+    )
+    server: HTTPServer = HTTPServer(
+        api.handle,
+        host=host,
+        port=port,
+        keepalive_timeout=server_settings.keepalive_timeout,
+        reuse_port=reuse_port,
+    )
+
+    await server.serve_forever()
+
+
+def run_worker(
+    host: str, port: int, cache_only: bool, reuse_port: bool, snapshot_dir: str | None = None
+) -> None:
+    try:
+        asyncio.run(serve(host, port, cache_only, reuse_port, snapshot_dir))
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    ensure_dirs_exist([app_settings.data_dir, app_settings.cache_dir])
+    init_logger(sinks=loguru_sinks)
+
+    args = parse_args()
+    log.info(
+        f"Starting read API on {args.host}:{args.port} with [{args.workers}] worker(s), cache-only: {args.cache_only}"
+    )
+
+    if args.workers <= 1:
+        run_worker(args.host, args.port, args.cache_only, False, args.snapshot_dir)
+        sys.exit(0)
+
+    ## Every worker listens on the same port (SO_REUSEPORT), the kernel balances connections
+    workers: list[multiprocessing.Process] = [
+        multiprocessing.Process(
+            target=run_worker,
+            args=(args.host, args.port, args.cache_only, True, args.snapshot_dir),
+        )
+        for _ in range(args.workers)
+    ]
+
+    for worker in workers:
+        worker.start()
+
+    try:
+        for worker in workers:
+            worker.join()
+    except KeyboardInterrupt:
+        for worker in workers:
+            worker.terminate()
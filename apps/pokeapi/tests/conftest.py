@@ -0,0 +1,74 @@
+"""Shared fixtures.
+
+The app reads its settings from config/ relative to the working directory & imports pokeapi from
+src/, so tests run from src/. Caches & data are written to a scratch directory (see
+pokeapi.benchmarks.isolate()) & Pokemon are requested from a MockPokeAPI, so no Redis, RabbitMQ or
+network access is needed.
+"""
+from __future__ import annotations
+
+import os
+
+from pathlib import Path
+import sys
+import tempfile
+
+SRC_DIR: Path = Path(__file__).resolve().parent.parent / "src"
+
+## RABBITMQ_PASS is a secret, only needed to build the Celery broker URL
+os.environ.setdefault("DYNACONF_RABBITMQ_PASS", "test")
+os.chdir(SRC_DIR)
+sys.path.insert(0, str(SRC_DIR))
+
+from pokeapi.benchmarks import MockPokeAPI, isolate
+
+## Before anything opens a cache
+isolate(tempfile.mkdtemp(prefix="pokeapi-tests-"))
+
+from pokeapi.core.conf import api_settings
+from pokeapi.dependencies import init_cache
+from pokeapi.domain.api.responses import APIAllPokemon, APIPokemonResource
+from pokeapi.utils.pokemon_utils import cache_all_pokemon
+import pytest
+
+## Pokemon served by the mock API
+POKEMON_COUNT: int = 30
+
+
+@pytest.fixture(scope="session")
+def mock_api():
+    """Serve Pokemon from a MockPokeAPI & point the app's requests at it."""
+    base_url: str = api_settings.base_url
+
+    with MockPokeAPI(count=POKEMON_COUNT, moves=4, latency=0, jitter=0) as server:
+        api_settings.base_url = server.base_url
+
+        yield server
+
+    api_settings.base_url = base_url
+
+
+@pytest.fixture
+def cache(tmp_path):
+    """Open an empty cache, without a memory tier."""
+    cache = init_cache(f"test-{tmp_path.name}", memory_max_size=0, seed=False)
+
+    yield cache
+
+    cache.close()
+
+
+@pytest.fixture
+def pokemon_cache(mock_api, cache):
+    """Cache the mock API's listing & every one of its Pokemon."""
+    listing = APIAllPokemon(url=f"{mock_api.base_url}/pokemon")
+    listing.get_pokemon(use_cache=True, cache=cache)
+
+    cache_all_pokemon(
+        pokemon_list=[
+            APIPokemonResource(name=p.name, url=p.request_url) for p in listing.pokemon_list
+        ],
+        cache=cache,
+    )
+
+    return cache
@@ -0,0 +1,88 @@
+from __future__ import annotations
+
+import diskcache
+
+from pokeapi.dependencies import CodecDisk, get_codec
+from pokeapi.dependencies.codecs import (
+    CODECS,
+    FORMAT_VERSION,
+    MAGIC,
+    decode_value,
+    is_encoded,
+)
+import pytest
+
+VALUE: dict = {
+    "id": 25,
+    "name": "pikachu",
+    "types": [{"slot": 1, "type": {"name": "electric"}}],
+    "sprites": {"front_default": None},
+    "weight": 60.5,
+    1: "int key",
+}
+
+
+@pytest.mark.parametrize("name", list(CODECS))
+def test_round_trip(name):
+    codec = get_codec(name)
+    data: bytes = codec.encode(VALUE)
+
+    assert is_encoded(data)
+    assert data[: len(MAGIC)] == MAGIC
+    assert data[len(MAGIC)] == FORMAT_VERSION
+    assert codec.decode(data) == VALUE
+
+
+@pytest.mark.parametrize("name", list(CODECS))
+def test_decode_value_reads_any_codec(name):
+    data: bytes = get_codec(name).encode(VALUE)
+
+    assert decode_value(data) == VALUE
+    assert decode_value(data, codec=get_codec("msgpack")) == VALUE
+
+
+def test_decode_value_rejects_unknown_format_version():
+    data: bytearray = bytearray(get_codec("msgpack").encode(VALUE))
+    data[len(MAGIC)] = FORMAT_VERSION + 1
+
+    with pytest.raises(ValueError):
+        decode_value(bytes(data))
+
+
+def test_decode_value_rejects_unknown_codec():
+    data: bytearray = bytearray(get_codec("msgpack").encode(VALUE))
+    data[len(MAGIC) + 1] = 255
+
+    with pytest.raises(ValueError):
+        decode_value(bytes(data))
+
+
+def test_get_codec_rejects_unknown_name():
+    with pytest.raises(ValueError):
+        get_codec("json")
+
+
+def test_codec_disk_stores_dicts_encoded(tmp_path):
+    with diskcache.Cache(str(tmp_path), disk=CodecDisk, disk_codec="msgpack-zlib") as cache:
+        cache.set("pokemon", VALUE)
+        cache.set("listing", [1, 2, 3])
+        cache.set("name", "pikachu")
+
+        assert cache.get("pokemon") == VALUE
+        assert cache.get("listing") == [1, 2, 3]
+        assert cache.get("name") == "pikachu"
+
+        raw = cache._sql("SELECT value FROM Cache WHERE key = ?", ("pokemon",)).fetchone()[0]
+        assert is_encoded(raw)
+
+
+def test_codec_disk_reads_entries_of_other_codecs(tmp_path):
+    with diskcache.Cache(str(tmp_path), disk=CodecDisk, disk_codec="pickle") as cache:
+        cache.set("pickled", VALUE)
+
+    with diskcache.Cache(str(tmp_path), disk=CodecDisk, disk_codec="msgpack") as cache:
+        cache.set("encoded", VALUE)
+
+    with diskcache.Cache(str(tmp_path), disk=CodecDisk, disk_codec="msgpack-zlib") as cache:
+        assert cache.get("pickled") == VALUE
+        assert cache.get("encoded") == VALUE
@@ -0,0 +1,89 @@
+from __future__ import annotations
+
+import json
+
+import pytest
+
+pa = pytest.importorskip("pyarrow")
+
+from pokeapi.domain.api.responses import APIPokemonResource
+from pokeapi.utils.export_utils import export_pokemon, load_export_table
+from pokeapi.utils.export_utils.operations import MANIFEST_FILE
+from pokeapi.utils.pokemon_utils import cache_all_pokemon
+
+@pytest.mark.parametrize("format", ["arrow", "parquet"])
+def test_export_writes_tables_and_manifest(mock_api, pokemon_cache, tmp_path, format):
+    directory = tmp_path / "export"
+    result = export_pokemon(pokemon_cache, directory=directory, format=format)
+
+    assert result.written
+    assert result.exported == mock_api.count
+    assert result.rows["stats"] == mock_api.count
+
+    manifest: dict = json.loads((directory / MANIFEST_FILE).read_text())
+    assert manifest["format"] == format
+    assert manifest["pokemon"]["pokemon-1"][0] == 1
+
+    stats = load_export_table("stats", directory=directory, format=format)
+    assert stats.num_rows == mock_api.count
+    assert stats["pokemon_id"].to_pylist() == list(range(1, mock_api.count + 1))
+
+    response: dict = pokemon_cache.get("pokemon-1")
+    row: dict = stats.slice(0, 1).to_pylist()[0]
+    assert row["name"] == "pokemon-1"
+    assert row["total"] == sum(s["base_stat"] for s in response["stats"])
+
+
+def test_export_is_incremental(mock_api, pokemon_cache, tmp_path):
+    count: int = mock_api.count
+    directory = tmp_path / "export"
+    first = export_pokemon(pokemon_cache, directory=directory)
+
+    again = export_pokemon(pokemon_cache, directory=directory)
+    assert not again.written
+    assert again.exported == 0
+    assert again.unchanged == count
+    assert again.rows == first.rows
+
+    changed: list[int] = mock_api.mutate(0.1)
+    cache_all_pokemon(
+        pokemon_list=[
+            APIPokemonResource(name=f"pokemon-{i}", url=mock_api.pokemon_url(i))
+            for i in range(1, count + 1)
+        ],
+        cache=pokemon_cache,
+        revalidate=True,
+    )
+
+    updated = export_pokemon(pokemon_cache, directory=directory)
+    assert updated.written
+    assert updated.exported == len(changed)
+    assert updated.unchanged == count - len(changed)
+    assert updated.rows == first.rows
+
+    stats = load_export_table("stats", directory=directory)
+    for pokemon_id in changed:
+        response: dict = pokemon_cache.get(f"pokemon-{pokemon_id}")
+        row: dict = stats.slice(pokemon_id - 1, 1).to_pylist()[0]
+        assert row["base_experience"] == response["base_experience"]
+
+    pokemon_cache.delete("pokemon-1")
+    removed = export_pokemon(pokemon_cache, directory=directory)
+    assert removed.removed == 1
+    assert removed.exported == 0
+    assert removed.rows["stats"] == count - 1
+    assert 1 not in load_export_table("stats", directory=directory)["pokemon_id"].to_pylist()
+
+
+def test_full_export_ignores_manifest(mock_api, pokemon_cache, tmp_path):
+    directory = tmp_path / "export"
+    export_pokemon(pokemon_cache, directory=directory)
+
+    result = export_pokemon(pokemon_cache, directory=directory, full=True)
+    assert result.written
+    assert result.exported == mock_api.count
+
+
+def test_export_rejects_unknown_format(pokemon_cache, tmp_path):
+    with pytest.raises(ValueError):
+        export_pokemon(pokemon_cache, directory=tmp_path, format="csv")
@@ -0,0 +1,86 @@
+from __future__ import annotations
+
+from pokeapi.domain.pokemon import IndexEntry, PokemonIndex
+from pokeapi.domain.pokemon.index import pokemon_id_from_url
+import pytest
+
+API_URL: str = "https://pokeapi.co/api/v2/pokemon"
+NAMES: list[str] = ["bulbasaur", "ivysaur", "venusaur", "charmander", "pikachu", "Pichu"]
+IDS: list[int] = [1, 2, 3, 4, 25, 172]
+
+
+@pytest.fixture
+def index() -> PokemonIndex:
+    return PokemonIndex(NAMES, [f"{API_URL}/{i}/" for i in IDS])
+
+
+def test_pokemon_id_from_url():
+    assert pokemon_id_from_url(f"{API_URL}/25/") == 25
+    assert pokemon_id_from_url(f"{API_URL}/25") == 25
+    assert pokemon_id_from_url(f"{API_URL}/pikachu/") is None
+    assert pokemon_id_from_url(None) is None
+
+
+def test_lookups(index):
+    pikachu = IndexEntry("pikachu", 25, f"{API_URL}/25/")
+
+    assert len(index) == len(NAMES)
+    assert index.get("pikachu") == pikachu
+    assert index.get(" PIKACHU ") == pikachu
+    assert index.get(25) == pikachu
+    assert index.get("25") == pikachu
+    assert index.get("pichu").id == 172
+    assert index.get("mew") is None
+    assert index.get(151) is None
+    assert "bulbasaur" in index
+    assert 151 not in index
+
+
+def test_prefix(index):
+    assert index.prefix("pi") == ["pichu", "pikachu"]
+    assert index.prefix("saur") == []
+    assert index.prefix("", limit=2) == ["bulbasaur", "charmander"]
+    assert index.prefix("", limit=None) == sorted(n.lower() for n in NAMES)
+
+
+def test_fuzzy(index):
+    assert index.fuzzy("pikachoo")[0] == "pikachu"
+    assert index.fuzzy("charmandr", limit=1) == ["charmander"]
+    assert index.fuzzy("zzzzzz") == []
+    assert index.fuzzy("") == []
+
+
+def test_update(index):
+    names: list[str] = ["bulbasaur", "ivysaur", "venusaur", "charmander", "pikachu", "mew"]
+    urls: list[str] = [f"{API_URL}/{i}/" for i in (1, 2, 3, 4, 10025, 151)]
+
+    diff = index.update(names, urls)
+
+    assert diff.added == ["mew"]
+    assert diff.removed == ["pichu"]
+    assert diff.changed == ["pikachu"]
+    assert not diff.is_empty
+
+    assert index.get(151).name == "mew"
+    assert index.get(10025).name == "pikachu"
+    assert index.get(25) is None
+    assert index.get("pichu") is None
+    assert index.names == sorted(names)
+
+    assert index.update(names, urls).is_empty
+
+
+def test_dict_round_trip(index):
+    restored = PokemonIndex.from_dict(index.to_dict())
+
+    assert restored.names == index.names
+    assert restored.get(25) == index.get(25)
+    assert restored.prefix("pi") == index.prefix("pi")
+
+
+def test_from_dict_rejects_other_versions(index):
+    data: dict = index.to_dict()
+    data["version"] += 1
+
+    with pytest.raises(ValueError):
+        PokemonIndex.from_dict(data)
@@ -0,0 +1,90 @@
+from __future__ import annotations
+
+import asyncio
+
+from email.utils import formatdate
+import time
+
+from pokeapi.dependencies.ratelimit import (
+    LocalTokenBucket,
+    RateLimiter,
+    parse_retry_after,
+)
+import pytest
+
+def test_token_bucket_allows_a_burst_then_waits():
+    bucket = LocalTokenBucket(rate=2.0, burst=3)
+
+    assert [bucket.take("pokeapi.co") for _ in range(3)] == [0.0, 0.0, 0.0]
+
+    wait: float = bucket.take("pokeapi.co")
+    ## Out of tokens: wait for the next one, at 2 tokens/s
+    assert 0 < wait <= 0.5
+
+    ## Buckets are per key
+    assert bucket.take("other") == 0.0
+
+
+def test_token_bucket_refills():
+    bucket = LocalTokenBucket(rate=50.0, burst=1)
+
+    assert bucket.take("k") == 0.0
+    assert bucket.take("k") > 0
+
+    time.sleep(0.05)
+    assert bucket.take("k") == 0.0
+
+
+def test_token_bucket_block():
+    bucket = LocalTokenBucket(rate=100.0, burst=10)
+    bucket.block("k", seconds=5)
+
+    assert 4 < bucket.take("k") <= 5
+    assert bucket.take("other") == 0.0
+
+    ## A shorter block doesn't shorten a longer one
+    bucket.block("k", seconds=1)
+    assert bucket.take("k") > 4
+
+
+@pytest.mark.parametrize(
+    "value, expected",
+    [(None, None), ("", None), ("120", 120.0), (" 3 ", 3.0), ("soon", None)],
+)
+def test_parse_retry_after_seconds(value, expected):
+    assert parse_retry_after(value) == expected
+
+
+def test_parse_retry_after_http_date():
+    assert 55 < parse_retry_after(formatdate(time.time() + 60, usegmt=True)) <= 60
+    assert parse_retry_after(formatdate(time.time() - 60, usegmt=True)) == 0.0
+
+
+class _UnreachableRedisBucket:
+    """Stands in for a RedisTokenBucket whose Redis times out on connect."""
+
+    def __init__(self) -> None:
+        """Start with no calls."""
+        self.calls: int = 0
+
+    async def take(self, key: str = None) -> float:
+        self.calls += 1
+        await asyncio.sleep(0.05)
+
+        raise OSError("Connect timeout")
+
+
+def test_rate_limiter_probes_redis_once():
+    limiter = RateLimiter(rate=100.0, burst=10, backend="local")
+    limiter._redis = _UnreachableRedisBucket()
+
+    async def _take_all() -> list[float]:
+        return await asyncio.gather(*(limiter._take("pokeapi.co") for _ in range(5)))
+
+    ## One request waits on Redis, the others use the local bucket meanwhile
+    assert asyncio.run(_take_all()) == [0.0] * 5
+    assert limiter._redis.calls == 1
+
+    ## Backed off: Redis isn't tried again until the retry interval passes
+    asyncio.run(_take_all())
+    assert limiter._redis.calls == 1
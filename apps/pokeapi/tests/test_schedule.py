@@ -0,0 +1,167 @@
+from __future__ import annotations
+
+import math
+
+from pokeapi.core.schedule import RefreshCandidate, RefreshScheduler, refresh_priority
+from pokeapi.core.schedule.wheel import TimerWheel
+from pokeapi.domain.api.responses import APIAllPokemon, meta_key, profile_key
+from pokeapi.utils.pokemon_utils import plan_pokemon_refresh
+import pytest
+
+def test_wheel_collects_due_items_in_order():
+    wheel: TimerWheel[str] = TimerWheel(tick=1.0, slots=4)
+    start: float = wheel._start
+
+    wheel.schedule(2.5, "c")
+    wheel.schedule(0, "a")
+    wheel.schedule(1.2, "b")
+    ## Further out than the wheel's slots, so it waits for another turn of the wheel
+    wheel.schedule(9.2, "d")
+
+    assert len(wheel) == 4
+    ## Items are due at the end of their tick
+    assert wheel.advance(start + 0.5) == []
+    assert wheel.advance(start + 1.5) == ["a"]
+    assert wheel.advance(start + 3.5) == ["b", "c"]
+    assert wheel.advance(start + 9.5) == []
+    assert wheel.advance(start + 10.5) == ["d"]
+    assert len(wheel) == 0
+
+
+def test_wheel_drain_returns_everything():
+    wheel: TimerWheel[int] = TimerWheel(tick=1.0, slots=8)
+
+    for delay in (30, 5, 0, 12):
+        wheel.schedule(delay, delay)
+
+    assert wheel.drain() == [0, 5, 12, 30]
+    assert len(wheel) == 0
+    assert wheel.drain() == []
+
+
+def test_wheel_rejects_invalid_settings():
+    with pytest.raises(ValueError):
+        TimerWheel(tick=0)
+    with pytest.raises(ValueError):
+        TimerWheel(slots=0)
+
+
+def test_refresh_priority():
+    assert refresh_priority(age=None, max_age=60) == math.inf
+    assert refresh_priority(age=60, max_age=0) == math.inf
+    ## Stale, never read, no revalidation history: exactly due
+    assert refresh_priority(age=60, max_age=60) == pytest.approx(1.0)
+
+    popular: float = refresh_priority(age=30, max_age=60, accesses=100)
+    unread: float = refresh_priority(age=30, max_age=60)
+    assert popular > unread
+
+    volatile: float = refresh_priority(age=30, max_age=60, checks=10, changes=10)
+    stable: float = refresh_priority(age=30, max_age=60, checks=10, changes=0)
+    assert volatile > unread > stable
+
+
+def _candidates(priorities: list[float]) -> list[RefreshCandidate]:
+    return [RefreshCandidate(key=f"p{i}", priority=p, payload=i) for i, p in enumerate(priorities)]
+
+
+def test_plan_cycle_keeps_the_top_due_candidates():
+    batches: list[list[int]] = []
+    scheduler = RefreshScheduler(
+        plan=lambda: _candidates([0.5, 3.0, 1.0, 2.0, math.inf, 0.9]),
+        dispatch=batches.append,
+        interval=60,
+        tick=1,
+        jitter=0,
+        max_per_cycle=3,
+        batch_size=2,
+    )
+
+    assert scheduler.plan_cycle() == 3
+    assert len(scheduler.wheel) == 3
+
+    assert scheduler.drain() == 3
+    ## Highest priority first
+    assert batches == [[4, 1], [3]]
+    assert scheduler.stats() == {"cycles": 1, "dispatched": 3, "failed_batches": 0, "waiting": 0}
+
+
+def test_plan_cycle_spreads_items_over_the_interval():
+    batches: list[list[int]] = []
+    scheduler = RefreshScheduler(
+        plan=lambda: _candidates([2.0] * 10),
+        dispatch=batches.append,
+        interval=10,
+        tick=1,
+        jitter=0,
+        max_per_cycle=100,
+        batch_size=100,
+    )
+    start: float = scheduler.wheel._start
+
+    scheduler.plan_cycle()
+
+    ## 0.9s apart, over the first 9s: the last tick is left free
+    assert scheduler.run_due(start + 1.5) == 2
+    assert scheduler.run_due(start + 4.5) == 3
+    assert scheduler.run_due(start + 9.5) == 5
+    assert len(scheduler.wheel) == 0
+    assert sum(len(b) for b in batches) == 10
+
+
+def test_failed_batches_are_counted_and_skipped():
+    sent: list[list[int]] = []
+
+    def dispatch(payloads: list[int]) -> None:
+        if 0 in payloads:
+            raise RuntimeError("Broker unavailable")
+
+        sent.append(payloads)
+
+    scheduler = RefreshScheduler(
+        plan=lambda: _candidates([5.0, 4.0, 3.0, 2.0]),
+        dispatch=dispatch,
+        interval=60,
+        tick=1,
+        jitter=0,
+        max_per_cycle=10,
+        batch_size=2,
+    )
+    scheduler.plan_cycle()
+
+    assert scheduler.drain() == 2
+    assert sent == [[2, 3]]
+    assert scheduler.failed_batches == 1
+    assert scheduler.dispatched == 2
+
+
+def test_scheduler_rejects_tick_longer_than_interval():
+    with pytest.raises(ValueError):
+        RefreshScheduler(plan=list, dispatch=print, interval=1, tick=5)
+
+
+def test_plan_pokemon_refresh(mock_api, pokemon_cache):
+    listing = APIAllPokemon.from_cache(pokemon_cache)
+    candidates: dict[str, RefreshCandidate] = {
+        c.key: c for c in plan_pokemon_refresh(all_pokemon=listing, cache=pokemon_cache)
+    }
+
+    ## Only full responses are cached: profiles nobody requested are skipped
+    assert len(candidates) == mock_api.count
+    assert candidates["pokemon-1"].payload == {
+        "name": "pokemon-1",
+        "url": mock_api.pokemon_url(1),
+        "profile": None,
+    }
+    assert all(c.priority < math.inf for c in candidates.values())
+
+    ## A profile cached before CacheMeta existed, and a response that lost its CacheMeta, are due
+    pokemon_cache.set(profile_key("pokemon-2", "core"), {"id": 2, "name": "pokemon-2"})
+    pokemon_cache.delete(meta_key("pokemon-3"))
+
+    candidates = {
+        c.key: c for c in plan_pokemon_refresh(all_pokemon=listing, cache=pokemon_cache)
+    }
+    assert len(candidates) == mock_api.count + 1
+    assert candidates["pokemon-2::core"].priority == math.inf
+    assert candidates["pokemon-3"].priority == math.inf
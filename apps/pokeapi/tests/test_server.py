@@ -0,0 +1,134 @@
+from __future__ import annotations
+
+import asyncio
+import gzip
+import json
+
+from pokeapi.dependencies import init_cache
+from pokeapi.domain.api.responses import APIAllPokemon
+from pokeapi.server import ReadAPI
+from pokeapi.server.http import Request, Response, parse_request
+from pokeapi.utils.pokemon_utils import update_pokemon_index
+import pytest
+
+def _get(api: ReadAPI, path: str, query: dict | None = None, headers: dict | None = None) -> Response:
+    return asyncio.run(
+        api.handle(Request("GET", path, query or {}, headers or {}, "HTTP/1.1"))
+    )
+
+
+@pytest.fixture
+def app_cache(mock_api, tmp_path):
+    """Open an app cache holding the Pokemon index of the mock API's listing."""
+    app_cache = init_cache(f"app-{tmp_path.name}", memory_max_size=0, seed=False)
+
+    listing = APIAllPokemon(url=f"{mock_api.base_url}/pokemon")
+    listing.get_pokemon(use_cache=False)
+    update_pokemon_index(all_pokemon=listing, cache=app_cache)
+
+    yield app_cache
+
+    app_cache.close()
+
+
+@pytest.fixture
+def api(pokemon_cache, app_cache) -> ReadAPI:
+    return ReadAPI(cache=pokemon_cache, app_cache=app_cache, cache_only=True)
+
+
+def test_parse_request():
+    request = parse_request(
+        b"GET /pokemon/pikachu%20x?profile=summary HTTP/1.1\r\nHost: localhost\r\nAccept-Encoding: gzip;q=0\r\n\r\n"
+    )
+
+    assert request.method == "GET"
+    assert request.path == "/pokemon/pikachu x"
+    assert request.query == {"profile": "summary"}
+    assert request.headers["host"] == "localhost"
+    assert not request.accepts_gzip()
+
+    with pytest.raises(ValueError):
+        parse_request(b"GET / HTTP/2\r\n\r\n")
+
+
+def test_pokemon_by_name_and_id(api, pokemon_cache):
+    response = _get(api, "/pokemon/pokemon-3")
+
+    assert response.status == 200
+    assert json.loads(response.body) == pokemon_cache.get("pokemon-3")
+    assert response.headers["ETag"]
+
+    by_id = _get(api, "/pokemon/3")
+    assert by_id.status == 200
+    assert by_id.body == response.body
+
+
+def test_pokemon_gzip(api, pokemon_cache):
+    response = _get(api, "/pokemon/pokemon-3", headers={"accept-encoding": "gzip, deflate"})
+
+    assert response.status == 200
+    assert response.headers["Content-Encoding"] == "gzip"
+    assert json.loads(gzip.decompress(response.body)) == pokemon_cache.get("pokemon-3")
+
+
+def test_etag_not_modified(api):
+    etag: str = _get(api, "/pokemon/pokemon-4").headers["ETag"]
+
+    response = _get(api, "/pokemon/pokemon-4", headers={"if-none-match": etag})
+    assert response.status == 304
+    assert response.body == b""
+    assert api.not_modified == 1
+
+    assert _get(api, "/pokemon/pokemon-4", headers={"if-none-match": '"other"'}).status == 200
+
+
+def test_not_found(api):
+    assert _get(api, "/pokemon/missingno").status == 404
+    assert _get(api, "/pokemon/9999").status == 404
+    assert _get(api, "/pokemon/pokemon-1", query={"profile": "everything"}).status == 400
+    assert _get(api, "/berries").status == 404
+    assert api.upstream_fetches == 0
+
+
+def test_listing(api, mock_api):
+    page: dict = json.loads(_get(api, "/pokemon", query={"limit": "10", "offset": "5"}).body)
+
+    assert page["count"] == mock_api.count
+    assert [p["name"] for p in page["results"]] == [f"pokemon-{i}" for i in range(6, 16)]
+    assert page["next"] == "/pokemon?offset=15&limit=10"
+    assert page["previous"] == "/pokemon?offset=0&limit=10"
+
+    assert _get(api, "/pokemon", query={"limit": "0"}).status == 400
+    assert _get(api, "/pokemon", query={"offset": "a"}).status == 400
+
+
+def test_index_routes(api):
+    assert json.loads(_get(api, "/index/pokemon-12").body)["id"] == 12
+    assert json.loads(_get(api, "/index", query={"prefix": "pokemon-2", "limit": "3"}).body) == {
+        "results": ["pokemon-2", "pokemon-20", "pokemon-21"]
+    }
+    assert "pokemon-12" in json.loads(_get(api, "/index", query={"fuzzy": "pokemon-12x"}).body)["results"]
+    assert _get(api, "/index").status == 400
+
+
+def test_health(api):
+    _get(api, "/pokemon/pokemon-1")
+    health: dict = json.loads(_get(api, "/health").body)
+
+    assert health["status"] == "ok"
+    assert health["cache_only"] is True
+    assert health["requests"] == 2
+
+
+def test_fetches_missing_pokemon(mock_api, cache, app_cache):
+    api = ReadAPI(cache=cache, app_cache=app_cache, cache_only=False)
+
+    response = _get(api, "/pokemon/pokemon-7")
+    assert response.status == 200
+    assert json.loads(response.body)["id"] == 7
+    assert api.upstream_fetches == 1
+    assert "pokemon-7" in cache
+
+    ## Served from the cache from now on
+    assert _get(api, "/pokemon/7").status == 200
+    assert api.upstream_fetches == 1
@@ -0,0 +1,120 @@
+from __future__ import annotations
+
+from pokeapi.dependencies import (
+    Snapshot,
+    init_cache,
+    restore_snapshot,
+    seed_from_snapshot,
+    write_snapshot,
+)
+import pytest
+
+ENTRIES: dict = {
+    "bulbasaur": {"id": 1, "name": "bulbasaur", "types": ["grass", "poison"]},
+    "pikachu": {"id": 25, "name": "pikachu", "types": ["electric"]},
+    "all_pokemon": [{"name": "bulbasaur"}, {"name": "pikachu"}],
+    "count": 2,
+}
+
+
+@pytest.fixture
+def snapshot_file(cache, tmp_path):
+    for key, value in ENTRIES.items():
+        cache.set(key, value)
+    ## Skipped: snapshot keys are strings
+    cache.set(42, "not a string key")
+
+    path = tmp_path / "snapshots" / "requests.pksnap"
+    info = write_snapshot(cache, path, codec="msgpack")
+
+    assert info.count == len(ENTRIES)
+    assert path.exists()
+
+    return path
+
+
+def test_read_snapshot(snapshot_file):
+    with Snapshot(snapshot_file) as snapshot:
+        assert len(snapshot) == len(ENTRIES)
+        assert list(snapshot) == sorted(ENTRIES)
+        assert dict(snapshot.items()) == ENTRIES
+
+        for key, value in ENTRIES.items():
+            assert key in snapshot
+            assert snapshot.get(key) == value
+            assert snapshot[key] == value
+
+        assert "mew" not in snapshot
+        assert 42 not in snapshot
+        assert snapshot.get("mew", "missing") == "missing"
+        assert snapshot.get_many(["pikachu", "mew"]) == {"pikachu": ENTRIES["pikachu"]}
+
+        with pytest.raises(KeyError):
+            snapshot["mew"]
+
+
+def test_snapshot_is_read_only(snapshot_file):
+    with Snapshot(snapshot_file) as snapshot:
+        with pytest.raises(TypeError):
+            snapshot.set("mew", {})
+        with pytest.raises(TypeError):
+            snapshot["mew"] = {}
+        with pytest.raises(TypeError):
+            snapshot.delete("pikachu")
+
+
+def test_snapshot_id_depends_on_contents(cache, snapshot_file, tmp_path):
+    with Snapshot(snapshot_file) as snap:
+        snapshot_id: str = snap.snapshot_id
+
+    assert write_snapshot(cache, tmp_path / "same.pksnap", codec="msgpack").snapshot_id == snapshot_id
+
+    cache.set("mew", {"id": 151})
+    assert write_snapshot(cache, tmp_path / "changed.pksnap", codec="msgpack").snapshot_id != snapshot_id
+
+
+def test_reject_invalid_files(snapshot_file, tmp_path):
+    not_a_snapshot = tmp_path / "garbage.pksnap"
+    not_a_snapshot.write_bytes(b"x" * 128)
+
+    truncated = tmp_path / "truncated.pksnap"
+    truncated.write_bytes(snapshot_file.read_bytes()[:-8])
+
+    too_short = tmp_path / "short.pksnap"
+    too_short.write_bytes(snapshot_file.read_bytes()[:16])
+
+    for path in (not_a_snapshot, truncated, too_short):
+        with pytest.raises(ValueError):
+            Snapshot(path)
+
+
+def test_restore_snapshot(snapshot_file, tmp_path):
+    target = init_cache(f"restore-{tmp_path.name}", memory_max_size=0, seed=False)
+    target.set("pikachu", {"id": 25, "name": "newer"})
+
+    with Snapshot(snapshot_file) as snapshot:
+        assert restore_snapshot(target, snapshot, batch_size=2) == len(ENTRIES) - 1
+        assert target.get("pikachu") == {"id": 25, "name": "newer"}
+        assert target.get("bulbasaur") == ENTRIES["bulbasaur"]
+
+        assert restore_snapshot(target, snapshot, overwrite=True) == len(ENTRIES)
+        assert target.get("pikachu") == ENTRIES["pikachu"]
+
+    target.close()
+
+
+def test_seed_from_snapshot_once(snapshot_file, tmp_path, monkeypatch):
+    monkeypatch.setattr("pokeapi.dependencies.snapshot._seeded", set())
+    target = init_cache(f"seed-{tmp_path.name}", memory_max_size=0, seed=False)
+
+    assert seed_from_snapshot(target, "requests", directory=snapshot_file.parent) == len(ENTRIES)
+
+    ## Seeded once per process, and once per snapshot per cache
+    target.delete("pikachu")
+    assert seed_from_snapshot(target, "requests", directory=snapshot_file.parent) == 0
+
+    monkeypatch.setattr("pokeapi.dependencies.snapshot._seeded", set())
+    assert seed_from_snapshot(target, "requests", directory=snapshot_file.parent) == 0
+    assert "pikachu" not in target
+
+    target.close()
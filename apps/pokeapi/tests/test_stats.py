@@ -0,0 +1,136 @@
+from __future__ import annotations
+
+import pytest
+
+np = pytest.importorskip("numpy")
+
+from pokeapi.domain.api.responses import meta_key
+from pokeapi.utils.pokemon_utils import is_pokemon_response, iter_pokemon_cache_keys
+from pokeapi.utils.stats_utils import StatsEngine, type_key
+from pokeapi.utils.stats_utils.operations import STAT_NAMES, TYPE_NAMES
+
+def _responses(cache) -> dict[str, dict]:
+    return {
+        value["name"]: value
+        for value in (cache.get(key) for key in iter_pokemon_cache_keys(cache))
+        if is_pokemon_response(value)
+    }
+
+
+def _base_stats(response: dict) -> dict[str, int]:
+    return {s["stat"]["name"]: s["base_stat"] for s in response["stats"]}
+
+
+def _types(response: dict) -> set[str]:
+    return {t["type"]["name"] for t in response["types"]}
+
+
+@pytest.fixture
+def engine(pokemon_cache) -> StatsEngine:
+    return StatsEngine(pokemon_cache, check_interval=3600, fetch_types=False)
+
+
+def test_totals(engine, pokemon_cache):
+    responses: dict[str, dict] = _responses(pokemon_cache)
+
+    assert engine.totals() == {
+        name: sum(_base_stats(r).values())
+        for name, r in sorted(responses.items(), key=lambda item: item[1]["id"])
+    }
+
+
+def test_filter(engine, pokemon_cache):
+    responses: dict[str, dict] = _responses(pokemon_cache)
+    first: dict = responses["pokemon-1"]
+    types: list[str] = sorted(_types(first))
+
+    matches: list[str] = engine.filter(types=types)
+    assert "pokemon-1" in matches
+    assert set(matches) == {name for name, r in responses.items() if set(types) <= _types(r)}
+
+    speed: int = _base_stats(first)["speed"]
+    assert set(engine.filter(min_stats={"speed": speed})) == {
+        name for name, r in responses.items() if _base_stats(r)["speed"] >= speed
+    }
+    assert set(engine.filter(max_stats={"speed": speed}, min_total=0)) == {
+        name for name, r in responses.items() if _base_stats(r)["speed"] <= speed
+    }
+
+
+def test_nearest(engine):
+    neighbours: list[tuple[str, float]] = engine.nearest(["pokemon-1"], k=3)["pokemon-1"]
+
+    assert len(neighbours) == 3
+    assert "pokemon-1" not in [name for name, _ in neighbours]
+    assert [d for _, d in neighbours] == sorted(d for _, d in neighbours)
+
+    with pytest.raises(KeyError):
+        engine.nearest(["missingno"])
+
+
+def test_percentile_ranks(engine):
+    ranks: dict[str, dict[str, float]] = engine.percentile_ranks(["pokemon-1"])
+
+    assert list(ranks) == ["pokemon-1"]
+    assert set(ranks["pokemon-1"]) == {*STAT_NAMES, "total"}
+    assert all(0 < rank <= 100 for rank in ranks["pokemon-1"].values())
+
+
+def test_rebuilds_from_changed_responses(engine, pokemon_cache):
+    assert engine.totals()["pokemon-2"] > 0
+    builds: int = engine.builds
+
+    ## Unchanged cache: checking again doesn't rebuild
+    engine.invalidate()
+    engine.totals()
+    assert engine.builds == builds
+
+    response: dict = pokemon_cache.get("pokemon-2")
+    for stat in response["stats"]:
+        stat["base_stat"] = 1
+    pokemon_cache.set("pokemon-2", response)
+    ## Without a CacheMeta, the response itself is fingerprinted
+    pokemon_cache.delete(meta_key("pokemon-2"))
+
+    ## Not checked again until check_interval passes
+    assert engine.totals()["pokemon-2"] > len(STAT_NAMES)
+
+    engine.invalidate()
+    assert engine.totals()["pokemon-2"] == len(STAT_NAMES)
+    assert engine.builds == builds + 1
+
+
+def test_effectiveness_from_cached_types(engine, pokemon_cache):
+    fire: int = TYPE_NAMES.index("fire")
+    grass: int = TYPE_NAMES.index("grass")
+    water: int = TYPE_NAMES.index("water")
+
+    assert engine.arrays.effectiveness[fire, grass] == 1.0
+
+    pokemon_cache.set(
+        type_key("fire"),
+        {
+            "id": fire + 1,
+            "name": "fire",
+            "damage_relations": {
+                "double_damage_to": [{"name": "grass", "url": ""}],
+                "double_damage_from": [{"name": "water", "url": ""}],
+                "half_damage_to": [{"name": "unknown", "url": f"https://pokeapi.co/api/v2/type/{water + 1}/"}],
+            },
+        },
+    )
+    engine.invalidate()
+    effectiveness = engine.arrays.effectiveness
+
+    assert effectiveness[fire, grass] == 2.0
+    assert effectiveness[water, fire] == 2.0
+    assert effectiveness[fire, water] == 0.5
+    assert effectiveness[grass, fire] == 1.0
+
+
+def test_counters(engine):
+    counters: list[tuple[str, float]] = engine.counters(["pokemon-1", "pokemon-2"], k=5)
+
+    assert len(counters) == 5
+    assert not {"pokemon-1", "pokemon-2"} & {name for name, _ in counters}
+    assert [s for _, s in counters] == sorted((s for _, s in counters), reverse=True)